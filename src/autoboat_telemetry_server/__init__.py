@@ -9,9 +9,19 @@ from flask import Flask as _flask
 from flask_cors import CORS
 from flask_migrate import Migrate
 
+from .alert_rules import alert_rules
+from .anomalies import anomalies
+from .config_store import config_store
+from .instance_names import instance_names
+from .kinematics import kinematics
 from .lock_manager import LockManager
+from .maintenance import init_app as init_maintenance
 from .models import db
 from .observability import init_app as init_observability
+from .position_index import position_index
+from .read_only import read_db
+from .rolling_stats import rolling_stats
+from .tracks import tracks
 
 shared_lock_manager = LockManager()
 
@@ -28,6 +38,7 @@ else:
 INSTANCE_DIR = HOME_DIR / "telemetry_server" / "src" / "instance"
 
 from autoboat_telemetry_server.routes import (  # noqa: E402
+    AdminEndpoint,
     AutopilotParametersEndpoint,
     BoatStatusEndpoint,
     InstanceManagerEndpoint,
@@ -74,9 +85,28 @@ def create_app() -> _flask:
     else:
         origins = app.config.get("CORS_ORIGINS", DEFAULT_CORS_ORIGINS)
 
-    CORS(app, origins=origins)
+    # pagination cursor header must be readable by the dashboard; see python-source.instructions.md#get_all_instance_info
+    CORS(app, origins=origins, expose_headers=["X-Next-Cursor"])
 
     db.init_app(app)
+    # lock-free read routes; see .github/instructions/python-source.instructions.md#Read-only session
+    read_db.init_app(app)
+    # in-memory name -> id map for get_id; see .github/instructions/python-source.instructions.md#Instance name cache
+    instance_names.init_app(app)
+    # in-memory grid of latest positions; see .github/instructions/python-source.instructions.md#Position index
+    position_index.init_app(app)
+    # in-memory position tracks per instance; see .github/instructions/python-source.instructions.md#Position tracks
+    tracks.init_app(app)
+    # previous sample per instance for derived_* fields; see .github/instructions/python-source.instructions.md#Derived kinematics
+    kinematics.init_app(app)
+    # rolling per-field aggregates; see .github/instructions/python-source.instructions.md#Rolling statistics
+    rolling_stats.init_app(app)
+    # hold timers of alert rules; see .github/instructions/python-source.instructions.md#Alert rules
+    alert_rules.init_app(app)
+    # ewma / stuck value detectors per field; see .github/instructions/python-source.instructions.md#Anomaly detection
+    anomalies.init_app(app)
+    # in-memory hash -> config map; see .github/instructions/python-source.instructions.md#Config store
+    config_store.init_app(app)
 
     # migrations are the only path that creates tables in prod; see
     # .github/instructions/python-source.instructions.md#App factory and AGENTS.md #6.2
@@ -95,11 +125,16 @@ def create_app() -> _flask:
     app.register_blueprint(AutopilotParametersEndpoint().blueprint)
     app.register_blueprint(BoatStatusEndpoint().blueprint)
     app.register_blueprint(WaypointEndpoint().blueprint)
+    app.register_blueprint(AdminEndpoint().blueprint)
 
     # structured logging + /metrics endpoint; see observability.py and
     # .github/instructions/python-source.instructions.md#Observability
     init_observability(app)
 
+    # leader-elected background clean-up / checkpoint / optimize; see maintenance.py and
+    # .github/instructions/python-source.instructions.md#Maintenance scheduler
+    init_maintenance(app, shared_lock_manager, INSTANCE_DIR / "maintenance.lock")
+
     @app.route("/")
     def index() -> str:
         """
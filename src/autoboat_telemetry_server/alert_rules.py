@@ -0,0 +1,427 @@
+"""
+Operator-defined threshold rules, compiled once and evaluated on every boat status write.
+
+See `.github/instructions/python-source.instructions.md` #"Alert rules"
+for the rule syntax, when a rule fires and how the evaluation cost is bounded.
+"""
+
+__all__ = [
+    "DEFAULT_RULE_CACHE_SIZE",
+    "MAX_ALERT_RULES",
+    "MAX_ALERT_RULE_HOLD",
+    "MAX_ALERT_RULE_LENGTH",
+    "AlertRules",
+    "CompiledRule",
+    "RuleCache",
+    "alert_rules",
+    "parse_rule",
+]
+
+import math
+import operator
+import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Mapping
+from datetime import UTC, datetime
+from typing import Any
+
+from flask import Flask, current_app
+
+from autoboat_telemetry_server.models import AlertRuleTable, TelemetryTable, db
+from autoboat_telemetry_server.positions import status_number
+from autoboat_telemetry_server.types import DiagnosticMessageIntensity
+
+# rules per instance, and global rules; every write evaluates at most twice this many
+MAX_ALERT_RULES = 64
+
+# upper bounds on one rule
+MAX_ALERT_RULE_LENGTH = 256
+MAX_ALERT_RULE_HOLD = 3600.0
+
+# compiled rules kept per process
+DEFAULT_RULE_CACHE_SIZE = 512
+
+# [abs(]field[)] comparator number [for duration unit]
+_RULE_PATTERN = re.compile(
+    r"\s*(?:abs\s*\(\s*(?P<absolute>[A-Za-z_]\w*)\s*\)|(?P<field>[A-Za-z_]\w*))"
+    r"\s*(?P<comparator><=|>=|==|!=|<|>)"
+    r"\s*(?P<threshold>[-+]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?)"
+    r"(?:\s+for\s+(?P<hold>\d+(?:\.\d*)?|\.\d+)\s*(?P<unit>ms|s|min))?\s*"
+)
+
+_COMPARATORS: dict[str, Callable[[float, float], bool]] = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+_UNIT_SECONDS = {"ms": 0.001, "s": 1.0, "min": 60.0}
+
+# seconds; monotonic so a wall clock step cannot shorten or stretch a hold
+_clock = time.monotonic
+
+
+class CompiledRule:
+    """
+    A parsed rule: one field, an optional ``abs``, a comparison with a constant and an optional hold time.
+
+    Parameters
+    ----------
+    rule
+        The rule text, e.g. ``battery_voltage < 11.2 for 5s`` or ``abs(heel) > 35``.
+
+    Raises
+    ------
+    ValueError
+        If the rule does not parse, or its hold time is out of range.
+    """
+
+    __slots__ = ("_absolute", "_compare", "field", "hold", "threshold")
+
+    def __init__(self, rule: str) -> None:
+        match = _RULE_PATTERN.fullmatch(rule)
+        if match is None:
+            raise ValueError(
+                "Invalid alert rule. Expected '<field> <op> <number> [for <n>ms|s|min]' with <field> optionally "
+                "wrapped in abs() and <op> one of " + ", ".join(_COMPARATORS) + "."
+            )
+
+        self._absolute = match["absolute"] is not None
+        self.field: str = match["absolute"] or match["field"]
+        self._compare = _COMPARATORS[match["comparator"]]
+        self.threshold = float(match["threshold"])
+        self.hold = float(match["hold"]) * _UNIT_SECONDS[match["unit"]] if match["hold"] else 0.0
+
+        if not (math.isfinite(self.threshold) and self.hold <= MAX_ALERT_RULE_HOLD):
+            raise ValueError(f"An alert rule's threshold must be finite and its hold at most {MAX_ALERT_RULE_HOLD:.0f}s.")
+
+    def matches(self, status: Mapping[str, object]) -> bool:
+        """
+        Return whether a boat status meets the rule's condition, ignoring the hold time.
+
+        Parameters
+        ----------
+        status
+            The boat status.
+
+        Returns
+        -------
+        bool
+            ``False`` if the field is missing, not a number or not finite.
+        """
+
+        value = status_number(status.get(self.field))
+        if value is None:
+            return False
+
+        return self._compare(abs(value) if self._absolute else value, self.threshold)
+
+
+class RuleCache:
+    """
+    Thread-safe LRU of compiled rules keyed by their text.
+
+    Parameters
+    ----------
+    maxsize
+        Maximum number of rules kept; the least recently used is evicted first.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_RULE_CACHE_SIZE) -> None:
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+        self._rules: OrderedDict[str, CompiledRule] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """Return the number of compiled rules."""
+
+        return len(self._rules)
+
+    def get(self, rule: str) -> CompiledRule:
+        """
+        Return the compiled form of a rule, compiling it on a miss.
+
+        Parameters
+        ----------
+        rule
+            The rule text, as stored in ``AlertRuleTable.rule``.
+
+        Returns
+        -------
+        CompiledRule
+            The compiled rule.
+        """
+
+        with self._lock:
+            compiled = self._rules.get(rule)
+            if compiled is not None:
+                self._rules.move_to_end(rule)
+                self.hits += 1
+                return compiled
+
+            self.misses += 1
+
+        compiled = CompiledRule(rule)
+        with self._lock:
+            self._rules[rule] = compiled
+            self._rules.move_to_end(rule)
+            while len(self._rules) > self._maxsize:
+                self._rules.popitem(last=False)
+
+        return compiled
+
+
+def parse_rule(data: object) -> dict[str, Any]:
+    """
+    Validate an alert rule from a request body.
+
+    Parameters
+    ----------
+    data
+        The decoded body, ``{"rule": str, "intensity": int}``; ``intensity`` defaults to ``WARNING``.
+
+    Returns
+    -------
+    dict[str, Any]
+        ``rule`` and ``intensity`` for ``AlertRuleTable``, with the rule's surrounding whitespace stripped.
+
+    Raises
+    ------
+    TypeError
+        If the body is not a dictionary or a field has the wrong type.
+    ValueError
+        If the rule does not compile or the intensity is not a ``DiagnosticMessageIntensity``.
+    """
+
+    if not isinstance(data, dict):
+        raise TypeError("Invalid alert rule format. Expected a dictionary with 'rule' and 'intensity'.")
+
+    rule, intensity = data.get("rule"), data.get("intensity", DiagnosticMessageIntensity.WARNING)
+    if not isinstance(rule, str) or not isinstance(intensity, int) or isinstance(intensity, bool):
+        raise TypeError("Alert rule 'rule' must be a string and 'intensity' an integer.")
+
+    rule = rule.strip()
+    if len(rule) > MAX_ALERT_RULE_LENGTH:
+        raise ValueError(f"An alert rule must be at most {MAX_ALERT_RULE_LENGTH} characters.")
+
+    CompiledRule(rule)
+    try:
+        intensity = DiagnosticMessageIntensity(intensity)
+    except ValueError as e:
+        raise ValueError("Alert rule intensity must be a valid DiagnosticMessageIntensity value.") from e
+
+    return {"rule": rule, "intensity": int(intensity)}
+
+
+class _AlertState:
+    """Per-app hold timers, stored in ``app.extensions["alert_rules"]``."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        # instance_id -> rule_id -> (monotonic time the condition started holding, whether it has fired since)
+        self.holds: dict[int, dict[int, tuple[float, bool]]] = {}
+
+
+class AlertRules:
+    """
+    Evaluates an instance's and the global alert rules against each new boat status.
+
+    A rule fires once when its condition has held for its hold time, and re-arms when the condition
+    stops holding. Hold timers are process-local; status routes call ``check_status`` before they commit
+    and ``record`` after. Delete paths call ``forget`` / ``forget_all`` in their
+    transaction, then ``discard`` / ``clear`` after they commit.
+    """
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Register empty hold timers for ``app``.
+
+        Parameters
+        ----------
+        app
+            The Flask app.
+        """
+
+        app.extensions["alert_rules"] = _AlertState()
+
+    @property
+    def _state(self) -> _AlertState:
+        return current_app.extensions["alert_rules"]
+
+    def check_status(
+        self, cache: RuleCache, instance: TelemetryTable, status: Mapping[str, object], *, raised: bool = False
+    ) -> tuple[dict[int, tuple[float, bool]], list[DiagnosticMessageIntensity], int, float]:
+        """
+        Evaluate the rules against a new boat status and raise a diagnostic message for those that fire.
+
+        ``last_fired_at`` and the diagnostic message are set in the caller's transaction; the message is
+        only written if it differs from the current one. A message raised earlier in the same write (a
+        geofence violation) is kept: the alerts are appended to it, at the higher of the two intensities.
+
+        Parameters
+        ----------
+        cache
+            Compiled rules.
+        instance
+            The telemetry instance being written.
+        status
+            The new ``boat_status``, including any ``derived_*`` fields.
+        raised
+            Whether ``instance.diagnostic_message`` was set earlier in this write.
+
+        Returns
+        -------
+        tuple[dict[int, tuple[float, bool]], list[DiagnosticMessageIntensity], int, float]
+            The instance's hold timers to ``record`` once the write is committed, the intensities of the rules
+            that fired, the number of rules evaluated, and the seconds spent.
+        """
+
+        start = time.perf_counter()
+        rules = db.session.execute(
+            db.select(AlertRuleTable.rule_id, AlertRuleTable.rule, AlertRuleTable.intensity)
+            .where((AlertRuleTable.instance_id == instance.instance_id) | AlertRuleTable.instance_id.is_(None))
+            .order_by(AlertRuleTable.rule_id)
+        ).all()
+        if not rules:
+            return {}, [], 0, time.perf_counter() - start
+
+        now = _clock()
+        state = self._state
+        with state.lock:
+            previous = dict(state.holds.get(instance.instance_id, {}))
+
+        # a new set of timers, applied by record() only if the write commits, so a rolled-back firing can fire again
+        holds: dict[int, tuple[float, bool]] = {}
+        fired: list[tuple[int, str, DiagnosticMessageIntensity]] = []
+        for rule_id, rule, intensity in rules:
+            compiled = cache.get(rule)
+            if not compiled.matches(status):
+                continue
+
+            since, has_fired = previous.get(rule_id, (now, False))
+            if not has_fired and now - since >= compiled.hold:
+                has_fired = True
+                fired.append((rule_id, rule, DiagnosticMessageIntensity(intensity)))
+            holds[rule_id] = (since, has_fired)
+
+        if fired:
+            db.session.execute(
+                db.update(AlertRuleTable)
+                .where(AlertRuleTable.rule_id.in_([rule_id for rule_id, _, _ in fired]))
+                .values(last_fired_at=datetime.now(UTC))
+            )
+            intensity = max(intensity for _, _, intensity in fired)
+            text = "Alert: " + "; ".join(rule for _, rule, _ in fired) + "."
+            current = instance.diagnostic_message
+            if raised and current:
+                intensity, text = max(intensity, DiagnosticMessageIntensity(current[0])), f"{current[1]} {text}"
+
+            message = [intensity, text]
+            if current != message:
+                instance.diagnostic_message = message
+
+        return holds, [intensity for _, _, intensity in fired], len(rules), time.perf_counter() - start
+
+    def record(self, instance_id: int, holds: dict[int, tuple[float, bool]]) -> None:
+        """
+        Keep the hold timers of a committed write for the next ``check_status``.
+
+        Parameters
+        ----------
+        instance_id
+            The instance whose boat status was written.
+        holds
+            The timers ``check_status`` returned; empty drops the instance's timers.
+        """
+
+        state = self._state
+        with state.lock:
+            if holds:
+                state.holds[instance_id] = holds
+            else:
+                state.holds.pop(instance_id, None)
+
+    def firing(self, instance_id: int) -> set[int]:
+        """
+        Return the rules that have fired for an instance and not yet re-armed.
+
+        Parameters
+        ----------
+        instance_id
+            The instance to look up.
+
+        Returns
+        -------
+        set[int]
+            Their ``rule_id``.
+        """
+
+        state = self._state
+        with state.lock:
+            return {rule_id for rule_id, (_, has_fired) in state.holds.get(instance_id, {}).items() if has_fired}
+
+    def forget(self, instance_ids: Iterable[int]) -> None:
+        """
+        Delete the rules of deleted instances, in the caller's transaction; global rules are kept.
+
+        Parameters
+        ----------
+        instance_ids
+            IDs of the instances being deleted.
+        """
+
+        instance_ids = list(instance_ids)
+        if instance_ids:
+            db.session.execute(db.delete(AlertRuleTable).where(AlertRuleTable.instance_id.in_(instance_ids)))
+
+    def forget_all(self) -> None:
+        """Delete every instance's rules, in the caller's transaction (e.g. ``delete_all``); global rules are kept."""
+
+        db.session.execute(db.delete(AlertRuleTable).where(AlertRuleTable.instance_id.is_not(None)))
+
+    def forget_rule(self, rule_id: int) -> None:
+        """
+        Drop the hold timers of a deleted rule.
+
+        Parameters
+        ----------
+        rule_id
+            The rule whose deletion was committed.
+        """
+
+        state = self._state
+        with state.lock:
+            for holds in state.holds.values():
+                holds.pop(rule_id, None)
+
+    def discard(self, instance_ids: Iterable[int]) -> None:
+        """
+        Drop the hold timers of deleted instances.
+
+        Parameters
+        ----------
+        instance_ids
+            IDs of the instances whose deletion was committed.
+        """
+
+        state = self._state
+        with state.lock:
+            for instance_id in instance_ids:
+                state.holds.pop(instance_id, None)
+
+    def clear(self) -> None:
+        """Drop every hold timer, e.g. after ``delete_all``."""
+
+        state = self._state
+        with state.lock:
+            state.holds.clear()
+
+
+alert_rules = AlertRules()
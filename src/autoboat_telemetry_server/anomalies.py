@@ -0,0 +1,284 @@
+"""
+Process-local detectors of bad sensor values: non-finite readings, sudden jumps and frozen values.
+
+See `.github/instructions/python-source.instructions.md` #"Anomaly detection"
+for what each detector flags, its defaults and why it is O(1) per sample.
+"""
+
+__all__ = [
+    "ANOMALY_TYPES",
+    "DEFAULT_ANOMALY_EWMA_ALPHA",
+    "DEFAULT_ANOMALY_JUMP_SIGMAS",
+    "DEFAULT_ANOMALY_STUCK_SAMPLES",
+    "MAX_ANOMALY_FIELDS",
+    "MAX_RECENT_ANOMALIES",
+    "STUCK_MIN_CHANGE_RATE",
+    "Anomalies",
+    "anomalies",
+]
+
+import math
+import threading
+from collections import deque
+from collections.abc import Iterable, Mapping
+from datetime import UTC, datetime
+from typing import Any
+
+from flask import Flask, current_app
+
+from autoboat_telemetry_server.positions import status_number
+
+ANOMALY_TYPES = ("non_finite", "jump", "stuck")
+
+# weight of the newest sample in the moving mean / variance; ~1 / alpha samples of memory
+DEFAULT_ANOMALY_EWMA_ALPHA = 0.05
+
+# a value further than this many moving standard deviations from the moving mean is a jump
+DEFAULT_ANOMALY_JUMP_SIGMAS = 6.0
+
+# consecutive identical samples before a value that used to change counts as stuck
+DEFAULT_ANOMALY_STUCK_SAMPLES = 50
+
+# share of samples that changed the value, before it froze, for it to count as stuck
+STUCK_MIN_CHANGE_RATE = 0.5
+
+# fields watched per instance, so a free-form status cannot grow the detectors without bound
+MAX_ANOMALY_FIELDS = 64
+
+# detected anomalies kept per instance
+MAX_RECENT_ANOMALIES = 32
+
+
+class _AnomalyState:
+    """Per-app detectors, stored in ``app.extensions["anomalies"]``."""
+
+    def __init__(self, alpha: float, jump_sigmas: float, stuck_samples: int) -> None:
+        self.lock = threading.Lock()
+        self.alpha = alpha
+        self.jump_sigmas = jump_sigmas
+        self.stuck_samples = stuck_samples
+        # instance_id -> field -> detector
+        self.detectors: dict[int, dict[str, _Detector]] = {}
+        # instance_id -> detected anomalies, oldest first
+        self.recent: dict[int, deque[dict[str, Any]]] = {}
+
+
+class _Detector:
+    """Moving mean / variance, the current run of identical values and the active anomalies of one field."""
+
+    __slots__ = ("active", "change_rate", "last", "mean", "repeats", "run_change_rate", "samples", "variance")
+
+    def __init__(self) -> None:
+        self.samples = 0
+        self.mean = 0.0
+        self.variance = 0.0
+        self.last: float | None = None
+        self.repeats = 0
+        self.change_rate = 0.0
+        self.run_change_rate = 0.0
+        # anomaly type -> when it started
+        self.active: dict[str, str] = {}
+
+    def add(self, value: float, settings: _AnomalyState, now: str) -> list[str]:
+        """Update the detector with one sample and return the anomaly types it started."""
+
+        started: list[str] = []
+        if not math.isfinite(value):
+            # the moving statistics and the run are left as they were, so the field picks up where it left off
+            self._set("non_finite", True, now, started)
+            return started
+
+        self._set("non_finite", False, now, started)
+        alpha = settings.alpha
+
+        if value == self.last:
+            # a held value says nothing new about the spread, so it does not shrink the moving variance
+            self.repeats += 1
+            self.change_rate -= alpha * self.change_rate
+            self._set(
+                "stuck", self.repeats >= settings.stuck_samples and self.run_change_rate >= STUCK_MIN_CHANGE_RATE, now, started
+            )
+            return started
+
+        if self.last is not None:
+            self.change_rate += alpha * (1.0 - self.change_rate)
+        self.run_change_rate = self.change_rate
+        self.last = value
+        self.repeats = 1
+        self._set("stuck", False, now, started)
+
+        if not self.samples:
+            self.mean = value
+        else:
+            difference = value - self.mean
+            self._set(
+                "jump",
+                self.samples >= 1 / alpha and abs(difference) > settings.jump_sigmas * math.sqrt(self.variance) > 0,
+                now,
+                started,
+            )
+            # west's incremental update of an exponentially weighted mean and variance
+            increment = alpha * difference
+            self.mean += increment
+            self.variance = (1.0 - alpha) * (self.variance + difference * increment)
+
+        self.samples += 1
+        return started
+
+    def _set(self, kind: str, on: bool, now: str, started: list[str]) -> None:
+        if not on:
+            self.active.pop(kind, None)
+        elif kind not in self.active:
+            self.active[kind] = now
+            started.append(kind)
+
+
+class Anomalies:
+    """
+    Anomaly detectors for every instance's numeric status fields since the server started.
+
+    Status routes call ``update`` after they commit, and delete paths call ``discard`` / ``clear``.
+    """
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Register empty detectors for ``app``.
+
+        Parameters
+        ----------
+        app
+            The Flask app.
+
+        Raises
+        ------
+        ValueError
+            If ``ANOMALY_EWMA_ALPHA`` is not in (0, 1], or ``ANOMALY_JUMP_SIGMAS`` / ``ANOMALY_STUCK_SAMPLES``
+            is not positive.
+        """
+
+        alpha = float(app.config.get("ANOMALY_EWMA_ALPHA", DEFAULT_ANOMALY_EWMA_ALPHA))
+        jump_sigmas = float(app.config.get("ANOMALY_JUMP_SIGMAS", DEFAULT_ANOMALY_JUMP_SIGMAS))
+        stuck_samples = int(app.config.get("ANOMALY_STUCK_SAMPLES", DEFAULT_ANOMALY_STUCK_SAMPLES))
+        if not (0 < alpha <= 1 and jump_sigmas > 0 and stuck_samples > 0):
+            raise ValueError("ANOMALY_EWMA_ALPHA must be in (0, 1], ANOMALY_JUMP_SIGMAS and ANOMALY_STUCK_SAMPLES positive.")
+
+        app.extensions["anomalies"] = _AnomalyState(alpha, jump_sigmas, stuck_samples)
+
+    @property
+    def _state(self) -> _AnomalyState:
+        return current_app.extensions["anomalies"]
+
+    def update(self, instance_id: int, status: Mapping[str, object], fields: Iterable[str] | None = None) -> list[str]:
+        """
+        Run a committed boat status through its instance's detectors.
+
+        Parameters
+        ----------
+        instance_id
+            The instance whose boat status was written.
+        status
+            The boat status as received, without ``derived_*`` fields.
+        fields
+            The fields to watch, from ``boat_status_mapping``; ``None`` watches every numeric field.
+            Booleans and non-numeric values are skipped.
+
+        Returns
+        -------
+        list[str]
+            The type of each anomaly that started with this status, for ``count_anomalies``.
+        """
+
+        values = [
+            (field, number)
+            for field in (status if fields is None else fields)
+            if (number := status_number(status.get(field), finite=False)) is not None
+        ]
+        now = datetime.now(UTC).isoformat()
+        started: list[str] = []
+
+        state = self._state
+        with state.lock:
+            detectors = state.detectors.setdefault(instance_id, {})
+            for field, value in values:
+                detector = detectors.get(field)
+                if detector is None:
+                    if len(detectors) >= MAX_ANOMALY_FIELDS:
+                        continue
+                    detector = detectors[field] = _Detector()
+
+                kinds = detector.add(value, state, now)
+                if kinds:
+                    recent = state.recent.setdefault(instance_id, deque(maxlen=MAX_RECENT_ANOMALIES))
+                    recent.extend(
+                        {"field": field, "type": kind, "value": value if math.isfinite(value) else None, "detected_at": now}
+                        for kind in kinds
+                    )
+                    started.extend(kinds)
+
+        return started
+
+    def summary(self, instance_id: int) -> dict[str, Any]:
+        """
+        Return an instance's active anomalies, its recent ones and the state of each detector.
+
+        Parameters
+        ----------
+        instance_id
+            The instance to look up.
+
+        Returns
+        -------
+        dict[str, Any]
+            ``active``: ``{"field", "type", "since"}`` for each anomaly still in progress; ``recent``: up to
+            ``MAX_RECENT_ANOMALIES`` ``{"field", "type", "value", "detected_at"}``, oldest first; ``fields``:
+            ``{field: {"mean", "stddev", "last", "repeats"}}`` of the moving statistics.
+        """
+
+        state = self._state
+        with state.lock:
+            detectors = state.detectors.get(instance_id, {})
+            return {
+                "active": [
+                    {"field": field, "type": kind, "since": since}
+                    for field, detector in detectors.items()
+                    for kind, since in detector.active.items()
+                ],
+                "recent": list(state.recent.get(instance_id, ())),
+                "fields": {
+                    field: {
+                        "mean": detector.mean,
+                        "stddev": math.sqrt(detector.variance),
+                        "last": detector.last,
+                        "repeats": detector.repeats,
+                    }
+                    for field, detector in detectors.items()
+                    if detector.samples
+                },
+            }
+
+    def discard(self, instance_ids: Iterable[int]) -> None:
+        """
+        Forget the detectors of deleted instances.
+
+        Parameters
+        ----------
+        instance_ids
+            IDs of the instances whose deletion was committed.
+        """
+
+        state = self._state
+        with state.lock:
+            for instance_id in instance_ids:
+                state.detectors.pop(instance_id, None)
+                state.recent.pop(instance_id, None)
+
+    def clear(self) -> None:
+        """Forget every detector, e.g. after ``delete_all``."""
+
+        state = self._state
+        with state.lock:
+            state.detectors.clear()
+            state.recent.clear()
+
+
+anomalies = Anomalies()
@@ -0,0 +1,122 @@
+"""
+Target selection and reporting for the fleet broadcast routes.
+
+See `.github/instructions/python-source.instructions.md` #"Fleet broadcast"
+for the request shape and the single-transaction update model.
+"""
+
+__all__ = ["MAX_BROADCAST_TARGETS", "BroadcastReport", "target_clause"]
+
+import time
+from collections.abc import Mapping
+
+from sqlalchemy.sql.elements import ColumnElement
+
+from autoboat_telemetry_server.models import TelemetryTable
+
+# upper bound for an explicit "instance_ids" list
+MAX_BROADCAST_TARGETS = 1000
+
+
+def target_clause(body: Mapping[str, object]) -> tuple[ColumnElement[bool], list[int] | None]:
+    """
+    Build the filter selecting a broadcast's target instances.
+
+    Targets are either an explicit ``instance_ids`` list, or a ``user`` (exact) and / or
+    ``name_prefix`` filter, as in ``/instance_manager/get_all_instance_info``.
+
+    Parameters
+    ----------
+    body
+        The broadcast request body.
+
+    Returns
+    -------
+    tuple[ColumnElement[bool], list[int] | None]
+        The ``WHERE`` clause, and the requested IDs (``None`` for a filter) so
+        IDs that match no instance can be reported.
+
+    Raises
+    ------
+    TypeError
+        If a target field has the wrong type.
+    ValueError
+        If no targets, or both IDs and a filter, are given, or there are too many IDs.
+    """
+
+    instance_ids = body.get("instance_ids")
+    user = body.get("user")
+    name_prefix = body.get("name_prefix")
+
+    if instance_ids is not None:
+        if user is not None or name_prefix is not None:
+            raise ValueError("Give either 'instance_ids' or a 'user' / 'name_prefix' filter, not both.")
+
+        if not isinstance(instance_ids, list) or not all(
+            isinstance(instance_id, int) and not isinstance(instance_id, bool) for instance_id in instance_ids
+        ):
+            raise TypeError("'instance_ids' must be a list of integers.")
+
+        if not 1 <= len(instance_ids) <= MAX_BROADCAST_TARGETS:
+            raise ValueError(f"'instance_ids' must list between 1 and {MAX_BROADCAST_TARGETS} instances.")
+
+        requested = sorted(set(instance_ids))
+        return TelemetryTable.instance_id.in_(requested), requested
+
+    if user is None and name_prefix is None:
+        raise ValueError("A broadcast needs 'instance_ids' or a 'user' / 'name_prefix' filter.")
+
+    clauses = []
+    if user is not None:
+        if not isinstance(user, str):
+            raise TypeError("'user' must be a string.")
+        clauses.append(TelemetryTable.user == user)
+
+    if name_prefix is not None:
+        if not isinstance(name_prefix, str) or not name_prefix:
+            raise TypeError("'name_prefix' must be a non-empty string.")
+        clauses.append(TelemetryTable.name_prefix_clause(name_prefix))
+
+    clause = clauses[0] if len(clauses) == 1 else clauses[0] & clauses[1]
+    return clause, None
+
+
+class BroadcastReport:
+    """Per-instance results and timing of one broadcast request."""
+
+    def __init__(self) -> None:
+        self.results: dict[int, str] = {}
+        self._start = time.perf_counter()
+
+    def missing(self, requested: list[int] | None, found: list[int]) -> None:
+        """
+        Record requested IDs that match no instance.
+
+        Parameters
+        ----------
+        requested
+            The requested IDs, or ``None`` for a filter.
+        found
+            The IDs of the instances that were found.
+        """
+
+        for instance_id in set(requested or ()) - set(found):
+            self.results[instance_id] = "Instance not found."
+
+    def to_dict(self) -> dict[str, object]:
+        """
+        Summarize the broadcast.
+
+        Returns
+        -------
+        dict[str, object]
+            ``results`` (``{"instance_id", "result"}`` in ID order, where ``result`` is
+            ``"updated"``, ``"unchanged"`` or the reason the instance was skipped),
+            the ``updated`` count and the elapsed ``seconds``.
+        """
+
+        return {
+            "results": [{"instance_id": instance_id, "result": result} for instance_id, result in sorted(self.results.items())],
+            "updated": sum(result == "updated" for result in self.results.values()),
+            "seconds": round(time.perf_counter() - self._start, 6),
+        }
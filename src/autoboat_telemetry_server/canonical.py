@@ -0,0 +1,176 @@
+"""
+Canonical JSON encoding and hashing for autopilot configurations and parameters.
+
+See `.github/instructions/python-source.instructions.md` #"Canonical encoding"
+for the encoding rules, why the config hash must not change, and how the
+running parameter digest works.
+"""
+
+__all__ = [
+    "EMPTY_PARAMETERS_DIGEST",
+    "HASH_ALGORITHMS",
+    "add_parameter",
+    "digest",
+    "encode",
+    "parameter_digest",
+    "parameters_digest",
+    "remove_parameter",
+]
+
+import hashlib
+import json
+from collections.abc import Mapping
+
+# one reusable encoder: json.dumps(..., sort_keys=True) builds a new one per call
+_ENCODER = json.JSONEncoder(sort_keys=True, separators=(",", ":"))
+
+HASH_ALGORITHMS = ("sha256", "blake2b")
+
+# the running parameter digest is a sum of per-parameter digests modulo 2**256
+_DIGEST_BITS = 256
+_DIGEST_MODULUS = 1 << _DIGEST_BITS
+EMPTY_PARAMETERS_DIGEST = "0" * (_DIGEST_BITS // 4)
+
+
+def encode(value: object) -> bytes:
+    """
+    Encode ``value`` as canonical JSON.
+
+    Keys are sorted, there is no whitespace, non-ASCII is escaped and
+    floats use ``repr`` (the shortest string that round-trips), so equal values
+    always encode to the same bytes.
+
+    Parameters
+    ----------
+    value
+        A JSON-serializable value.
+
+    Returns
+    -------
+    bytes
+        The canonical UTF-8 encoding.
+    """
+
+    return _ENCODER.encode(value).encode("utf-8")
+
+
+def digest(value: object, algorithm: str = "sha256") -> str:
+    """
+    Hash the canonical encoding of ``value``.
+
+    ``sha256`` is what ``HashTable`` keys are; changing it would orphan every
+    stored hash. ``blake2b`` (32-byte digest) is faster for hashes that are not
+    persisted as keys.
+
+    Parameters
+    ----------
+    value
+        A JSON-serializable value.
+    algorithm
+        One of ``HASH_ALGORITHMS``.
+
+    Returns
+    -------
+    str
+        The 64-character hex digest.
+
+    Raises
+    ------
+    ValueError
+        If ``algorithm`` is not supported.
+    """
+
+    if algorithm == "sha256":
+        return hashlib.sha256(encode(value)).hexdigest()
+
+    if algorithm == "blake2b":
+        return hashlib.blake2b(encode(value), digest_size=32).hexdigest()
+
+    raise ValueError(f"Unsupported hash algorithm: {algorithm}. Expected one of {', '.join(HASH_ALGORITHMS)}.")
+
+
+def parameter_digest(key: str, value: object) -> int:
+    """
+    Hash one ``key: value`` parameter for the running digest.
+
+    Parameters
+    ----------
+    key
+        The parameter name.
+    value
+        The parameter value.
+
+    Returns
+    -------
+    int
+        The BLAKE2b digest of the canonical ``[key, value]`` pair, as an integer.
+    """
+
+    return int.from_bytes(hashlib.blake2b(encode([key, value]), digest_size=_DIGEST_BITS // 8).digest(), "big")
+
+
+def _to_hex(total: int) -> str:
+    return format(total % _DIGEST_MODULUS, f"0{_DIGEST_BITS // 4}x")
+
+
+def parameters_digest(parameters: Mapping[str, object]) -> str:
+    """
+    Compute the running digest of a whole parameter dict.
+
+    Parameters
+    ----------
+    parameters
+        The autopilot parameters.
+
+    Returns
+    -------
+    str
+        The sum of every parameter's digest modulo ``2**256``, as 64 hex characters.
+        Independent of key order; ``EMPTY_PARAMETERS_DIGEST`` for ``{}``.
+    """
+
+    return _to_hex(sum(parameter_digest(key, value) for key, value in parameters.items()))
+
+
+def add_parameter(running_digest: str, key: str, value: object) -> str:
+    """
+    Add one parameter to a running digest in O(1).
+
+    Parameters
+    ----------
+    running_digest
+        The digest of the parameters without ``key``.
+    key
+        The parameter name.
+    value
+        The parameter value.
+
+    Returns
+    -------
+    str
+        The digest of the parameters with ``key: value``.
+    """
+
+    return _to_hex(int(running_digest, 16) + parameter_digest(key, value))
+
+
+def remove_parameter(running_digest: str, key: str, value: object) -> str:
+    """
+    Remove one parameter from a running digest in O(1).
+
+    Parameters
+    ----------
+    running_digest
+        The digest of the parameters including ``key: value``.
+    key
+        The parameter name.
+    value
+        The parameter's current value.
+
+    Returns
+    -------
+    str
+        The digest of the parameters without ``key``.
+    """
+
+    return _to_hex(int(running_digest, 16) - parameter_digest(key, value))
@@ -0,0 +1,116 @@
+"""
+Structural diff of autopilot configurations, memoized by content.
+
+See `.github/instructions/python-source.instructions.md` #"Config diff"
+for the result shape and why the memo never needs invalidating.
+"""
+
+__all__ = ["DEFAULT_DIFF_CACHE_SIZE", "DiffCache", "diff_mappings"]
+
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable, Mapping
+from typing import Any
+
+from autoboat_telemetry_server.canonical import encode
+
+# memoized diffs kept per process
+DEFAULT_DIFF_CACHE_SIZE = 256
+
+
+def diff_mappings(old: Mapping[str, object], new: Mapping[str, object]) -> dict[str, Any]:
+    """
+    Compare two parameter mappings key by key.
+
+    Values are compared by their canonical encoding, so ``1`` and ``1.0`` count as changed.
+
+    Parameters
+    ----------
+    old
+        The mapping to diff from.
+    new
+        The mapping to diff to.
+
+    Returns
+    -------
+    dict[str, Any]
+        ``{"added": {key: new_value}, "removed": {key: old_value},
+        "changed": {key: {"from": old_value, "to": new_value}}, "unchanged": count}``.
+    """
+
+    added = {key: new[key] for key in new.keys() - old.keys()}
+    removed = {key: old[key] for key in old.keys() - new.keys()}
+    changed = {
+        key: {"from": old[key], "to": new[key]}
+        for key in old.keys() & new.keys()
+        if old[key] is not new[key] and encode(old[key]) != encode(new[key])
+    }
+    unchanged = len(old.keys() & new.keys()) - len(changed)
+
+    return {"added": added, "removed": removed, "changed": changed, "unchanged": unchanged}
+
+
+class DiffCache:
+    """
+    Thread-safe LRU of diff results keyed by content identifiers (hashes, digests).
+
+    Parameters
+    ----------
+    maxsize
+        Maximum number of results kept; the least recently used is evicted first.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_DIFF_CACHE_SIZE) -> None:
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+        self._results: OrderedDict[Hashable, dict[str, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """Return the number of memoized results."""
+
+        return len(self._results)
+
+    def get(self, key: Hashable) -> dict[str, Any] | None:
+        """
+        Return the memoized result for ``key`` and mark it most recently used.
+
+        Parameters
+        ----------
+        key
+            The content key, e.g. ``("config", hash_a, hash_b)``.
+
+        Returns
+        -------
+        dict[str, Any] | None
+            The cached diff, or ``None`` on a miss.
+        """
+
+        with self._lock:
+            result = self._results.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+
+            self._results.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key: Hashable, result: dict[str, Any]) -> None:
+        """
+        Memoize ``result`` under ``key``, evicting the least recently used entry if full.
+
+        Parameters
+        ----------
+        key
+            The content key.
+        result
+            The diff to keep.
+        """
+
+        with self._lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            while len(self._results) > self._maxsize:
+                self._results.popitem(last=False)
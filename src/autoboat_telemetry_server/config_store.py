@@ -0,0 +1,242 @@
+"""
+Process-wide, content-addressed cache of ``HashTable`` rows.
+
+See `.github/instructions/python-source.instructions.md` #"Config store" for
+which writes must keep it coherent and how the hit ratio is exported.
+"""
+
+__all__ = ["ConfigStore", "config_store"]
+
+import copy
+import threading
+from typing import cast
+
+from flask import Flask, current_app
+
+from autoboat_telemetry_server.models import HashTable, db
+from autoboat_telemetry_server.observability import count_config_cache_lookup
+from autoboat_telemetry_server.read_only import read_db
+from autoboat_telemetry_server.types import AutopilotParametersType
+
+
+class _ConfigState:
+    """Per-app maps, stored in ``app.extensions["config_store"]``."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.loaded = False
+        self.configs: dict[str, AutopilotParametersType] = {}
+        self.descriptions: dict[str, str | None] = {}
+        self.default_values: dict[str, AutopilotParametersType] = {}
+
+
+class ConfigStore:
+    """
+    Every stored config, keyed by its hash, loaded once from ``hashes.db``.
+
+    A config's ``data`` never changes for a given hash, so the only updates
+    are new hashes, deleted hashes and description edits. Writers call
+    ``add`` / ``discard`` / ``set_description`` after they commit; until the
+    first read loads the maps those calls are no-ops, because the load reads
+    the committed state anyway.
+    """
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Register an empty, not yet loaded store for ``app``.
+
+        Parameters
+        ----------
+        app
+            The Flask app.
+        """
+
+        app.extensions["config_store"] = _ConfigState()
+
+    @property
+    def _state(self) -> _ConfigState:
+        return current_app.extensions["config_store"]
+
+    def _ensure_loaded(self) -> _ConfigState:
+        state = self._state
+        if state.loaded:
+            return state
+
+        with state.lock:
+            if not state.loaded:
+                rows = cast(
+                    "list[tuple[str, AutopilotParametersType, str | None]]",
+                    read_db.session.execute(db.select(HashTable.config_hash, HashTable.data, HashTable.description)).all(),
+                )
+                state.configs = {config_hash: data for config_hash, data, _ in rows}
+                state.descriptions = {config_hash: description for config_hash, _, description in rows}
+                state.loaded = True
+
+        return state
+
+    def contains(self, config_hash: str) -> bool:
+        """
+        Check whether ``config_hash`` is stored, without querying the database.
+
+        Parameters
+        ----------
+        config_hash
+            The configuration hash to check.
+
+        Returns
+        -------
+        bool
+            ``True`` if the hash exists, ``False`` otherwise.
+        """
+
+        found = config_hash in self._ensure_loaded().configs
+        count_config_cache_lookup(hit=found)
+        return found
+
+    def get(self, config_hash: str) -> AutopilotParametersType:
+        """
+        Return the parsed config for ``config_hash``.
+
+        The returned dict is shared; copy it before handing it to a model column.
+
+        Parameters
+        ----------
+        config_hash
+            The configuration hash to look up.
+
+        Returns
+        -------
+        AutopilotParametersType
+            The stored configuration.
+
+        Raises
+        ------
+        TypeError
+            If the hash does not exist.
+        """
+
+        config = self._ensure_loaded().configs.get(config_hash)
+        count_config_cache_lookup(hit=config is not None)
+        if config is None:
+            raise TypeError("Hash entry not found.")
+
+        return config
+
+    def get_default_values(self, config_hash: str) -> AutopilotParametersType:
+        """
+        Return ``{key: entry["default"]}`` for the config stored under ``config_hash``.
+
+        Built once per hash and shared like ``get``'s result; do not mutate it.
+
+        Parameters
+        ----------
+        config_hash
+            The configuration hash to look up.
+
+        Returns
+        -------
+        AutopilotParametersType
+            The default value of every parameter in the configuration.
+
+        Raises
+        ------
+        TypeError
+            If the hash does not exist.
+        """
+
+        state = self._ensure_loaded()
+        default_values = state.default_values.get(config_hash)
+        if default_values is not None:
+            count_config_cache_lookup(hit=True)
+            return default_values
+
+        default_values = {key: entry["default"] for key, entry in self.get(config_hash).items()}
+        with state.lock:
+            state.default_values[config_hash] = default_values
+
+        return default_values
+
+    def get_description(self, config_hash: str) -> str | None:
+        """
+        Return the description stored for ``config_hash``.
+
+        Parameters
+        ----------
+        config_hash
+            The configuration hash to look up.
+
+        Returns
+        -------
+        str | None
+            The description.
+
+        Raises
+        ------
+        TypeError
+            If the hash does not exist.
+        """
+
+        descriptions = self._ensure_loaded().descriptions
+        found = config_hash in descriptions
+        count_config_cache_lookup(hit=found)
+        if not found:
+            raise TypeError("Hash entry not found.")
+
+        return descriptions[config_hash]
+
+    def add(self, config_hash: str, data: AutopilotParametersType, description: str | None) -> None:
+        """
+        Record a newly committed ``HashTable`` row.
+
+        Parameters
+        ----------
+        config_hash
+            The new row's hash.
+        data
+            Its configuration; a private copy is stored.
+        description
+            Its description.
+        """
+
+        state = self._state
+        with state.lock:
+            if state.loaded:
+                state.configs[config_hash] = copy.deepcopy(data)
+                state.descriptions[config_hash] = description
+
+    def set_description(self, config_hash: str, description: str | None) -> None:
+        """
+        Record a committed description change.
+
+        Parameters
+        ----------
+        config_hash
+            The hash whose description changed.
+        description
+            The new description.
+        """
+
+        state = self._state
+        with state.lock:
+            if state.loaded and config_hash in state.configs:
+                state.descriptions[config_hash] = description
+
+    def discard(self, config_hash: str) -> None:
+        """
+        Forget a deleted ``HashTable`` row.
+
+        Parameters
+        ----------
+        config_hash
+            The hash whose deletion was committed.
+        """
+
+        state = self._state
+        with state.lock:
+            if state.loaded:
+                state.configs.pop(config_hash, None)
+                state.descriptions.pop(config_hash, None)
+                state.default_values.pop(config_hash, None)
+
+
+config_store = ConfigStore()
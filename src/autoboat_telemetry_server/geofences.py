@@ -0,0 +1,324 @@
+"""
+Per-instance geofence polygons, compiled once and checked on every boat status write.
+
+See `.github/instructions/python-source.instructions.md` #"Geofences"
+for the polygon format, the edge index and when the diagnostic message is set.
+"""
+
+__all__ = [
+    "DEFAULT_POLYGON_CACHE_SIZE",
+    "GEOFENCE_MODES",
+    "MAX_GEOFENCES_PER_INSTANCE",
+    "MAX_GEOFENCE_VERTICES",
+    "CompiledPolygon",
+    "PolygonCache",
+    "check_status",
+    "forget",
+    "forget_all",
+    "parse_geofence",
+    "violated",
+]
+
+import hashlib
+import math
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+from sqlalchemy.orm import Session, scoped_session
+
+from autoboat_telemetry_server.models import GeofenceTable, TelemetryTable, db
+from autoboat_telemetry_server.types import DiagnosticMessageIntensity
+from autoboat_telemetry_server.waypoint_storage import WAYPOINT_DTYPE, WaypointArray, parse_json
+
+# keep_in: the boat must stay inside; keep_out: the boat must stay outside
+GEOFENCE_MODES = ("keep_in", "keep_out")
+
+# upper bounds that keep a status write's check cheap
+MAX_GEOFENCES_PER_INSTANCE = 64
+MAX_GEOFENCE_VERTICES = 10_000
+
+# compiled polygons kept per process
+DEFAULT_POLYGON_CACHE_SIZE = 256
+
+
+def parse_geofence(data: object) -> dict[str, Any]:
+    """
+    Validate a geofence from a request body.
+
+    Parameters
+    ----------
+    data
+        The decoded body, ``{"name": str, "mode": "keep_in" | "keep_out", "points": [[latitude, longitude], ...]}``.
+
+    Returns
+    -------
+    dict[str, Any]
+        ``name``, ``mode``, and ``points_packed`` / ``digest`` for ``GeofenceTable``; a repeated
+        closing vertex is dropped.
+
+    Raises
+    ------
+    TypeError
+        If the body is not a dictionary or a field has the wrong type.
+    ValueError
+        If the mode is unknown, or the polygon has too few or too many vertices or one out of bounds.
+    """
+
+    if not isinstance(data, dict):
+        raise TypeError("Invalid geofence format. Expected a dictionary with 'name', 'mode' and 'points'.")
+
+    name, mode = data.get("name"), data.get("mode", "keep_in")
+    if not isinstance(name, str) or not name:
+        raise TypeError("Geofence 'name' must be a non-empty string.")
+
+    if mode not in GEOFENCE_MODES:
+        raise ValueError(f"Geofence 'mode' must be one of {', '.join(GEOFENCE_MODES)}.")
+
+    points = parse_json(data.get("points"))
+    if len(points) > 1 and (points[0] == points[-1]).all():
+        points = points[:-1]
+
+    if not 3 <= len(points) <= MAX_GEOFENCE_VERTICES:
+        raise ValueError(f"A geofence must have between 3 and {MAX_GEOFENCE_VERTICES} vertices.")
+
+    packed = points.tobytes()
+    return {"name": name, "mode": mode, "points_packed": packed, "digest": hashlib.blake2b(packed, digest_size=16).hexdigest()}
+
+
+class CompiledPolygon:
+    """
+    A polygon ready for point-in-polygon tests: bounding box, edge arrays and a latitude-band edge index.
+
+    Coordinates are treated as planar latitude / longitude, which is exact enough for fences a few
+    kilometres across; a polygon must not cross the antimeridian.
+
+    Parameters
+    ----------
+    points
+        ``(n, 2)`` vertices, ``n >= 3``; the polygon closes from the last vertex back to the first.
+    """
+
+    def __init__(self, points: WaypointArray) -> None:
+        start_latitude, start_longitude = points[:, 0], points[:, 1]
+        end_latitude, end_longitude = np.roll(start_latitude, -1), np.roll(start_longitude, -1)
+
+        self.bounds = (
+            float(start_latitude.min()),
+            float(start_longitude.min()),
+            float(start_latitude.max()),
+            float(start_longitude.max()),
+        )
+        self._start_latitude = start_latitude
+        self._end_latitude = end_latitude
+        self._start_longitude = start_longitude
+
+        # longitude change per degree of latitude; edges along a parallel never cross the ray
+        rise = end_latitude - start_latitude
+        self._slopes = np.divide(end_longitude - start_longitude, rise, out=np.zeros_like(rise), where=rise != 0)
+
+        # each band of latitude lists the edges whose latitude range overlaps it
+        south, north = self.bounds[0], self.bounds[2]
+        self._band_count = max(1, math.isqrt(len(points)))
+        self._band_height = (north - south) / self._band_count or 1.0
+        low = np.minimum(start_latitude, end_latitude)
+        high = np.maximum(start_latitude, end_latitude)
+        first = np.clip(((low - south) // self._band_height).astype(np.intp), 0, self._band_count - 1)
+        last = np.clip(((high - south) // self._band_height).astype(np.intp), 0, self._band_count - 1)
+        self._bands: list[npt.NDArray[np.intp]] = [
+            np.flatnonzero((first <= band) & (last >= band)) for band in range(self._band_count)
+        ]
+
+    def contains(self, latitude: float, longitude: float) -> bool:
+        """
+        Return whether a position is inside the polygon (even-odd rule).
+
+        Parameters
+        ----------
+        latitude
+            Latitude in degrees.
+        longitude
+            Longitude in degrees.
+
+        Returns
+        -------
+        bool
+            ``True`` if inside; a position on the boundary may fall either way.
+        """
+
+        south, west, north, east = self.bounds
+        if not (south <= latitude <= north and west <= longitude <= east):
+            return False
+
+        # cast a ray east along the parallel and count the edges it crosses, only among the band's edges
+        band = min(int((latitude - south) // self._band_height), self._band_count - 1)
+        edges = self._bands[band]
+        start_latitude = self._start_latitude[edges]
+        spans = (start_latitude > latitude) != (self._end_latitude[edges] > latitude)
+        crossings = self._start_longitude[edges] + (latitude - start_latitude) * self._slopes[edges]
+
+        return bool(np.count_nonzero(spans & (longitude < crossings)) % 2)
+
+
+class PolygonCache:
+    """
+    Thread-safe LRU of compiled polygons keyed by ``GeofenceTable.digest``.
+
+    Parameters
+    ----------
+    maxsize
+        Maximum number of polygons kept; the least recently used is evicted first.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_POLYGON_CACHE_SIZE) -> None:
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+        self._polygons: OrderedDict[str, CompiledPolygon] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """Return the number of compiled polygons."""
+
+        return len(self._polygons)
+
+    def get(self, session: Session | scoped_session, geofence_id: int, digest: str) -> CompiledPolygon:
+        """
+        Return the compiled polygon of a geofence, loading and compiling its vertices on a miss.
+
+        Parameters
+        ----------
+        session
+            Session to load the vertices with on a miss.
+        geofence_id
+            The geofence to load.
+        digest
+            Its ``digest``; the cache key.
+
+        Returns
+        -------
+        CompiledPolygon
+            The compiled polygon.
+        """
+
+        with self._lock:
+            polygon = self._polygons.get(digest)
+            if polygon is not None:
+                self._polygons.move_to_end(digest)
+                self.hits += 1
+                return polygon
+
+            self.misses += 1
+
+        packed = session.execute(
+            db.select(GeofenceTable.points_packed).where(GeofenceTable.geofence_id == geofence_id)
+        ).scalar_one()
+        polygon = CompiledPolygon(np.frombuffer(packed, dtype=WAYPOINT_DTYPE).reshape(-1, 2))
+        with self._lock:
+            self._polygons[digest] = polygon
+            self._polygons.move_to_end(digest)
+            while len(self._polygons) > self._maxsize:
+                self._polygons.popitem(last=False)
+
+        return polygon
+
+
+def violated(
+    session: Session | scoped_session, cache: PolygonCache, instance_id: int, position: tuple[float, float]
+) -> list[tuple[int, str, str]]:
+    """
+    Return the instance's geofences that a position violates.
+
+    Parameters
+    ----------
+    session
+        Session to query with.
+    cache
+        Compiled polygons.
+    instance_id
+        The instance whose geofences to check.
+    position
+        ``(latitude, longitude)`` in degrees.
+
+    Returns
+    -------
+    list[tuple[int, str, str]]
+        ``(geofence_id, name, mode)`` of each violated geofence, in creation order.
+    """
+
+    geofences = session.execute(
+        db.select(GeofenceTable.geofence_id, GeofenceTable.name, GeofenceTable.mode, GeofenceTable.digest)
+        .where(GeofenceTable.instance_id == instance_id)
+        .order_by(GeofenceTable.geofence_id)
+    ).all()
+
+    return [
+        (geofence_id, name, mode)
+        for geofence_id, name, mode, digest in geofences
+        if cache.get(session, geofence_id, digest).contains(*position) != (mode == "keep_in")
+    ]
+
+
+def check_status(cache: PolygonCache, instance: TelemetryTable, position: tuple[float, float] | None) -> list[str]:
+    """
+    Check a new boat status position against the instance's geofences and raise an ERROR diagnostic on violation.
+
+    The diagnostic message is set on ``instance`` in the caller's transaction, and only if it is not
+    already the same message (possibly followed by alerts raised with it), so a boat that stays outside
+    does not rewrite it on every status.
+
+    Parameters
+    ----------
+    cache
+        Compiled polygons.
+    instance
+        The telemetry instance being written.
+    position
+        The position in the new ``boat_status`` (``positions.status_position``); ``None`` is not checked.
+
+    Returns
+    -------
+    list[str]
+        The modes of the violated geofences if the message was set, for the violation counter; else empty.
+    """
+
+    if position is None:
+        return []
+
+    violations = violated(db.session, cache, instance.instance_id, position)
+    if not violations:
+        return []
+
+    names = ", ".join(f"{name} ({mode})" for _, name, mode in violations)
+    message = [DiagnosticMessageIntensity.ERROR, f"Geofence violation: {names}."]
+    # alert rules that fired in the same write append to the message; see python-source.instructions.md#Alert rules
+    current = instance.diagnostic_message
+    if current and current[0] == message[0] and isinstance(current[1], str) and current[1].startswith(message[1]):
+        return []
+
+    instance.diagnostic_message = message
+    return [mode for _, _, mode in violations]
+
+
+def forget(instance_ids: Iterable[int]) -> None:
+    """
+    Delete the geofences of deleted instances, in the caller's transaction.
+
+    Parameters
+    ----------
+    instance_ids
+        IDs of the instances being deleted.
+    """
+
+    instance_ids = list(instance_ids)
+    if instance_ids:
+        db.session.execute(db.delete(GeofenceTable).where(GeofenceTable.instance_id.in_(instance_ids)))
+
+
+def forget_all() -> None:
+    """Delete every instance's geofences, in the caller's transaction (e.g. ``delete_all``)."""
+
+    db.session.execute(db.delete(GeofenceTable))
@@ -0,0 +1,60 @@
+"""
+The one list of per-instance state that every instance delete path must clean up.
+
+See `.github/instructions/python-source.instructions.md` #"Instance cleanup"
+for the two phases and how to add a module to them.
+"""
+
+__all__ = ["discard_instances", "forget_instances"]
+
+from collections.abc import Sequence
+
+from autoboat_telemetry_server import geofences, parameter_history, waypoint_edits
+from autoboat_telemetry_server.alert_rules import alert_rules
+from autoboat_telemetry_server.anomalies import anomalies
+from autoboat_telemetry_server.instance_names import instance_names
+from autoboat_telemetry_server.kinematics import kinematics
+from autoboat_telemetry_server.position_index import position_index
+from autoboat_telemetry_server.rolling_stats import rolling_stats
+from autoboat_telemetry_server.tracks import tracks
+
+
+def forget_instances(instance_ids: Sequence[int] | None) -> None:
+    """
+    Delete the rows other tables keep for deleted instances, in the caller's transaction.
+
+    Parameters
+    ----------
+    instance_ids
+        IDs of the instances being deleted, or ``None`` when every instance is (``delete_all``).
+    """
+
+    if instance_ids is None:
+        parameter_history.forget_all()
+        waypoint_edits.forget_all()
+        geofences.forget_all()
+        alert_rules.forget_all()
+        return
+
+    parameter_history.forget(instance_ids)
+    waypoint_edits.forget(instance_ids)
+    geofences.forget(instance_ids)
+    alert_rules.forget(instance_ids)
+
+
+def discard_instances(instance_ids: Sequence[int] | None) -> None:
+    """
+    Drop the process-local state of deleted instances, after the delete has committed.
+
+    Parameters
+    ----------
+    instance_ids
+        IDs of the instances whose deletion was committed, or ``None`` after ``delete_all``.
+    """
+
+    caches = (instance_names, position_index, tracks, kinematics, rolling_stats, alert_rules, anomalies)
+    for cache in caches:
+        if instance_ids is None:
+            cache.clear()
+        else:
+            cache.discard(instance_ids)
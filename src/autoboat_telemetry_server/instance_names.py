@@ -0,0 +1,161 @@
+"""
+Process-local ``instance_identifier`` -> ``instance_id`` map for name lookups.
+
+See `.github/instructions/python-source.instructions.md` #"Instance name cache"
+for which writes must keep it coherent and why lookups never reach SQLite.
+"""
+
+__all__ = ["InstanceNameCache", "default_instance_name", "instance_names"]
+
+import threading
+from collections.abc import Iterable
+from typing import cast
+
+from flask import Flask, current_app
+
+from autoboat_telemetry_server.models import TelemetryTable, db
+from autoboat_telemetry_server.read_only import read_db
+
+
+def default_instance_name(instance_id: int) -> str:
+    """
+    Return the name ``set_instance_identifier`` / ``create_many`` give a new instance.
+
+    Parameters
+    ----------
+    instance_id
+        The ID of the new instance.
+
+    Returns
+    -------
+    str
+        ``"Unnamed instance #<instance_id>"``.
+    """
+
+    return f"Unnamed instance #{instance_id}"
+
+
+class _NameState:
+    """Per-app maps, stored in ``app.extensions["instance_names"]``."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.loaded = False
+        self.ids: dict[str, int] = {}
+        self.names: dict[int, str] = {}
+
+
+class InstanceNameCache:
+    """
+    Both directions of the name <-> id mapping, loaded once from the database.
+
+    Writers call ``set_name`` / ``discard`` / ``clear`` after they commit; until the
+    first lookup loads the maps those calls are no-ops, because the load reads
+    the committed state anyway.
+    """
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Register an empty, not yet loaded cache for ``app``.
+
+        Parameters
+        ----------
+        app
+            The Flask app.
+        """
+
+        app.extensions["instance_names"] = _NameState()
+
+    @property
+    def _state(self) -> _NameState:
+        return current_app.extensions["instance_names"]
+
+    def _ensure_loaded(self, state: _NameState) -> None:
+        if state.loaded:
+            return
+
+        with state.lock:
+            if state.loaded:
+                return
+
+            rows = cast(
+                "list[tuple[int, str | None]]",
+                read_db.session.execute(db.select(TelemetryTable.instance_id, TelemetryTable.instance_identifier)).all(),
+            )
+            state.names = {instance_id: name for instance_id, name in rows if name is not None}
+            state.ids = {name: instance_id for instance_id, name in state.names.items()}
+            state.loaded = True
+
+    def get_id(self, name: str) -> int | None:
+        """
+        Resolve an instance name without querying the database (after the first call).
+
+        Parameters
+        ----------
+        name
+            The ``instance_identifier`` to look up.
+
+        Returns
+        -------
+        int | None
+            The instance ID, or ``None`` if no instance has that name.
+        """
+
+        state = self._state
+        self._ensure_loaded(state)
+        return state.ids.get(name)
+
+    def set_name(self, instance_id: int, name: str) -> None:
+        """
+        Record that ``instance_id`` is now called ``name`` (creation or rename).
+
+        Parameters
+        ----------
+        instance_id
+            The instance that was created or renamed.
+        name
+            Its committed ``instance_identifier``.
+        """
+
+        state = self._state
+        with state.lock:
+            if not state.loaded:
+                return
+
+            old_name = state.names.get(instance_id)
+            if old_name is not None and state.ids.get(old_name) == instance_id:
+                del state.ids[old_name]
+
+            state.names[instance_id] = name
+            state.ids[name] = instance_id
+
+    def discard(self, instance_ids: Iterable[int]) -> None:
+        """
+        Forget deleted instances.
+
+        Parameters
+        ----------
+        instance_ids
+            IDs of the instances whose deletion was committed.
+        """
+
+        state = self._state
+        with state.lock:
+            if not state.loaded:
+                return
+
+            for instance_id in instance_ids:
+                name = state.names.pop(instance_id, None)
+                if name is not None and state.ids.get(name) == instance_id:
+                    del state.ids[name]
+
+    def clear(self) -> None:
+        """Forget every instance, e.g. after ``delete_all``."""
+
+        state = self._state
+        with state.lock:
+            state.ids.clear()
+            state.names.clear()
+
+
+instance_names = InstanceNameCache()
@@ -0,0 +1,196 @@
+"""
+Opt-in speed, course, turn rate and distance derived from successive boat statuses.
+
+See `.github/instructions/python-source.instructions.md` #"Derived kinematics"
+for the fields, their units and which earlier sample each is measured from.
+"""
+
+__all__ = ["DEFAULT_HEADING_FIELD", "DERIVED_FIELDS", "Kinematics", "kinematics"]
+
+import math
+import threading
+import time
+from collections.abc import Iterable, Mapping
+
+from flask import Flask, current_app
+
+from autoboat_telemetry_server.positions import status_number
+from autoboat_telemetry_server.route_geometry import EARTH_RADIUS_M
+
+# boat_status key of the heading, in degrees clockwise from north
+DEFAULT_HEADING_FIELD = "heading"
+
+# keys added to boat_status when derivation is enabled
+DERIVED_FIELDS = ("derived_speed_over_ground", "derived_course_over_ground", "derived_turn_rate", "derived_distance_travelled")
+
+# (position time, position, heading time, heading, distance travelled)
+type _Sample = tuple[float, tuple[float, float] | None, float, float | None, float]
+
+# seconds; monotonic so a wall clock step cannot produce a negative interval
+_clock = time.monotonic
+
+
+def _distance(start: tuple[float, float], end: tuple[float, float]) -> float:
+    """Great-circle distance in metres between two latitude / longitude pairs."""
+
+    latitude_1, longitude_1, latitude_2, longitude_2 = map(math.radians, (*start, *end))
+    half_chord = (
+        math.sin((latitude_2 - latitude_1) / 2) ** 2
+        + math.cos(latitude_1) * math.cos(latitude_2) * math.sin((longitude_2 - longitude_1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(min(half_chord, 1.0)))
+
+
+def _bearing(start: tuple[float, float], end: tuple[float, float]) -> float:
+    """Initial great-circle bearing in degrees [0, 360) from ``start`` to ``end``."""
+
+    latitude_1, longitude_1, latitude_2, longitude_2 = map(math.radians, (*start, *end))
+    delta_longitude = longitude_2 - longitude_1
+    y = math.sin(delta_longitude) * math.cos(latitude_2)
+    x = math.cos(latitude_1) * math.sin(latitude_2) - math.sin(latitude_1) * math.cos(latitude_2) * math.cos(delta_longitude)
+    return math.degrees(math.atan2(y, x)) % 360.0
+
+
+class _KinematicsState:
+    """Per-app previous samples, stored in ``app.extensions["kinematics"]``."""
+
+    def __init__(self, enabled: bool, heading_field: str) -> None:
+        self.lock = threading.Lock()
+        self.enabled = enabled
+        self.heading_field = heading_field
+        self.samples: dict[int, _Sample] = {}
+
+
+class Kinematics:
+    """
+    The previous sample of every instance, and the ``derived_*`` fields of the next one.
+
+    Status routes call ``derive`` before they commit and ``record`` after; delete paths call
+    ``discard`` / ``clear``. Everything is a no-op unless ``DERIVE_KINEMATICS`` is set.
+    """
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Register empty samples for ``app``.
+
+        Parameters
+        ----------
+        app
+            The Flask app.
+        """
+
+        app.extensions["kinematics"] = _KinematicsState(
+            bool(app.config.get("DERIVE_KINEMATICS", False)), str(app.config.get("HEADING_FIELD", DEFAULT_HEADING_FIELD))
+        )
+
+    @property
+    def _state(self) -> _KinematicsState:
+        return current_app.extensions["kinematics"]
+
+    def derive(
+        self, instance_id: int, status: Mapping[str, object], position: tuple[float, float] | None
+    ) -> tuple[_Sample | None, dict[str, float]]:
+        """
+        Compute the derived fields of a new boat status from the instance's previous sample.
+
+        Parameters
+        ----------
+        instance_id
+            The instance being written.
+        status
+            The new ``boat_status``.
+        position
+            Its position (``positions.status_position``), or ``None``.
+
+        Returns
+        -------
+        tuple[_Sample | None, dict[str, float]]
+            The sample to ``record`` once the status is committed, and the ``derived_*`` fields to add
+            to it; ``(None, {})`` if derivation is disabled.
+        """
+
+        state = self._state
+        if not state.enabled:
+            return None, {}
+
+        now = _clock()
+        heading = status_number(status.get(state.heading_field))
+        with state.lock:
+            previous = state.samples.get(instance_id)
+
+        if previous is None:
+            return (now, position, now, heading, 0.0), {"derived_distance_travelled": 0.0}
+
+        position_time, previous_position, heading_time, previous_heading, distance = previous
+        derived: dict[str, float] = {}
+
+        # each quantity is measured from the last sample that had it, so a status without a position keeps the gap
+        if position is not None and previous_position is not None:
+            step = _distance(previous_position, position)
+            distance += step
+            if now > position_time:
+                derived["derived_speed_over_ground"] = step / (now - position_time)
+            if step > 0:
+                derived["derived_course_over_ground"] = _bearing(previous_position, position)
+
+        if heading is not None and previous_heading is not None and now > heading_time:
+            turn = (heading - previous_heading + 180) % 360 - 180
+            derived["derived_turn_rate"] = turn / (now - heading_time)
+
+        derived["derived_distance_travelled"] = distance
+
+        if position is None:
+            position = previous_position
+        else:
+            position_time = now
+
+        if heading is None:
+            heading = previous_heading
+        else:
+            heading_time = now
+
+        return (position_time, position, heading_time, heading, distance), derived
+
+    def record(self, instance_id: int, sample: _Sample | None) -> None:
+        """
+        Keep a committed status's sample for the next ``derive``.
+
+        Parameters
+        ----------
+        instance_id
+            The instance whose boat status was written.
+        sample
+            The sample ``derive`` returned; ``None`` is ignored.
+        """
+
+        if sample is None:
+            return
+
+        state = self._state
+        with state.lock:
+            state.samples[instance_id] = sample
+
+    def discard(self, instance_ids: Iterable[int]) -> None:
+        """
+        Forget the samples of deleted instances.
+
+        Parameters
+        ----------
+        instance_ids
+            IDs of the instances whose deletion was committed.
+        """
+
+        state = self._state
+        with state.lock:
+            for instance_id in instance_ids:
+                state.samples.pop(instance_id, None)
+
+    def clear(self) -> None:
+        """Forget every sample, e.g. after ``delete_all``."""
+
+        state = self._state
+        with state.lock:
+            state.samples.clear()
+
+
+kinematics = Kinematics()
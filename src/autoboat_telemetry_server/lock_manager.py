@@ -3,7 +3,8 @@
 __all__ = ["LockManager"]
 
 import threading
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 from functools import wraps
 from typing import ParamSpec, TypeVar
 
@@ -84,6 +85,27 @@ class LockManager:
     def __init__(self) -> None:
         self._rw_lock = ReaderWriterLock()
 
+    @contextmanager
+    def write_locked(self) -> Iterator[None]:
+        """
+        Hold the write lock for the duration of a ``with`` block.
+
+        Unlike ``require_write_lock`` this blocks until the lock is free, so it is
+        meant for background work (the maintenance scheduler), not request handlers.
+
+        Yields
+        ------
+        None
+        """
+
+        self._rw_lock.acquire_write()
+
+        try:
+            yield
+
+        finally:
+            self._rw_lock.release_write()
+
     def require_read_lock(self, func: Callable[P, R]) -> Callable[P, R]:
         """
         Decorator to require a read lock for the decorated function.
@@ -0,0 +1,581 @@
+"""
+In-process background maintenance for the telemetry server.
+
+See `.github/instructions/python-source.instructions.md` #"Maintenance scheduler"
+for the leader election, the batching rationale, and the config keys.
+"""
+
+__all__ = [
+    "LeaderLease",
+    "MaintenanceScheduler",
+    "checkpoint_wal",
+    "convert_auto_vacuum",
+    "delete_inactive_instances",
+    "incremental_vacuum",
+    "init_app",
+    "optimize_databases",
+]
+
+import fcntl
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+from contextlib import nullcontext
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from flask import Flask, current_app
+from sqlalchemy import text
+
+from autoboat_telemetry_server.instance_cleanup import discard_instances, forget_instances
+from autoboat_telemetry_server.lock_manager import LockManager
+from autoboat_telemetry_server.models import TelemetryTable, db
+from autoboat_telemetry_server.observability import (
+    bind_label,
+    count_clean_instances_deletions,
+    observe_maintenance_job,
+    observe_sqlite_checkpoint,
+)
+
+logger = logging.getLogger(__name__)
+
+# config keys and their defaults; see python-source.instructions.md#Maintenance scheduler
+MAINTENANCE_DEFAULTS: dict[str, object] = {
+    "MAINTENANCE_ENABLED": True,
+    "MAINTENANCE_POLL_INTERVAL": 5.0,
+    "MAINTENANCE_CLEAN_INTERVAL": 300.0,
+    "MAINTENANCE_CLEAN_MAX_AGE": 300.0,
+    "MAINTENANCE_CLEAN_BATCH_SIZE": 500,
+    "MAINTENANCE_CHECKPOINT_INTERVAL": 60.0,
+    "MAINTENANCE_TRUNCATE_CHECKPOINT_INTERVAL": 3600.0,
+    "MAINTENANCE_VACUUM_INTERVAL": 3600.0,
+    "MAINTENANCE_VACUUM_PAGES": 2000,
+    "MAINTENANCE_OPTIMIZE_INTERVAL": 3600.0,
+}
+
+_CHECKPOINT_MODES = frozenset({"PASSIVE", "FULL", "RESTART", "TRUNCATE"})
+_AUTO_VACUUM_INCREMENTAL = 2
+
+
+def _config(app: Flask, key: str) -> object:
+    """Return ``app.config[key]``, falling back to ``MAINTENANCE_DEFAULTS``."""
+
+    return app.config.get(key, MAINTENANCE_DEFAULTS[key])
+
+
+def _bind_keys(app: Flask) -> list[str | None]:
+    """Return the default bind followed by every extra bind in ``SQLALCHEMY_BINDS``."""
+
+    return [None, *(key for key in app.config.get("SQLALCHEMY_BINDS", {}) if key is not None)]
+
+
+class LeaderLease:
+    """
+    Process-exclusive lease backed by an advisory ``flock`` on a file.
+
+    Every gunicorn worker (and every container sharing the instance volume)
+    competes for the same file; only the holder runs maintenance jobs.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._fd: int | None = None
+
+    @property
+    def held(self) -> bool:
+        """Whether this process currently holds the lease."""
+
+        return self._fd is not None
+
+    def try_acquire(self) -> bool:
+        """
+        Try to take the lease without blocking.
+
+        Returns
+        -------
+        bool
+            ``True`` if the lease is held after the call, ``False`` otherwise, including when the lease
+            file cannot be opened.
+        """
+
+        if self._fd is not None:
+            return True
+
+        try:
+            fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o644)
+
+        except OSError:
+            # e.g. a read-only or missing instance dir; logged, and retried on the next tick
+            logger.exception("Cannot open maintenance lease file %s.", self._path)
+            return False
+
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+        except OSError:
+            os.close(fd)
+            return False
+
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._fd = fd
+        return True
+
+    def release(self) -> None:
+        """Give up the lease if held."""
+
+        if self._fd is None:
+            return
+
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+        self._fd = None
+
+
+class _Job:
+    """A named callable run every ``interval`` seconds; returns the rows it affected."""
+
+    def __init__(self, name: str, interval: float, func: Callable[[], int]) -> None:
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self.next_run = 0.0
+        self.last_run_at: datetime | None = None
+        self.last_duration_seconds: float | None = None
+        self.last_rows_affected: int | None = None
+        self.last_error: str | None = None
+
+    def to_dict(self) -> dict[str, object]:
+        """Return the job's schedule and last outcome as a JSON-serializable dict."""
+
+        return {
+            "name": self.name,
+            "interval_seconds": self.interval,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "last_duration_seconds": self.last_duration_seconds,
+            "last_rows_affected": self.last_rows_affected,
+            "last_error": self.last_error,
+        }
+
+
+class MaintenanceScheduler:
+    """
+    Leader-elected background thread that runs periodic maintenance jobs.
+
+    Parameters
+    ----------
+    app
+        The Flask app whose context jobs run in.
+    lease
+        The leader lease; jobs only run while it is held.
+    poll_interval
+        Seconds between scheduler ticks.
+    """
+
+    def __init__(self, app: Flask, lease: LeaderLease, *, poll_interval: float = 5.0) -> None:
+        self._app = app
+        self._lease = lease
+        self._poll_interval = poll_interval
+        self._jobs: dict[str, _Job] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+
+    @property
+    def job_names(self) -> list[str]:
+        """Names of the registered jobs, in registration order."""
+
+        return list(self._jobs)
+
+    @property
+    def is_leader(self) -> bool:
+        """Whether this process holds the leader lease."""
+
+        return self._lease.held
+
+    def job_status(self) -> list[dict[str, object]]:
+        """Schedule and last outcome of every registered job, in registration order."""
+
+        return [job.to_dict() for job in self._jobs.values()]
+
+    def add_job(self, name: str, interval: float, func: Callable[[], int]) -> None:
+        """
+        Register a job. A non-positive ``interval`` only disables its schedule; it
+        can still be run on demand with ``run_job``.
+
+        Parameters
+        ----------
+        name
+            Metric label and log name for the job.
+        interval
+            Seconds between runs.
+        func
+            Zero-argument callable returning the number of rows it affected.
+        """
+
+        self._jobs[name] = _Job(name, interval, func)
+
+    def run_job(self, name: str) -> int:
+        """
+        Run one job now inside an app context and record its metrics.
+
+        Parameters
+        ----------
+        name
+            Name of a registered job.
+
+        Returns
+        -------
+        int
+            Rows affected by the job.
+
+        Raises
+        ------
+        TypeError
+            If no job with that name is registered.
+        """
+
+        job = self._jobs.get(name)
+        if job is None:
+            raise TypeError(f"Unknown maintenance job: {name}.")
+
+        job.last_run_at = datetime.now(UTC)
+        start = time.perf_counter()
+        with self._app.app_context():
+            try:
+                rows = job.func()
+
+            except Exception as e:
+                job.last_error = str(e)
+                raise
+
+            finally:
+                job.last_duration_seconds = time.perf_counter() - start
+                db.session.remove()
+
+        job.last_rows_affected = rows
+        job.last_error = None
+        observe_maintenance_job(name, job.last_duration_seconds, rows)
+        return rows
+
+    def run_pending(self, now: float | None = None) -> list[str]:
+        """
+        Run every job whose next run time has passed, if this process is the leader.
+
+        Parameters
+        ----------
+        now
+            Monotonic timestamp to schedule against; defaults to ``time.monotonic()``.
+
+        Returns
+        -------
+        list[str]
+            Names of the jobs that ran (including ones that raised).
+        """
+
+        if not self._lease.try_acquire():
+            return []
+
+        now = time.monotonic() if now is None else now
+        ran: list[str] = []
+        for job in self._jobs.values():
+            if job.interval <= 0 or now < job.next_run:
+                continue
+
+            job.next_run = now + job.interval
+            ran.append(job.name)
+            try:
+                self.run_job(job.name)
+
+            except Exception:
+                logger.exception("Maintenance job %s failed.", job.name)
+
+        return ran
+
+    def start(self) -> None:
+        """Start the scheduler thread. Idempotent."""
+
+        with self._start_lock:
+            if self._thread is not None:
+                return
+
+            self._thread = threading.Thread(target=self._run, name="maintenance-scheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop the scheduler thread and release the leader lease."""
+
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+        self._lease.release()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            # an escaped error would end the thread silently and stop maintenance for good
+            try:
+                self.run_pending()
+
+            except Exception:
+                logger.exception("Maintenance scheduler tick failed.")
+
+            self._stop.wait(self._poll_interval)
+
+
+def delete_inactive_instances(lock_manager: LockManager, *, max_age: timedelta, batch_size: int) -> int:
+    """
+    Delete instances not updated within ``max_age`` in bounded batches.
+
+    Each batch runs in its own transaction under the write lock, and the lock is
+    released between batches so request handlers can interleave.
+
+    Parameters
+    ----------
+    lock_manager
+        The shared lock manager serializing database writes.
+    max_age
+        Instances whose ``updated_at`` is older than this are deleted.
+    batch_size
+        Maximum rows deleted per transaction.
+
+    Returns
+    -------
+    int
+        Total number of instances deleted.
+    """
+
+    cutoff = datetime.now(UTC) - max_age
+    # sqlite has no DELETE ... LIMIT by default, so bound the batch with a subquery
+    batch = db.select(TelemetryTable.instance_id).where(TelemetryTable.updated_at < cutoff).limit(batch_size)
+    statement = db.delete(TelemetryTable).where(TelemetryTable.instance_id.in_(batch)).returning(TelemetryTable.instance_id)
+
+    total = 0
+    while True:
+        with lock_manager.write_locked():
+            try:
+                deleted_ids = db.session.execute(statement).scalars().all()
+                forget_instances(deleted_ids)
+                db.session.commit()
+
+            except Exception:
+                db.session.rollback()
+                raise
+
+        discard_instances(deleted_ids)
+        deleted = len(deleted_ids)
+        total += deleted
+        count_clean_instances_deletions(deleted)
+        if deleted < batch_size:
+            return total
+
+        # yield the gil as well as the lock so a waiting request thread can run
+        time.sleep(0)
+
+
+def checkpoint_wal(mode: str = "PASSIVE", lock_manager: LockManager | None = None) -> int:
+    """
+    Run ``PRAGMA wal_checkpoint(<mode>)`` on every bind.
+
+    Parameters
+    ----------
+    mode
+        SQLite checkpoint mode (``PASSIVE``, ``FULL``, ``RESTART`` or ``TRUNCATE``).
+    lock_manager
+        If given, the checkpoint runs under its write lock. Use it for the blocking
+        modes so they neither wait on nor starve request handlers.
+
+    Returns
+    -------
+    int
+        Total WAL frames checkpointed across binds.
+
+    Raises
+    ------
+    ValueError
+        If ``mode`` is not a SQLite checkpoint mode.
+    """
+
+    mode = mode.upper()
+    if mode not in _CHECKPOINT_MODES:
+        raise ValueError(f"Invalid checkpoint mode: {mode}. Expected one of {sorted(_CHECKPOINT_MODES)}.")
+
+    bind_keys = _bind_keys(current_app)
+    total = 0
+    with lock_manager.write_locked() if lock_manager is not None else nullcontext():
+        for bind_key in bind_keys:
+            start = time.perf_counter()
+            with db.engines[bind_key].connect() as connection:
+                _busy, _log_frames, checkpointed = connection.execute(text(f"PRAGMA wal_checkpoint({mode})")).one()
+                total += max(int(checkpointed), 0)
+
+            observe_sqlite_checkpoint(bind_label(bind_key), mode, time.perf_counter() - start)
+
+    return total
+
+
+def incremental_vacuum(lock_manager: LockManager, *, max_pages: int) -> int:
+    """
+    Return up to ``max_pages`` free pages per bind to the filesystem.
+
+    A bind created before ``auto_vacuum=INCREMENTAL`` was added to ``_SQLITE_PRAGMAS``
+    is skipped and logged; ``convert_auto_vacuum`` converts it on operator request.
+
+    Parameters
+    ----------
+    lock_manager
+        The shared lock manager; vacuuming writes to the database.
+    max_pages
+        Upper bound on pages freed per bind per run.
+
+    Returns
+    -------
+    int
+        Total pages freed across binds.
+    """
+
+    bind_keys = _bind_keys(current_app)
+    freed = 0
+    with lock_manager.write_locked():
+        for bind_key in bind_keys:
+            with db.engines[bind_key].connect() as connection:
+                # no implicit full VACUUM here; see python-source.instructions.md#Maintenance scheduler
+                if connection.execute(text("PRAGMA auto_vacuum")).scalar_one() != _AUTO_VACUUM_INCREMENTAL:
+                    logger.warning(
+                        "Skipping incremental_vacuum on bind %s: auto_vacuum is not INCREMENTAL; run convert_auto_vacuum.",
+                        bind_label(bind_key),
+                    )
+                    continue
+
+                before = connection.execute(text("PRAGMA freelist_count")).scalar_one()
+                # each sqlite3_step frees one page, so the dbapi cursor has to be drained
+                cursor = connection.connection.cursor()
+                try:
+                    cursor.execute(f"PRAGMA incremental_vacuum({int(max_pages)})").fetchall()
+
+                finally:
+                    cursor.close()
+
+                freed += before - connection.execute(text("PRAGMA freelist_count")).scalar_one()
+                connection.commit()
+
+    return freed
+
+
+def convert_auto_vacuum(lock_manager: LockManager) -> int:
+    """
+    Convert every bind without ``auto_vacuum=INCREMENTAL`` with a one-off full ``VACUUM``.
+
+    The ``VACUUM`` rewrites the whole file under the write lock, so this job is never
+    scheduled; an operator runs it once from ``/admin/maintenance/run/convert_auto_vacuum``.
+
+    Parameters
+    ----------
+    lock_manager
+        The shared lock manager; ``VACUUM`` rewrites the database.
+
+    Returns
+    -------
+    int
+        Number of binds converted.
+    """
+
+    bind_keys = _bind_keys(current_app)
+    converted = 0
+    with lock_manager.write_locked():
+        for bind_key in bind_keys:
+            with db.engines[bind_key].connect() as connection:
+                if connection.execute(text("PRAGMA auto_vacuum")).scalar_one() == _AUTO_VACUUM_INCREMENTAL:
+                    continue
+
+                logger.info("Converting bind %s to auto_vacuum=INCREMENTAL.", bind_label(bind_key))
+                connection.execute(text("PRAGMA auto_vacuum=INCREMENTAL"))
+                connection.execute(text("VACUUM"))
+                converted += 1
+
+    return converted
+
+
+def optimize_databases(lock_manager: LockManager) -> int:
+    """
+    Run ``PRAGMA optimize`` on every bind under the write lock.
+
+    Parameters
+    ----------
+    lock_manager
+        The shared lock manager; ``optimize`` may write ``sqlite_stat1``.
+
+    Returns
+    -------
+    int
+        Number of binds optimized.
+    """
+
+    bind_keys = _bind_keys(current_app)
+    with lock_manager.write_locked():
+        for bind_key in bind_keys:
+            with db.engines[bind_key].connect() as connection:
+                connection.execute(text("PRAGMA optimize"))
+                connection.commit()
+
+    return len(bind_keys)
+
+
+def init_app(app: Flask, lock_manager: LockManager, lease_path: Path) -> MaintenanceScheduler:
+    """
+    Build the maintenance scheduler and start it on the first request.
+
+    The scheduler is always built so the admin routes can run jobs on demand;
+    ``MAINTENANCE_ENABLED`` only controls whether the background thread starts.
+
+    Parameters
+    ----------
+    app
+        The Flask app.
+    lock_manager
+        The shared lock manager.
+    lease_path
+        File used for leader election between worker processes.
+
+    Returns
+    -------
+    MaintenanceScheduler
+        The scheduler, also stored in ``app.extensions["maintenance"]``.
+    """
+
+    scheduler = MaintenanceScheduler(app, LeaderLease(lease_path), poll_interval=float(_config(app, "MAINTENANCE_POLL_INTERVAL")))
+    scheduler.add_job(
+        "clean_instances",
+        float(_config(app, "MAINTENANCE_CLEAN_INTERVAL")),
+        lambda: delete_inactive_instances(
+            lock_manager,
+            max_age=timedelta(seconds=float(_config(app, "MAINTENANCE_CLEAN_MAX_AGE"))),
+            batch_size=int(_config(app, "MAINTENANCE_CLEAN_BATCH_SIZE")),
+        ),
+    )
+    scheduler.add_job("wal_checkpoint", float(_config(app, "MAINTENANCE_CHECKPOINT_INTERVAL")), checkpoint_wal)
+    scheduler.add_job(
+        "wal_checkpoint_truncate",
+        float(_config(app, "MAINTENANCE_TRUNCATE_CHECKPOINT_INTERVAL")),
+        lambda: checkpoint_wal("TRUNCATE", lock_manager),
+    )
+    scheduler.add_job(
+        "incremental_vacuum",
+        float(_config(app, "MAINTENANCE_VACUUM_INTERVAL")),
+        lambda: incremental_vacuum(lock_manager, max_pages=int(_config(app, "MAINTENANCE_VACUUM_PAGES"))),
+    )
+    # interval 0: never scheduled, only run by an operator from the admin route
+    scheduler.add_job("convert_auto_vacuum", 0.0, lambda: convert_auto_vacuum(lock_manager))
+    scheduler.add_job("optimize", float(_config(app, "MAINTENANCE_OPTIMIZE_INTERVAL")), lambda: optimize_databases(lock_manager))
+    app.extensions["maintenance"] = scheduler
+
+    # started lazily so `flask db upgrade` and tests never spawn the thread
+    @app.before_request
+    def _start_maintenance_scheduler() -> None:
+        if _config(app, "MAINTENANCE_ENABLED") and not app.testing:
+            scheduler.start()
+
+    return scheduler
@@ -0,0 +1,55 @@
+"""Indexes for paginated, filtered instance listing.
+
+Revision ID: 0002_listing_indexes
+Revises: 0001_initial
+Create Date: 2026-10-19 09:00:00.000000
+
+Adds composite indexes on telemetry_table (default bind only) so that
+``/instance_manager/get_all_instance_info`` can filter by user or config hash
+and page by ``(updated_at, instance_id)`` without a sort or a table scan:
+  - ix_telemetry_table_user_updated_at                (user, updated_at)
+  - ix_telemetry_table_current_config_hash_updated_at (current_config_hash, updated_at)
+
+``instance_id`` is the rowid, which SQLite appends to every index entry, so
+both indexes are effectively ``(..., updated_at, instance_id)``.
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision = "0002_listing_indexes"
+down_revision = "0001_initial"
+branch_labels = None
+depends_on = None
+
+
+def _bind_key() -> str | None:
+    """Return the current bind key (None=default, "hashes"=hashes.db); see 0001_initial."""
+
+    from alembic import context
+
+    return context.config.attributes.get("bind_key")
+
+
+def _default_bind() -> bool:
+    return _bind_key() is None
+
+
+def upgrade() -> None:
+    """Create the listing indexes on the default bind."""
+
+    if _default_bind():
+        with op.batch_alter_table("telemetry_table", schema=None) as batch_op:
+            batch_op.create_index("ix_telemetry_table_user_updated_at", ["user", "updated_at"], unique=False)
+            batch_op.create_index(
+                "ix_telemetry_table_current_config_hash_updated_at", ["current_config_hash", "updated_at"], unique=False
+            )
+
+
+def downgrade() -> None:
+    """Drop the listing indexes from the default bind."""
+
+    if _default_bind():
+        with op.batch_alter_table("telemetry_table", schema=None) as batch_op:
+            batch_op.drop_index("ix_telemetry_table_current_config_hash_updated_at")
+            batch_op.drop_index("ix_telemetry_table_user_updated_at")
@@ -0,0 +1,62 @@
+"""Make instance_identifier unique.
+
+Revision ID: 0003_unique_identifier
+Revises: 0002_listing_indexes
+Create Date: 2026-10-19 12:00:00.000000
+
+Replaces the plain ix_telemetry_table_instance_identifier index on
+telemetry_table (default bind only) with a UNIQUE one, so the database
+enforces what ``set_name`` already checks and the in-memory name cache can
+rely on one id per name.
+
+Volumes written before ``set_name`` checked for duplicates may hold the same
+name twice; every duplicate except the lowest ``instance_id`` is renamed to
+``"<name> (<instance_id>)"`` first so the index can be built.
+
+``current_config_hash`` needs no index of its own: the leading column of
+ix_telemetry_table_current_config_hash_updated_at (0002) already serves
+``current_config_hash = ?`` lookups.
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision = "0003_unique_identifier"
+down_revision = "0002_listing_indexes"
+branch_labels = None
+depends_on = None
+
+
+def _bind_key() -> str | None:
+    """Return the current bind key (None=default, "hashes"=hashes.db); see 0001_initial."""
+
+    from alembic import context
+
+    return context.config.attributes.get("bind_key")
+
+
+def _default_bind() -> bool:
+    return _bind_key() is None
+
+
+def upgrade() -> None:
+    """Rename duplicate names, then make the identifier index unique on the default bind."""
+
+    if _default_bind():
+        op.execute(
+            "UPDATE telemetry_table SET instance_identifier = instance_identifier || ' (' || instance_id || ')' "
+            "WHERE instance_identifier IS NOT NULL AND instance_id NOT IN "
+            "(SELECT MIN(instance_id) FROM telemetry_table GROUP BY instance_identifier)"
+        )
+        with op.batch_alter_table("telemetry_table", schema=None) as batch_op:
+            batch_op.drop_index("ix_telemetry_table_instance_identifier")
+            batch_op.create_index("ix_telemetry_table_instance_identifier", ["instance_identifier"], unique=True)
+
+
+def downgrade() -> None:
+    """Restore the non-unique identifier index on the default bind (renamed duplicates stay renamed)."""
+
+    if _default_bind():
+        with op.batch_alter_table("telemetry_table", schema=None) as batch_op:
+            batch_op.drop_index("ix_telemetry_table_instance_identifier")
+            batch_op.create_index("ix_telemetry_table_instance_identifier", ["instance_identifier"], unique=False)
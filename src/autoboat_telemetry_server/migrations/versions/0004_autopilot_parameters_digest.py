@@ -0,0 +1,78 @@
+"""Running digest of autopilot_parameters.
+
+Revision ID: 0004_parameters_digest
+Revises: 0003_unique_identifier
+Create Date: 2026-10-19 15:00:00.000000
+
+Adds telemetry_table.autopilot_parameters_digest (default bind only) and
+backfills it for existing rows. The digest is the sum, modulo 2**256, of the
+32-byte BLAKE2b digest of each canonical ``[key, value]`` pair — the same
+function as ``canonical.parameters_digest``, copied here so this migration
+keeps producing the same values if that module changes.
+"""
+
+import hashlib
+import json
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision = "0004_parameters_digest"
+down_revision = "0003_unique_identifier"
+branch_labels = None
+depends_on = None
+
+_EMPTY_DIGEST = "0" * 64
+
+
+def _bind_key() -> str | None:
+    """Return the current bind key (None=default, "hashes"=hashes.db); see 0001_initial."""
+
+    from alembic import context
+
+    return context.config.attributes.get("bind_key")
+
+
+def _default_bind() -> bool:
+    return _bind_key() is None
+
+
+def _parameters_digest(parameters: dict) -> str:
+    encoder = json.JSONEncoder(sort_keys=True, separators=(",", ":"))
+    total = sum(
+        int.from_bytes(hashlib.blake2b(encoder.encode([key, value]).encode("utf-8"), digest_size=32).digest(), "big")
+        for key, value in parameters.items()
+    )
+    return format(total % (1 << 256), "064x")
+
+
+def upgrade() -> None:
+    """Add and backfill the digest column on the default bind."""
+
+    if _default_bind():
+        with op.batch_alter_table("telemetry_table", schema=None) as batch_op:
+            batch_op.add_column(
+                sa.Column("autopilot_parameters_digest", sa.String(), nullable=False, server_default=_EMPTY_DIGEST)
+            )
+
+        connection = op.get_bind()
+        rows = connection.execute(sa.text("SELECT instance_id, autopilot_parameters FROM telemetry_table")).all()
+        updates = [
+            {"instance_id": instance_id, "digest": _parameters_digest(json.loads(parameters) or {})}
+            for instance_id, parameters in rows
+        ]
+        updates = [update for update in updates if update["digest"] != _EMPTY_DIGEST]
+        if updates:
+            connection.execute(
+                sa.text("UPDATE telemetry_table SET autopilot_parameters_digest = :digest WHERE instance_id = :instance_id"),
+                updates,
+            )
+
+
+def downgrade() -> None:
+    """Drop the digest column from the default bind."""
+
+    if _default_bind():
+        with op.batch_alter_table("telemetry_table", schema=None) as batch_op:
+            batch_op.drop_column("autopilot_parameters_digest")
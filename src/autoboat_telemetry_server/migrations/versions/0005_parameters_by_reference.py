@@ -0,0 +1,140 @@
+"""Store autopilot parameters by config reference.
+
+Revision ID: 0005_parameters_by_reference
+Revises: 0004_parameters_digest
+Create Date: 2026-10-19 18:00:00.000000
+
+Adds telemetry_table.autopilot_parameters_by_reference (default bind only)
+and converts existing rows whose ``default_autopilot_parameters`` is exactly
+the ``hash_table`` row named by ``current_config_hash`` and whose
+``autopilot_parameters`` has the same keys: the defaults column becomes
+``{}`` and the parameters column keeps only the values that differ from the
+config's defaults (compared by canonical JSON, as in ``parameter_storage``).
+Other rows keep their full copies. Downgrade expands converted rows back.
+
+``hash_table`` lives in hashes.db, so it is read through the "hashes" engine
+of the app running the migration; without it no rows are converted.
+"""
+
+import json
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision = "0005_parameters_by_reference"
+down_revision = "0004_parameters_digest"
+branch_labels = None
+depends_on = None
+
+_ENCODER = json.JSONEncoder(sort_keys=True, separators=(",", ":"))
+
+
+def _bind_key() -> str | None:
+    """Return the current bind key (None=default, "hashes"=hashes.db); see 0001_initial."""
+
+    from alembic import context
+
+    return context.config.attributes.get("bind_key")
+
+
+def _default_bind() -> bool:
+    return _bind_key() is None
+
+
+def _stored_configs() -> dict[str, dict]:
+    """Return every ``hash_table`` row as ``{config_hash: data}``, or ``{}`` if hashes.db is not reachable."""
+
+    from flask import current_app
+
+    engine = current_app.extensions["migrate"].db.engines.get("hashes")
+    if engine is None:
+        return {}
+
+    with engine.connect() as connection:
+        if not sa.inspect(connection).has_table("hash_table"):
+            return {}
+
+        rows = connection.execute(sa.text("SELECT config_hash, data FROM hash_table")).all()
+
+    return {config_hash: json.loads(data) for config_hash, data in rows}
+
+
+def upgrade() -> None:
+    """Add the layout column and convert rows that match their stored config."""
+
+    if not _default_bind():
+        return
+
+    with op.batch_alter_table("telemetry_table", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("autopilot_parameters_by_reference", sa.Boolean(), nullable=False, server_default=sa.false())
+        )
+
+    configs = _stored_configs()
+    if not configs:
+        return
+
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.text(
+            "SELECT instance_id, current_config_hash, default_autopilot_parameters, autopilot_parameters "
+            "FROM telemetry_table WHERE current_config_hash != ''"
+        )
+    ).all()
+
+    updates = []
+    for instance_id, config_hash, defaults_json, parameters_json in rows:
+        config = configs.get(config_hash)
+        defaults = json.loads(defaults_json) if defaults_json else {}
+        parameters = json.loads(parameters_json) if parameters_json else {}
+        if config is None or _ENCODER.encode(defaults) != _ENCODER.encode(config) or parameters.keys() != config.keys():
+            continue
+
+        overrides = {
+            key: value for key, value in parameters.items() if _ENCODER.encode(value) != _ENCODER.encode(config[key]["default"])
+        }
+        updates.append({"instance_id": instance_id, "parameters": json.dumps(overrides)})
+
+    if updates:
+        connection.execute(
+            sa.text(
+                "UPDATE telemetry_table SET default_autopilot_parameters = '{}', autopilot_parameters = :parameters, "
+                "autopilot_parameters_by_reference = 1 WHERE instance_id = :instance_id"
+            ),
+            updates,
+        )
+
+
+def downgrade() -> None:
+    """Expand rows stored by reference back to full copies and drop the layout column."""
+
+    if not _default_bind():
+        return
+
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.text(
+            "SELECT instance_id, current_config_hash, autopilot_parameters FROM telemetry_table "
+            "WHERE autopilot_parameters_by_reference = 1"
+        )
+    ).all()
+
+    if rows:
+        configs = _stored_configs()
+        updates = []
+        for instance_id, config_hash, overrides in rows:
+            config = configs[config_hash]
+            parameters = {key: entry["default"] for key, entry in config.items()} | json.loads(overrides)
+            updates.append({"instance_id": instance_id, "defaults": json.dumps(config), "parameters": json.dumps(parameters)})
+
+        connection.execute(
+            sa.text(
+                "UPDATE telemetry_table SET default_autopilot_parameters = :defaults, autopilot_parameters = :parameters "
+                "WHERE instance_id = :instance_id"
+            ),
+            updates,
+        )
+
+    with op.batch_alter_table("telemetry_table", schema=None) as batch_op:
+        batch_op.drop_column("autopilot_parameters_by_reference")
@@ -0,0 +1,86 @@
+"""Autopilot parameter change log and snapshots.
+
+Revision ID: 0006_parameter_history
+Revises: 0005_parameters_by_reference
+Create Date: 2026-10-19 20:00:00.000000
+
+Creates two append-only tables on the default bind:
+  - parameter_change_table   one row per changed key per write, indexed by
+                             (instance_id, change_id) and (instance_id, changed_at)
+  - parameter_snapshot_table full parameters every PARAMETER_SNAPSHOT_INTERVAL
+                             changes, indexed by (instance_id, taken_at)
+
+Existing instances get no rows: their first logged write stores the current
+parameters as a baseline snapshot.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision = "0006_parameter_history"
+down_revision = "0005_parameters_by_reference"
+branch_labels = None
+depends_on = None
+
+
+def _bind_key() -> str | None:
+    """Return the current bind key (None=default, "hashes"=hashes.db); see 0001_initial."""
+
+    from alembic import context
+
+    return context.config.attributes.get("bind_key")
+
+
+def _default_bind() -> bool:
+    return _bind_key() is None
+
+
+def upgrade() -> None:
+    """Create the history tables on the default bind."""
+
+    if not _default_bind():
+        return
+
+    op.create_table(
+        "parameter_change_table",
+        sa.Column("change_id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("instance_id", sa.Integer(), nullable=False),
+        sa.Column("changed_at", sa.DateTime(), nullable=False),
+        sa.Column("key", sa.String(), nullable=False),
+        sa.Column("change", sa.String(), nullable=False),
+        sa.Column("old_value", sa.JSON(), nullable=True),
+        sa.Column("new_value", sa.JSON(), nullable=True),
+        sa.PrimaryKeyConstraint("change_id"),
+    )
+    with op.batch_alter_table("parameter_change_table", schema=None) as batch_op:
+        batch_op.create_index("ix_parameter_change_table_instance_id_change_id", ["instance_id", "change_id"], unique=False)
+        batch_op.create_index("ix_parameter_change_table_instance_id_changed_at", ["instance_id", "changed_at"], unique=False)
+
+    op.create_table(
+        "parameter_snapshot_table",
+        sa.Column("snapshot_id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("instance_id", sa.Integer(), nullable=False),
+        sa.Column("change_id", sa.Integer(), nullable=False),
+        sa.Column("taken_at", sa.DateTime(), nullable=False),
+        sa.Column("parameters", sa.JSON(), nullable=False),
+        sa.PrimaryKeyConstraint("snapshot_id"),
+    )
+    with op.batch_alter_table("parameter_snapshot_table", schema=None) as batch_op:
+        batch_op.create_index("ix_parameter_snapshot_table_instance_id_taken_at", ["instance_id", "taken_at"], unique=False)
+
+
+def downgrade() -> None:
+    """Drop the history tables from the default bind."""
+
+    if not _default_bind():
+        return
+
+    with op.batch_alter_table("parameter_snapshot_table", schema=None) as batch_op:
+        batch_op.drop_index("ix_parameter_snapshot_table_instance_id_taken_at")
+    op.drop_table("parameter_snapshot_table")
+
+    with op.batch_alter_table("parameter_change_table", schema=None) as batch_op:
+        batch_op.drop_index("ix_parameter_change_table_instance_id_changed_at")
+        batch_op.drop_index("ix_parameter_change_table_instance_id_change_id")
+    op.drop_table("parameter_change_table")
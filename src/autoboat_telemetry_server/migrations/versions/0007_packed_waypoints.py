@@ -0,0 +1,72 @@
+"""Store waypoints as a packed float64 blob.
+
+Revision ID: 0007_packed_waypoints
+Revises: 0006_parameter_history
+Create Date: 2026-10-19 21:00:00.000000
+
+Adds the nullable telemetry_table.waypoints_packed (default bind only).
+Existing rows keep their JSON waypoints, with the blob NULL, until their
+next write; ``waypoint_storage`` reads both layouts. Downgrade unpacks
+every blob back into the JSON column.
+"""
+
+import json
+import struct
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision = "0007_packed_waypoints"
+down_revision = "0006_parameter_history"
+branch_labels = None
+depends_on = None
+
+
+def _bind_key() -> str | None:
+    """Return the current bind key (None=default, "hashes"=hashes.db); see 0001_initial."""
+
+    from alembic import context
+
+    return context.config.attributes.get("bind_key")
+
+
+def _default_bind() -> bool:
+    return _bind_key() is None
+
+
+def upgrade() -> None:
+    """Add the blob column on the default bind."""
+
+    if not _default_bind():
+        return
+
+    with op.batch_alter_table("telemetry_table", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("waypoints_packed", sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    """Unpack blobs into the JSON column and drop the blob column."""
+
+    if not _default_bind():
+        return
+
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.text("SELECT instance_id, waypoints_packed FROM telemetry_table WHERE waypoints_packed IS NOT NULL")
+    ).all()
+
+    if rows:
+        connection.execute(
+            sa.text("UPDATE telemetry_table SET waypoints = :waypoints WHERE instance_id = :instance_id"),
+            [
+                {
+                    "instance_id": instance_id,
+                    "waypoints": json.dumps([list(point) for point in struct.iter_unpack("<2d", packed)]),
+                }
+                for instance_id, packed in rows
+            ],
+        )
+
+    with op.batch_alter_table("telemetry_table", schema=None) as batch_op:
+        batch_op.drop_column("waypoints_packed")
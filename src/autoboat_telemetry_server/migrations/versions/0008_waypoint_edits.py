@@ -0,0 +1,68 @@
+"""Waypoint versions and the waypoint edit log.
+
+Revision ID: 0008_waypoint_edits
+Revises: 0007_packed_waypoints
+Create Date: 2026-10-19 22:00:00.000000
+
+On the default bind:
+  - adds telemetry_table.waypoints_version (0 for existing rows)
+  - creates waypoint_edit_table, one row per edited version, with a unique
+    (instance_id, version) index
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision = "0008_waypoint_edits"
+down_revision = "0007_packed_waypoints"
+branch_labels = None
+depends_on = None
+
+
+def _bind_key() -> str | None:
+    """Return the current bind key (None=default, "hashes"=hashes.db); see 0001_initial."""
+
+    from alembic import context
+
+    return context.config.attributes.get("bind_key")
+
+
+def _default_bind() -> bool:
+    return _bind_key() is None
+
+
+def upgrade() -> None:
+    """Add the version column and create the edit log on the default bind."""
+
+    if not _default_bind():
+        return
+
+    with op.batch_alter_table("telemetry_table", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("waypoints_version", sa.Integer(), nullable=False, server_default="0"))
+
+    op.create_table(
+        "waypoint_edit_table",
+        sa.Column("edit_id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("instance_id", sa.Integer(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("edited_at", sa.DateTime(), nullable=False),
+        sa.Column("ops", sa.JSON(), nullable=False),
+        sa.PrimaryKeyConstraint("edit_id"),
+    )
+    with op.batch_alter_table("waypoint_edit_table", schema=None) as batch_op:
+        batch_op.create_index("ix_waypoint_edit_table_instance_id_version", ["instance_id", "version"], unique=True)
+
+
+def downgrade() -> None:
+    """Drop the edit log and the version column from the default bind."""
+
+    if not _default_bind():
+        return
+
+    with op.batch_alter_table("waypoint_edit_table", schema=None) as batch_op:
+        batch_op.drop_index("ix_waypoint_edit_table_instance_id_version")
+    op.drop_table("waypoint_edit_table")
+
+    with op.batch_alter_table("telemetry_table", schema=None) as batch_op:
+        batch_op.drop_column("waypoints_version")
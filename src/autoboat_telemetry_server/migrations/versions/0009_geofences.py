@@ -0,0 +1,61 @@
+"""Per-instance geofence polygons.
+
+Revision ID: 0009_geofences
+Revises: 0008_waypoint_edits
+Create Date: 2026-10-19 23:00:00.000000
+
+Creates geofence_table on the default bind, indexed by instance_id.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision = "0009_geofences"
+down_revision = "0008_waypoint_edits"
+branch_labels = None
+depends_on = None
+
+
+def _bind_key() -> str | None:
+    """Return the current bind key (None=default, "hashes"=hashes.db); see 0001_initial."""
+
+    from alembic import context
+
+    return context.config.attributes.get("bind_key")
+
+
+def _default_bind() -> bool:
+    return _bind_key() is None
+
+
+def upgrade() -> None:
+    """Create the geofence table on the default bind."""
+
+    if not _default_bind():
+        return
+
+    op.create_table(
+        "geofence_table",
+        sa.Column("geofence_id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("instance_id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("mode", sa.String(), nullable=False),
+        sa.Column("points_packed", sa.LargeBinary(), nullable=False),
+        sa.Column("digest", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("geofence_id"),
+    )
+    with op.batch_alter_table("geofence_table", schema=None) as batch_op:
+        batch_op.create_index("ix_geofence_table_instance_id", ["instance_id"], unique=False)
+
+
+def downgrade() -> None:
+    """Drop the geofence table from the default bind."""
+
+    if not _default_bind():
+        return
+
+    with op.batch_alter_table("geofence_table", schema=None) as batch_op:
+        batch_op.drop_index("ix_geofence_table_instance_id")
+    op.drop_table("geofence_table")
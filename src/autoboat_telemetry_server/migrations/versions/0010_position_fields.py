@@ -0,0 +1,50 @@
+"""Per-instance boat status position field names.
+
+Revision ID: 0010_position_fields
+Revises: 0009_geofences
+Create Date: 2026-10-20 09:00:00.000000
+
+Adds the nullable telemetry_table.boat_status_position_fields (default bind
+only). NULL means the app-wide POSITION_FIELDS.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision = "0010_position_fields"
+down_revision = "0009_geofences"
+branch_labels = None
+depends_on = None
+
+
+def _bind_key() -> str | None:
+    """Return the current bind key (None=default, "hashes"=hashes.db); see 0001_initial."""
+
+    from alembic import context
+
+    return context.config.attributes.get("bind_key")
+
+
+def _default_bind() -> bool:
+    return _bind_key() is None
+
+
+def upgrade() -> None:
+    """Add the position fields column on the default bind."""
+
+    if not _default_bind():
+        return
+
+    with op.batch_alter_table("telemetry_table", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("boat_status_position_fields", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Drop the position fields column from the default bind."""
+
+    if not _default_bind():
+        return
+
+    with op.batch_alter_table("telemetry_table", schema=None) as batch_op:
+        batch_op.drop_column("boat_status_position_fields")
@@ -0,0 +1,61 @@
+"""Per-instance and global alert rules.
+
+Revision ID: 0011_alert_rules
+Revises: 0010_position_fields
+Create Date: 2026-10-20 12:00:00.000000
+
+Creates alert_rule_table on the default bind, indexed by instance_id.
+A NULL instance_id is a rule for every instance.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision = "0011_alert_rules"
+down_revision = "0010_position_fields"
+branch_labels = None
+depends_on = None
+
+
+def _bind_key() -> str | None:
+    """Return the current bind key (None=default, "hashes"=hashes.db); see 0001_initial."""
+
+    from alembic import context
+
+    return context.config.attributes.get("bind_key")
+
+
+def _default_bind() -> bool:
+    return _bind_key() is None
+
+
+def upgrade() -> None:
+    """Create the alert rule table on the default bind."""
+
+    if not _default_bind():
+        return
+
+    op.create_table(
+        "alert_rule_table",
+        sa.Column("rule_id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("instance_id", sa.Integer(), nullable=True),
+        sa.Column("rule", sa.String(), nullable=False),
+        sa.Column("intensity", sa.Integer(), nullable=False),
+        sa.Column("last_fired_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("rule_id"),
+    )
+    with op.batch_alter_table("alert_rule_table", schema=None) as batch_op:
+        batch_op.create_index("ix_alert_rule_table_instance_id", ["instance_id"], unique=False)
+
+
+def downgrade() -> None:
+    """Drop the alert rule table from the default bind."""
+
+    if not _default_bind():
+        return
+
+    with op.batch_alter_table("alert_rule_table", schema=None) as batch_op:
+        batch_op.drop_index("ix_alert_rule_table_instance_id")
+    op.drop_table("alert_rule_table")
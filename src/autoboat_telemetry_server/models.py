@@ -4,23 +4,38 @@ Database models for the Autoboat Telemetry Server.
 Includes:
 - TelemetryTable: Model for storing telemetry data.
 - HashTable: Model for storing configuration hashes.
+- ParameterChangeTable: Append-only log of autopilot parameter changes.
+- ParameterSnapshotTable: Periodic full copies of an instance's autopilot parameters.
+- WaypointEditTable: Recent waypoint edit operations, one row per waypoint version.
+- GeofenceTable: Per-instance keep-in / keep-out polygons checked on boat status writes.
+- AlertRuleTable: Per-instance or global threshold rules evaluated on boat status writes.
 """
 
-__all__ = ["HashTable", "TelemetryTable", "db"]
+__all__ = [
+    "AlertRuleTable",
+    "GeofenceTable",
+    "HashTable",
+    "ParameterChangeTable",
+    "ParameterSnapshotTable",
+    "TelemetryTable",
+    "WaypointEditTable",
+    "db",
+]
 
-import hashlib
-import json
 import sqlite3
+from collections.abc import Mapping
 from datetime import UTC, datetime
 from typing import Any
 
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import Boolean, Index, Integer, String, event
+from sqlalchemy import Boolean, Index, Integer, LargeBinary, String, cast, event, func, literal, true
 from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.ext.mutable import MutableDict, MutableList
-from sqlalchemy.orm import Mapped, Mapper, mapped_column, validates
+from sqlalchemy.orm import Mapped, Mapper, Session, mapped_column, scoped_session, validates
+from sqlalchemy.sql.elements import ColumnElement
 from sqlalchemy.types import JSON as _JSON
 
+from autoboat_telemetry_server.canonical import EMPTY_PARAMETERS_DIGEST, digest
 from autoboat_telemetry_server.types import (
     AutopilotParametersType,
     BoatStatusMappingType,
@@ -36,10 +51,13 @@ MutableJSONList = MutableList.as_mutable(_JSON)
 
 db = SQLAlchemy()
 
-# connection-scoped sqlite pragmas — see python-source.instructions.md
+# database-level then connection-scoped sqlite pragmas — see python-source.instructions.md
 # #"SQLite connection pragmas"
-_SQLITE_PRAGMAS = (
+_SQLITE_DATABASE_PRAGMAS = (
+    "PRAGMA auto_vacuum=INCREMENTAL;",  # only takes effect on a new (or VACUUMed) database
     "PRAGMA journal_mode=WAL;",
+)
+_SQLITE_PRAGMAS = (
     "PRAGMA synchronous=NORMAL;",
     "PRAGMA busy_timeout=5000;",
     "PRAGMA cache_size=-65536;",  # 64 MiB page cache (negative = kibibytes)
@@ -65,6 +83,11 @@ def _set_sqlite_pragmas(dbapi_connection: object, _connection_record: object) ->
 
     cursor = dbapi_connection.cursor()
     try:
+        # read-only connections (read_only.py) can't change database-level settings
+        if cursor.execute("PRAGMA query_only").fetchone()[0] == 0:
+            for pragma in _SQLITE_DATABASE_PRAGMAS:
+                cursor.execute(pragma)
+
         for pragma in _SQLITE_PRAGMAS:
             cursor.execute(pragma)
 
@@ -97,11 +120,16 @@ class TelemetryTable(db.Model):
     current_config_hash : str
         SHA-256 hash of the current autopilot parameters configuration.
     default_autopilot_parameters : AutopilotParametersType
-        Default autopilot parameters for the telemetry instance.
+        Default autopilot parameters for the telemetry instance, or ``{}`` when stored by reference.
     autopilot_parameters : AutopilotParametersType
-        Autopilot parameters associated with the telemetry instance.
+        Autopilot parameters associated with the telemetry instance, or only those that differ from
+        the config's defaults when stored by reference.
+    autopilot_parameters_by_reference : bool
+        Whether both parameter columns are resolved against ``current_config_hash``, see ``parameter_storage``.
     autopilot_parameters_new_flag : bool
         Flag indicating if there are new autopilot parameters.
+    autopilot_parameters_digest : str
+        Running order-independent digest of ``autopilot_parameters``, see ``canonical.parameters_digest``.
 
     boat_status : BoatStatusType
         Current status of the boat.
@@ -109,11 +137,17 @@ class TelemetryTable(db.Model):
         Mapping of the boat status payload field names to their corresponding data types.
     boat_status_new_flag : bool
         Flag indicating if there is a new boat status.
+    boat_status_position_fields : list[str] | None
+        The ``boat_status`` keys of the latitude and longitude, or ``None`` for ``POSITION_FIELDS``.
 
     waypoints : WaypointSequenceType
-        List of waypoints for the boat.
+        List of waypoints for the boat, or ``[]`` when stored packed.
+    waypoints_packed : bytes | None
+        The waypoints as little-endian float64 ``latitude, longitude`` pairs, see ``waypoint_storage``.
     waypoints_new_flag : bool
         Flag indicating if there are new waypoints.
+    waypoints_version : int
+        Incremented by every waypoint write, see ``waypoint_edits``.
 
     created_at : datetime
         Timestamp when the telemetry instance was created.
@@ -126,7 +160,9 @@ class TelemetryTable(db.Model):
     # indexed columns — see .github/instructions/python-source.instructions.md#TelemetryTable
     __table_args__ = (
         Index("ix_telemetry_table_updated_at", "updated_at"),
-        Index("ix_telemetry_table_instance_identifier", "instance_identifier"),
+        Index("ix_telemetry_table_instance_identifier", "instance_identifier", unique=True),
+        Index("ix_telemetry_table_user_updated_at", "user", "updated_at"),
+        Index("ix_telemetry_table_current_config_hash_updated_at", "current_config_hash", "updated_at"),
     )
 
     instance_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -137,14 +173,19 @@ class TelemetryTable(db.Model):
     current_config_hash: Mapped[str] = mapped_column(String, default="", nullable=False)
     default_autopilot_parameters: Mapped[AutopilotParametersType] = mapped_column(MutableJSON, nullable=False)
     autopilot_parameters: Mapped[AutopilotParametersType] = mapped_column(MutableJSON, nullable=False)
+    autopilot_parameters_by_reference: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     autopilot_parameters_new_flag: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    autopilot_parameters_digest: Mapped[str] = mapped_column(String, default=EMPTY_PARAMETERS_DIGEST, nullable=False)
 
     boat_status: Mapped[BoatStatusType] = mapped_column(MutableJSON, nullable=False)
     boat_status_mapping: Mapped[BoatStatusMappingType] = mapped_column(MutableJSONList, nullable=True)
     boat_status_new_flag: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    boat_status_position_fields: Mapped[list[str] | None] = mapped_column(_JSON, nullable=True)
 
     waypoints: Mapped[WaypointSequenceType] = mapped_column(MutableJSONList, nullable=False)
+    waypoints_packed: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
     waypoints_new_flag: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    waypoints_version: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
 
     created_at: Mapped[datetime] = mapped_column(db.DateTime, default=lambda: datetime.now(UTC), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(
@@ -175,7 +216,9 @@ class TelemetryTable(db.Model):
             If there is an attempt to change the user after it has been set.
         """
 
-        if getattr(self, "user", "unknown") != "unknown" and self.user != value:
+        # a new, unflushed row has user None until it is first assigned
+        current = getattr(self, "user", None)
+        if current not in {None, "unknown"} and current != value:
             raise ValueError("The 'user' field can only be set once and cannot be changed.")
 
         return value
@@ -200,46 +243,167 @@ class TelemetryTable(db.Model):
         }
 
     @classmethod
-    def get_all_ids(cls) -> list[int]:
+    def get_all_ids(cls, session: Session | scoped_session | None = None) -> list[int]:
         """
         Retrieve all instance IDs from the database.
 
+        Parameters
+        ----------
+        session
+            Session to query with; defaults to ``db.session``.
+
         Returns
         -------
         list[int]
             A list of all instance IDs.
         """
 
-        return db.session.execute(db.select(cls.instance_id)).scalars().all()
+        session = db.session if session is None else session
+        return session.execute(db.select(cls.instance_id)).scalars().all()
+
+    @staticmethod
+    def default_identifier(instance_id: ColumnElement[int]) -> ColumnElement[str]:
+        """
+        Build the SQL expression for the default ``"Unnamed instance #<id>"`` name.
+
+        Parameters
+        ----------
+        instance_id
+            SQL expression evaluating to the instance ID the name is for.
+
+        Returns
+        -------
+        ColumnElement[str]
+            A string-valued SQL expression.
+        """
+
+        return literal("Unnamed instance #") + cast(instance_id, String)
+
+    @classmethod
+    def name_prefix_clause(cls, name_prefix: str) -> ColumnElement[bool]:
+        """
+        Build the filter for instances whose ``instance_identifier`` starts with ``name_prefix``.
+
+        A range instead of ``LIKE``, so the ``instance_identifier`` index is used.
+
+        Parameters
+        ----------
+        name_prefix
+            The non-empty name prefix.
+
+        Returns
+        -------
+        ColumnElement[bool]
+            ``name_prefix <= instance_identifier < <prefix with its last character incremented>``.
+        """
+
+        upper_bound = name_prefix[:-1] + chr(ord(name_prefix[-1]) + 1)
+        return (cls.instance_identifier >= name_prefix) & (cls.instance_identifier < upper_bound)
+
+    @classmethod
+    def next_instance_id(cls) -> ColumnElement[int]:
+        """
+        Build a scalar subquery for the ID SQLite will assign to the next inserted row.
+
+        Returns
+        -------
+        ColumnElement[int]
+            ``COALESCE(MAX(instance_id), 0) + 1`` as a scalar subquery.
+        """
+
+        return db.select(func.coalesce(func.max(cls.instance_id), 0) + 1).scalar_subquery()
+
+    @classmethod
+    def create_many(cls, count: int, values: Mapping[str, object] | None = None) -> list[int]:
+        """
+        Insert ``count`` empty instances with default names in a single ``INSERT ... RETURNING``.
+
+        Does not commit; the caller owns the transaction.
 
+        Parameters
+        ----------
+        count
+            Number of instances to create. Must be positive.
+        values
+            Column values shared by every new instance, replacing the empty defaults
+            (e.g. ``parameter_storage.config_columns``).
+
+        Returns
+        -------
+        list[int]
+            The new instance IDs in ascending order.
+
+        Raises
+        ------
+        ValueError
+            If ``count`` is not positive.
+        """
 
-@event.listens_for(TelemetryTable, "after_insert")
+        if count < 1:
+            raise ValueError("The number of instances to create must be at least 1.")
+
+        # single-statement insert — see python-source.instructions.md#Instance creation
+        seq = db.select(literal(1).label("k")).cte("seq", recursive=True)
+        seq = seq.union_all(db.select(seq.c.k + 1).where(seq.c.k < count))
+        base = db.select(func.coalesce(func.max(cls.instance_id), 0).label("max_id")).subquery("base")
+        new_id = base.c.max_id + seq.c.k
+        now = datetime.now(UTC)
+
+        columns = {
+            "instance_id": new_id,
+            "instance_identifier": cls.default_identifier(new_id),
+            "user": literal("unknown"),
+            "current_config_hash": literal(""),
+            "default_autopilot_parameters": literal({}, _JSON),
+            "autopilot_parameters": literal({}, _JSON),
+            "autopilot_parameters_by_reference": literal(False),
+            "autopilot_parameters_new_flag": literal(False),
+            "autopilot_parameters_digest": literal(EMPTY_PARAMETERS_DIGEST),
+            "boat_status": literal({}, _JSON),
+            "boat_status_mapping": literal([], _JSON),
+            "boat_status_new_flag": literal(False),
+            "waypoints": literal([], _JSON),
+            "waypoints_new_flag": literal(False),
+            "waypoints_version": literal(0),
+            "created_at": literal(now, db.DateTime),
+            "updated_at": literal(now, db.DateTime),
+        }
+        for name, value in (values or {}).items():
+            columns[name] = literal(value, cls.__table__.c[name].type)
+
+        rows = db.select(*columns.values()).select_from(seq.join(base, true()))
+        statement = cls.__table__.insert().from_select(list(columns), rows).returning(cls.__table__.c.instance_id)
+
+        return sorted(db.session.execute(statement).scalars().all())
+
+
+@event.listens_for(TelemetryTable, "before_insert")
 def set_instance_identifier(mapper: Mapper, connection: Connection, target: TelemetryTable) -> None:
     """
-    Event listener to set the ``instance_identifier`` after a ``TelemetryTable`` row is inserted.
+    Event listener to default the ``instance_identifier`` inside the ``INSERT`` of a ``TelemetryTable`` row.
 
     Parameters
     ----------
     mapper
         SQLAlchemy mapper for the model.
     connection
-        Database connection used for the update.
+        Database connection used for the insert.
     target
-        The instance of ``TelemetryTable`` that was inserted.
+        The instance of ``TelemetryTable`` about to be inserted.
 
     Returns
     -------
     None
     """
 
-    new_identifier = f"Unnamed instance #{target.instance_id}"
-    if not target.instance_identifier:
-        connection.execute(
-            TelemetryTable.__table__.update()
-            .where(TelemetryTable.instance_id == target.instance_id)
-            .values(instance_identifier=new_identifier)
-        )
-        target.instance_identifier = new_identifier
+    if target.instance_identifier:
+        return
+
+    if target.instance_id is not None:
+        target.instance_identifier = f"Unnamed instance #{target.instance_id}"
+    else:
+        # computed in the same statement as the insert — see python-source.instructions.md#Instance creation
+        target.instance_identifier = TelemetryTable.default_identifier(TelemetryTable.next_instance_id())
 
 
 class HashTable(db.Model):
@@ -285,7 +449,7 @@ class HashTable(db.Model):
         return {"config_hash": self.config_hash, "description": self.description, "created_at": self.created_at.isoformat()}
 
     @classmethod
-    def check_hash_exists(cls, config_hash: str) -> bool:
+    def check_hash_exists(cls, config_hash: str, session: Session | scoped_session | None = None) -> bool:
         """
         Check if a configuration hash exists in the database.
 
@@ -293,6 +457,8 @@ class HashTable(db.Model):
         ----------
         config_hash
             The SHA-256 hash of the configuration to check.
+        session
+            Session to query with; defaults to ``db.session``.
 
         Returns
         -------
@@ -300,13 +466,14 @@ class HashTable(db.Model):
             ``True`` if the hash exists, ``False`` otherwise.
         """
 
-        exists = db.session.execute(db.select(cls.config_hash).where(cls.config_hash == config_hash)).first()
+        session = db.session if session is None else session
+        exists = session.execute(db.select(cls.config_hash).where(cls.config_hash == config_hash)).first()
         return exists is not None
 
     @staticmethod
     def compute_hash(config_data: dict) -> str:
         """
-        Compute the SHA-256 hash of the given configuration data.
+        Compute the SHA-256 hash of the canonical encoding of the given configuration data.
 
         Parameters
         ----------
@@ -319,9 +486,8 @@ class HashTable(db.Model):
             The SHA-256 hash of the configuration data.
         """
 
-        config_json = json.dumps(config_data, sort_keys=True, separators=(",", ":"))
-        hash_obj = hashlib.sha256(config_json.encode(encoding="utf-8"))
-        return hash_obj.hexdigest()
+        # must stay byte-identical to the stored keys — see python-source.instructions.md#Canonical encoding
+        return digest(config_data, "sha256")
 
     @staticmethod
     def validate_config(config: object) -> tuple[bool, str]:
@@ -360,3 +526,230 @@ class HashTable(db.Model):
                 return False, "Each inner dictionary must contain 'default' and 'description' keys."
 
         return True, "The configuration is valid."
+
+
+class ParameterChangeTable(db.Model):
+    """
+    Append-only log of autopilot parameter changes, one row per changed key.
+
+    Inherits
+    -------
+    ``db.Model``
+        SQLAlchemy base model for database interaction.
+
+    Attributes
+    ----------
+    change_id : int
+        Monotonic identifier; orders changes made at the same timestamp.
+    instance_id : int
+        The telemetry instance whose parameter changed.
+    changed_at : datetime
+        Timestamp of the write that made the change.
+    key : str
+        The parameter name.
+    change : str
+        ``"added"``, ``"removed"`` or ``"changed"``.
+    old_value : Any
+        The value before the write (``None`` when added).
+    new_value : Any
+        The value after the write (``None`` when removed).
+    """
+
+    __tablename__ = "parameter_change_table"
+
+    # history reads — see .github/instructions/python-source.instructions.md#Parameter history
+    __table_args__ = (
+        Index("ix_parameter_change_table_instance_id_change_id", "instance_id", "change_id"),
+        Index("ix_parameter_change_table_instance_id_changed_at", "instance_id", "changed_at"),
+    )
+
+    change_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    instance_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    changed_at: Mapped[datetime] = mapped_column(db.DateTime, default=lambda: datetime.now(UTC), nullable=False)
+    key: Mapped[str] = mapped_column(String, nullable=False)
+    change: Mapped[str] = mapped_column(String, nullable=False)
+    old_value: Mapped[Any] = mapped_column(_JSON, nullable=True)
+    new_value: Mapped[Any] = mapped_column(_JSON, nullable=True)
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Convert the change to a dictionary.
+
+        Returns
+        -------
+        dict[str, Any]
+            A dictionary representation of the change.
+        """
+
+        return {
+            "changed_at": self.changed_at.isoformat(),
+            "key": self.key,
+            "change": self.change,
+            "old": self.old_value,
+            "new": self.new_value,
+        }
+
+
+class ParameterSnapshotTable(db.Model):
+    """
+    Full copy of an instance's autopilot parameters, taken every few changes.
+
+    Inherits
+    -------
+    ``db.Model``
+        SQLAlchemy base model for database interaction.
+
+    Attributes
+    ----------
+    snapshot_id : int
+        Unique identifier for each snapshot.
+    instance_id : int
+        The telemetry instance the snapshot belongs to.
+    change_id : int
+        The last ``ParameterChangeTable.change_id`` included (0 for a baseline taken before any change).
+    taken_at : datetime
+        Timestamp of the write that took the snapshot.
+    parameters : AutopilotParametersType
+        The full parameters after ``change_id``.
+    """
+
+    __tablename__ = "parameter_snapshot_table"
+
+    __table_args__ = (Index("ix_parameter_snapshot_table_instance_id_taken_at", "instance_id", "taken_at"),)
+
+    snapshot_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    instance_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    change_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    taken_at: Mapped[datetime] = mapped_column(db.DateTime, default=lambda: datetime.now(UTC), nullable=False)
+    parameters: Mapped[AutopilotParametersType] = mapped_column(_JSON, nullable=False)
+
+
+class WaypointEditTable(db.Model):
+    """
+    The edit operations that produced one waypoint version, kept for the last few versions.
+
+    Inherits
+    -------
+    ``db.Model``
+        SQLAlchemy base model for database interaction.
+
+    Attributes
+    ----------
+    edit_id : int
+        Unique identifier for each edit.
+    instance_id : int
+        The telemetry instance that was edited.
+    version : int
+        The ``TelemetryTable.waypoints_version`` the edit produced.
+    edited_at : datetime
+        Timestamp of the edit.
+    ops : list[dict[str, Any]]
+        The operations, in the form ``/waypoints/edit`` takes them.
+    """
+
+    __tablename__ = "waypoint_edit_table"
+
+    __table_args__ = (Index("ix_waypoint_edit_table_instance_id_version", "instance_id", "version", unique=True),)
+
+    edit_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    instance_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+    edited_at: Mapped[datetime] = mapped_column(db.DateTime, default=lambda: datetime.now(UTC), nullable=False)
+    ops: Mapped[list[dict[str, Any]]] = mapped_column(_JSON, nullable=False)
+
+
+class GeofenceTable(db.Model):
+    """
+    A polygon an instance's boat must stay inside (``keep_in``) or outside (``keep_out``).
+
+    Inherits
+    -------
+    ``db.Model``
+        SQLAlchemy base model for database interaction.
+
+    Attributes
+    ----------
+    geofence_id : int
+        Unique identifier for each geofence.
+    instance_id : int
+        The telemetry instance the geofence applies to.
+    name : str
+        Label used in the diagnostic message.
+    mode : str
+        ``"keep_in"`` or ``"keep_out"``.
+    points_packed : bytes
+        The vertices as little-endian float64 ``latitude, longitude`` pairs, as for waypoints.
+    digest : str
+        Hex digest of ``points_packed``; the key of the compiled polygon cache.
+    created_at : datetime
+        Timestamp of creation.
+    """
+
+    __tablename__ = "geofence_table"
+
+    # checked on every boat status write — see .github/instructions/python-source.instructions.md#Geofences
+    __table_args__ = (Index("ix_geofence_table_instance_id", "instance_id"),)
+
+    geofence_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    instance_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    name: Mapped[str] = mapped_column(String, nullable=False)
+    mode: Mapped[str] = mapped_column(String, nullable=False)
+    points_packed: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    digest: Mapped[str] = mapped_column(String, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(db.DateTime, default=lambda: datetime.now(UTC), nullable=False)
+
+
+class AlertRuleTable(db.Model):
+    """
+    An operator-defined threshold rule, e.g. ``battery_voltage < 11.2 for 5s``, for one instance or all of them.
+
+    Inherits
+    -------
+    ``db.Model``
+        SQLAlchemy base model for database interaction.
+
+    Attributes
+    ----------
+    rule_id : int
+        Unique identifier for each rule.
+    instance_id : int | None
+        The telemetry instance the rule applies to; ``None`` for a global rule.
+    rule : str
+        The rule as written; the key of the compiled rule cache.
+    intensity : int
+        The ``DiagnosticMessageIntensity`` set when the rule fires.
+    last_fired_at : datetime | None
+        When the rule last fired, for any instance.
+    created_at : datetime
+        Timestamp of creation.
+    """
+
+    __tablename__ = "alert_rule_table"
+
+    # checked on every boat status write — see .github/instructions/python-source.instructions.md#Alert rules
+    __table_args__ = (Index("ix_alert_rule_table_instance_id", "instance_id"),)
+
+    rule_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    instance_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    rule: Mapped[str] = mapped_column(String, nullable=False)
+    intensity: Mapped[int] = mapped_column(Integer, nullable=False)
+    last_fired_at: Mapped[datetime | None] = mapped_column(db.DateTime, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(db.DateTime, default=lambda: datetime.now(UTC), nullable=False)
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Convert the rule to a dictionary.
+
+        Returns
+        -------
+        dict[str, Any]
+            A dictionary representation of the rule; ``instance_id`` is ``None`` for a global rule.
+        """
+
+        return {
+            "rule_id": self.rule_id,
+            "instance_id": self.instance_id,
+            "rule": self.rule,
+            "intensity": self.intensity,
+            "last_fired_at": self.last_fired_at.isoformat() if self.last_fired_at else None,
+        }
@@ -0,0 +1,138 @@
+"""
+Newline-delimited JSON helpers for the streaming bulk export / import routes.
+
+See `.github/instructions/python-source.instructions.md` #"Bulk export and
+import (NDJSON)" for the record shapes and the chunked transaction model.
+"""
+
+__all__ = [
+    "DEFAULT_EXPORT_BATCH_SIZE",
+    "DEFAULT_IMPORT_CHUNK_SIZE",
+    "NDJSON_MIMETYPE",
+    "ImportReport",
+    "chunked",
+    "encode_line",
+    "iter_records",
+]
+
+import json
+import time
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from typing import IO, Any
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+# rows fetched per round trip while exporting, and rows inserted per transaction while importing
+DEFAULT_EXPORT_BATCH_SIZE = 500
+DEFAULT_IMPORT_CHUNK_SIZE = 500
+
+_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+
+def encode_line(record: dict[str, Any]) -> bytes:
+    """
+    Encode one record as a compact JSON line.
+
+    Parameters
+    ----------
+    record
+        A JSON-serializable dict.
+
+    Returns
+    -------
+    bytes
+        The UTF-8 JSON followed by a newline.
+    """
+
+    return (_ENCODER.encode(record) + "\n").encode("utf-8")
+
+
+def iter_records(stream: IO[bytes]) -> Iterator[tuple[int, dict[str, Any]]]:
+    """
+    Parse an NDJSON body one line at a time, without reading it all into memory.
+
+    Blank lines are skipped.
+
+    Parameters
+    ----------
+    stream
+        The binary request body, e.g. ``request.stream``.
+
+    Yields
+    ------
+    tuple[int, dict[str, Any]]
+        Each record with its 1-based line number, for error messages.
+
+    Raises
+    ------
+    ValueError
+        If a line is not valid JSON; the message names the line number.
+    TypeError
+        If a line is valid JSON but not an object.
+    """
+
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Line {line_number}: invalid JSON ({e.msg}).") from e
+
+        if not isinstance(record, dict):
+            raise TypeError(f"Line {line_number}: expected a JSON object.")
+
+        yield line_number, record
+
+
+def chunked[T](iterable: Iterable[T], size: int) -> Iterator[list[T]]:
+    """
+    Split ``iterable`` into lists of at most ``size`` items, lazily.
+
+    Parameters
+    ----------
+    iterable
+        The items to split.
+    size
+        The maximum chunk length. Must be positive.
+
+    Yields
+    ------
+    list[T]
+        The next chunk.
+    """
+
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+class ImportReport:
+    """Counts and throughput of one import request."""
+
+    def __init__(self) -> None:
+        self.imported = 0
+        self.skipped = 0
+        self._start = time.perf_counter()
+
+    def to_dict(self) -> dict[str, int | float]:
+        """
+        Summarize the import so far.
+
+        Returns
+        -------
+        dict[str, int | float]
+            ``imported`` and ``skipped`` row counts, elapsed ``seconds``, and
+            ``rows_per_second`` over every row read (imported + skipped).
+        """
+
+        seconds = time.perf_counter() - self._start
+        rows = self.imported + self.skipped
+        return {
+            "imported": self.imported,
+            "skipped": self.skipped,
+            "seconds": round(seconds, 3),
+            "rows_per_second": round(rows / seconds, 1) if seconds > 0 else 0.0,
+        }
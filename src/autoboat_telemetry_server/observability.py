@@ -6,16 +6,41 @@ the rationale (why JSON, why stdlib logging, cardinality bounds, singleton
 guards, how to add a metric).
 """
 
-__all__ = ["REQUEST_LOG_FORMAT", "count_429", "count_clean_instances_deletions", "init_app", "setup_logging"]
+__all__ = [
+    "REQUEST_LOG_FORMAT",
+    "bind_label",
+    "count_429",
+    "count_anomalies",
+    "count_clean_instances_deletions",
+    "count_config_cache_lookup",
+    "count_geofence_violations",
+    "count_sqlite_busy",
+    "init_app",
+    "observe_alert_rules",
+    "observe_maintenance_job",
+    "observe_sqlite_checkpoint",
+    "setup_logging",
+]
 
 import json
 import logging
+import os
+import threading
 import time
 import uuid
+from collections.abc import Iterator
+from functools import partial
 from typing import Any
 
 from flask import Blueprint, Flask, Response, g, request
-from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Histogram, generate_latest
+from prometheus_client.core import GaugeMetricFamily, Metric
+from sqlalchemy import event, func, select, text
+from sqlalchemy.engine import ExceptionContext
+
+from autoboat_telemetry_server.models import db
+from autoboat_telemetry_server.ndjson import NDJSON_MIMETYPE
+from autoboat_telemetry_server.types import DiagnosticMessageIntensity
 
 # re-exported for tests / callers that want the raw formatter string
 REQUEST_LOG_FORMAT = (
@@ -30,6 +55,22 @@ _http_request_duration_seconds: Histogram | None = None
 _http_429_total: Counter | None = None
 _clean_instances_deleted_total: Counter | None = None
 _http_response_bytes_total: Counter | None = None
+_maintenance_job_duration_seconds: Histogram | None = None
+_maintenance_job_rows_total: Counter | None = None
+_sqlite_checkpoint_duration_seconds: Histogram | None = None
+_sqlite_busy_errors_total: Counter | None = None
+_config_cache_lookups_total: Counter | None = None
+_geofence_violations_total: Counter | None = None
+_alert_rule_evaluations_total: Counter | None = None
+_alert_rule_evaluation_seconds: Histogram | None = None
+_alert_rules_fired_total: Counter | None = None
+_anomalies_detected_total: Counter | None = None
+
+# seconds a storage snapshot is reused across scrapes; see instructions #"SQLite storage metrics"
+DEFAULT_STORAGE_METRICS_TTL = 5.0
+
+# tables whose rows are counted; the append-only logs would cost a full scan per snapshot
+_COUNTED_TABLES = frozenset({"telemetry_table", "hash_table"})
 
 
 class _JsonFormatter(logging.Formatter):
@@ -86,6 +127,11 @@ def _ensure_metrics() -> None:
 
     global _http_requests_total, _http_request_duration_seconds, _http_429_total  # noqa: PLW0603
     global _clean_instances_deleted_total, _http_response_bytes_total  # noqa: PLW0603
+    global _maintenance_job_duration_seconds, _maintenance_job_rows_total  # noqa: PLW0603
+    global _sqlite_checkpoint_duration_seconds, _sqlite_busy_errors_total  # noqa: PLW0603
+    global _config_cache_lookups_total, _geofence_violations_total  # noqa: PLW0603
+    global _alert_rule_evaluations_total, _alert_rule_evaluation_seconds, _alert_rules_fired_total  # noqa: PLW0603
+    global _anomalies_detected_total  # noqa: PLW0603
 
     if _http_requests_total is None:
         _http_requests_total = Counter(
@@ -100,7 +146,7 @@ def _ensure_metrics() -> None:
         )
         _http_429_total = Counter("http_429_total", "HTTP 429 responses from write-lock contention.")
         _clean_instances_deleted_total = Counter(
-            "clean_instances_deleted_total", "Telemetry instances deleted by the clean_instances cron route."
+            "clean_instances_deleted_total", "Telemetry instances deleted by clean_instances (route or maintenance job)."
         )
         _http_response_bytes_total = Counter(
             "http_response_bytes_total",
@@ -108,6 +154,181 @@ def _ensure_metrics() -> None:
             labelnames=("method", "path"),
         )
 
+    if _maintenance_job_duration_seconds is None:
+        _maintenance_job_duration_seconds = Histogram(
+            "maintenance_job_duration_seconds", "Wall-clock duration of background maintenance jobs.", labelnames=("job",)
+        )
+        _maintenance_job_rows_total = Counter(
+            "maintenance_job_rows_total",
+            "Rows (or pages, for checkpoints) affected by background maintenance jobs.",
+            labelnames=("job",),
+        )
+
+    if _sqlite_checkpoint_duration_seconds is None:
+        _sqlite_checkpoint_duration_seconds = Histogram(
+            "sqlite_checkpoint_duration_seconds",
+            "Duration of PRAGMA wal_checkpoint runs, by bind and checkpoint mode.",
+            labelnames=("bind", "mode"),
+        )
+        _sqlite_busy_errors_total = Counter(
+            "sqlite_busy_errors_total",
+            "Statements that failed with SQLITE_BUSY/SQLITE_LOCKED after busy_timeout expired, by bind.",
+            labelnames=("bind",),
+        )
+
+    if _config_cache_lookups_total is None:
+        _config_cache_lookups_total = Counter(
+            "config_cache_lookups_total",
+            "Config store lookups by result (hit = hash known, miss = unknown hash).",
+            labelnames=("result",),
+        )
+
+    if _geofence_violations_total is None:
+        _geofence_violations_total = Counter(
+            "geofence_violations_total",
+            "Geofence violations raised as an ERROR diagnostic message on boat status writes, by geofence mode.",
+            labelnames=("mode",),
+        )
+
+    if _alert_rule_evaluations_total is None:
+        _alert_rule_evaluations_total = Counter(
+            "alert_rule_evaluations_total", "Alert rules evaluated against boat status writes (one per rule per write)."
+        )
+        _alert_rule_evaluation_seconds = Histogram(
+            "alert_rule_evaluation_seconds",
+            "Time spent evaluating the alert rules of one boat status write that has rules.",
+            buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025),
+        )
+        _alert_rules_fired_total = Counter(
+            "alert_rules_fired_total", "Alert rules that fired on a boat status write, by intensity.", labelnames=("intensity",)
+        )
+
+    if _anomalies_detected_total is None:
+        _anomalies_detected_total = Counter(
+            "anomalies_detected_total",
+            "Anomalies that started on a boat status field, by type (non_finite / jump / stuck).",
+            labelnames=("type",),
+        )
+
+
+def bind_label(bind_key: str | None) -> str:
+    """Return the metric label for a Flask-SQLAlchemy bind key (``None`` is ``"default"``)."""
+
+    return bind_key or "default"
+
+
+class _SqliteStorageCollector:
+    """
+    Custom collector reporting per-bind SQLite storage gauges.
+
+    Values come from cheap PRAGMAs, one ``COUNT(*)`` per table, and a ``stat`` of
+    the ``-wal`` file, read on a plain WAL read connection without the app lock.
+    A snapshot is reused for ``ttl`` seconds so frequent scrapes cost nothing.
+    """
+
+    def __init__(self) -> None:
+        self._app: Flask | None = None
+        self._ttl = DEFAULT_STORAGE_METRICS_TTL
+        self._lock = threading.Lock()
+        self._cached_at = 0.0
+        self._cached: list[Metric] = []
+
+    def bind(self, app: Flask) -> None:
+        """Point the collector at ``app`` and drop any cached snapshot."""
+
+        with self._lock:
+            self._app = app
+            self._ttl = float(app.config.get("STORAGE_METRICS_TTL", DEFAULT_STORAGE_METRICS_TTL))
+            self._cached_at = 0.0
+            self._cached = []
+
+    def describe(self) -> Iterator[Metric]:
+        # static description so REGISTRY.register doesn't run a collection
+        yield from self._empty_families().values()
+
+    def collect(self) -> Iterator[Metric]:
+        with self._lock:
+            now = time.monotonic()
+            if self._app is not None and now - self._cached_at >= self._ttl:
+                self._cached = self._gather(self._app)
+                self._cached_at = now
+
+            cached = self._cached
+
+        yield from cached
+
+    @staticmethod
+    def _empty_families() -> dict[str, GaugeMetricFamily]:
+        return {
+            "page_count": GaugeMetricFamily("sqlite_page_count", "Pages in the database file.", labels=("bind",)),
+            "freelist_count": GaugeMetricFamily(
+                "sqlite_freelist_count", "Unused pages awaiting incremental_vacuum.", labels=("bind",)
+            ),
+            "page_size": GaugeMetricFamily("sqlite_page_size_bytes", "Database page size in bytes.", labels=("bind",)),
+            "wal_size": GaugeMetricFamily("sqlite_wal_size_bytes", "Size of the -wal file in bytes.", labels=("bind",)),
+            "table_rows": GaugeMetricFamily(
+                "sqlite_table_rows", "Rows in telemetry_table and hash_table.", labels=("bind", "table")
+            ),
+        }
+
+    def _gather(self, app: Flask) -> list[Metric]:
+        families = self._empty_families()
+        with app.app_context():
+            for bind_key, engine in db.engines.items():
+                label = bind_label(bind_key)
+                try:
+                    with engine.connect() as connection:
+                        page_count = connection.execute(text("PRAGMA page_count")).scalar_one()
+                        freelist_count = connection.execute(text("PRAGMA freelist_count")).scalar_one()
+                        page_size = connection.execute(text("PRAGMA page_size")).scalar_one()
+                        table_rows = {
+                            table.name: connection.execute(select(func.count()).select_from(table)).scalar_one()
+                            for table in db.metadatas[bind_key].tables.values()
+                            if table.name in _COUNTED_TABLES
+                        }
+
+                except Exception:
+                    logging.getLogger(__name__).warning("Could not read storage metrics for bind %s.", label, exc_info=True)
+                    continue
+
+                wal_path = f"{engine.url.database}-wal"
+                families["page_count"].add_metric([label], page_count)
+                families["freelist_count"].add_metric([label], freelist_count)
+                families["page_size"].add_metric([label], page_size)
+                families["wal_size"].add_metric([label], os.path.getsize(wal_path) if os.path.exists(wal_path) else 0)
+                for table_name, rows in table_rows.items():
+                    families["table_rows"].add_metric([label, table_name], rows)
+
+        return list(families.values())
+
+
+# registered with the default REGISTRY once, re-bound to the newest app by init_app
+_storage_collector: _SqliteStorageCollector | None = None
+
+
+def _count_busy_errors(bind: str, context: ExceptionContext) -> None:
+    """``handle_error`` listener counting statements that gave up on a locked database."""
+
+    message = str(context.original_exception)
+    if "database is locked" in message or "database is busy" in message or "database table is locked" in message:
+        count_sqlite_busy(bind)
+
+
+def _init_storage_metrics(app: Flask) -> None:
+    """Register the storage collector once and hook busy-error counting onto this app's engines."""
+
+    global _storage_collector  # noqa: PLW0603
+
+    if _storage_collector is None:
+        _storage_collector = _SqliteStorageCollector()
+        REGISTRY.register(_storage_collector)
+
+    _storage_collector.bind(app)
+
+    with app.app_context():
+        for bind_key, engine in db.engines.items():
+            event.listen(engine, "handle_error", partial(_count_busy_errors, bind_label(bind_key)))
+
 
 def _path_label() -> str:
     """
@@ -126,7 +347,8 @@ def _log_request(response: Response) -> Response:
     """Emit the structured request log record and record metrics."""
 
     duration_ms = (time.perf_counter() - g.request_start) * 1000.0
-    response_bytes = len(response.get_data())
+    # get_data would buffer a whole streamed NDJSON export, so those bodies are not measured
+    response_bytes = 0 if response.mimetype == NDJSON_MIMETYPE else len(response.get_data())
 
     logging.getLogger("autoboat_telemetry_server.request").info(
         REQUEST_LOG_FORMAT,
@@ -155,6 +377,7 @@ def init_app(app: Flask) -> None:
     """Register structured logging, request hooks, and the /metrics endpoint."""
 
     _ensure_metrics()
+    _init_storage_metrics(app)
     setup_logging()
 
     @app.before_request
@@ -191,3 +414,61 @@ def count_clean_instances_deletions(num_deleted: int) -> None:
 
     if _clean_instances_deleted_total is not None:
         _clean_instances_deleted_total.inc(num_deleted)
+
+
+def observe_maintenance_job(job: str, duration_seconds: float, rows_affected: int) -> None:
+    """Record one run of a background maintenance job. No-op if metrics uninitialized."""
+
+    if _maintenance_job_duration_seconds is not None and _maintenance_job_rows_total is not None:
+        _maintenance_job_duration_seconds.labels(job=job).observe(duration_seconds)
+        _maintenance_job_rows_total.labels(job=job).inc(rows_affected)
+
+
+def observe_sqlite_checkpoint(bind: str, mode: str, duration_seconds: float) -> None:
+    """Record one ``PRAGMA wal_checkpoint`` run on ``bind``. No-op if metrics uninitialized."""
+
+    if _sqlite_checkpoint_duration_seconds is not None:
+        _sqlite_checkpoint_duration_seconds.labels(bind=bind, mode=mode).observe(duration_seconds)
+
+
+def count_sqlite_busy(bind: str) -> None:
+    """Increment the busy/locked error counter for ``bind``. No-op if metrics uninitialized."""
+
+    if _sqlite_busy_errors_total is not None:
+        _sqlite_busy_errors_total.labels(bind=bind).inc()
+
+
+def count_config_cache_lookup(*, hit: bool) -> None:
+    """Count one config store lookup as a hit or a miss. No-op if metrics uninitialized."""
+
+    if _config_cache_lookups_total is not None:
+        _config_cache_lookups_total.labels(result="hit" if hit else "miss").inc()
+
+
+def count_geofence_violations(modes: list[str]) -> None:
+    """Count one violation per violated geofence, labelled by its mode. No-op if metrics uninitialized."""
+
+    if _geofence_violations_total is not None:
+        for mode in modes:
+            _geofence_violations_total.labels(mode=mode).inc()
+
+
+def observe_alert_rules(evaluated: int, duration_seconds: float, intensities: list[DiagnosticMessageIntensity]) -> None:
+    """Record one boat status write's alert rule evaluation. No-op if metrics uninitialized or no rule was evaluated."""
+
+    if not evaluated or _alert_rule_evaluations_total is None or _alert_rule_evaluation_seconds is None:
+        return
+
+    _alert_rule_evaluations_total.inc(evaluated)
+    _alert_rule_evaluation_seconds.observe(duration_seconds)
+    if _alert_rules_fired_total is not None:
+        for intensity in intensities:
+            _alert_rules_fired_total.labels(intensity=intensity.name.lower()).inc()
+
+
+def count_anomalies(types: list[str]) -> None:
+    """Count one anomaly per detector that started one, labelled by its type. No-op if metrics uninitialized."""
+
+    if _anomalies_detected_total is not None:
+        for anomaly_type in types:
+            _anomalies_detected_total.labels(type=anomaly_type).inc()
@@ -0,0 +1,276 @@
+"""
+Append-only autopilot parameter change log with periodic snapshots.
+
+See `.github/instructions/python-source.instructions.md` #"Parameter history"
+for what is logged, when snapshots are taken and how a point in time is rebuilt.
+"""
+
+__all__ = [
+    "DEFAULT_PARAMETER_SNAPSHOT_INTERVAL",
+    "forget",
+    "forget_all",
+    "list_changes",
+    "parse_timestamp",
+    "reconstruct",
+    "record_changes",
+]
+
+from collections.abc import Collection, Iterable, Mapping
+from datetime import UTC, datetime
+from typing import Any
+
+from flask import current_app
+from sqlalchemy.orm import Session, scoped_session
+
+from autoboat_telemetry_server.config_diff import diff_mappings
+from autoboat_telemetry_server.models import ParameterChangeTable, ParameterSnapshotTable, db
+from autoboat_telemetry_server.types import AutopilotParametersType
+
+# logged changes per instance between two snapshots
+DEFAULT_PARAMETER_SNAPSHOT_INTERVAL = 100
+
+
+def parse_timestamp(value: str, name: str) -> datetime:
+    """
+    Parse an ISO 8601 query value into the naive UTC form stored in SQLite.
+
+    Parameters
+    ----------
+    value
+        An ISO 8601 datetime; a value without an offset is taken as UTC.
+    name
+        The query parameter's name, for the error message.
+
+    Returns
+    -------
+    datetime
+        The naive UTC datetime.
+
+    Raises
+    ------
+    ValueError
+        If the value is not an ISO 8601 datetime.
+    """
+
+    try:
+        parsed = datetime.fromisoformat(value)
+
+    except ValueError as e:
+        raise ValueError(f"'{name}' must be an ISO 8601 datetime.") from e
+
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(UTC).replace(tzinfo=None)
+
+    return parsed
+
+
+def record_changes(
+    instance_id: int,
+    old_parameters: Mapping[str, object],
+    new_parameters: Mapping[str, object],
+    *,
+    keys: Collection[str] | None = None,
+) -> int:
+    """
+    Log the keys that differ between two parameter dicts, and snapshot if due.
+
+    Rows are added to ``db.session``; the caller commits them with the write they describe.
+    The first logged write of an instance also stores ``old_parameters`` as its baseline.
+
+    Parameters
+    ----------
+    instance_id
+        The instance being written.
+    old_parameters
+        The full parameters before the write.
+    new_parameters
+        The full parameters after the write.
+    keys
+        Only compare these keys (e.g. the one ``update_existing_parameter`` touched).
+
+    Returns
+    -------
+    int
+        The number of change rows logged.
+    """
+
+    if keys is None:
+        diff = diff_mappings(old_parameters, new_parameters)
+    else:
+        diff = diff_mappings(
+            {key: old_parameters[key] for key in keys if key in old_parameters},
+            {key: new_parameters[key] for key in keys if key in new_parameters},
+        )
+
+    changed_at = datetime.now(UTC)
+    # sorted by key within a write, so the log order doesn't depend on set iteration
+    rows = [
+        *(ParameterChangeTable(key=key, change="added", new_value=value) for key, value in sorted(diff["added"].items())),
+        *(ParameterChangeTable(key=key, change="removed", old_value=value) for key, value in sorted(diff["removed"].items())),
+        *(
+            ParameterChangeTable(key=key, change="changed", old_value=values["from"], new_value=values["to"])
+            for key, values in sorted(diff["changed"].items())
+        ),
+    ]
+    if not rows:
+        return 0
+
+    for row in rows:
+        row.instance_id = instance_id
+        row.changed_at = changed_at
+
+    last_snapshot_change_id = db.session.execute(
+        db.select(ParameterSnapshotTable.change_id)
+        .where(ParameterSnapshotTable.instance_id == instance_id)
+        .order_by(ParameterSnapshotTable.snapshot_id.desc())
+        .limit(1)
+    ).scalar()
+    if last_snapshot_change_id is None:
+        last_snapshot_change_id = 0
+        db.session.add(
+            ParameterSnapshotTable(instance_id=instance_id, change_id=0, taken_at=changed_at, parameters=dict(old_parameters))
+        )
+
+    db.session.add_all(rows)
+    db.session.flush()
+
+    # bounded by the interval: the (instance_id, change_id) index range since the last snapshot
+    pending = db.session.execute(
+        db.select(db.func.count())
+        .select_from(ParameterChangeTable)
+        .where(ParameterChangeTable.instance_id == instance_id, ParameterChangeTable.change_id > last_snapshot_change_id)
+    ).scalar_one()
+    interval = int(current_app.config.get("PARAMETER_SNAPSHOT_INTERVAL", DEFAULT_PARAMETER_SNAPSHOT_INTERVAL))
+    if pending >= interval:
+        db.session.add(
+            ParameterSnapshotTable(
+                instance_id=instance_id,
+                change_id=max(row.change_id for row in rows),
+                taken_at=changed_at,
+                parameters=dict(new_parameters),
+            )
+        )
+
+    return len(rows)
+
+
+def list_changes(
+    session: Session | scoped_session,
+    instance_id: int,
+    *,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    limit: int,
+) -> list[dict[str, Any]]:
+    """
+    Return an instance's logged changes in the order they were made.
+
+    Parameters
+    ----------
+    session
+        Session to query with.
+    instance_id
+        The instance whose history to read.
+    since
+        Only changes at or after this naive UTC time.
+    until
+        Only changes at or before this naive UTC time.
+    limit
+        Maximum number of changes returned (the oldest first).
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        ``ParameterChangeTable.to_dict()`` for each change.
+    """
+
+    statement = db.select(ParameterChangeTable).where(ParameterChangeTable.instance_id == instance_id)
+    if since is not None:
+        statement = statement.where(ParameterChangeTable.changed_at >= since)
+    if until is not None:
+        statement = statement.where(ParameterChangeTable.changed_at <= until)
+
+    changes = session.execute(statement.order_by(ParameterChangeTable.change_id).limit(limit)).scalars()
+    return [change.to_dict() for change in changes]
+
+
+def reconstruct(session: Session | scoped_session, instance_id: int, at: datetime) -> AutopilotParametersType:
+    """
+    Rebuild an instance's parameters as they were at ``at``.
+
+    Starts from the latest snapshot taken at or before ``at`` and replays at most
+    one snapshot interval of changes, never the whole log.
+
+    Parameters
+    ----------
+    session
+        Session to query with.
+    instance_id
+        The instance whose parameters to rebuild.
+    at
+        The naive UTC point in time.
+
+    Returns
+    -------
+    AutopilotParametersType
+        The full parameters at ``at``.
+
+    Raises
+    ------
+    ValueError
+        If nothing was logged for the instance at or before ``at``.
+    """
+
+    snapshot = session.execute(
+        db.select(ParameterSnapshotTable)
+        .where(ParameterSnapshotTable.instance_id == instance_id, ParameterSnapshotTable.taken_at <= at)
+        .order_by(ParameterSnapshotTable.taken_at.desc(), ParameterSnapshotTable.snapshot_id.desc())
+        .limit(1)
+    ).scalar_one_or_none()
+    if snapshot is None:
+        raise ValueError("No parameter history at or before the requested time.")
+
+    parameters = dict(snapshot.parameters)
+    replay = session.execute(
+        db.select(ParameterChangeTable.key, ParameterChangeTable.change, ParameterChangeTable.new_value)
+        .where(
+            ParameterChangeTable.instance_id == instance_id,
+            ParameterChangeTable.change_id > snapshot.change_id,
+            ParameterChangeTable.changed_at <= at,
+        )
+        .order_by(ParameterChangeTable.change_id)
+    )
+    for key, change, new_value in replay:
+        if change == "removed":
+            parameters.pop(key, None)
+        else:
+            parameters[key] = new_value
+
+    return parameters
+
+
+def forget(instance_ids: Iterable[int]) -> None:
+    """
+    Delete the history of deleted instances, in the caller's transaction.
+
+    IDs can be reused after the highest one is deleted, so a new instance must not inherit the log.
+
+    Parameters
+    ----------
+    instance_ids
+        IDs of the instances being deleted.
+    """
+
+    instance_ids = list(instance_ids)
+    if not instance_ids:
+        return
+
+    db.session.execute(db.delete(ParameterChangeTable).where(ParameterChangeTable.instance_id.in_(instance_ids)))
+    db.session.execute(db.delete(ParameterSnapshotTable).where(ParameterSnapshotTable.instance_id.in_(instance_ids)))
+
+
+def forget_all() -> None:
+    """Delete every instance's history, in the caller's transaction (e.g. ``delete_all``)."""
+
+    db.session.execute(db.delete(ParameterChangeTable))
+    db.session.execute(db.delete(ParameterSnapshotTable))
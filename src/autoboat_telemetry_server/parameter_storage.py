@@ -0,0 +1,213 @@
+"""
+Read and write an instance's autopilot parameters, stored by config reference where possible.
+
+See `.github/instructions/python-source.instructions.md` #"Parameter storage
+by reference" for the two row layouts and when each is used.
+"""
+
+__all__ = [
+    "DEFAULT_DEDUPLICATE_AUTOPILOT_PARAMETERS",
+    "config_columns",
+    "get_default_parameters",
+    "get_parameters",
+    "overrides",
+    "parameter_columns",
+    "set_config",
+    "set_parameters",
+]
+
+import copy
+from collections.abc import Mapping
+
+from flask import current_app
+
+from autoboat_telemetry_server.canonical import encode, parameters_digest
+from autoboat_telemetry_server.config_store import config_store
+from autoboat_telemetry_server.models import TelemetryTable
+from autoboat_telemetry_server.types import AutopilotParametersType
+
+# store new configs by reference unless DEDUPLICATE_AUTOPILOT_PARAMETERS says otherwise
+DEFAULT_DEDUPLICATE_AUTOPILOT_PARAMETERS = True
+
+
+def overrides(default_values: Mapping[str, object], parameters: Mapping[str, object]) -> AutopilotParametersType:
+    """
+    Return the parameters whose value differs from the default.
+
+    Values are compared by canonical encoding, so ``1.0`` overriding a default of ``1`` is kept.
+
+    Parameters
+    ----------
+    default_values
+        ``{key: default}`` of the config.
+    parameters
+        The full parameters, with the same keys as ``default_values``.
+
+    Returns
+    -------
+    AutopilotParametersType
+        The sparse override dict.
+    """
+
+    return {
+        key: value
+        for key, value in parameters.items()
+        if value is not default_values[key] and encode(value) != encode(default_values[key])
+    }
+
+
+def get_default_parameters(instance: TelemetryTable) -> AutopilotParametersType:
+    """
+    Return the instance's default autopilot parameters (its config).
+
+    Parameters
+    ----------
+    instance
+        The telemetry instance.
+
+    Returns
+    -------
+    AutopilotParametersType
+        The config; shared with the config store when stored by reference, so do not mutate it.
+    """
+
+    if instance.autopilot_parameters_by_reference:
+        return config_store.get(instance.current_config_hash)
+
+    return instance.default_autopilot_parameters or {}
+
+
+def get_parameters(instance: TelemetryTable) -> AutopilotParametersType:
+    """
+    Return the instance's full autopilot parameters.
+
+    Parameters
+    ----------
+    instance
+        The telemetry instance.
+
+    Returns
+    -------
+    AutopilotParametersType
+        The parameters, with the config's defaults filled in when stored by reference.
+    """
+
+    if instance.autopilot_parameters_by_reference:
+        return {**config_store.get_default_values(instance.current_config_hash), **instance.autopilot_parameters}
+
+    return instance.autopilot_parameters or {}
+
+
+def config_columns(
+    config_hash: str, config: AutopilotParametersType, parameters: AutopilotParametersType | None = None
+) -> dict[str, object]:
+    """
+    Build the column values of an instance running ``config`` with ``parameters``.
+
+    The row stores a reference when deduplication is enabled and ``parameters``
+    has exactly the config's keys; otherwise it stores full copies.
+
+    Parameters
+    ----------
+    config_hash
+        The hash of ``config``; must be (or be about to be) committed to ``HashTable``.
+    config
+        The config.
+    parameters
+        The full parameters; the config's defaults if ``None``.
+
+    Returns
+    -------
+    dict[str, object]
+        ``current_config_hash``, both parameter columns, ``autopilot_parameters_by_reference``
+        and ``autopilot_parameters_digest``.
+    """
+
+    default_values = {key: entry["default"] for key, entry in config.items()}
+    parameters = default_values if parameters is None else parameters
+    by_reference = (
+        bool(current_app.config.get("DEDUPLICATE_AUTOPILOT_PARAMETERS", DEFAULT_DEDUPLICATE_AUTOPILOT_PARAMETERS))
+        and parameters.keys() == default_values.keys()
+    )
+
+    return {
+        "current_config_hash": config_hash,
+        "default_autopilot_parameters": {} if by_reference else copy.deepcopy(config),
+        "autopilot_parameters": overrides(default_values, parameters) if by_reference else dict(parameters),
+        "autopilot_parameters_by_reference": by_reference,
+        "autopilot_parameters_digest": parameters_digest(parameters),
+    }
+
+
+def set_config(
+    instance: TelemetryTable, config_hash: str, config: AutopilotParametersType, parameters: AutopilotParametersType | None = None
+) -> None:
+    """
+    Point the instance at a config and write its parameters and their digest.
+
+    Parameters
+    ----------
+    instance
+        The telemetry instance.
+    config_hash
+        The hash of ``config``.
+    config
+        The config.
+    parameters
+        The full parameters; the config's defaults if ``None``.
+    """
+
+    for name, value in config_columns(config_hash, config, parameters).items():
+        setattr(instance, name, value)
+
+
+def parameter_columns(instance: TelemetryTable, parameters: AutopilotParametersType) -> dict[str, object]:
+    """
+    Build the column values that replace the instance's autopilot parameters, keeping its layout where possible.
+
+    Does not include ``autopilot_parameters_digest``; the caller keeps it in step.
+
+    Parameters
+    ----------
+    instance
+        The telemetry instance.
+    parameters
+        The full new parameters.
+
+    Returns
+    -------
+    dict[str, object]
+        ``autopilot_parameters``, plus both other storage columns if the row falls back to full copies.
+    """
+
+    if not instance.autopilot_parameters_by_reference:
+        return {"autopilot_parameters": dict(parameters)}
+
+    default_values = config_store.get_default_values(instance.current_config_hash)
+    if parameters.keys() == default_values.keys():
+        return {"autopilot_parameters": overrides(default_values, parameters)}
+
+    # keys no longer match the config, so the row can't be expressed as overrides
+    return {
+        "default_autopilot_parameters": copy.deepcopy(config_store.get(instance.current_config_hash)),
+        "autopilot_parameters": dict(parameters),
+        "autopilot_parameters_by_reference": False,
+    }
+
+
+def set_parameters(instance: TelemetryTable, parameters: AutopilotParametersType) -> None:
+    """
+    Replace the instance's autopilot parameters, keeping its storage layout where possible.
+
+    Does not touch ``autopilot_parameters_digest``; the caller keeps it in step.
+
+    Parameters
+    ----------
+    instance
+        The telemetry instance.
+    parameters
+        The full new parameters.
+    """
+
+    for name, value in parameter_columns(instance, parameters).items():
+        setattr(instance, name, value)
@@ -0,0 +1,264 @@
+"""
+Process-local grid index of every instance's latest position, for radius and viewport queries.
+
+See `.github/instructions/python-source.instructions.md` #"Position index"
+for which writes must keep it coherent and how the grid is searched.
+"""
+
+__all__ = ["DEFAULT_POSITION_INDEX_CELL_DEGREES", "MAX_NEAR_RADIUS_M", "PositionIndex", "position_index"]
+
+import math
+import threading
+from collections.abc import Iterable, Iterator
+from typing import cast
+
+import numpy as np
+from flask import Flask, current_app
+
+from autoboat_telemetry_server.models import TelemetryTable, db
+from autoboat_telemetry_server.positions import status_position
+from autoboat_telemetry_server.read_only import read_db
+from autoboat_telemetry_server.route_geometry import EARTH_RADIUS_M
+
+# side of a grid cell in degrees; 0.01 is about 1.1 km of latitude
+DEFAULT_POSITION_INDEX_CELL_DEGREES = 0.01
+
+# half the earth's circumference; every position is within it
+MAX_NEAR_RADIUS_M = math.pi * EARTH_RADIUS_M
+
+type _Cell = tuple[int, int]
+
+
+def _longitude_ranges(west: float, east: float) -> list[tuple[float, float]]:
+    """Split a longitude range that may wrap past ±180 into ranges within [-180, 180]."""
+
+    if east - west >= 360:
+        return [(-180.0, 180.0)]
+
+    if west < -180:
+        return [(west + 360, 180.0), (-180.0, east)]
+
+    if east > 180:
+        return [(west, 180.0), (-180.0, east - 360)]
+
+    if west > east:
+        return [(west, 180.0), (-180.0, east)]
+
+    return [(west, east)]
+
+
+class _IndexState:
+    """Per-app grid, stored in ``app.extensions["position_index"]``."""
+
+    def __init__(self, cell_degrees: float) -> None:
+        self.lock = threading.Lock()
+        self.loaded = False
+        self.cell_degrees = cell_degrees
+        self.positions: dict[int, tuple[float, float]] = {}
+        self.cells: dict[_Cell, set[int]] = {}
+
+    def cell(self, latitude: float, longitude: float) -> _Cell:
+        return math.floor(latitude / self.cell_degrees), math.floor(longitude / self.cell_degrees)
+
+    def put(self, instance_id: int, position: tuple[float, float] | None) -> None:
+        old = self.positions.pop(instance_id, None)
+        if old is not None:
+            cell = self.cell(*old)
+            self.cells[cell].discard(instance_id)
+            if not self.cells[cell]:
+                del self.cells[cell]
+
+        if position is not None:
+            self.positions[instance_id] = position
+            self.cells.setdefault(self.cell(*position), set()).add(instance_id)
+
+    def candidates(self, south: float, west: float, north: float, east: float) -> Iterator[int]:
+        """Yield the instances in the cells overlapping a box that does not wrap."""
+
+        (first_row, first_column), (last_row, last_column) = self.cell(south, west), self.cell(north, east)
+
+        # walk whichever is smaller: the cells in the box, or the occupied cells
+        if (last_row - first_row + 1) * (last_column - first_column + 1) <= len(self.cells):
+            for row in range(first_row, last_row + 1):
+                for column in range(first_column, last_column + 1):
+                    yield from self.cells.get((row, column), ())
+        else:
+            for (row, column), instance_ids in self.cells.items():
+                if first_row <= row <= last_row and first_column <= column <= last_column:
+                    yield from instance_ids
+
+
+class PositionIndex:
+    """
+    The latest position of every instance, bucketed into a latitude / longitude grid.
+
+    Writers call ``update`` / ``discard`` / ``clear`` after they commit; until the first
+    query loads the grid those calls are no-ops, because the load reads the committed state anyway.
+    """
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Register an empty, not yet loaded index for ``app``.
+
+        Parameters
+        ----------
+        app
+            The Flask app.
+        """
+
+        app.extensions["position_index"] = _IndexState(
+            float(app.config.get("POSITION_INDEX_CELL_DEGREES", DEFAULT_POSITION_INDEX_CELL_DEGREES))
+        )
+
+    @property
+    def _state(self) -> _IndexState:
+        return current_app.extensions["position_index"]
+
+    def _ensure_loaded(self, state: _IndexState) -> None:
+        if state.loaded:
+            return
+
+        with state.lock:
+            if state.loaded:
+                return
+
+            rows = cast(
+                "list[tuple[int, dict, list[str] | None]]",
+                read_db.session.execute(
+                    db.select(TelemetryTable.instance_id, TelemetryTable.boat_status, TelemetryTable.boat_status_position_fields)
+                ).all(),
+            )
+            for instance_id, status, fields in rows:
+                state.put(instance_id, status_position(status, fields))
+            state.loaded = True
+
+    def update(self, instance_id: int, position: tuple[float, float] | None) -> None:
+        """
+        Record an instance's committed position.
+
+        Parameters
+        ----------
+        instance_id
+            The instance whose boat status or position fields were written.
+        position
+            Its ``(latitude, longitude)``, or ``None`` if the status has no valid position.
+        """
+
+        state = self._state
+        with state.lock:
+            if state.loaded:
+                state.put(instance_id, position)
+
+    def discard(self, instance_ids: Iterable[int]) -> None:
+        """
+        Forget deleted instances.
+
+        Parameters
+        ----------
+        instance_ids
+            IDs of the instances whose deletion was committed.
+        """
+
+        state = self._state
+        with state.lock:
+            if state.loaded:
+                for instance_id in instance_ids:
+                    state.put(instance_id, None)
+
+    def clear(self) -> None:
+        """Forget every instance, e.g. after ``delete_all``."""
+
+        state = self._state
+        with state.lock:
+            state.positions.clear()
+            state.cells.clear()
+
+    def near(self, latitude: float, longitude: float, radius: float) -> list[tuple[int, float, float, float]]:
+        """
+        Return the instances within ``radius`` metres of a position, nearest first.
+
+        Parameters
+        ----------
+        latitude
+            Latitude of the centre in degrees.
+        longitude
+            Longitude of the centre in degrees.
+        radius
+            Great-circle radius in metres.
+
+        Returns
+        -------
+        list[tuple[int, float, float, float]]
+            ``(instance_id, latitude, longitude, distance)`` per instance.
+        """
+
+        # the box around the circle: a cap of angular radius r spans asin(sin r / cos lat) of longitude
+        angle = min(radius / EARTH_RADIUS_M, math.pi)
+        south, north = latitude - math.degrees(angle), latitude + math.degrees(angle)
+        ratio = math.sin(angle) / math.cos(math.radians(latitude)) if abs(latitude) < 90 else math.inf
+        polar = south <= -90 or north >= 90 or ratio >= 1
+        spread = 180.0 if polar else math.degrees(math.asin(ratio))
+
+        state = self._state
+        self._ensure_loaded(state)
+        with state.lock:
+            instance_ids = np.fromiter(
+                {
+                    instance_id
+                    for west, east in _longitude_ranges(longitude - spread, longitude + spread)
+                    for instance_id in state.candidates(max(south, -90.0), west, min(north, 90.0), east)
+                },
+                dtype=np.int64,
+            )
+            positions = np.array([state.positions[instance_id] for instance_id in instance_ids.tolist()]).reshape(-1, 2)
+
+        # exact haversine distance for the candidates only
+        latitudes, longitudes = np.radians(positions[:, 0]), np.radians(positions[:, 1])
+        centre_latitude, centre_longitude = math.radians(latitude), math.radians(longitude)
+        half_chord = (
+            np.sin((latitudes - centre_latitude) / 2) ** 2
+            + math.cos(centre_latitude) * np.cos(latitudes) * np.sin((longitudes - centre_longitude) / 2) ** 2
+        )
+        distances = 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(half_chord, 0.0, 1.0)))
+
+        order = np.lexsort((instance_ids, distances))
+        return [
+            (int(instance_ids[i]), float(positions[i, 0]), float(positions[i, 1]), float(distances[i]))
+            for i in order
+            if distances[i] <= radius
+        ]
+
+    def within(self, south: float, west: float, north: float, east: float) -> list[tuple[int, float, float]]:
+        """
+        Return the instances inside a latitude / longitude box, by ID.
+
+        Parameters
+        ----------
+        south, west, north, east
+            The box edges in degrees; ``west > east`` is a box across the antimeridian.
+
+        Returns
+        -------
+        list[tuple[int, float, float]]
+            ``(instance_id, latitude, longitude)`` per instance.
+        """
+
+        ranges = _longitude_ranges(west, east)
+
+        state = self._state
+        self._ensure_loaded(state)
+        with state.lock:
+            found = {
+                instance_id: state.positions[instance_id]
+                for range_west, range_east in ranges
+                for instance_id in state.candidates(south, range_west, north, range_east)
+            }
+
+        return [
+            (instance_id, latitude, longitude)
+            for instance_id, (latitude, longitude) in sorted(found.items())
+            if south <= latitude <= north and any(range_west <= longitude <= range_east for range_west, range_east in ranges)
+        ]
+
+
+position_index = PositionIndex()
@@ -0,0 +1,126 @@
+"""
+Read an instance's latest position out of its free-form ``boat_status``.
+
+See `.github/instructions/python-source.instructions.md` #"Route geometry"
+and #"Position index" for how the field names are chosen.
+"""
+
+__all__ = ["DEFAULT_POSITION_FIELDS", "parse_position_fields", "position_fields", "status_number", "status_position"]
+
+import math
+from collections.abc import Mapping, Sequence
+
+from flask import current_app
+
+# boat_status keys holding the latitude and longitude, in degrees
+DEFAULT_POSITION_FIELDS = ("latitude", "longitude")
+
+
+def position_fields(fields: Sequence[str] | None = None) -> tuple[str, str]:
+    """
+    Return the ``boat_status`` keys of the latitude and longitude.
+
+    Parameters
+    ----------
+    fields
+        The instance's ``boat_status_position_fields``, if set.
+
+    Returns
+    -------
+    tuple[str, str]
+        ``fields``, else ``POSITION_FIELDS`` from the config, else ``DEFAULT_POSITION_FIELDS``.
+    """
+
+    latitude, longitude = fields or current_app.config.get("POSITION_FIELDS", DEFAULT_POSITION_FIELDS)
+    return latitude, longitude
+
+
+def parse_position_fields(data: object) -> list[str] | None:
+    """
+    Validate the position field names of a ``set_position_fields`` request.
+
+    Parameters
+    ----------
+    data
+        The decoded body, ``[latitude_key, longitude_key]`` or ``None`` to use ``POSITION_FIELDS``.
+
+    Returns
+    -------
+    list[str] | None
+        The two keys, or ``None``.
+
+    Raises
+    ------
+    TypeError
+        If the data is not ``None`` or a list of two non-empty strings.
+    ValueError
+        If both keys are the same.
+    """
+
+    if data is None:
+        return None
+
+    if not isinstance(data, list) or len(data) != 2 or not all(isinstance(field, str) and field for field in data):
+        raise TypeError("Invalid position fields. Expected [latitude_key, longitude_key] or null.")
+
+    if data[0] == data[1]:
+        raise ValueError("The latitude and longitude keys must differ.")
+
+    return list(data)
+
+
+def status_number(value: object, *, finite: bool = True) -> float | None:
+    """
+    Return a ``boat_status`` value as a float, if it is a number.
+
+    Parameters
+    ----------
+    value
+        The value, e.g. ``status.get(field)``.
+    finite
+        Whether NaN and infinities count as not a number. Anomaly detection passes ``False``
+        because it flags them.
+
+    Returns
+    -------
+    float | None
+        The value, or ``None`` if it is missing, a boolean, not an ``int`` / ``float``,
+        or not finite when ``finite`` is set.
+    """
+
+    if not isinstance(value, int | float) or isinstance(value, bool) or (finite and not math.isfinite(value)):
+        return None
+
+    return float(value)
+
+
+def status_position(status: Mapping[str, object], fields: Sequence[str] | None = None) -> tuple[float, float] | None:
+    """
+    Return the position in a boat status, if it has a valid one.
+
+    Parameters
+    ----------
+    status
+        The instance's ``boat_status``.
+    fields
+        The instance's ``boat_status_position_fields``; ``None`` for the config default.
+
+    Returns
+    -------
+    tuple[float, float] | None
+        ``(latitude, longitude)`` in degrees, or ``None`` if a field is missing, not a number,
+        not finite or out of range.
+    """
+
+    values = []
+    for field in position_fields(fields):
+        value = status_number(status.get(field))
+        if value is None:
+            return None
+        values.append(value)
+
+    latitude, longitude = values
+    if abs(latitude) > 90 or abs(longitude) > 180:
+        return None
+
+    return latitude, longitude
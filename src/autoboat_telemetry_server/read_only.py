@@ -0,0 +1,119 @@
+"""
+Read-only SQLite engines and session for lock-free read routes.
+
+See `.github/instructions/python-source.instructions.md` #"Read-only session"
+for why read routes can skip the shared lock and what they must not do.
+"""
+
+__all__ = ["ReadOnlyDatabase", "read_db"]
+
+import sqlite3
+from collections.abc import Mapping
+from functools import partial
+from pathlib import Path
+
+from flask import Flask, current_app
+from flask.globals import app_ctx
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from autoboat_telemetry_server.models import db
+
+# default pool size per bind; see python-source.instructions.md#Read-only session
+DEFAULT_READ_ONLY_POOL_SIZE = 8
+
+
+def _connect_read_only(database: str) -> sqlite3.Connection:
+    """
+    Open ``database`` with ``mode=ro`` and ``query_only`` set.
+
+    ``query_only`` is set here, before SQLAlchemy's connect listeners run, so
+    ``models._set_sqlite_pragmas`` can tell it is on a read-only connection.
+
+    Parameters
+    ----------
+    database
+        Filesystem path of the SQLite database.
+
+    Returns
+    -------
+    sqlite3.Connection
+        The read-only DBAPI connection.
+    """
+
+    connection = sqlite3.connect(f"{Path(database).resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False)
+    connection.execute("PRAGMA query_only=ON")
+    return connection
+
+
+def _app_ctx_id() -> int:
+    """Scope sessions to the current app context, like Flask-SQLAlchemy's ``db.session``."""
+
+    return id(app_ctx._get_current_object())
+
+
+class _ReadOnlyState:
+    """Per-app engines and scoped session, stored in ``app.extensions["read_only_db"]``."""
+
+    def __init__(self, engines: dict[str | None, Engine], session: scoped_session) -> None:
+        self.engines = engines
+        self.session = session
+
+
+class ReadOnlyDatabase:
+    """
+    A second set of engines, one per bind, that can only read.
+
+    Each engine has its own connection pool, so read routes never wait for a
+    connection held by a writer, and ``mode=ro`` + ``query_only`` make any
+    accidental write fail instead of racing the write lock.
+    """
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Create the read-only engines for every bind of ``db`` and register session teardown.
+
+        Must be called after ``db.init_app(app)``.
+
+        Parameters
+        ----------
+        app
+            The Flask app.
+        """
+
+        pool_size = int(app.config.get("READ_ONLY_POOL_SIZE", DEFAULT_READ_ONLY_POOL_SIZE))
+        with app.app_context():
+            engines: dict[str | None, Engine] = {
+                bind_key: create_engine(
+                    "sqlite://",
+                    creator=partial(_connect_read_only, engine.url.database),
+                    poolclass=QueuePool,
+                    pool_size=pool_size,
+                    max_overflow=pool_size,
+                )
+                for bind_key, engine in db.engines.items()
+            }
+
+        binds = {table: engines[bind_key] for bind_key, metadata in db.metadatas.items() for table in metadata.tables.values()}
+        session = scoped_session(sessionmaker(binds=binds, autoflush=False), scopefunc=_app_ctx_id)
+        app.extensions["read_only_db"] = _ReadOnlyState(engines, session)
+
+        @app.teardown_appcontext
+        def _remove_read_only_session(_exc: BaseException | None) -> None:
+            session.remove()
+
+    @property
+    def session(self) -> scoped_session:
+        """The current app's read-only session, scoped to the app context."""
+
+        return current_app.extensions["read_only_db"].session
+
+    @property
+    def engines(self) -> Mapping[str | None, Engine]:
+        """The current app's read-only engines, keyed like ``db.engines``."""
+
+        return current_app.extensions["read_only_db"].engines
+
+
+read_db = ReadOnlyDatabase()
@@ -0,0 +1,220 @@
+"""
+Process-local rolling min / max / mean / standard deviation of each numeric boat status field.
+
+See `.github/instructions/python-source.instructions.md` #"Rolling statistics"
+for the windows, how buckets keep memory constant and which fields are tracked.
+"""
+
+__all__ = ["DEFAULT_STATS_WINDOW", "MAX_STATS_FIELDS", "STATS_WINDOWS", "WINDOW_BUCKETS", "RollingStats", "rolling_stats"]
+
+import math
+import threading
+import time
+from collections import deque
+from collections.abc import Iterable, Mapping
+
+from flask import Flask, current_app
+
+from autoboat_telemetry_server.positions import status_number
+
+# window name -> length in seconds
+STATS_WINDOWS = {"10s": 10.0, "1min": 60.0, "10min": 600.0}
+DEFAULT_STATS_WINDOW = "1min"
+
+# buckets per window; a window covers its current bucket and the nine before it
+WINDOW_BUCKETS = 10
+
+# fields tracked per instance, so a free-form status cannot grow the aggregates without bound
+MAX_STATS_FIELDS = 64
+
+# seconds; monotonic so a wall clock step cannot reorder buckets
+_clock = time.monotonic
+
+
+class _Bucket:
+    """Welford aggregate and extremes of the values in one slice of a window."""
+
+    __slots__ = ("count", "index", "m2", "maximum", "mean", "minimum")
+
+    def __init__(self, index: int) -> None:
+        self.index = index
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+
+class _Window:
+    """The last ``WINDOW_BUCKETS`` buckets of one field; the oldest falls off as a new one starts."""
+
+    __slots__ = ("buckets", "width")
+
+    def __init__(self, seconds: float) -> None:
+        self.width = seconds / WINDOW_BUCKETS
+        self.buckets: deque[_Bucket] = deque(maxlen=WINDOW_BUCKETS)
+
+    def add(self, now: float, value: float) -> None:
+        index = math.floor(now / self.width)
+        if not self.buckets or self.buckets[-1].index != index:
+            self.buckets.append(_Bucket(index))
+        self.buckets[-1].add(value)
+
+    def summary(self, now: float) -> dict[str, float] | None:
+        first = math.floor(now / self.width) - WINDOW_BUCKETS + 1
+        count, mean, m2 = 0, 0.0, 0.0
+        minimum, maximum = math.inf, -math.inf
+        for bucket in self.buckets:
+            if bucket.index < first:
+                continue
+
+            # chan et al.: merge two welford aggregates exactly
+            total = count + bucket.count
+            delta = bucket.mean - mean
+            mean += delta * bucket.count / total
+            m2 += bucket.m2 + delta * delta * count * bucket.count / total
+            count = total
+            minimum = min(minimum, bucket.minimum)
+            maximum = max(maximum, bucket.maximum)
+
+        if not count:
+            return None
+
+        return {"count": count, "min": minimum, "max": maximum, "mean": mean, "stddev": math.sqrt(max(m2, 0.0) / count)}
+
+
+class _StatsState:
+    """Per-app aggregates, stored in ``app.extensions["rolling_stats"]``."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        # instance_id -> field -> one window per STATS_WINDOWS entry
+        self.instances: dict[int, dict[str, tuple[_Window, ...]]] = {}
+
+
+class RollingStats:
+    """
+    Rolling aggregates of every instance's numeric status fields since the server started.
+
+    Status routes call ``update`` after they commit, and delete paths call ``discard`` / ``clear``.
+    """
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Register empty aggregates for ``app``.
+
+        Parameters
+        ----------
+        app
+            The Flask app.
+        """
+
+        app.extensions["rolling_stats"] = _StatsState()
+
+    @property
+    def _state(self) -> _StatsState:
+        return current_app.extensions["rolling_stats"]
+
+    def update(self, instance_id: int, status: Mapping[str, object], fields: Iterable[str] | None = None) -> None:
+        """
+        Add a committed boat status to its instance's aggregates.
+
+        Parameters
+        ----------
+        instance_id
+            The instance whose boat status was written.
+        status
+            The stored ``boat_status``.
+        fields
+            The fields to track, from ``boat_status_mapping``; ``None`` tracks every numeric field.
+            Non-numeric and non-finite values are skipped.
+        """
+
+        now = _clock()
+        values = [
+            (field, number)
+            for field in (status if fields is None else fields)
+            if (number := status_number(status.get(field))) is not None
+        ]
+
+        state = self._state
+        with state.lock:
+            aggregates = state.instances.setdefault(instance_id, {})
+            for field, value in values:
+                windows = aggregates.get(field)
+                if windows is None:
+                    if len(aggregates) >= MAX_STATS_FIELDS:
+                        continue
+                    windows = aggregates[field] = tuple(_Window(seconds) for seconds in STATS_WINDOWS.values())
+
+                for window in windows:
+                    window.add(now, value)
+
+    def summary(self, instance_id: int, window: str = DEFAULT_STATS_WINDOW) -> dict[str, dict[str, float]]:
+        """
+        Return the aggregates of an instance's fields over one window.
+
+        Parameters
+        ----------
+        instance_id
+            The instance whose aggregates to return.
+        window
+            A ``STATS_WINDOWS`` name.
+
+        Returns
+        -------
+        dict[str, dict[str, float]]
+            ``{field: {"count", "min", "max", "mean", "stddev"}}`` for each field with a value in the window;
+            ``stddev`` is the population standard deviation.
+
+        Raises
+        ------
+        ValueError
+            If the window is not a ``STATS_WINDOWS`` name.
+        """
+
+        if window not in STATS_WINDOWS:
+            raise ValueError(f"'window' must be one of {', '.join(STATS_WINDOWS)}.")
+
+        position = list(STATS_WINDOWS).index(window)
+        now = _clock()
+
+        state = self._state
+        with state.lock:
+            aggregates = state.instances.get(instance_id, {})
+            summaries = {field: windows[position].summary(now) for field, windows in aggregates.items()}
+
+        return {field: summary for field, summary in summaries.items() if summary is not None}
+
+    def discard(self, instance_ids: Iterable[int]) -> None:
+        """
+        Forget the aggregates of deleted instances.
+
+        Parameters
+        ----------
+        instance_ids
+            IDs of the instances whose deletion was committed.
+        """
+
+        state = self._state
+        with state.lock:
+            for instance_id in instance_ids:
+                state.instances.pop(instance_id, None)
+
+    def clear(self) -> None:
+        """Forget every aggregate, e.g. after ``delete_all``."""
+
+        state = self._state
+        with state.lock:
+            state.instances.clear()
+
+
+rolling_stats = RollingStats()
@@ -0,0 +1,278 @@
+"""
+Great-circle geometry of a waypoint route, precomputed once per list of waypoints.
+
+See `.github/instructions/python-source.instructions.md` #"Route geometry"
+for the per-leg arrays, the segment index and the cache key.
+"""
+
+__all__ = ["DEFAULT_ROUTE_GEOMETRY_CACHE_SIZE", "EARTH_RADIUS_M", "SEGMENT_BLOCK_SIZE", "GeometryCache", "RouteGeometry"]
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from autoboat_telemetry_server.waypoint_storage import WAYPOINT_DTYPE, WaypointArray
+
+# mean earth radius (IUGG), in metres
+EARTH_RADIUS_M = 6_371_008.8
+
+# legs per block of the segment index; routes with fewer legs are searched in one pass
+SEGMENT_BLOCK_SIZE = 16
+
+# route geometries kept per process
+DEFAULT_ROUTE_GEOMETRY_CACHE_SIZE = 128
+
+
+def _unit_vectors(points: WaypointArray) -> WaypointArray:
+    """Return the ``(n, 3)`` earth-centred unit vectors of ``(n, 2)`` latitude / longitude degrees."""
+
+    latitude, longitude = np.radians(points[:, 0]), np.radians(points[:, 1])
+    cos_latitude = np.cos(latitude)
+    return np.column_stack((cos_latitude * np.cos(longitude), cos_latitude * np.sin(longitude), np.sin(latitude)))
+
+
+def _angle(u: WaypointArray, v: WaypointArray) -> WaypointArray:
+    """Return the angle in radians between unit vectors, row by row; stable for tiny and near-antipodal angles."""
+
+    return np.arctan2(np.linalg.norm(np.cross(u, v), axis=-1), np.einsum("...i,...i->...", u, v))
+
+
+def _bearing(start: WaypointArray, end: WaypointArray) -> WaypointArray:
+    """Return the initial great-circle bearing in degrees [0, 360) from ``start`` to ``end`` latitude / longitude rows."""
+
+    latitude_1, latitude_2 = np.radians(start[..., 0]), np.radians(end[..., 0])
+    delta_longitude = np.radians(end[..., 1] - start[..., 1])
+    y = np.sin(delta_longitude) * np.cos(latitude_2)
+    x = np.cos(latitude_1) * np.sin(latitude_2) - np.sin(latitude_1) * np.cos(latitude_2) * np.cos(delta_longitude)
+    return np.degrees(np.arctan2(y, x)) % 360.0
+
+
+class RouteGeometry:
+    """
+    Per-leg distances, bearings and cumulative distance of a route, plus a segment index.
+
+    Leg ``i`` runs from waypoint ``i`` to waypoint ``i + 1``. Distances are in metres and bearings
+    in degrees clockwise from true north.
+
+    Parameters
+    ----------
+    points
+        Validated ``(n, 2)`` waypoints, ``n >= 2``.
+    """
+
+    def __init__(self, points: WaypointArray) -> None:
+        self.points = np.array(points, dtype=WAYPOINT_DTYPE).reshape(-1, 2)
+        self._vectors = _unit_vectors(self.points)
+
+        start, end = self._vectors[:-1], self._vectors[1:]
+        self._leg_angles = _angle(start, end)
+        self.leg_distances = self._leg_angles * EARTH_RADIUS_M
+        self.leg_bearings = _bearing(self.points[:-1], self.points[1:])
+        self.cumulative_distances = np.concatenate(([0.0], np.cumsum(self.leg_distances)))
+
+        # unit normal of each leg's great circle; zero for a zero-length leg
+        normals = np.cross(start, end)
+        lengths = np.linalg.norm(normals, axis=1)
+        self._has_normal = lengths > 0
+        self._normals = np.divide(normals, lengths[:, None], out=np.zeros_like(normals), where=self._has_normal[:, None])
+
+        # one bounding cap (centre, angular radius) per block of legs, and each leg's block
+        self._leg_blocks = np.arange(self.leg_count) // SEGMENT_BLOCK_SIZE
+        centres, radii = [], []
+        for first in range(0, self.leg_count, SEGMENT_BLOCK_SIZE):
+            block = self._vectors[first : first + SEGMENT_BLOCK_SIZE + 1]
+            centre = block.sum(axis=0)
+            norm = np.linalg.norm(centre)
+            centre = centre / norm if norm > 0 else block[0]
+            radius = float(_angle(block, centre).max())
+            centres.append(centre)
+            # a cap of 90 degrees or more does not contain its great-circle arcs, so it cannot prune
+            radii.append(radius if radius < np.pi / 2 else np.pi)
+        self._block_centres = np.array(centres)
+        self._block_radii = np.array(radii)
+
+    @property
+    def leg_count(self) -> int:
+        """Return the number of legs, one less than the number of waypoints."""
+
+        return len(self.points) - 1
+
+    @property
+    def total_distance(self) -> float:
+        """Return the length of the whole route in metres."""
+
+        return float(self.cumulative_distances[-1])
+
+    def legs(self) -> dict[str, Any]:
+        """
+        Return the per-leg arrays as JSON-ready lists.
+
+        Returns
+        -------
+        dict[str, Any]
+            ``{"distance", "bearing", "cumulative_distance", "total_distance"}``; ``cumulative_distance[i]``
+            is the distance from the first waypoint to the start of leg ``i``.
+        """
+
+        return {
+            "distance": self.leg_distances.tolist(),
+            "bearing": self.leg_bearings.tolist(),
+            "cumulative_distance": self.cumulative_distances[:-1].tolist(),
+            "total_distance": self.total_distance,
+        }
+
+    def _nearest_among(self, position: WaypointArray, legs: npt.NDArray[np.intp]) -> tuple[int, float, float]:
+        """
+        Find the leg among ``legs`` (ascending indexes) closest to ``position``, in one vectorized pass.
+
+        Returns
+        -------
+        tuple[int, float, float]
+            The leg index, the angular distance to it and the angle along it to the closest point.
+        """
+
+        start, end, normals = self._vectors[legs], self._vectors[legs + 1], self._normals[legs]
+        sine = normals @ position
+
+        # the closest point of each great circle lies within the leg iff it is on the inner side of both ends
+        projected = position - sine[:, None] * normals
+        inside = (
+            self._has_normal[legs]
+            & (np.einsum("ij,ij->i", np.cross(start, projected), normals) >= 0)
+            & (np.einsum("ij,ij->i", np.cross(projected, end), normals) >= 0)
+        )
+
+        to_start, to_end = _angle(start, position), _angle(end, position)
+        distances = np.where(inside, np.abs(np.arcsin(np.clip(sine, -1.0, 1.0))), np.minimum(to_start, to_end))
+        along = np.where(inside, _angle(start, projected), np.where(to_start <= to_end, 0.0, self._leg_angles[legs]))
+
+        # argmin takes the first of equal distances, so ties go to the earlier leg
+        closest = int(np.argmin(distances))
+        return int(legs[closest]), float(distances[closest]), float(along[closest])
+
+    def nearest_leg(self, latitude: float, longitude: float) -> tuple[int, float]:
+        """
+        Find the leg closest to a position, skipping blocks of legs with the segment index.
+
+        Parameters
+        ----------
+        latitude
+            Latitude in degrees.
+        longitude
+            Longitude in degrees.
+
+        Returns
+        -------
+        tuple[int, float]
+            The leg index and the distance along it, in metres, to the point closest to the position.
+        """
+
+        position = _unit_vectors(np.array([[latitude, longitude]], dtype=WAYPOINT_DTYPE))[0]
+
+        # every leg of a block is within [centre - radius, centre + radius] of the position, so a block whose
+        # lower bound is past the smallest upper bound cannot hold the closest leg
+        to_centres = _angle(self._block_centres, position)
+        candidates = np.maximum(to_centres - self._block_radii, 0.0) <= (to_centres + self._block_radii).min()
+        legs = np.flatnonzero(candidates[self._leg_blocks])
+
+        leg, _, along = self._nearest_among(position, legs)
+        return leg, along * EARTH_RADIUS_M
+
+    def progress(self, latitude: float, longitude: float) -> dict[str, Any]:
+        """
+        Locate a position on the route.
+
+        Parameters
+        ----------
+        latitude
+            Latitude in degrees.
+        longitude
+            Longitude in degrees.
+
+        Returns
+        -------
+        dict[str, Any]
+            ``leg``, ``cross_track_error`` (metres from the leg's great circle, positive to the right of
+            the direction of travel), ``distance_along_leg``, ``distance_to_next_waypoint``,
+            ``bearing_to_next_waypoint``, ``leg_bearing``, ``distance_remaining`` and ``total_distance``.
+        """
+
+        leg, along = self.nearest_leg(latitude, longitude)
+        position = np.array([latitude, longitude], dtype=WAYPOINT_DTYPE)
+        vector = _unit_vectors(position[None, :])[0]
+
+        cross_track = -float(np.arcsin(np.clip(self._normals[leg] @ vector, -1.0, 1.0))) * EARTH_RADIUS_M
+        to_next = max(float(self.leg_distances[leg]) - along, 0.0)
+
+        return {
+            "leg": leg,
+            "cross_track_error": cross_track,
+            "distance_along_leg": along,
+            "distance_to_next_waypoint": to_next,
+            "bearing_to_next_waypoint": float(_bearing(position, self.points[leg + 1])),
+            "leg_bearing": float(self.leg_bearings[leg]),
+            "distance_remaining": to_next + self.total_distance - float(self.cumulative_distances[leg + 1]),
+            "total_distance": self.total_distance,
+        }
+
+
+class GeometryCache:
+    """
+    Thread-safe LRU of route geometries keyed by a digest of the packed waypoints.
+
+    Parameters
+    ----------
+    maxsize
+        Maximum number of geometries kept; the least recently used is evicted first.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_ROUTE_GEOMETRY_CACHE_SIZE) -> None:
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+        self._geometries: OrderedDict[bytes, RouteGeometry] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached geometries."""
+
+        return len(self._geometries)
+
+    def get(self, packed: bytes) -> RouteGeometry:
+        """
+        Return the geometry of the packed waypoints, computing and caching it on a miss.
+
+        Parameters
+        ----------
+        packed
+            Little-endian float64 ``latitude, longitude`` pairs, as from ``get_packed``; at least two waypoints.
+
+        Returns
+        -------
+        RouteGeometry
+            The route's geometry.
+        """
+
+        key = hashlib.blake2b(packed, digest_size=16).digest()
+        with self._lock:
+            geometry = self._geometries.get(key)
+            if geometry is not None:
+                self._geometries.move_to_end(key)
+                self.hits += 1
+                return geometry
+
+            self.misses += 1
+
+        # computed outside the lock; two threads missing together both compute the same result
+        geometry = RouteGeometry(np.frombuffer(packed, dtype=WAYPOINT_DTYPE).reshape(-1, 2))
+        with self._lock:
+            self._geometries[key] = geometry
+            self._geometries.move_to_end(key)
+            while len(self._geometries) > self._maxsize:
+                self._geometries.popitem(last=False)
+
+        return geometry
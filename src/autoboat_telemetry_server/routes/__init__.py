@@ -11,13 +11,19 @@ Autopilot Routes:
 - `/autopilot_parameters/get_hash_description/<config_hash>`: Get the description for a specific configuration hash.
 - `/autopilot_parameters/get_all_hashes`: Get all stored autopilot configuration hashes.
 - `/autopilot_parameters/get_hash_exists/<config_hash>`: Check if a specific configuration hash exists.
+- `/autopilot_parameters/history/<int:instance_id>?since=&until=&limit=&at=`: Get the logged parameter changes of an instance, or its parameters at a point in time.
+- `/autopilot_parameters/diff/<hash_a>/<hash_b>`: Get the added, removed and changed parameters between two configuration hashes.
+- `/autopilot_parameters/diff_instance/<int:instance_id>/<config_hash>`: Get the parameters of an instance that differ from a configuration's defaults.
 - `/autopilot_parameters/set/<int:instance_id>`: Set the autopilot parameters from the request data.
 - `autopilot_parameters/update_existing_parameter/<int:instance_id>/<parameter_key>`: Update an existing autopilot parameter with a new value from the request data.
+- `/autopilot_parameters/broadcast`: Set or update the autopilot parameters of many instances (by ID, user or name prefix) in one transaction.
 - `/autopilot_parameters/set_default/<int:instance_id>`: Set the default autopilot parameters from the request data.
 - `/autopilot_parameters/set_hash_description/<config_hash>/<description>`: Set the description for a specific configuration hash.
 - `/autopilot_parameters/set_default_from_hash/<int:instance_id>/<config_hash>`: Set the default autopilot parameters using a stored configuration hash.
 - `/autopilot_parameters/create_config`: Create a new autopilot configuration from the request data.
 - `/autopilot_parameters/delete_config/<config_hash>`: Delete a stored autopilot configuration hash.
+- `/autopilot_parameters/export`: Stream every stored configuration as NDJSON.
+- `/autopilot_parameters/import`: Import configurations from a streamed NDJSON body in chunked transactions.
 
 Boat Status Routes:
 - `/boat_status/test`: Test route for boat status.
@@ -26,16 +32,36 @@ Boat Status Routes:
 - `/boat_status/set/<int:instance_id>`: Set the boat status from the request data.
 - `/boat_status/set_fast/<int:instance_id>`: Set the boat status using a list of values corresponding to the boat status mapping for the instance.
 - `/boat_status/set_mapping/<int:instance_id>`: Set the boat status mapping for an instance using a list of keys corresponding to the boat status mapping for the instance.
+- `/boat_status/set_position_fields/<int:instance_id>`: Set which boat status fields hold the latitude and longitude.
+- `/boat_status/near?lat=&lon=&radius=`: Get the instances whose latest position is within a radius (metres), nearest first.
+- `/boat_status/bbox?south=&west=&north=&east=`: Get the instances whose latest position is inside a latitude / longitude box.
+- `/boat_status/track/<int:instance_id>?tolerance=`: Get the positions an instance has reported, simplified to a tolerance (metres).
+- `/boat_status/stats/<int:instance_id>?window=`: Get the rolling min / max / mean / stddev of each numeric status field over 10s, 1min or 10min.
+- `/boat_status/anomalies/<int:instance_id>`: Get the non-finite, jump and stuck value anomalies detected on each status field.
+- `/boat_status/get_geofences/<int:instance_id>`: Get the geofences of an instance and whether its latest position violates each.
+- `/boat_status/add_geofence/<int:instance_id>`: Add a keep-in or keep-out polygon checked on every boat status write.
+- `/boat_status/delete_geofence/<int:instance_id>/<int:geofence_id>`: Delete a geofence.
+- `/boat_status/get_alert_rules[/<int:instance_id>]`: Get the global alert rules, plus an instance's own rules and whether each is firing.
+- `/boat_status/add_alert_rule[/<int:instance_id>]`: Add a threshold rule, e.g. `battery_voltage < 11.2 for 5s`, for an instance or for every instance.
+- `/boat_status/delete_alert_rule/<int:rule_id>`: Delete an alert rule.
 
 Waypoint Routes:
 - `/waypoints/test`: Test route for waypoints.
 - `/waypoints/get/<int:instance_id>`: Get the current waypoints.
-- `/waypoints/get_new/<int:instance_id>`: Get the latest waypoints for
+- `/waypoints/get_new/<int:instance_id>?since=`: Get the latest waypoints if they haven't been seen yet, or only the edit operations since a version.
+- `/waypoints/get_fast/<int:instance_id>`: Get the current waypoints as packed little-endian float64 latitude / longitude pairs.
 - `/waypoints/set/<int:instance_id>`: Set the waypoints from the request data.
+- `/waypoints/set_fast/<int:instance_id>`: Set the waypoints from a packed little-endian float64 request body.
+- `/waypoints/edit/<int:instance_id>`: Apply insert, delete, move and replace operations to the waypoints as one new version.
+- `/waypoints/legs/<int:instance_id>`: Get the great-circle distance, bearing and cumulative distance of every leg of the route.
+- `/waypoints/progress/<int:instance_id>?lat=&lon=`: Get the current leg, cross-track error and distance remaining for the latest position.
+- `/waypoints/broadcast`: Set the same waypoints on many instances (by ID, user or name prefix) in one transaction.
 
 Instance Manager Routes:
 - `/instance_manager/test`: Test route for instance management.
 - `/instance_manager/create`: Create a new telemetry instance.
+- `/instance_manager/create_many?n=<count>[&config_hash=<hash>]`: Create `count` telemetry instances in one transaction,
+  optionally all on one stored config.
 - `/instance_manager/delete/<int:instance_id>`: Delete a telemetry instance by its ID.
 - `/instance_manager/delete_all`: Delete all telemetry instances.
 - `/instance_manager/clean_instances`: Remove all telemetry instances which haven't been marked for keeping.
@@ -47,12 +73,20 @@ Instance Manager Routes:
 - `/instance_manager/get_diagnostic_message/<int:instance_id>`: Get the diagnostic message for a telemetry instance.
 - `/instance_manager/get_id/<instance_name>`: Get the ID of a telemetry instance by its name.
 - `/instance_manager/get_instance_info/<int:instance_id>`: Get detailed information about a telemetry instance.
-- `/instance_manager/get_all_instance_info`: Get detailed information about all telemetry instances.
+- `/instance_manager/get_all_instance_info?user=&name_prefix=&config_hash=&active_since=&limit=&after=`: Get detailed information about telemetry instances, newest first, filtered and keyset-paginated (`X-Next-Cursor` header).
 - `/instance_manager/get_ids`: Return all telemetry instance IDs.
+- `/instance_manager/export`: Stream the full state of every telemetry instance as NDJSON.
+- `/instance_manager/import`: Create telemetry instances from a streamed NDJSON body in chunked transactions.
+
+Admin Routes:
+- `/admin/test`: Test route for admin.
+- `/admin/maintenance`: Get the schedule and last outcome of every maintenance job.
+- `/admin/maintenance/run/<job_name>`: Run a maintenance job (checkpoint, vacuum, optimize, clean-up) now.
 """  # noqa: E501
 
-__all__ = ["AutopilotParametersEndpoint", "BoatStatusEndpoint", "InstanceManagerEndpoint", "WaypointEndpoint"]
+__all__ = ["AdminEndpoint", "AutopilotParametersEndpoint", "BoatStatusEndpoint", "InstanceManagerEndpoint", "WaypointEndpoint"]
 
+from .admin import AdminEndpoint
 from .autopilot_parameters import AutopilotParametersEndpoint
 from .boat_status import BoatStatusEndpoint
 from .instance_manager import InstanceManagerEndpoint
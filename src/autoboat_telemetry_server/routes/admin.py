@@ -0,0 +1,118 @@
+import time
+from typing import Literal
+
+from flask import Blueprint, current_app, jsonify
+
+from autoboat_telemetry_server.maintenance import MaintenanceScheduler
+from autoboat_telemetry_server.models import db
+from autoboat_telemetry_server.types import ResponseType
+
+
+class AdminEndpoint:
+    """Endpoint for on-demand database housekeeping."""
+
+    def __init__(self) -> None:
+        self._blueprint = Blueprint(name="admin_page", import_name=__name__, url_prefix="/admin")
+        self._register_routes()
+
+    @property
+    def blueprint(self) -> Blueprint:
+        """Returns the Flask blueprint for admin routes."""
+
+        return self._blueprint
+
+    def _get_scheduler(self) -> MaintenanceScheduler:
+        """
+        Helper function to retrieve the app's maintenance scheduler.
+
+        Returns
+        -------
+        MaintenanceScheduler
+            The scheduler registered by ``maintenance.init_app``.
+        """
+
+        return current_app.extensions["maintenance"]
+
+    def _register_routes(self) -> str:
+        """
+        Registers the routes for the admin endpoint.
+
+        Returns
+        -------
+        str
+            Confirmation message indicating the routes have been registered successfully.
+        """
+
+        @self._blueprint.route("/test", methods=["GET"])
+        def test_route() -> Literal["admin route testing!"]:
+            """
+            Test route for admin.
+
+            Method: GET
+
+            Returns
+            -------
+            Literal["admin route testing!"]
+                Confirmation message for testing the admin route.
+            """
+
+            return "admin route testing!"
+
+        @self._blueprint.route("/maintenance", methods=["GET"])
+        def get_maintenance_route() -> ResponseType:
+            """
+            Get the schedule and last outcome of every maintenance job.
+
+            Method: GET
+
+            Returns
+            -------
+            ResponseType
+                A tuple containing a JSON response with whether this process is the maintenance leader
+                and a list of jobs with their interval and last run time, duration, rows affected and error.
+            """
+
+            try:
+                scheduler = self._get_scheduler()
+                return jsonify({"leader": scheduler.is_leader, "jobs": scheduler.job_status()}), 200
+
+            except Exception as e:
+                return jsonify(str(e)), 500
+
+        # no lock decorator: jobs take the write lock themselves (blocking), see
+        # .github/instructions/python-source.instructions.md#Maintenance scheduler
+        @self._blueprint.route("/maintenance/run/<job_name>", methods=["POST"])
+        def run_maintenance_route(job_name: str) -> ResponseType:
+            """
+            Run a maintenance job now, regardless of its schedule.
+
+            Method: POST
+
+            Parameters
+            ----------
+            job_name
+                The job to run, e.g. ``wal_checkpoint``, ``wal_checkpoint_truncate``,
+                ``incremental_vacuum``, ``convert_auto_vacuum``, ``optimize`` or ``clean_instances``.
+
+            Returns
+            -------
+            ResponseType
+                A tuple containing a JSON response with the job name, rows affected and duration,
+                or an error message if the job does not exist or fails.
+            """
+
+            try:
+                start = time.perf_counter()
+                rows_affected = self._get_scheduler().run_job(job_name)
+                return jsonify(
+                    {"job": job_name, "rows_affected": rows_affected, "duration_seconds": time.perf_counter() - start}
+                ), 200
+
+            except TypeError as e:
+                return jsonify(str(e)), 404
+
+            except Exception as e:
+                db.session.rollback()
+                return jsonify(str(e)), 500
+
+        return f"admin paths registered successfully: {self._blueprint.url_prefix}"
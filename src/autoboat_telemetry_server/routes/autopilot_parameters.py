@@ -1,13 +1,45 @@
 import json
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 from datetime import datetime
 from typing import Literal, cast
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
 
 from autoboat_telemetry_server import shared_lock_manager
+from autoboat_telemetry_server.broadcast import BroadcastReport, target_clause
+from autoboat_telemetry_server.canonical import add_parameter, parameters_digest, remove_parameter
+from autoboat_telemetry_server.config_diff import DiffCache, diff_mappings
+from autoboat_telemetry_server.config_store import config_store
 from autoboat_telemetry_server.models import HashTable, TelemetryTable, db
-from autoboat_telemetry_server.types import ResponseType
+from autoboat_telemetry_server.ndjson import (
+    DEFAULT_EXPORT_BATCH_SIZE,
+    DEFAULT_IMPORT_CHUNK_SIZE,
+    NDJSON_MIMETYPE,
+    ImportReport,
+    chunked,
+    encode_line,
+    iter_records,
+)
+from autoboat_telemetry_server.parameter_history import list_changes, parse_timestamp, reconstruct, record_changes
+from autoboat_telemetry_server.parameter_storage import (
+    get_default_parameters,
+    get_parameters,
+    parameter_columns,
+    set_config,
+    set_parameters,
+)
+from autoboat_telemetry_server.read_only import read_db
+from autoboat_telemetry_server.types import AutopilotParametersType, ResponseType
+
+# description of a freshly created HashTable row
+DEFAULT_HASH_DESCRIPTION = "This hash does not have a description yet."
+
+# upper bound for /autopilot_parameters/history/<id>?limit=
+MAX_HISTORY_PAGE = 1000
+
+# default http cache lifetimes; see python-source.instructions.md#HTTP caching of config hashes
+DEFAULT_CONFIG_CACHE_MAX_AGE = 31536000
+DEFAULT_HASH_EXISTS_CACHE_MAX_AGE = 60
 
 
 class AutopilotParametersEndpoint:
@@ -15,6 +47,8 @@ class AutopilotParametersEndpoint:
 
     def __init__(self) -> None:
         self._blueprint = Blueprint(name="autopilot_parameters_page", import_name=__name__, url_prefix="/autopilot_parameters")
+        # keyed by content, so entries never go stale — see python-source.instructions.md#Config diff
+        self._diff_cache = DiffCache()
         self._register_routes()
 
     @property
@@ -23,7 +57,7 @@ class AutopilotParametersEndpoint:
 
         return self._blueprint
 
-    def _get_instance(self, instance_id: int) -> TelemetryTable:
+    def _get_instance(self, instance_id: int, *, read_only: bool = False) -> TelemetryTable:
         """
         Helper function to retrieve a telemetry instance by its ID.
 
@@ -31,6 +65,8 @@ class AutopilotParametersEndpoint:
         ----------
         instance_id
             The ID of the telemetry instance to retrieve.
+        read_only
+            Whether to load it through the lock-free read-only session.
 
         Returns
         -------
@@ -43,7 +79,8 @@ class AutopilotParametersEndpoint:
             If the instance with the given ID does not exist.
         """
 
-        instance = db.session.get(TelemetryTable, instance_id)
+        session = read_db.session if read_only else db.session
+        instance = session.get(TelemetryTable, instance_id)
 
         if not isinstance(instance, TelemetryTable):
             raise TypeError("Instance not found.")
@@ -52,7 +89,9 @@ class AutopilotParametersEndpoint:
 
     def _get_hash(self, config_hash: str) -> HashTable:
         """
-        Helper function to retrieve a hash table entry by its configuration hash.
+        Helper function to retrieve a hash table entry by its configuration hash, for writes.
+
+        Reads go through ``config_store`` instead.
 
         Parameters
         ----------
@@ -77,6 +116,62 @@ class AutopilotParametersEndpoint:
 
         return hash_entry
 
+    def _broadcast_parameters(
+        self,
+        instance: TelemetryTable,
+        new_parameters: AutopilotParametersType | None,
+        new_parameters_digest: str | None,
+        updates: AutopilotParametersType | None,
+    ) -> tuple[str, AutopilotParametersType, str]:
+        """
+        Work out one broadcast target's new parameters, applying the checks of ``set`` / ``update_existing_parameter``.
+
+        Parameters
+        ----------
+        instance
+            The target telemetry instance.
+        new_parameters
+            The full parameters being broadcast, or ``None`` for ``updates``.
+        new_parameters_digest
+            The digest of ``new_parameters``, computed once for every target.
+        updates
+            The existing keys being changed, or ``None`` for ``new_parameters``.
+
+        Returns
+        -------
+        tuple[str, AutopilotParametersType, str]
+            ``"updated"``, ``"unchanged"`` or the reason the instance is skipped,
+            then the full new parameters and their digest.
+        """
+
+        default_parameters = get_default_parameters(instance)
+        current_digest = instance.autopilot_parameters_digest
+
+        if new_parameters is not None and new_parameters_digest is not None:
+            if default_parameters and new_parameters.keys() != default_parameters.keys():
+                return "Autopilot parameters keys do not match the default configuration keys.", {}, current_digest
+
+            result = "unchanged" if new_parameters_digest == current_digest else "updated"
+            return result, new_parameters, new_parameters_digest
+
+        updates = updates or {}
+        if not default_parameters:
+            return "Default autopilot parameters must be set before updating individual parameters.", {}, current_digest
+
+        if not updates.keys() <= default_parameters.keys():
+            return "Parameter key does not exist in the default autopilot parameters.", {}, current_digest
+
+        # swap one term of the running digest per key — see python-source.instructions.md#Canonical encoding
+        parameters = get_parameters(instance)
+        new_digest = current_digest
+        for key, value in updates.items():
+            if key in parameters:
+                new_digest = remove_parameter(new_digest, key, parameters[key])
+            new_digest = add_parameter(new_digest, key, value)
+
+        result = "unchanged" if new_digest == current_digest else "updated"
+        return result, {**parameters, **updates}, new_digest
+
     def _register_routes(self) -> str:
         """
         Registers the routes for the autopilot parameters endpoint.
@@ -103,7 +198,6 @@ class AutopilotParametersEndpoint:
             return "autopilot_parameters route testing!"
 
         @self._blueprint.route("/get/<int:instance_id>", methods=["GET"])
-        @shared_lock_manager.require_read_lock
         def get_route(instance_id: int) -> ResponseType:
             """
             Get the current autopilot parameters.
@@ -119,12 +213,18 @@ class AutopilotParametersEndpoint:
             -------
             ResponseType
                 A tuple containing a JSON response with the autopilot parameters for the specified telemetry instance,
+                tagged with their running digest as a strong ETag (304 if ``If-None-Match`` matches),
                 or an error message if the instance is not found.
             """
 
             try:
-                telemetry_instance = self._get_instance(instance_id)
-                return jsonify(telemetry_instance.autopilot_parameters), 200
+                telemetry_instance = self._get_instance(instance_id, read_only=True)
+
+                # revalidate every time; the digest makes the 304 check O(1)
+                response = jsonify(get_parameters(telemetry_instance))
+                response.set_etag(telemetry_instance.autopilot_parameters_digest)
+                response.cache_control.no_cache = True
+                response.make_conditional(request)
 
             except TypeError as e:
                 return jsonify(str(e)), 404
@@ -132,6 +232,9 @@ class AutopilotParametersEndpoint:
             except Exception as e:
                 return jsonify(str(e)), 500
 
+            else:
+                return response, response.status_code
+
         @self._blueprint.route("/get_new/<int:instance_id>", methods=["GET"])
         @shared_lock_manager.require_write_lock
         def get_new_route(instance_id: int) -> ResponseType:
@@ -161,7 +264,7 @@ class AutopilotParametersEndpoint:
                 telemetry_instance.autopilot_parameters_new_flag = False
                 db.session.commit()
 
-                return jsonify(telemetry_instance.autopilot_parameters), 200
+                return jsonify(get_parameters(telemetry_instance)), 200
 
             except TypeError as e:
                 return jsonify(str(e)), 404
@@ -171,7 +274,6 @@ class AutopilotParametersEndpoint:
                 return jsonify(str(e)), 500
 
         @self._blueprint.route("/get_default/<int:instance_id>", methods=["GET"])
-        @shared_lock_manager.require_read_lock
         def get_default_route(instance_id: int) -> ResponseType:
             """
             Get the default autopilot parameters.
@@ -191,8 +293,8 @@ class AutopilotParametersEndpoint:
             """
 
             try:
-                telemetry_instance = self._get_instance(instance_id)
-                return jsonify(telemetry_instance.default_autopilot_parameters), 200
+                telemetry_instance = self._get_instance(instance_id, read_only=True)
+                return jsonify(get_default_parameters(telemetry_instance)), 200
 
             except TypeError as e:
                 return jsonify(str(e)), 404
@@ -201,7 +303,6 @@ class AutopilotParametersEndpoint:
                 return jsonify(str(e)), 500
 
         @self._blueprint.route("/get_hash/<int:instance_id>", methods=["GET"])
-        @shared_lock_manager.require_read_lock
         def get_current_hash_route(instance_id: int) -> ResponseType:
             """
             Get the current autopilot configuration hash.
@@ -221,7 +322,7 @@ class AutopilotParametersEndpoint:
             """
 
             try:
-                telemetry_instance = self._get_instance(instance_id)
+                telemetry_instance = self._get_instance(instance_id, read_only=True)
                 return jsonify(telemetry_instance.current_config_hash), 200
 
             except TypeError as e:
@@ -231,7 +332,6 @@ class AutopilotParametersEndpoint:
                 return jsonify(str(e)), 500
 
         @self._blueprint.route("/get_config/<config_hash>", methods=["GET"])
-        @shared_lock_manager.require_read_lock
         def get_config_route(config_hash: str) -> ResponseType:
             """
             Get the autopilot configuration for a given hash.
@@ -247,12 +347,21 @@ class AutopilotParametersEndpoint:
             -------
             ResponseType
                 A tuple containing a JSON response with the autopilot configuration for the specified hash,
+                cacheable forever and tagged with the hash as a strong ETag (304 if ``If-None-Match`` matches),
                 or an error message if the configuration is not found.
             """
 
             try:
-                config = self._get_hash(config_hash).data
-                return jsonify(config), 200
+                # served from memory — see python-source.instructions.md#Config store
+                config = config_store.get(config_hash)
+
+                # content never changes for a hash — see python-source.instructions.md#HTTP caching of config hashes
+                response = jsonify(config)
+                response.set_etag(config_hash)
+                response.cache_control.public = True
+                response.cache_control.max_age = int(current_app.config.get("CONFIG_CACHE_MAX_AGE", DEFAULT_CONFIG_CACHE_MAX_AGE))
+                response.cache_control.immutable = True
+                response.make_conditional(request)
 
             except TypeError as e:
                 return jsonify(str(e)), 404
@@ -260,8 +369,10 @@ class AutopilotParametersEndpoint:
             except Exception as e:
                 return jsonify(str(e)), 500
 
+            else:
+                return response, response.status_code
+
         @self._blueprint.route("/get_hash_description/<config_hash>", methods=["GET"])
-        @shared_lock_manager.require_read_lock
         def get_hash_description_route(config_hash: str) -> ResponseType:
             """
             Get the description for a given autopilot configuration hash.
@@ -281,7 +392,7 @@ class AutopilotParametersEndpoint:
             """
 
             try:
-                description = self._get_hash(config_hash).description
+                description = config_store.get_description(config_hash)
                 return jsonify(description), 200
 
             except TypeError as e:
@@ -291,7 +402,6 @@ class AutopilotParametersEndpoint:
                 return jsonify(str(e)), 500
 
         @self._blueprint.route("/get_all_hashes", methods=["GET"])
-        @shared_lock_manager.require_read_lock
         def get_all_hashes_route() -> ResponseType:
             """
             Get all stored autopilot configuration hashes.
@@ -308,7 +418,7 @@ class AutopilotParametersEndpoint:
             try:
                 rows = cast(
                     "Sequence[tuple[str, str | None, datetime]]",
-                    db.session.execute(db.select(HashTable.config_hash, HashTable.description, HashTable.created_at)).all(),
+                    read_db.session.execute(db.select(HashTable.config_hash, HashTable.description, HashTable.created_at)).all(),
                 )
 
                 hashes_info = [
@@ -322,7 +432,6 @@ class AutopilotParametersEndpoint:
                 return jsonify(str(e)), 500
 
         @self._blueprint.route("/get_hash_exists/<config_hash>", methods=["GET"])
-        @shared_lock_manager.require_read_lock
         def get_hash_exists_route(config_hash: str) -> ResponseType:
             """
             Check if a given autopilot configuration hash exists in storage.
@@ -337,13 +446,161 @@ class AutopilotParametersEndpoint:
             Returns
             -------
             ResponseType
-                A tuple containing a JSON response with a boolean indicating whether the configuration hash exists,
-                or an error message if an unexpected error occurs.
+                A tuple containing a JSON response with a boolean indicating whether the configuration hash exists
+                (a ``true`` is briefly cacheable, a ``false`` is not), or an error message if an unexpected error occurs.
             """
 
             try:
-                exists = HashTable.check_hash_exists(config_hash)
-                return jsonify(exists), 200
+                exists = config_store.contains(config_hash)
+
+                # a hash can be deleted, so only a short positive cache; "no" may flip any moment
+                response = jsonify(exists)
+                if exists:
+                    response.cache_control.public = True
+                    response.cache_control.max_age = int(
+                        current_app.config.get("HASH_EXISTS_CACHE_MAX_AGE", DEFAULT_HASH_EXISTS_CACHE_MAX_AGE)
+                    )
+                else:
+                    response.cache_control.no_cache = True
+
+            except Exception as e:
+                return jsonify(str(e)), 500
+
+            else:
+                return response, 200
+
+        @self._blueprint.route("/history/<int:instance_id>", methods=["GET"])
+        def history_route(instance_id: int) -> ResponseType:
+            """
+            Get the logged autopilot parameter changes of an instance, or its parameters at a point in time.
+
+            Method: GET
+
+            With ``at`` (ISO 8601), returns ``{"at", "parameters"}`` rebuilt from the nearest snapshot.
+            Otherwise returns the changes oldest first, optionally bounded by ``since`` / ``until``
+            (ISO 8601) and ``limit`` (1 to ``MAX_HISTORY_PAGE``).
+
+            Parameters
+            ----------
+            instance_id
+                The ID of the telemetry instance whose history to read.
+
+            Returns
+            -------
+            ResponseType
+                A tuple containing a JSON response with the changes or the reconstructed parameters,
+                or an error message if the instance is not found or a query parameter is invalid.
+            """
+
+            try:
+                self._get_instance(instance_id, read_only=True)
+
+                # snapshots bound the replay — see python-source.instructions.md#Parameter history
+                at = request.args.get("at")
+                if at is not None:
+                    parameters = reconstruct(read_db.session, instance_id, parse_timestamp(at, "at"))
+                    return jsonify({"at": at, "parameters": parameters}), 200
+
+                since = request.args.get("since")
+                until = request.args.get("until")
+                limit = request.args.get("limit", default=MAX_HISTORY_PAGE, type=int)
+                if not 1 <= limit <= MAX_HISTORY_PAGE:
+                    raise ValueError(f"Query parameter 'limit' must be an integer between 1 and {MAX_HISTORY_PAGE}.")
+
+                changes = list_changes(
+                    read_db.session,
+                    instance_id,
+                    since=parse_timestamp(since, "since") if since is not None else None,
+                    until=parse_timestamp(until, "until") if until is not None else None,
+                    limit=limit,
+                )
+                return jsonify(changes), 200
+
+            except TypeError as e:
+                return jsonify(str(e)), 404
+
+            except ValueError as e:
+                return jsonify(str(e)), 400
+
+            except Exception as e:
+                return jsonify(str(e)), 500
+
+        @self._blueprint.route("/diff/<hash_a>/<hash_b>", methods=["GET"])
+        def diff_route(hash_a: str, hash_b: str) -> ResponseType:
+            """
+            Get the structural difference between two autopilot configurations.
+
+            Method: GET
+
+            Parameters
+            ----------
+            hash_a
+                The hash of the configuration to diff from.
+            hash_b
+                The hash of the configuration to diff to.
+
+            Returns
+            -------
+            ResponseType
+                A tuple containing a JSON response with the ``added``, ``removed`` and ``changed`` parameters
+                and the ``unchanged`` count, or an error message if either configuration is not found.
+            """
+
+            try:
+                config_a = config_store.get(hash_a)
+                config_b = config_store.get(hash_b)
+
+                key = ("config", hash_a, hash_b)
+                result = self._diff_cache.get(key)
+                if result is None:
+                    result = diff_mappings(config_a, config_b)
+                    self._diff_cache.put(key, result)
+
+                return jsonify(result), 200
+
+            except TypeError as e:
+                return jsonify(str(e)), 404
+
+            except Exception as e:
+                return jsonify(str(e)), 500
+
+        @self._blueprint.route("/diff_instance/<int:instance_id>/<config_hash>", methods=["GET"])
+        def diff_instance_route(instance_id: int, config_hash: str) -> ResponseType:
+            """
+            Get how an instance's current autopilot parameters differ from a configuration's defaults.
+
+            Method: GET
+
+            Parameters
+            ----------
+            instance_id
+                The ID of the telemetry instance whose parameters are diffed to.
+            config_hash
+                The hash of the configuration whose ``default`` values are diffed from.
+
+            Returns
+            -------
+            ResponseType
+                A tuple containing a JSON response with the ``added``, ``removed`` and ``changed`` parameters
+                and the ``unchanged`` count, or an error message if the instance or configuration is not found.
+            """
+
+            try:
+                config = config_store.get(config_hash)
+                telemetry_instance = self._get_instance(instance_id, read_only=True)
+
+                # the parameters digest identifies their content, like the hash does for the config
+                key = ("instance", config_hash, telemetry_instance.autopilot_parameters_digest)
+                result = self._diff_cache.get(key)
+                if result is None:
+                    defaults = {parameter: entry["default"] for parameter, entry in config.items()}
+                    result = diff_mappings(defaults, get_parameters(telemetry_instance))
+                    self._diff_cache.put(key, result)
+
+                return jsonify(result), 200
+
+            except TypeError as e:
+                return jsonify(str(e)), 404
 
             except Exception as e:
                 return jsonify(str(e)), 500
@@ -375,15 +632,22 @@ class AutopilotParametersEndpoint:
                 if not isinstance(new_parameters, dict):
                     raise TypeError("Invalid autopilot parameters format. Expected a dictionary.")
 
-                if telemetry_instance.default_autopilot_parameters:
+                default_parameters = get_default_parameters(telemetry_instance)
+                if default_parameters:
                     new_parameters_keys = frozenset(new_parameters)
-                    default_parameters_keys = frozenset(telemetry_instance.default_autopilot_parameters)
+                    default_parameters_keys = frozenset(default_parameters)
 
                     if new_parameters_keys != default_parameters_keys:
                         raise ValueError("Autopilot parameters keys do not match the default configuration keys.")
 
-                telemetry_instance.autopilot_parameters_new_flag = telemetry_instance.autopilot_parameters != new_parameters
-                telemetry_instance.autopilot_parameters = new_parameters
+                # digest compare instead of a dict compare — see python-source.instructions.md#Canonical encoding
+                new_digest = parameters_digest(new_parameters)
+                if telemetry_instance.autopilot_parameters_digest != new_digest:
+                    record_changes(instance_id, get_parameters(telemetry_instance), new_parameters)
+
+                telemetry_instance.autopilot_parameters_new_flag = telemetry_instance.autopilot_parameters_digest != new_digest
+                set_parameters(telemetry_instance, new_parameters)
+                telemetry_instance.autopilot_parameters_digest = new_digest
                 db.session.commit()
 
                 return jsonify("Autopilot parameters updated successfully."), 200
@@ -428,20 +692,28 @@ class AutopilotParametersEndpoint:
                 if not isinstance(new_value, (str, int, float, bool, list)):
                     raise TypeError("Invalid autopilot parameter value format. Expected a primitive type or a list.")
 
-                if not telemetry_instance.default_autopilot_parameters:
+                default_parameters = get_default_parameters(telemetry_instance)
+                if not default_parameters:
                     raise ValueError("Default autopilot parameters must be set before updating individual parameters.")
 
-                if parameter_key not in telemetry_instance.default_autopilot_parameters:
+                if parameter_key not in default_parameters:
                     raise ValueError("Parameter key does not exist in the default autopilot parameters.")
 
-                # copy for a stable diff snapshot — see python-source.instructions.md#update_existing_parameter
-                current_parameters = (
-                    dict(telemetry_instance.autopilot_parameters) if telemetry_instance.autopilot_parameters else {}
-                )
+                # copy-then-reassign — see python-source.instructions.md#update_existing_parameter
+                old_parameters = get_parameters(telemetry_instance)
+                current_parameters = dict(old_parameters)
+
+                # swap one term of the running digest in O(1) — see python-source.instructions.md#Canonical encoding
+                new_digest = telemetry_instance.autopilot_parameters_digest
+                if parameter_key in current_parameters:
+                    new_digest = remove_parameter(new_digest, parameter_key, current_parameters[parameter_key])
+                new_digest = add_parameter(new_digest, parameter_key, new_value)
                 current_parameters[parameter_key] = new_value
+                record_changes(instance_id, old_parameters, current_parameters, keys=(parameter_key,))
 
-                telemetry_instance.autopilot_parameters_new_flag = telemetry_instance.autopilot_parameters != current_parameters
-                telemetry_instance.autopilot_parameters = current_parameters
+                telemetry_instance.autopilot_parameters_new_flag = telemetry_instance.autopilot_parameters_digest != new_digest
+                set_parameters(telemetry_instance, current_parameters)
+                telemetry_instance.autopilot_parameters_digest = new_digest
                 db.session.commit()
 
                 return jsonify("Autopilot parameter updated successfully."), 200
@@ -456,6 +728,91 @@ class AutopilotParametersEndpoint:
                 db.session.rollback()
                 return jsonify(str(e)), 500
 
+        @self._blueprint.route("/broadcast", methods=["POST"])
+        @shared_lock_manager.require_write_lock
+        def broadcast_route() -> ResponseType:
+            """
+            Apply one parameter change to many telemetry instances in a single transaction.
+
+            Method: POST
+
+            The body selects the targets (``instance_ids``, or ``user`` / ``name_prefix``) and holds either
+            ``parameters`` (a full dict, as for ``set``) or ``updates`` (existing keys to change, as for
+            ``update_existing_parameter``). Instances that cannot take the change are skipped with a reason.
+
+            Returns
+            -------
+            ResponseType
+                A tuple containing a JSON response with the per-instance ``results``, the ``updated``
+                count and the elapsed ``seconds``, or an error message if the body is invalid.
+            """
+
+            try:
+                body = json.loads(request.json)
+                if not isinstance(body, dict):
+                    raise TypeError("Invalid broadcast format. Expected a dictionary.")
+
+                clause, requested = target_clause(body)
+                new_parameters = body.get("parameters")
+                updates = body.get("updates")
+                if (new_parameters is None) == (updates is None):
+                    raise ValueError("A broadcast needs exactly one of 'parameters' or 'updates'.")
+
+                if new_parameters is not None and not isinstance(new_parameters, dict):
+                    raise TypeError("Invalid autopilot parameters format. Expected a dictionary.")
+
+                if updates is not None and not (
+                    isinstance(updates, dict)
+                    and updates
+                    and all(isinstance(value, (str, int, float, bool, list)) for value in updates.values())
+                ):
+                    raise TypeError("Invalid updates format. Expected a non-empty dictionary of primitive types or lists.")
+
+                report = BroadcastReport()
+                instances = (
+                    db.session.execute(db.select(TelemetryTable).where(clause).order_by(TelemetryTable.instance_id))
+                    .scalars()
+                    .all()
+                )
+                report.missing(requested, [instance.instance_id for instance in instances])
+
+                # one digest for every full-dict target — see python-source.instructions.md#Fleet broadcast
+                shared_digest = parameters_digest(new_parameters) if new_parameters is not None else None
+                rows = []
+                for instance in instances:
+                    result, parameters, new_digest = self._broadcast_parameters(instance, new_parameters, shared_digest, updates)
+                    report.results[instance.instance_id] = result
+                    if result != "updated":
+                        continue
+
+                    record_changes(instance.instance_id, get_parameters(instance), parameters, keys=updates)
+                    rows.append(
+                        {
+                            "instance_id": instance.instance_id,
+                            **parameter_columns(instance, parameters),
+                            "autopilot_parameters_digest": new_digest,
+                            "autopilot_parameters_new_flag": True,
+                        }
+                    )
+
+                # bulk UPDATE by primary key, one executemany per column layout
+                if rows:
+                    db.session.execute(db.update(TelemetryTable), rows)
+                db.session.commit()
+
+            except TypeError as e:
+                return jsonify(str(e)), 400
+
+            except ValueError as e:
+                return jsonify(str(e)), 400
+
+            except Exception as e:
+                db.session.rollback()
+                return jsonify(str(e)), 500
+
+            else:
+                return jsonify(report.to_dict()), 200
+
         @self._blueprint.route("/set_default/<int:instance_id>", methods=["POST"])
         @shared_lock_manager.require_write_lock
         def set_default_route(instance_id: int) -> ResponseType:
@@ -486,18 +843,20 @@ class AutopilotParametersEndpoint:
 
                 new_parameters = cast("dict", new_parameters)
                 tmp_hash = HashTable.compute_hash(new_parameters)
-                if HashTable.check_hash_exists(tmp_hash):
+                if config_store.contains(tmp_hash):
                     raise ValueError("Configuration hash already exists.")
 
-                new_hashtable_entry = HashTable(
-                    config_hash=tmp_hash, data=new_parameters, description="This hash does not have a description yet."
-                )
+                new_hashtable_entry = HashTable(config_hash=tmp_hash, data=new_parameters, description=DEFAULT_HASH_DESCRIPTION)
                 db.session.add(new_hashtable_entry)
 
-                telemetry_instance.default_autopilot_parameters = new_parameters
-                telemetry_instance.current_config_hash = tmp_hash
-                telemetry_instance.autopilot_parameters = {key: value["default"] for key, value in new_parameters.items()}
+                # the new hash is not in config_store until the commit, so the defaults are built here
+                default_values = {key: value["default"] for key, value in new_parameters.items()}
+                record_changes(instance_id, get_parameters(telemetry_instance), default_values)
+
+                # stored by reference — see python-source.instructions.md#Parameter storage by reference
+                set_config(telemetry_instance, tmp_hash, new_parameters, default_values)
                 db.session.commit()
+                config_store.add(tmp_hash, new_parameters, DEFAULT_HASH_DESCRIPTION)
 
                 return jsonify(tmp_hash), 200
 
@@ -536,17 +895,15 @@ class AutopilotParametersEndpoint:
             try:
                 telemetry_instance = self._get_instance(instance_id)
 
-                if not HashTable.check_hash_exists(config_hash):
+                if not config_store.contains(config_hash):
                     raise ValueError("Configuration hash does not exist.")
 
-                new_parameters = self._get_hash(config_hash).data
-
-                telemetry_instance.current_config_hash = config_hash
-                telemetry_instance.default_autopilot_parameters = new_parameters
-
-                if not telemetry_instance.autopilot_parameters:
-                    telemetry_instance.autopilot_parameters = {key: value["default"] for key, value in new_parameters.items()}
+                # existing parameters are kept; set_config copies the shared config if it stores it in full
+                current_parameters = get_parameters(telemetry_instance)
+                if not current_parameters:
+                    record_changes(instance_id, current_parameters, config_store.get_default_values(config_hash))
 
+                set_config(telemetry_instance, config_hash, config_store.get(config_hash), current_parameters or None)
                 db.session.commit()
 
                 return jsonify("Default autopilot parameters updated successfully from hash."), 200
@@ -587,6 +944,7 @@ class AutopilotParametersEndpoint:
                 hash_entry = self._get_hash(config_hash)
                 hash_entry.description = description
                 db.session.commit()
+                config_store.set_description(config_hash, description)
 
                 return jsonify("Description set successfully."), 200
 
@@ -621,14 +979,15 @@ class AutopilotParametersEndpoint:
 
                 new_parameters = cast("dict", new_parameters)
                 config_hash = HashTable.compute_hash(new_parameters)
-                if HashTable.check_hash_exists(config_hash):
+                if config_store.contains(config_hash):
                     raise ValueError("Configuration hash already exists.")
 
                 new_hashtable_entry = HashTable(
-                    config_hash=config_hash, data=new_parameters, description="This hash does not have a description yet."
+                    config_hash=config_hash, data=new_parameters, description=DEFAULT_HASH_DESCRIPTION
                 )
                 db.session.add(new_hashtable_entry)
                 db.session.commit()
+                config_store.add(config_hash, new_parameters, DEFAULT_HASH_DESCRIPTION)
 
                 return jsonify(config_hash), 200
 
@@ -681,6 +1040,7 @@ class AutopilotParametersEndpoint:
 
                 db.session.delete(hash_entry)
                 db.session.commit()
+                config_store.discard(config_hash)
 
                 return jsonify("Configuration deleted successfully."), 200
 
@@ -691,4 +1051,93 @@ class AutopilotParametersEndpoint:
                 db.session.rollback()
                 return jsonify(str(e)), 500
 
+        @self._blueprint.route("/export", methods=["GET"])
+        def export_route() -> ResponseType:
+            """
+            Stream every stored autopilot configuration as NDJSON.
+
+            Method: GET
+
+            Returns
+            -------
+            ResponseType
+                A tuple containing a streamed ``application/x-ndjson`` response with one
+                ``{"config_hash", "data", "description", "created_at"}`` object per line,
+                or an error message if an unexpected error occurs.
+            """
+
+            try:
+                # constant memory — see python-source.instructions.md#Bulk export and import (NDJSON)
+                batch_size = int(current_app.config.get("EXPORT_BATCH_SIZE", DEFAULT_EXPORT_BATCH_SIZE))
+                statement = db.select(HashTable).order_by(HashTable.config_hash).execution_options(yield_per=batch_size)
+
+                def generate() -> Iterator[bytes]:
+                    for hash_entry in read_db.session.execute(statement).scalars():
+                        yield encode_line({**hash_entry.to_dict(), "data": hash_entry.data})
+
+                return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE), 200
+
+            except Exception as e:
+                return jsonify(str(e)), 500
+
+        @self._blueprint.route("/import", methods=["POST"])
+        @shared_lock_manager.require_write_lock
+        def import_route() -> ResponseType:
+            """
+            Import autopilot configurations from a streamed NDJSON body, as written by ``export``.
+
+            Method: POST
+
+            Each line needs ``data``; ``config_hash`` is checked against it if present and
+            ``description`` is kept. Hashes that already exist are skipped. Rows are committed
+            in chunks, so the ones before an invalid line stay imported.
+
+            Returns
+            -------
+            ResponseType
+                A tuple containing a JSON response with the ``imported`` / ``skipped`` counts,
+                elapsed ``seconds`` and ``rows_per_second``, or an error message naming the first invalid line.
+            """
+
+            report = ImportReport()
+            try:
+                chunk_size = int(current_app.config.get("IMPORT_CHUNK_SIZE", DEFAULT_IMPORT_CHUNK_SIZE))
+
+                for chunk in chunked(iter_records(request.stream), chunk_size):
+                    new_configs: dict[str, tuple[AutopilotParametersType, str | None]] = {}
+                    for line_number, record in chunk:
+                        data = record.get("data")
+                        config_valid, validation_message = HashTable.validate_config(data)
+                        if not config_valid:
+                            raise ValueError(f"Line {line_number}: {validation_message}")
+
+                        config_hash = HashTable.compute_hash(cast("dict", data))
+                        if record.get("config_hash", config_hash) != config_hash:
+                            raise ValueError(f"Line {line_number}: the configuration hash does not match its data.")
+
+                        if config_hash in new_configs or config_store.contains(config_hash):
+                            report.skipped += 1
+                            continue
+
+                        new_configs[config_hash] = (cast("dict", data), record.get("description", DEFAULT_HASH_DESCRIPTION))
+
+                    db.session.add_all(
+                        HashTable(config_hash=config_hash, data=data, description=description)
+                        for config_hash, (data, description) in new_configs.items()
+                    )
+                    db.session.commit()
+                    for config_hash, (data, description) in new_configs.items():
+                        config_store.add(config_hash, data, description)
+                    report.imported += len(new_configs)
+
+                return jsonify(report.to_dict()), 200
+
+            except (TypeError, ValueError) as e:
+                db.session.rollback()
+                return jsonify({"error": str(e), **report.to_dict()}), 400
+
+            except Exception as e:
+                db.session.rollback()
+                return jsonify(str(e)), 500
+
         return f"autopilot_parameters paths registered successfully: {self._blueprint.url_prefix}"
@@ -1,11 +1,49 @@
 import ctypes
-from typing import ClassVar, Literal
+import math
+from collections.abc import Iterable
+from typing import Any, ClassVar, Literal, cast
 
+import numpy as np
 from flask import Blueprint, jsonify, request
 
 from autoboat_telemetry_server import shared_lock_manager
-from autoboat_telemetry_server.models import TelemetryTable, db
+from autoboat_telemetry_server.alert_rules import MAX_ALERT_RULES, RuleCache, alert_rules, parse_rule
+from autoboat_telemetry_server.anomalies import anomalies
+from autoboat_telemetry_server.geofences import MAX_GEOFENCES_PER_INSTANCE, PolygonCache, check_status, parse_geofence, violated
+from autoboat_telemetry_server.kinematics import kinematics
+from autoboat_telemetry_server.models import AlertRuleTable, GeofenceTable, TelemetryTable, db
+from autoboat_telemetry_server.observability import count_anomalies, count_geofence_violations, observe_alert_rules
+from autoboat_telemetry_server.position_index import MAX_NEAR_RADIUS_M, position_index
+from autoboat_telemetry_server.positions import parse_position_fields, status_position
+from autoboat_telemetry_server.read_only import read_db
+from autoboat_telemetry_server.rolling_stats import DEFAULT_STATS_WINDOW, rolling_stats
+from autoboat_telemetry_server.tracks import tracks
 from autoboat_telemetry_server.types import ResponseType
+from autoboat_telemetry_server.waypoint_storage import WAYPOINT_DTYPE
+
+
+def stats_fields(instance: TelemetryTable, derived: Iterable[str]) -> list[str] | None:
+    """
+    Return the boat status fields whose rolling statistics and anomaly detectors are kept.
+
+    Parameters
+    ----------
+    instance
+        The telemetry instance being written.
+    derived
+        The ``derived_*`` fields added to its status.
+
+    Returns
+    -------
+    list[str] | None
+        The ``boat_status_mapping`` field names plus the derived fields, or ``None`` (every numeric field)
+        for an instance without a mapping. Anomaly detectors get the status without its derived fields.
+    """
+
+    if not instance.boat_status_mapping:
+        return None
+
+    return [field_name for field_name, _ in instance.boat_status_mapping] + list(derived)
 
 
 class BoatStatusEndpoint:
@@ -13,6 +51,8 @@ class BoatStatusEndpoint:
 
     def __init__(self) -> None:
         self._blueprint = Blueprint(name="boat_status_page", import_name=__name__, url_prefix="/boat_status")
+        self._polygon_cache = PolygonCache()
+        self._rule_cache = RuleCache()
         self._register_routes()
 
     @property
@@ -20,7 +60,7 @@ class BoatStatusEndpoint:
         """Returns the Flask blueprint for autopilot parameters."""
         return self._blueprint
 
-    def _get_instance(self, instance_id: int) -> TelemetryTable:
+    def _get_instance(self, instance_id: int, *, read_only: bool = False) -> TelemetryTable:
         """
         Helper function to retrieve a telemetry instance by its ID.
 
@@ -28,6 +68,8 @@ class BoatStatusEndpoint:
         ----------
         instance_id
             The ID of the telemetry instance to retrieve.
+        read_only
+            Whether to load it through the lock-free read-only session.
 
         Returns
         -------
@@ -40,13 +82,53 @@ class BoatStatusEndpoint:
             If the instance with the given ID does not exist.
         """
 
-        instance = db.session.get(TelemetryTable, instance_id)
+        session = read_db.session if read_only else db.session
+        instance = session.get(TelemetryTable, instance_id)
 
         if not isinstance(instance, TelemetryTable):
             raise TypeError("Instance not found.")
 
         return instance
 
+    def _ingest(self, telemetry_instance: TelemetryTable, status: dict[str, Any]) -> None:
+        """
+        Store a new boat status, run the per-write checks, commit, then update the in-memory state.
+
+        The one write path of ``set`` and ``set_fast``; a new per-write step goes here.
+
+        Parameters
+        ----------
+        telemetry_instance
+            The telemetry instance being written, from ``_get_instance``.
+        status
+            The new boat status, as received.
+        """
+
+        # read before commit, which expires the instance's attributes
+        instance_id = telemetry_instance.instance_id
+        position = status_position(status, telemetry_instance.boat_status_position_fields)
+        # from the previous sample in memory, no extra read — see python-source.instructions.md#Derived kinematics
+        sample, derived = kinematics.derive(instance_id, status, position)
+        stored_status = {**status, **derived}
+        telemetry_instance.boat_status = stored_status
+        telemetry_instance.boat_status_new_flag = True
+        # one indexed select of digests, polygons compiled once — see python-source.instructions.md#Geofences
+        violations = check_status(self._polygon_cache, telemetry_instance, position)
+        # compiled rules, one indexed select — see python-source.instructions.md#Alert rules
+        holds, fired, evaluated, seconds = alert_rules.check_status(
+            self._rule_cache, telemetry_instance, stored_status, raised=bool(violations)
+        )
+        fields = stats_fields(telemetry_instance, derived)
+        db.session.commit()
+        count_geofence_violations(violations)
+        observe_alert_rules(evaluated, seconds, fired)
+        position_index.update(instance_id, position)
+        tracks.append(instance_id, position)
+        kinematics.record(instance_id, sample)
+        alert_rules.record(instance_id, holds)
+        rolling_stats.update(instance_id, stored_status, fields)
+        count_anomalies(anomalies.update(instance_id, status, fields))
+
     def _register_routes(self) -> str:
         """
         Registers the routes for the boat status endpoint.
@@ -73,7 +155,6 @@ class BoatStatusEndpoint:
             return "boat_status route testing!"
 
         @self._blueprint.route("/get/<int:instance_id>", methods=["GET"])
-        @shared_lock_manager.require_read_lock
         def get_route(instance_id: int) -> ResponseType:
             """
             Get the boat status for a specific telemetry instance.
@@ -93,7 +174,7 @@ class BoatStatusEndpoint:
             """
 
             try:
-                telemetry_instance = self._get_instance(instance_id)
+                telemetry_instance = self._get_instance(instance_id, read_only=True)
                 return jsonify(telemetry_instance.boat_status), 200
 
             except TypeError as e:
@@ -166,9 +247,7 @@ class BoatStatusEndpoint:
                 if not isinstance(new_status, dict):
                     raise TypeError("Invalid boat status format. Expected a dictionary.")
 
-                telemetry_instance.boat_status = new_status
-                telemetry_instance.boat_status_new_flag = True
-                db.session.commit()
+                self._ingest(telemetry_instance, new_status)
 
                 return jsonify("Boat status updated successfully."), 200
 
@@ -219,9 +298,7 @@ class BoatStatusEndpoint:
                     field_name: getattr(payload, field_name) for field_name, _ in telemetry_instance.boat_status_mapping
                 }
 
-                telemetry_instance.boat_status = updated_status
-                telemetry_instance.boat_status_new_flag = True
-                db.session.commit()
+                self._ingest(telemetry_instance, updated_status)
 
                 return jsonify("Boat status updated successfully using fast update method."), 200
 
@@ -282,4 +359,532 @@ class BoatStatusEndpoint:
                 db.session.rollback()
                 return jsonify(str(e)), 500
 
+        @self._blueprint.route("/set_position_fields/<int:instance_id>", methods=["POST"])
+        @shared_lock_manager.require_write_lock
+        def set_position_fields_route(instance_id: int) -> ResponseType:
+            """
+            Set which boat status fields hold the latitude and longitude of a specific telemetry instance.
+
+            Method: POST
+
+            The body is ``[latitude_key, longitude_key]``, e.g. ``["gps_lat", "gps_lon"]``, or ``null`` to use
+            the server's ``POSITION_FIELDS``.
+
+            Parameters
+            ----------
+            instance_id
+                The ID of the telemetry instance to set the position fields for.
+
+            Returns
+            -------
+            ResponseType
+                A tuple containing a JSON response confirming the position fields have been updated successfully,
+                or an error message if the instance is not found or if the input format is invalid.
+            """
+
+            try:
+                telemetry_instance = self._get_instance(instance_id)
+                fields = parse_position_fields(request.json)
+                telemetry_instance.boat_status_position_fields = fields
+                position = status_position(telemetry_instance.boat_status, fields)
+                db.session.commit()
+                position_index.update(instance_id, position)
+
+                return jsonify("Position fields updated successfully."), 200
+
+            except TypeError as e:
+                return jsonify(str(e)), 404
+
+            except ValueError as e:
+                return jsonify(str(e)), 400
+
+            except Exception as e:
+                db.session.rollback()
+                return jsonify(str(e)), 500
+
+        @self._blueprint.route("/near", methods=["GET"])
+        def near_route() -> ResponseType:
+            """
+            Get the instances whose latest position is within a radius of a point, nearest first.
+
+            Method: GET
+
+            Query parameters: ``lat`` and ``lon`` in degrees, ``radius`` in metres.
+
+            Returns
+            -------
+            ResponseType
+                A tuple containing a JSON response with a list of ``{"instance_id", "latitude", "longitude", "distance"}``,
+                or an error message if a parameter is missing or out of range.
+            """
+
+            try:
+                latitude = request.args.get("lat", type=float)
+                longitude = request.args.get("lon", type=float)
+                radius = request.args.get("radius", type=float)
+                if latitude is None or longitude is None or radius is None:
+                    raise ValueError("Query parameters 'lat', 'lon' and 'radius' must be numbers.")
+
+                if not (abs(latitude) <= 90 and abs(longitude) <= 180):
+                    raise ValueError("'lat' must be within [-90, 90] and 'lon' within [-180, 180].")
+
+                if not 0 <= radius <= MAX_NEAR_RADIUS_M:
+                    raise ValueError(f"'radius' must be between 0 and {MAX_NEAR_RADIUS_M:.0f} metres.")
+
+                # grid cells around the point, not a telemetry_table scan — see python-source.instructions.md#Position index
+                return jsonify(
+                    [
+                        {
+                            "instance_id": instance_id,
+                            "latitude": found_latitude,
+                            "longitude": found_longitude,
+                            "distance": distance,
+                        }
+                        for instance_id, found_latitude, found_longitude, distance in position_index.near(
+                            latitude, longitude, radius
+                        )
+                    ]
+                ), 200
+
+            except ValueError as e:
+                return jsonify(str(e)), 400
+
+            except Exception as e:
+                return jsonify(str(e)), 500
+
+        @self._blueprint.route("/bbox", methods=["GET"])
+        def bbox_route() -> ResponseType:
+            """
+            Get the instances whose latest position is inside a latitude / longitude box, e.g. a map viewport.
+
+            Method: GET
+
+            Query parameters: ``south``, ``west``, ``north`` and ``east`` in degrees; ``west > east`` is a box
+            across the antimeridian.
+
+            Returns
+            -------
+            ResponseType
+                A tuple containing a JSON response with a list of ``{"instance_id", "latitude", "longitude"}`` ordered by ID,
+                or an error message if a parameter is missing or out of range.
+            """
+
+            try:
+                edges = [request.args.get(name, type=float) for name in ("south", "west", "north", "east")]
+                if any(edge is None for edge in edges):
+                    raise ValueError("Query parameters 'south', 'west', 'north' and 'east' must be numbers.")
+
+                south, west, north, east = cast("list[float]", edges)
+                if not (-90 <= south <= north <= 90 and abs(west) <= 180 and abs(east) <= 180):
+                    raise ValueError("Latitudes must be within [-90, 90] with south <= north, longitudes within [-180, 180].")
+
+                return jsonify(
+                    [
+                        {"instance_id": instance_id, "latitude": latitude, "longitude": longitude}
+                        for instance_id, latitude, longitude in position_index.within(south, west, north, east)
+                    ]
+                ), 200
+
+            except ValueError as e:
+                return jsonify(str(e)), 400
+
+            except Exception as e:
+                return jsonify(str(e)), 500
+
+        @self._blueprint.route("/track/<int:instance_id>", methods=["GET"])
+        def track_route(instance_id: int) -> ResponseType:
+            """
+            Get the positions a specific telemetry instance has reported, simplified for map display.
+
+            Method: GET
+
+            Query parameter: ``tolerance`` in metres (default 0, every recorded position); no recorded
+            position is farther than it from the returned polyline.
+
+            Parameters
+            ----------
+            instance_id
+                The ID of the telemetry instance to retrieve the track for.
+
+            Returns
+            -------
+            ResponseType
+                A tuple containing a JSON response with a list of ``[latitude, longitude]`` pairs, oldest first,
+                or an error message if the instance is not found or the tolerance is invalid.
+            """
+
+            try:
+                try:
+                    tolerance = float(request.args.get("tolerance", "0"))
+                except ValueError:
+                    tolerance = math.nan
+
+                if not 0 <= tolerance <= MAX_NEAR_RADIUS_M:
+                    raise ValueError(f"'tolerance' must be a number between 0 and {MAX_NEAR_RADIUS_M:.0f} metres.")
+
+                self._get_instance(instance_id, read_only=True)
+
+                # cached per tolerance and extended block by block — see python-source.instructions.md#Position tracks
+                return jsonify(tracks.simplified(instance_id, tolerance).tolist()), 200
+
+            except TypeError as e:
+                return jsonify(str(e)), 404
+
+            except ValueError as e:
+                return jsonify(str(e)), 400
+
+            except Exception as e:
+                return jsonify(str(e)), 500
+
+        @self._blueprint.route("/stats/<int:instance_id>", methods=["GET"])
+        def stats_route(instance_id: int) -> ResponseType:
+            """
+            Get the rolling min / max / mean / standard deviation of each numeric boat status field of a specific
+            telemetry instance.
+
+            Method: GET
+
+            Query parameter: ``window``, one of ``10s``, ``1min`` (the default) or ``10min``.
+
+            Parameters
+            ----------
+            instance_id
+                The ID of the telemetry instance to retrieve the statistics for.
+
+            Returns
+            -------
+            ResponseType
+                A tuple containing a JSON response with ``{field: {"count", "min", "max", "mean", "stddev"}}``,
+                or an error message if the instance is not found or the window is unknown.
+            """
+
+            try:
+                window = request.args.get("window", DEFAULT_STATS_WINDOW)
+                self._get_instance(instance_id, read_only=True)
+
+                # bucketed aggregates kept on each write — see python-source.instructions.md#Rolling statistics
+                return jsonify(rolling_stats.summary(instance_id, window)), 200
+
+            except TypeError as e:
+                return jsonify(str(e)), 404
+
+            except ValueError as e:
+                return jsonify(str(e)), 400
+
+            except Exception as e:
+                return jsonify(str(e)), 500
+
+        @self._blueprint.route("/anomalies/<int:instance_id>", methods=["GET"])
+        def anomalies_route(instance_id: int) -> ResponseType:
+            """
+            Get the non-finite, jump and stuck value anomalies detected on a specific telemetry instance's fields.
+
+            Method: GET
+
+            Parameters
+            ----------
+            instance_id
+                The ID of the telemetry instance to retrieve the anomalies for.
+
+            Returns
+            -------
+            ResponseType
+                A tuple containing a JSON response with ``{"active", "recent", "fields"}``,
+                or an error message if the instance is not found.
+            """
+
+            try:
+                self._get_instance(instance_id, read_only=True)
+
+                # detectors updated on each write — see python-source.instructions.md#Anomaly detection
+                return jsonify(anomalies.summary(instance_id)), 200
+
+            except TypeError as e:
+                return jsonify(str(e)), 404
+
+            except Exception as e:
+                return jsonify(str(e)), 500
+
+        @self._blueprint.route("/get_geofences/<int:instance_id>", methods=["GET"])
+        def get_geofences_route(instance_id: int) -> ResponseType:
+            """
+            Get the geofences of a specific telemetry instance, and whether its latest position violates each.
+
+            Method: GET
+
+            Parameters
+            ----------
+            instance_id
+                The ID of the telemetry instance to retrieve the geofences for.
+
+            Returns
+            -------
+            ResponseType
+                A tuple containing a JSON response with a list of ``{"geofence_id", "name", "mode", "points", "violated"}``,
+                or an error message if the instance is not found.
+            """
+
+            try:
+                telemetry_instance = self._get_instance(instance_id, read_only=True)
+                position = status_position(telemetry_instance.boat_status, telemetry_instance.boat_status_position_fields)
+                violated_ids = (
+                    {geofence_id for geofence_id, _, _ in violated(read_db.session, self._polygon_cache, instance_id, position)}
+                    if position is not None
+                    else set()
+                )
+
+                geofences = (
+                    read_db.session.execute(
+                        db.select(GeofenceTable)
+                        .where(GeofenceTable.instance_id == instance_id)
+                        .order_by(GeofenceTable.geofence_id)
+                    )
+                    .scalars()
+                    .all()
+                )
+
+                return jsonify(
+                    [
+                        {
+                            "geofence_id": geofence.geofence_id,
+                            "name": geofence.name,
+                            "mode": geofence.mode,
+                            "points": np.frombuffer(geofence.points_packed, dtype=WAYPOINT_DTYPE).reshape(-1, 2).tolist(),
+                            "violated": geofence.geofence_id in violated_ids,
+                        }
+                        for geofence in geofences
+                    ]
+                ), 200
+
+            except TypeError as e:
+                return jsonify(str(e)), 404
+
+            except Exception as e:
+                return jsonify(str(e)), 500
+
+        @self._blueprint.route("/add_geofence/<int:instance_id>", methods=["POST"])
+        @shared_lock_manager.require_write_lock
+        def add_geofence_route(instance_id: int) -> ResponseType:
+            """
+            Add a geofence polygon that every boat status write of the instance is checked against.
+
+            Method: POST
+
+            The body is ``{"name": str, "mode": "keep_in" | "keep_out", "points": [[latitude, longitude], ...]}``;
+            ``mode`` defaults to ``"keep_in"``.
+
+            Parameters
+            ----------
+            instance_id
+                The ID of the telemetry instance to add the geofence to.
+
+            Returns
+            -------
+            ResponseType
+                A tuple containing a JSON response with the new ``geofence_id``,
+                or an error message if the instance is not found or if the polygon is invalid.
+            """
+
+            try:
+                self._get_instance(instance_id)
+                geofence = GeofenceTable(instance_id=instance_id, **parse_geofence(request.json))
+
+                count = db.session.execute(
+                    db.select(db.func.count()).select_from(GeofenceTable).where(GeofenceTable.instance_id == instance_id)
+                ).scalar_one()
+                if count >= MAX_GEOFENCES_PER_INSTANCE:
+                    raise ValueError(f"An instance can have at most {MAX_GEOFENCES_PER_INSTANCE} geofences.")
+
+                db.session.add(geofence)
+                db.session.commit()
+
+                return jsonify({"geofence_id": geofence.geofence_id}), 200
+
+            except TypeError as e:
+                return jsonify(str(e)), 400
+
+            except ValueError as e:
+                return jsonify(str(e)), 400
+
+            except Exception as e:
+                db.session.rollback()
+                return jsonify(str(e)), 500
+
+        @self._blueprint.route("/delete_geofence/<int:instance_id>/<int:geofence_id>", methods=["DELETE"])
+        @shared_lock_manager.require_write_lock
+        def delete_geofence_route(instance_id: int, geofence_id: int) -> ResponseType:
+            """
+            Delete one geofence of a specific telemetry instance.
+
+            Method: DELETE
+
+            Parameters
+            ----------
+            instance_id
+                The ID of the telemetry instance the geofence belongs to.
+            geofence_id
+                The ID of the geofence to delete.
+
+            Returns
+            -------
+            ResponseType
+                A tuple containing a JSON response confirming the deletion,
+                or an error message if the instance or the geofence is not found.
+            """
+
+            try:
+                self._get_instance(instance_id)
+                deleted = db.session.execute(
+                    db.delete(GeofenceTable).where(
+                        GeofenceTable.instance_id == instance_id, GeofenceTable.geofence_id == geofence_id
+                    )
+                ).rowcount
+                if not deleted:
+                    raise TypeError("Geofence not found.")
+
+                db.session.commit()
+
+                return jsonify(f"Geofence {geofence_id} deleted."), 200
+
+            except TypeError as e:
+                db.session.rollback()
+                return jsonify(str(e)), 404
+
+            except Exception as e:
+                db.session.rollback()
+                return jsonify(str(e)), 500
+
+        @self._blueprint.route("/get_alert_rules", methods=["GET"], defaults={"instance_id": None})
+        @self._blueprint.route("/get_alert_rules/<int:instance_id>", methods=["GET"])
+        def get_alert_rules_route(instance_id: int | None) -> ResponseType:
+            """
+            Get the alert rules that apply to a specific telemetry instance, or the global rules.
+
+            Method: GET
+
+            Parameters
+            ----------
+            instance_id
+                The ID of the telemetry instance to retrieve the rules for; omitted for the global rules only.
+
+            Returns
+            -------
+            ResponseType
+                A tuple containing a JSON response with a list of ``{"rule_id", "instance_id", "rule", "intensity",
+                "last_fired_at", "firing"}``, where ``firing`` is whether the rule has fired for the instance and
+                not yet re-armed (always ``false`` for the global listing), or an error message if the instance is
+                not found.
+            """
+
+            try:
+                scope = AlertRuleTable.instance_id.is_(None)
+                firing: set[int] = set()
+                if instance_id is not None:
+                    self._get_instance(instance_id, read_only=True)
+                    scope = scope | (AlertRuleTable.instance_id == instance_id)
+                    firing = alert_rules.firing(instance_id)
+
+                rules = (
+                    read_db.session.execute(db.select(AlertRuleTable).where(scope).order_by(AlertRuleTable.rule_id))
+                    .scalars()
+                    .all()
+                )
+
+                return jsonify([{**rule.to_dict(), "firing": rule.rule_id in firing} for rule in rules]), 200
+
+            except TypeError as e:
+                return jsonify(str(e)), 404
+
+            except Exception as e:
+                return jsonify(str(e)), 500
+
+        @self._blueprint.route("/add_alert_rule", methods=["POST"], defaults={"instance_id": None})
+        @self._blueprint.route("/add_alert_rule/<int:instance_id>", methods=["POST"])
+        @shared_lock_manager.require_write_lock
+        def add_alert_rule_route(instance_id: int | None) -> ResponseType:
+            """
+            Add an alert rule that every boat status write of the instance, or of every instance, is checked against.
+
+            Method: POST
+
+            The body is ``{"rule": str, "intensity": int}``, e.g. ``{"rule": "battery_voltage < 11.2 for 5s"}``;
+            ``intensity`` is a ``DiagnosticMessageIntensity`` value and defaults to ``WARNING``.
+
+            Parameters
+            ----------
+            instance_id
+                The ID of the telemetry instance to add the rule to; omitted for a global rule.
+
+            Returns
+            -------
+            ResponseType
+                A tuple containing a JSON response with the new ``rule_id``,
+                or an error message if the instance is not found or if the rule is invalid.
+            """
+
+            try:
+                if instance_id is not None:
+                    self._get_instance(instance_id)
+                rule = AlertRuleTable(instance_id=instance_id, **parse_rule(request.json))
+
+                # == None renders as IS NULL, so this counts the global rules for a global add
+                count = db.session.execute(
+                    db.select(db.func.count()).select_from(AlertRuleTable).where(AlertRuleTable.instance_id == instance_id)
+                ).scalar_one()
+                if count >= MAX_ALERT_RULES:
+                    raise ValueError(f"An instance, and the global scope, can have at most {MAX_ALERT_RULES} alert rules.")
+
+                db.session.add(rule)
+                db.session.commit()
+
+                return jsonify({"rule_id": rule.rule_id}), 200
+
+            except TypeError as e:
+                return jsonify(str(e)), 400
+
+            except ValueError as e:
+                return jsonify(str(e)), 400
+
+            except Exception as e:
+                db.session.rollback()
+                return jsonify(str(e)), 500
+
+        @self._blueprint.route("/delete_alert_rule/<int:rule_id>", methods=["DELETE"])
+        @shared_lock_manager.require_write_lock
+        def delete_alert_rule_route(rule_id: int) -> ResponseType:
+            """
+            Delete one alert rule, instance-specific or global.
+
+            Method: DELETE
+
+            Parameters
+            ----------
+            rule_id
+                The ID of the rule to delete.
+
+            Returns
+            -------
+            ResponseType
+                A tuple containing a JSON response confirming the deletion,
+                or an error message if the rule is not found.
+            """
+
+            try:
+                deleted = db.session.execute(db.delete(AlertRuleTable).where(AlertRuleTable.rule_id == rule_id)).rowcount
+                if not deleted:
+                    raise TypeError("Alert rule not found.")
+
+                db.session.commit()
+                alert_rules.forget_rule(rule_id)
+
+                return jsonify(f"Alert rule {rule_id} deleted."), 200
+
+            except TypeError as e:
+                db.session.rollback()
+                return jsonify(str(e)), 404
+
+            except Exception as e:
+                db.session.rollback()
+                return jsonify(str(e)), 500
+
         return f"boat_status paths registered successfully: {self._blueprint.url_prefix}"
@@ -1,13 +1,238 @@
-from collections.abc import Sequence
+import base64
+import re
+from collections.abc import Iterator, Sequence
 from datetime import UTC, datetime, timedelta
-from typing import Literal, cast
+from typing import Any, Literal, cast
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
 
 from autoboat_telemetry_server import shared_lock_manager
+from autoboat_telemetry_server.canonical import parameters_digest
+from autoboat_telemetry_server.config_store import config_store
+from autoboat_telemetry_server.instance_cleanup import discard_instances, forget_instances
+from autoboat_telemetry_server.instance_names import default_instance_name, instance_names
 from autoboat_telemetry_server.models import TelemetryTable, db
+from autoboat_telemetry_server.ndjson import (
+    DEFAULT_EXPORT_BATCH_SIZE,
+    DEFAULT_IMPORT_CHUNK_SIZE,
+    NDJSON_MIMETYPE,
+    ImportReport,
+    chunked,
+    encode_line,
+    iter_records,
+)
 from autoboat_telemetry_server.observability import count_clean_instances_deletions
+from autoboat_telemetry_server.parameter_storage import config_columns, get_default_parameters, get_parameters, set_config
+from autoboat_telemetry_server.position_index import position_index
+from autoboat_telemetry_server.positions import parse_position_fields, status_position
+from autoboat_telemetry_server.read_only import read_db
 from autoboat_telemetry_server.types import DiagnosticMessageIntensity, ResponseType
+from autoboat_telemetry_server.waypoint_storage import get_waypoints, parse_json, set_waypoints
+
+# upper bound for /instance_manager/create_many?n= (one simulation fleet per request)
+MAX_CREATE_MANY = 1000
+
+# upper bound for /instance_manager/get_all_instance_info?limit=
+MAX_INSTANCE_INFO_PAGE = 1000
+
+# default names are reserved for the id they name, or a later create would hit the unique index
+_DEFAULT_NAME_PATTERN = re.compile(r"Unnamed instance #(\d+)")
+
+
+def _encode_cursor(updated_at: datetime, instance_id: int) -> str:
+    """
+    Encode the position of the last row of a page as an opaque ``after`` cursor.
+
+    Parameters
+    ----------
+    updated_at
+        The ``updated_at`` of the last row returned.
+    instance_id
+        The ``instance_id`` of the last row returned.
+
+    Returns
+    -------
+    str
+        A URL-safe cursor to pass back as ``?after=``.
+    """
+
+    return base64.urlsafe_b64encode(f"{updated_at.isoformat()}|{instance_id}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Decode an ``after`` cursor produced by ``_encode_cursor``.
+
+    Parameters
+    ----------
+    cursor
+        The cursor taken from the ``X-Next-Cursor`` header of the previous page.
+
+    Returns
+    -------
+    tuple[datetime, int]
+        The ``(updated_at, instance_id)`` to continue after.
+
+    Raises
+    ------
+    ValueError
+        If the cursor is malformed.
+    """
+
+    try:
+        updated_at, instance_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(updated_at), int(instance_id)
+
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid 'after' cursor.") from e
+
+
+def _parse_since(value: str) -> datetime:
+    """
+    Parse an ISO 8601 ``active_since`` value into the naive UTC form stored in SQLite.
+
+    Parameters
+    ----------
+    value
+        An ISO 8601 datetime; a value without an offset is taken as UTC.
+
+    Returns
+    -------
+    datetime
+        The naive UTC datetime to compare against ``updated_at``.
+
+    Raises
+    ------
+    ValueError
+        If the value is not an ISO 8601 datetime.
+    """
+
+    try:
+        since = datetime.fromisoformat(value)
+
+    except ValueError as e:
+        raise ValueError("'active_since' must be an ISO 8601 datetime.") from e
+
+    if since.tzinfo is not None:
+        since = since.astimezone(UTC).replace(tzinfo=None)
+
+    return since
+
+
+def _export_record(instance: TelemetryTable) -> dict[str, Any]:
+    """
+    Serialize the full state of an instance for ``/instance_manager/export``.
+
+    Parameters
+    ----------
+    instance
+        The telemetry instance.
+
+    Returns
+    -------
+    dict[str, Any]
+        ``to_dict()`` plus every state column, with the autopilot parameters resolved to full dicts.
+    """
+
+    return {
+        **instance.to_dict(),
+        "diagnostic_message": instance.diagnostic_message,
+        "default_autopilot_parameters": get_default_parameters(instance),
+        "autopilot_parameters": get_parameters(instance),
+        "autopilot_parameters_new_flag": instance.autopilot_parameters_new_flag,
+        "boat_status": instance.boat_status,
+        "boat_status_mapping": instance.boat_status_mapping,
+        "boat_status_new_flag": instance.boat_status_new_flag,
+        "boat_status_position_fields": instance.boat_status_position_fields,
+        "waypoints": get_waypoints(instance),
+        "waypoints_new_flag": instance.waypoints_new_flag,
+    }
+
+
+def _import_instance(line_number: int, record: dict[str, Any], instance_id: int, name: str) -> TelemetryTable:
+    """
+    Build a new instance from an ``/instance_manager/export`` record.
+
+    Parameters
+    ----------
+    line_number
+        The record's line in the request body, for error messages.
+    record
+        The exported state; missing fields get the same defaults as ``create``.
+    instance_id
+        The ID to give the new instance.
+    name
+        The ``instance_identifier`` to give it.
+
+    Returns
+    -------
+    TelemetryTable
+        The new, not yet added instance, stored by config reference if its config exists here.
+
+    Raises
+    ------
+    TypeError
+        If a field has the wrong JSON type.
+    ValueError
+        If ``created_at`` is not an ISO 8601 datetime, or a waypoint is out of bounds.
+    """
+
+    expected_types: dict[str, type | tuple[type, ...]] = {
+        "user": str,
+        "current_config_hash": str,
+        "diagnostic_message": (list, type(None)),
+        "default_autopilot_parameters": dict,
+        "autopilot_parameters": dict,
+        "boat_status": dict,
+        "boat_status_mapping": (list, type(None)),
+        "boat_status_position_fields": (list, type(None)),
+        "waypoints": list,
+        "created_at": str,
+    }
+    for field, expected_type in expected_types.items():
+        if field in record and not isinstance(record[field], expected_type):
+            raise TypeError(f"Line {line_number}: '{field}' has the wrong type.")
+
+    now = datetime.now(UTC)
+    try:
+        created_at = datetime.fromisoformat(record["created_at"]) if "created_at" in record else now
+    except ValueError as e:
+        raise ValueError(f"Line {line_number}: 'created_at' must be an ISO 8601 datetime.") from e
+
+    try:
+        points = parse_json(record.get("waypoints", []))
+        position_fields = parse_position_fields(record.get("boat_status_position_fields"))
+    except (TypeError, ValueError) as e:
+        raise type(e)(f"Line {line_number}: {e}") from e
+
+    # imported instances count as active now, or maintenance would delete them on its next run
+    instance = TelemetryTable(
+        instance_id=instance_id,
+        instance_identifier=name,
+        user=record.get("user", "unknown"),
+        diagnostic_message=record.get("diagnostic_message"),
+        autopilot_parameters_new_flag=bool(record.get("autopilot_parameters_new_flag", False)),
+        boat_status=record.get("boat_status", {}),
+        boat_status_mapping=record.get("boat_status_mapping", []),
+        boat_status_new_flag=bool(record.get("boat_status_new_flag", False)),
+        boat_status_position_fields=position_fields,
+        waypoints_new_flag=bool(record.get("waypoints_new_flag", False)),
+        created_at=created_at,
+        updated_at=now,
+    )
+    set_waypoints(instance, points)
+
+    config_hash = record.get("current_config_hash", "")
+    parameters = record.get("autopilot_parameters", {})
+    if config_hash and config_store.contains(config_hash):
+        set_config(instance, config_hash, config_store.get(config_hash), parameters or None)
+    else:
+        instance.current_config_hash = config_hash
+        instance.default_autopilot_parameters = record.get("default_autopilot_parameters", {})
+        instance.autopilot_parameters = parameters
+        instance.autopilot_parameters_digest = parameters_digest(parameters)
+
+    return instance
 
 
 class InstanceManagerEndpoint:
@@ -23,7 +248,7 @@ class InstanceManagerEndpoint:
 
         return self._blueprint
 
-    def _get_instance(self, instance_id: int) -> TelemetryTable:
+    def _get_instance(self, instance_id: int, *, read_only: bool = False) -> TelemetryTable:
         """
         Helper function to retrieve a telemetry instance by its ID.
 
@@ -31,6 +256,8 @@ class InstanceManagerEndpoint:
         ----------
         instance_id
             The ID of the telemetry instance to retrieve.
+        read_only
+            Whether to load it through the lock-free read-only session.
 
         Returns
         -------
@@ -43,7 +270,8 @@ class InstanceManagerEndpoint:
             If the instance with the given ID does not exist.
         """
 
-        instance = db.session.get(TelemetryTable, instance_id)
+        session = read_db.session if read_only else db.session
+        instance = session.get(TelemetryTable, instance_id)
 
         if not isinstance(instance, TelemetryTable):
             raise TypeError("Instance not found.")
@@ -90,13 +318,57 @@ class InstanceManagerEndpoint:
             """
 
             try:
-                new_instance = TelemetryTable(
-                    default_autopilot_parameters={}, autopilot_parameters={}, boat_status={}, waypoints=[], boat_status_mapping=[]
-                )
-                db.session.add(new_instance)
+                # one INSERT ... RETURNING, no reload — see python-source.instructions.md#Instance creation
+                (new_instance_id,) = TelemetryTable.create_many(1)
                 db.session.commit()
+                instance_names.set_name(new_instance_id, default_instance_name(new_instance_id))
 
-                return jsonify(new_instance.instance_id), 200
+                return jsonify(new_instance_id), 200
+
+            except Exception as e:
+                db.session.rollback()
+                return jsonify(str(e)), 500
+
+        @self._blueprint.route("/create_many", methods=["GET"])
+        @shared_lock_manager.require_write_lock
+        def create_many_instances() -> ResponseType:
+            """
+            Create ``n`` new telemetry instances in a single transaction.
+
+            Method: GET
+
+            The number of instances is read from the ``n`` query parameter (1 to ``MAX_CREATE_MANY``).
+            An optional ``config_hash`` query parameter starts every instance on that stored config,
+            with its default parameters.
+
+            Returns
+            -------
+            ResponseType
+                A tuple containing a JSON response with the list of new instance IDs and a status code of 200,
+                or an error message if ``n`` is invalid or the config is not found.
+            """
+
+            try:
+                count = request.args.get("n", type=int)
+                if count is None or not 1 <= count <= MAX_CREATE_MANY:
+                    raise ValueError(f"Query parameter 'n' must be an integer between 1 and {MAX_CREATE_MANY}.")
+
+                # a fleet shares one config reference — see python-source.instructions.md#Parameter storage by reference
+                config_hash = request.args.get("config_hash")
+                values = config_columns(config_hash, config_store.get(config_hash)) if config_hash else None
+
+                new_instance_ids = TelemetryTable.create_many(count, values)
+                db.session.commit()
+                for new_instance_id in new_instance_ids:
+                    instance_names.set_name(new_instance_id, default_instance_name(new_instance_id))
+
+                return jsonify(new_instance_ids), 200
+
+            except TypeError as e:
+                return jsonify(str(e)), 404
+
+            except ValueError as e:
+                return jsonify(str(e)), 400
 
             except Exception as e:
                 db.session.rollback()
@@ -119,7 +391,10 @@ class InstanceManagerEndpoint:
             try:
                 telemetry_instance = self._get_instance(instance_id)
                 db.session.delete(telemetry_instance)
+                # one list for every delete path; see python-source.instructions.md#Instance cleanup
+                forget_instances([instance_id])
                 db.session.commit()
+                discard_instances([instance_id])
                 return jsonify(f"Successfully deleted instance {instance_id}."), 200
 
             except TypeError as e:
@@ -145,7 +420,9 @@ class InstanceManagerEndpoint:
 
             try:
                 num_deleted = int(db.session.execute(db.delete(TelemetryTable)).rowcount)
+                forget_instances(None)
                 db.session.commit()
+                discard_instances(None)
                 return jsonify(f"Successfully deleted {num_deleted} instances."), 200
 
             except Exception as e:
@@ -169,11 +446,17 @@ class InstanceManagerEndpoint:
             try:
                 timeout = 5.0
                 cutoff = datetime.now(UTC) - timedelta(minutes=timeout)
-                num_deleted = int(
-                    db.session.execute(db.delete(TelemetryTable).where(TelemetryTable.updated_at < cutoff)).rowcount
+                deleted_ids = (
+                    db.session.execute(
+                        db.delete(TelemetryTable).where(TelemetryTable.updated_at < cutoff).returning(TelemetryTable.instance_id)
+                    )
+                    .scalars()
+                    .all()
                 )
-
+                num_deleted = len(deleted_ids)
+                forget_instances(deleted_ids)
                 db.session.commit()
+                discard_instances(deleted_ids)
                 count_clean_instances_deletions(num_deleted)
                 return jsonify(f"Successfully deleted {num_deleted} inactive instances."), 200
 
@@ -220,7 +503,6 @@ class InstanceManagerEndpoint:
                 return jsonify(str(e)), 500
 
         @self._blueprint.route("/get_user/<int:instance_id>", methods=["GET"])
-        @shared_lock_manager.require_read_lock
         def get_instance_user(instance_id: int) -> ResponseType:
             """
             Get the user of a telemetry instance by its ID.
@@ -239,7 +521,7 @@ class InstanceManagerEndpoint:
             """
 
             try:
-                telemetry_instance = self._get_instance(instance_id)
+                telemetry_instance = self._get_instance(instance_id, read_only=True)
                 return jsonify(telemetry_instance.user), 200
 
             except TypeError as e:
@@ -272,6 +554,10 @@ class InstanceManagerEndpoint:
             try:
                 telemetry_instance = self._get_instance(instance_id)
 
+                default_name = _DEFAULT_NAME_PATTERN.fullmatch(instance_name)
+                if default_name is not None and int(default_name.group(1)) != instance_id:
+                    raise ValueError("Names of the form 'Unnamed instance #<id>' are reserved for that instance.")
+
                 conflicting_id = (
                     db.session.execute(
                         db.select(TelemetryTable.instance_id).where(
@@ -286,6 +572,7 @@ class InstanceManagerEndpoint:
 
                 telemetry_instance.instance_identifier = instance_name
                 db.session.commit()
+                instance_names.set_name(instance_id, instance_name)
 
                 return jsonify(f"Instance {instance_id} name set to {instance_name}."), 200
 
@@ -300,7 +587,6 @@ class InstanceManagerEndpoint:
                 return jsonify(str(e)), 500
 
         @self._blueprint.route("/get_name/<int:instance_id>", methods=["GET"])
-        @shared_lock_manager.require_read_lock
         def get_instance_name(instance_id: int) -> ResponseType:
             """
             Get the name of a telemetry instance by its ID.
@@ -319,7 +605,7 @@ class InstanceManagerEndpoint:
             """
 
             try:
-                telemetry_instance = self._get_instance(instance_id)
+                telemetry_instance = self._get_instance(instance_id, read_only=True)
                 return jsonify(telemetry_instance.instance_identifier), 200
 
             except TypeError as e:
@@ -383,7 +669,6 @@ class InstanceManagerEndpoint:
                 return jsonify(str(e)), 500
 
         @self._blueprint.route("/get_diagnostic_message/<int:instance_id>", methods=["GET"])
-        @shared_lock_manager.require_read_lock
         def get_diagnostic_message(instance_id: int) -> ResponseType:
             """
             Get the diagnostic message of a telemetry instance by its ID.
@@ -403,7 +688,7 @@ class InstanceManagerEndpoint:
             """
 
             try:
-                telemetry_instance = self._get_instance(instance_id)
+                telemetry_instance = self._get_instance(instance_id, read_only=True)
                 return jsonify(telemetry_instance.diagnostic_message), 200
 
             except TypeError as e:
@@ -413,7 +698,6 @@ class InstanceManagerEndpoint:
                 return jsonify(str(e)), 500
 
         @self._blueprint.route("/get_id/<instance_name>", methods=["GET"])
-        @shared_lock_manager.require_read_lock
         def get_instance_id(instance_name: str) -> ResponseType:
             """
             Get the ID of a telemetry instance by its name.
@@ -432,13 +716,12 @@ class InstanceManagerEndpoint:
             """
 
             try:
-                telemetry_instance = db.session.execute(
-                    db.select(TelemetryTable).where(TelemetryTable.instance_identifier == instance_name)
-                ).scalar_one_or_none()
-                if not isinstance(telemetry_instance, TelemetryTable):
+                # served from memory — see python-source.instructions.md#Instance name cache
+                instance_id = instance_names.get_id(instance_name)
+                if instance_id is None:
                     raise TypeError("Instance not found.")
 
-                return jsonify(telemetry_instance.instance_id), 200
+                return jsonify(instance_id), 200
 
             except TypeError as e:
                 return jsonify(str(e)), 404
@@ -447,7 +730,6 @@ class InstanceManagerEndpoint:
                 return jsonify(str(e)), 500
 
         @self._blueprint.route("/get_instance_info/<int:instance_id>", methods=["GET"])
-        @shared_lock_manager.require_read_lock
         def get_instance_info(instance_id: int) -> ResponseType:
             """
             Get detailed information about a telemetry instance by its ID.
@@ -467,7 +749,7 @@ class InstanceManagerEndpoint:
             """
 
             try:
-                telemetry_instance = self._get_instance(instance_id)
+                telemetry_instance = self._get_instance(instance_id, read_only=True)
                 return jsonify(telemetry_instance.to_dict()), 200
 
             except TypeError as e:
@@ -477,36 +759,69 @@ class InstanceManagerEndpoint:
                 return jsonify(str(e)), 500
 
         @self._blueprint.route("/get_all_instance_info", methods=["GET"])
-        @shared_lock_manager.require_read_lock
         def get_all_instance_info() -> ResponseType:
             """
-            Get detailed information about all telemetry instances.
+            Get detailed information about telemetry instances, most recently updated first.
 
             Method: GET
 
+            Optional query parameters narrow and page the listing: ``user`` (exact), ``name_prefix``
+            (prefix of ``instance_identifier``), ``config_hash`` (exact ``current_config_hash``),
+            ``active_since`` (ISO 8601, compared to ``updated_at``), ``limit`` (1 to ``MAX_INSTANCE_INFO_PAGE``;
+            without it every matching instance is returned) and ``after`` (the ``X-Next-Cursor`` of the previous page).
+
             Returns
             -------
             ResponseType
-                A tuple containing a JSON response with a list of all instance details and a 200 status,
-                or an error message if the retrieval fails.
+                A tuple containing a JSON response with a list of instance details and a 200 status,
+                or an error message if a query parameter is invalid or the retrieval fails.
+                When more rows match than ``limit``, the ``X-Next-Cursor`` header holds the cursor for the next page.
             """
 
             try:
-                # column-limited select skips the fat JSON columns — see
-                # python-source.instructions.md#get_all_instance_info
+                page_size = request.args.get("limit", type=int)
+                if "limit" in request.args and (page_size is None or not 1 <= page_size <= MAX_INSTANCE_INFO_PAGE):
+                    raise ValueError(f"Query parameter 'limit' must be an integer between 1 and {MAX_INSTANCE_INFO_PAGE}.")
+
+                # column-limited select skips the fat JSON columns; filters and keyset order are served
+                # by indexes — see python-source.instructions.md#get_all_instance_info
+                query = db.select(
+                    TelemetryTable.instance_id,
+                    TelemetryTable.instance_identifier,
+                    TelemetryTable.user,
+                    TelemetryTable.current_config_hash,
+                    TelemetryTable.created_at,
+                    TelemetryTable.updated_at,
+                ).order_by(TelemetryTable.updated_at.desc(), TelemetryTable.instance_id.desc())
+
+                if (user := request.args.get("user")) is not None:
+                    query = query.where(TelemetryTable.user == user)
+
+                if name_prefix := request.args.get("name_prefix"):
+                    query = query.where(TelemetryTable.name_prefix_clause(name_prefix))
+
+                if (config_hash := request.args.get("config_hash")) is not None:
+                    query = query.where(TelemetryTable.current_config_hash == config_hash)
+
+                if (active_since := request.args.get("active_since")) is not None:
+                    query = query.where(TelemetryTable.updated_at >= _parse_since(active_since))
+
+                if (after := request.args.get("after")) is not None:
+                    query = query.where(db.tuple_(TelemetryTable.updated_at, TelemetryTable.instance_id) < _decode_cursor(after))
+
+                if page_size is not None:
+                    # one extra row tells us whether there is a next page
+                    query = query.limit(page_size + 1)
+
                 rows = cast(
-                    "Sequence[tuple[int, str | None, str, str, datetime, datetime]]",
-                    db.session.execute(
-                        db.select(
-                            TelemetryTable.instance_id,
-                            TelemetryTable.instance_identifier,
-                            TelemetryTable.user,
-                            TelemetryTable.current_config_hash,
-                            TelemetryTable.created_at,
-                            TelemetryTable.updated_at,
-                        )
-                    ).all(),
+                    "Sequence[tuple[int, str | None, str, str, datetime, datetime]]", read_db.session.execute(query).all()
                 )
+
+                next_cursor = None
+                if page_size is not None and len(rows) > page_size:
+                    rows = rows[:page_size]
+                    next_cursor = _encode_cursor(rows[-1][5], rows[-1][0])
+
                 instances_info = [
                     {
                         "instance_id": instance_id,
@@ -519,13 +834,20 @@ class InstanceManagerEndpoint:
                     for instance_id, instance_identifier, user, current_config_hash, created_at, updated_at in rows
                 ]
 
-                return jsonify(instances_info), 200
+                response = jsonify(instances_info)
+                if next_cursor is not None:
+                    response.headers["X-Next-Cursor"] = next_cursor
+
+            except ValueError as e:
+                return jsonify(str(e)), 400
 
             except Exception as e:
                 return jsonify(str(e)), 500
 
+            else:
+                return response, 200
+
         @self._blueprint.route("/get_ids", methods=["GET"])
-        @shared_lock_manager.require_read_lock
         def get_ids() -> ResponseType:
             """
             Return all telemetry instance IDs.
@@ -539,9 +861,98 @@ class InstanceManagerEndpoint:
             """
 
             try:
-                return jsonify(TelemetryTable.get_all_ids()), 200
+                return jsonify(TelemetryTable.get_all_ids(read_db.session)), 200
+
+            except Exception as e:
+                return jsonify(str(e)), 500
+
+        @self._blueprint.route("/export", methods=["GET"])
+        def export_instances() -> ResponseType:
+            """
+            Stream the full state of every telemetry instance as NDJSON.
+
+            Method: GET
+
+            Returns
+            -------
+            ResponseType
+                A tuple containing a streamed ``application/x-ndjson`` response with one instance per line,
+                in ``instance_id`` order, or an error message if an unexpected error occurs.
+            """
+
+            try:
+                # constant memory — see python-source.instructions.md#Bulk export and import (NDJSON)
+                batch_size = int(current_app.config.get("EXPORT_BATCH_SIZE", DEFAULT_EXPORT_BATCH_SIZE))
+                statement = db.select(TelemetryTable).order_by(TelemetryTable.instance_id).execution_options(yield_per=batch_size)
+
+                def generate() -> Iterator[bytes]:
+                    for telemetry_instance in read_db.session.execute(statement).scalars():
+                        yield encode_line(_export_record(telemetry_instance))
+
+                return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE), 200
 
             except Exception as e:
                 return jsonify(str(e)), 500
 
+        @self._blueprint.route("/import", methods=["POST"])
+        @shared_lock_manager.require_write_lock
+        def import_instances() -> ResponseType:
+            """
+            Create telemetry instances from a streamed NDJSON body, as written by ``export``.
+
+            Method: POST
+
+            Every record becomes a new instance with a new ID. Default names are renamed for the new ID;
+            records whose name is already taken are skipped. Configs should be imported first so
+            ``current_config_hash`` resolves. Rows are committed in chunks, so the ones before an
+            invalid line stay imported.
+
+            Returns
+            -------
+            ResponseType
+                A tuple containing a JSON response with the ``imported`` / ``skipped`` counts,
+                elapsed ``seconds`` and ``rows_per_second``, or an error message naming the first invalid line.
+            """
+
+            report = ImportReport()
+            try:
+                chunk_size = int(current_app.config.get("IMPORT_CHUNK_SIZE", DEFAULT_IMPORT_CHUNK_SIZE))
+                next_instance_id = db.session.execute(db.select(TelemetryTable.next_instance_id())).scalar_one()
+
+                for chunk in chunked(iter_records(request.stream), chunk_size):
+                    new_names: dict[str, int] = {}
+                    new_positions: dict[int, tuple[float, float] | None] = {}
+                    for line_number, record in chunk:
+                        name = record.get("instance_identifier")
+                        if not isinstance(name, str) or not name or _DEFAULT_NAME_PATTERN.fullmatch(name):
+                            name = default_instance_name(next_instance_id)
+                        elif name in new_names or instance_names.get_id(name) is not None:
+                            report.skipped += 1
+                            continue
+
+                        instance = _import_instance(line_number, record, next_instance_id, name)
+                        db.session.add(instance)
+                        new_names[name] = next_instance_id
+                        new_positions[next_instance_id] = status_position(
+                            instance.boat_status, instance.boat_status_position_fields
+                        )
+                        next_instance_id += 1
+
+                    db.session.commit()
+                    for name, instance_id in new_names.items():
+                        instance_names.set_name(instance_id, name)
+                    for instance_id, position in new_positions.items():
+                        position_index.update(instance_id, position)
+                    report.imported += len(new_names)
+
+                return jsonify(report.to_dict()), 200
+
+            except (TypeError, ValueError) as e:
+                db.session.rollback()
+                return jsonify({"error": str(e), **report.to_dict()}), 400
+
+            except Exception as e:
+                db.session.rollback()
+                return jsonify(str(e)), 500
+
         return f"instance_manager routes registered successfully: {self._blueprint.url_prefix}"
@@ -1,10 +1,29 @@
 from typing import Literal
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request
 
 from autoboat_telemetry_server import shared_lock_manager
+from autoboat_telemetry_server.broadcast import BroadcastReport, target_clause
 from autoboat_telemetry_server.models import TelemetryTable, db
+from autoboat_telemetry_server.positions import status_position
+from autoboat_telemetry_server.read_only import read_db
+from autoboat_telemetry_server.route_geometry import GeometryCache, RouteGeometry
 from autoboat_telemetry_server.types import ResponseType
+from autoboat_telemetry_server.waypoint_edits import apply_ops, ops_since, parse_ops, record_edit
+from autoboat_telemetry_server.waypoint_storage import (
+    WAYPOINT_DTYPE,
+    WaypointArray,
+    get_packed,
+    get_points,
+    get_waypoints,
+    parse_json,
+    parse_packed,
+    set_waypoints,
+    waypoint_columns,
+)
+
+# response header carrying the instance's waypoints_version
+VERSION_HEADER = "X-Waypoints-Version"
 
 
 class WaypointEndpoint:
@@ -12,6 +31,7 @@ class WaypointEndpoint:
 
     def __init__(self) -> None:
         self._blueprint = Blueprint(name="waypoints_page", import_name=__name__, url_prefix="/waypoints")
+        self._geometry_cache = GeometryCache()
         self._register_routes()
 
     @property
@@ -20,7 +40,7 @@ class WaypointEndpoint:
 
         return self._blueprint
 
-    def _get_instance(self, instance_id: int) -> TelemetryTable:
+    def _get_instance(self, instance_id: int, *, read_only: bool = False) -> TelemetryTable:
         """
         Helper function to retrieve a telemetry instance by its ID.
 
@@ -28,6 +48,8 @@ class WaypointEndpoint:
         ----------
         instance_id
             The ID of the telemetry instance to retrieve.
+        read_only
+            Whether to load it through the lock-free read-only session.
 
         Returns
         -------
@@ -40,13 +62,53 @@ class WaypointEndpoint:
             If the instance with the given ID does not exist.
         """
 
-        instance = db.session.get(TelemetryTable, instance_id)
+        session = read_db.session if read_only else db.session
+        instance = session.get(TelemetryTable, instance_id)
 
         if not isinstance(instance, TelemetryTable):
             raise TypeError("Instance not found.")
 
         return instance
 
+    def _geometry(self, instance: TelemetryTable) -> RouteGeometry:
+        """
+        Return the cached geometry of the instance's current waypoints.
+
+        Parameters
+        ----------
+        instance
+            The telemetry instance.
+
+        Returns
+        -------
+        RouteGeometry
+            Per-leg distances and bearings, and the segment index.
+
+        Raises
+        ------
+        ValueError
+            If the instance has fewer than two waypoints.
+        """
+
+        packed = get_packed(instance)
+        if len(packed) < 2 * 2 * WAYPOINT_DTYPE.itemsize:
+            raise ValueError("The route needs at least two waypoints.")
+
+        return self._geometry_cache.get(packed)
+
+    def _warm_geometry(self, points: WaypointArray) -> None:
+        """
+        Precompute the geometry of newly written waypoints, so the first progress request is a cache hit.
+
+        Parameters
+        ----------
+        points
+            The ``(n, 2)`` waypoints that were just committed.
+        """
+
+        if len(points) >= 2:
+            self._geometry_cache.get(points.astype(WAYPOINT_DTYPE, copy=False).tobytes())
+
     def _register_routes(self) -> str:
         """
         Registers the routes for the waypoints endpoint.
@@ -73,7 +135,6 @@ class WaypointEndpoint:
             return "waypoints route testing!"
 
         @self._blueprint.route("/get/<int:instance_id>", methods=["GET"])
-        @shared_lock_manager.require_read_lock
         def get_route(instance_id: int) -> ResponseType:
             """
             Get the current waypoints for a specific telemetry instance.
@@ -93,8 +154,9 @@ class WaypointEndpoint:
             """
 
             try:
-                telemetry_instance = self._get_instance(instance_id)
-                return jsonify(telemetry_instance.waypoints), 200
+                telemetry_instance = self._get_instance(instance_id, read_only=True)
+                response = jsonify(get_waypoints(telemetry_instance))
+                response.headers[VERSION_HEADER] = str(telemetry_instance.waypoints_version)
 
             except TypeError as e:
                 return jsonify(str(e)), 404
@@ -102,6 +164,9 @@ class WaypointEndpoint:
             except Exception as e:
                 return jsonify(str(e)), 500
 
+            else:
+                return response, 200
+
         @self._blueprint.route("/get_new/<int:instance_id>", methods=["GET"])
         @shared_lock_manager.require_write_lock
         def get_new_route(instance_id: int) -> ResponseType:
@@ -111,6 +176,10 @@ class WaypointEndpoint:
 
             Method: GET
 
+            With ``?since=<version>`` (the last ``waypoints_version`` the caller applied), the response is
+            ``{"version", "ops"}`` with only the edit operations since then when they are all logged,
+            else ``{"version", "waypoints"}``, and ``{}`` if the caller is up to date.
+
             Parameters
             ----------
             instance_id
@@ -124,22 +193,49 @@ class WaypointEndpoint:
             """
 
             try:
+                since = request.args.get("since", type=int)
+                if "since" in request.args and (since is None or since < 0):
+                    raise ValueError("Query parameter 'since' must be a non-negative integer.")
+
                 telemetry_instance = self._get_instance(instance_id)
-                if telemetry_instance.waypoints_new_flag is False:
+                version = telemetry_instance.waypoints_version
+                if since is None:
+                    if telemetry_instance.waypoints_new_flag is False:
+                        return jsonify({}), 200
+
+                    payload: object = get_waypoints(telemetry_instance)
+
+                elif since == version:
                     return jsonify({}), 200
 
+                else:
+                    # only the ops the boat is missing — see python-source.instructions.md#Waypoint edits
+                    ops = ops_since(db.session, instance_id, since, version)
+                    payload = (
+                        {"version": version, "ops": ops}
+                        if ops is not None
+                        else {"version": version, "waypoints": get_waypoints(telemetry_instance)}
+                    )
+
                 telemetry_instance.waypoints_new_flag = False
                 db.session.commit()
 
-                return jsonify(telemetry_instance.waypoints), 200
+                response = jsonify(payload)
+                response.headers[VERSION_HEADER] = str(version)
 
             except TypeError as e:
                 return jsonify(str(e)), 404
 
+            except ValueError as e:
+                return jsonify(str(e)), 400
+
             except Exception as e:
                 db.session.rollback()
                 return jsonify(str(e)), 500
 
+            else:
+                return response, 200
+
         @self._blueprint.route("/set/<int:instance_id>", methods=["POST"])
         @shared_lock_manager.require_write_lock
         def set_route(instance_id: int) -> ResponseType:
@@ -162,28 +258,310 @@ class WaypointEndpoint:
 
             try:
                 telemetry_instance = self._get_instance(instance_id)
-                waypoints_data = request.json
-                if not isinstance(waypoints_data, list):
-                    raise TypeError("Invalid waypoints data format. Expected a list of [x, y] coordinates.")
+                # one vectorized pass instead of a per-point loop — see python-source.instructions.md#Packed waypoints
+                points = parse_json(request.json)
+                set_waypoints(telemetry_instance, points)
+                telemetry_instance.waypoints_new_flag = True
+                telemetry_instance.waypoints_version += 1
+                db.session.commit()
+                self._warm_geometry(points)
+
+                return jsonify("Waypoints updated successfully."), 200
+
+            except TypeError as e:
+                return jsonify(str(e)), 400
+
+            except ValueError as e:
+                return jsonify(str(e)), 400
+
+            except Exception as e:
+                db.session.rollback()
+                return jsonify(str(e)), 500
 
-                for point in waypoints_data:
-                    if not (isinstance(point, (list, tuple)) and len(point) == 2):
-                        raise TypeError("Invalid waypoint format. Each waypoint must be a list or tuple of two coordinates.")
+        @self._blueprint.route("/get_fast/<int:instance_id>", methods=["GET"])
+        def get_fast_route(instance_id: int) -> ResponseType:
+            """
+            Get the current waypoints for a specific telemetry instance as packed binary.
 
-                    if not all(isinstance(coord, (int, float)) for coord in point):
-                        raise TypeError("Invalid coordinate type. Each coordinate must be an integer or float.")
+            Method: GET
 
-                telemetry_instance.waypoints = waypoints_data
+            Parameters
+            ----------
+            instance_id
+                The ID of the telemetry instance to retrieve the waypoints for.
+
+            Returns
+            -------
+            ResponseType
+                A tuple containing an ``application/octet-stream`` response of little-endian float64
+                ``latitude, longitude`` pairs, or an error message if the instance is not found.
+            """
+
+            try:
+                telemetry_instance = self._get_instance(instance_id, read_only=True)
+                response = Response(get_packed(telemetry_instance), mimetype="application/octet-stream")
+                response.headers[VERSION_HEADER] = str(telemetry_instance.waypoints_version)
+
+            except TypeError as e:
+                return jsonify(str(e)), 404
+
+            except Exception as e:
+                return jsonify(str(e)), 500
+
+            else:
+                return response, 200
+
+        @self._blueprint.route("/set_fast/<int:instance_id>", methods=["POST"])
+        @shared_lock_manager.require_write_lock
+        def set_fast_route(instance_id: int) -> ResponseType:
+            """
+            Set the waypoints from a packed binary request body.
+
+            Method: POST
+
+            The body is little-endian float64 ``latitude, longitude`` pairs, 16 bytes per waypoint.
+
+            Parameters
+            ----------
+            instance_id
+                The ID of the telemetry instance to set the waypoints for.
+
+            Returns
+            -------
+            ResponseType
+                A tuple containing a JSON response confirming the waypoints have been updated successfully,
+                or an error message if the instance is not found or if the body is invalid.
+            """
+
+            try:
+                telemetry_instance = self._get_instance(instance_id)
+                points = parse_packed(request.get_data())
+                set_waypoints(telemetry_instance, points)
                 telemetry_instance.waypoints_new_flag = True
+                telemetry_instance.waypoints_version += 1
                 db.session.commit()
+                self._warm_geometry(points)
 
                 return jsonify("Waypoints updated successfully."), 200
 
             except TypeError as e:
                 return jsonify(str(e)), 400
 
+            except ValueError as e:
+                return jsonify(str(e)), 400
+
             except Exception as e:
                 db.session.rollback()
                 return jsonify(str(e)), 500
 
+        @self._blueprint.route("/edit/<int:instance_id>", methods=["POST"])
+        @shared_lock_manager.require_write_lock
+        def edit_route(instance_id: int) -> ResponseType:
+            """
+            Apply insert, delete, move and replace operations to the waypoints, as one new version.
+
+            Method: POST
+
+            The body is ``{"ops": [...], "base_version": <optional int>}``. The operations are applied in order;
+            if any is invalid none are. A ``base_version`` other than the current version is rejected with 409.
+
+            Parameters
+            ----------
+            instance_id
+                The ID of the telemetry instance to edit the waypoints of.
+
+            Returns
+            -------
+            ResponseType
+                A tuple containing a JSON response with the new ``version`` and waypoint ``count``,
+                or an error message if the instance is not found, the version is stale, or the operations are invalid.
+            """
+
+            try:
+                telemetry_instance = self._get_instance(instance_id)
+                body = request.json
+                if not isinstance(body, dict):
+                    raise TypeError("Invalid edit format. Expected a dictionary with 'ops'.")
+
+                base_version = body.get("base_version")
+                if base_version is not None and base_version != telemetry_instance.waypoints_version:
+                    return jsonify(
+                        {"error": "Waypoints have changed since 'base_version'.", "version": telemetry_instance.waypoints_version}
+                    ), 409
+
+                ops = parse_ops(body.get("ops"))
+                points = apply_ops(get_points(telemetry_instance), ops)
+
+                version = telemetry_instance.waypoints_version + 1
+                set_waypoints(telemetry_instance, points)
+                telemetry_instance.waypoints_new_flag = True
+                telemetry_instance.waypoints_version = version
+                record_edit(instance_id, version, ops)
+                db.session.commit()
+                self._warm_geometry(points)
+
+                return jsonify({"version": version, "count": len(points)}), 200
+
+            except TypeError as e:
+                return jsonify(str(e)), 400
+
+            except ValueError as e:
+                return jsonify(str(e)), 400
+
+            except Exception as e:
+                db.session.rollback()
+                return jsonify(str(e)), 500
+
+        @self._blueprint.route("/legs/<int:instance_id>", methods=["GET"])
+        def legs_route(instance_id: int) -> ResponseType:
+            """
+            Get the great-circle distance and initial bearing of every leg of the route.
+
+            Method: GET
+
+            Parameters
+            ----------
+            instance_id
+                The ID of the telemetry instance whose route to describe.
+
+            Returns
+            -------
+            ResponseType
+                A tuple containing a JSON response with the ``version`` and the per-leg ``distance``, ``bearing``
+                and ``cumulative_distance`` lists, or an error message if the instance is not found
+                or has fewer than two waypoints.
+            """
+
+            try:
+                telemetry_instance = self._get_instance(instance_id, read_only=True)
+                # computed once per list of waypoints — see python-source.instructions.md#Route geometry
+                geometry = self._geometry(telemetry_instance)
+                response = jsonify({"version": telemetry_instance.waypoints_version, **geometry.legs()})
+                response.headers[VERSION_HEADER] = str(telemetry_instance.waypoints_version)
+
+            except TypeError as e:
+                return jsonify(str(e)), 404
+
+            except ValueError as e:
+                return jsonify(str(e)), 400
+
+            except Exception as e:
+                return jsonify(str(e)), 500
+
+            else:
+                return response, 200
+
+        @self._blueprint.route("/progress/<int:instance_id>", methods=["GET"])
+        def progress_route(instance_id: int) -> ResponseType:
+            """
+            Locate the boat on its route: current leg, cross-track error and distance remaining.
+
+            Method: GET
+
+            The position is the instance's latest boat status, unless ``?lat=&lon=`` are given.
+
+            Parameters
+            ----------
+            instance_id
+                The ID of the telemetry instance to locate.
+
+            Returns
+            -------
+            ResponseType
+                A tuple containing a JSON response with the ``version``, ``position`` and the progress along the route,
+                or an error message if the instance is not found, has fewer than two waypoints or has no position.
+            """
+
+            try:
+                latitude = request.args.get("lat", type=float)
+                longitude = request.args.get("lon", type=float)
+                if ("lat" in request.args or "lon" in request.args) and (latitude is None or longitude is None):
+                    raise ValueError("Query parameters 'lat' and 'lon' must both be numbers.")
+
+                telemetry_instance = self._get_instance(instance_id, read_only=True)
+                geometry = self._geometry(telemetry_instance)
+
+                position = (
+                    (latitude, longitude)
+                    if latitude is not None
+                    else status_position(telemetry_instance.boat_status, telemetry_instance.boat_status_position_fields)
+                )
+                if position is None or not (abs(position[0]) <= 90 and abs(position[1]) <= 180):
+                    raise ValueError("No valid position. Set the boat status position fields or pass 'lat' and 'lon'.")
+
+                response = jsonify(
+                    {"version": telemetry_instance.waypoints_version, "position": list(position), **geometry.progress(*position)}
+                )
+                response.headers[VERSION_HEADER] = str(telemetry_instance.waypoints_version)
+
+            except TypeError as e:
+                return jsonify(str(e)), 404
+
+            except ValueError as e:
+                return jsonify(str(e)), 400
+
+            except Exception as e:
+                return jsonify(str(e)), 500
+
+            else:
+                return response, 200
+
+        @self._blueprint.route("/broadcast", methods=["POST"])
+        @shared_lock_manager.require_write_lock
+        def broadcast_route() -> ResponseType:
+            """
+            Set the same waypoints on many telemetry instances in a single transaction.
+
+            Method: POST
+
+            The body selects the targets (``instance_ids``, or ``user`` / ``name_prefix``) and holds
+            the ``waypoints`` in the format ``set`` takes.
+
+            Returns
+            -------
+            ResponseType
+                A tuple containing a JSON response with the per-instance ``results``, the ``updated``
+                count and the elapsed ``seconds``, or an error message if the body is invalid.
+            """
+
+            try:
+                body = request.json
+                if not isinstance(body, dict):
+                    raise TypeError("Invalid broadcast format. Expected a dictionary.")
+
+                clause, requested = target_clause(body)
+                points = parse_json(body.get("waypoints"))
+                columns = waypoint_columns(points)
+
+                report = BroadcastReport()
+                instance_ids = db.session.execute(db.select(TelemetryTable.instance_id).where(clause)).scalars().all()
+                report.missing(requested, instance_ids)
+
+                # every target gets the same values, so one set-based UPDATE — see python-source.instructions.md#Fleet broadcast
+                if instance_ids:
+                    db.session.execute(
+                        db.update(TelemetryTable)
+                        .where(TelemetryTable.instance_id.in_(instance_ids))
+                        .values(**columns, waypoints_new_flag=True, waypoints_version=TelemetryTable.waypoints_version + 1),
+                        execution_options={"synchronize_session": False},
+                    )
+                db.session.commit()
+                self._warm_geometry(points)
+
+                for instance_id in instance_ids:
+                    report.results[instance_id] = "updated"
+
+            except TypeError as e:
+                return jsonify(str(e)), 400
+
+            except ValueError as e:
+                return jsonify(str(e)), 400
+
+            except Exception as e:
+                db.session.rollback()
+                return jsonify(str(e)), 500
+
+            else:
+                return jsonify(report.to_dict()), 200
+
         return f"waypoints paths registered successfully: {self._blueprint.url_prefix}"
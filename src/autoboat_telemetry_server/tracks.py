@@ -0,0 +1,283 @@
+"""
+Process-local position track of every instance, served simplified for map display.
+
+See `.github/instructions/python-source.instructions.md` #"Position tracks"
+for what is recorded, how the simplification is extended block by block and how the track is bounded.
+"""
+
+__all__ = ["DEFAULT_TRACK_MAX_POINTS", "MAX_TRACK_TOLERANCES", "TRACK_BLOCK_SIZE", "TrackStore", "simplify", "tracks"]
+
+import bisect
+import math
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+
+import numpy as np
+import numpy.typing as npt
+from flask import Flask, current_app
+
+from autoboat_telemetry_server.route_geometry import EARTH_RADIUS_M
+from autoboat_telemetry_server.waypoint_storage import WAYPOINT_DTYPE, WaypointArray
+
+# positions kept per instance; one hour at 10 Hz
+DEFAULT_TRACK_MAX_POINTS = 36_000
+
+# points simplified together; a full block is simplified once and never revisited
+TRACK_BLOCK_SIZE = 256
+
+# simplified versions kept per track, one per tolerance
+MAX_TRACK_TOLERANCES = 8
+
+# metres per degree of latitude
+_METRES_PER_DEGREE = math.radians(1) * EARTH_RADIUS_M
+
+
+def simplify(points: WaypointArray, tolerance: float) -> npt.NDArray[np.intp]:
+    """
+    Douglas-Peucker simplification of a short polyline.
+
+    Points are projected onto a plane tangent at the first point, which is accurate for the
+    few hundred metres a block spans.
+
+    Parameters
+    ----------
+    points
+        ``(n, 2)`` latitude / longitude pairs in degrees.
+    tolerance
+        Maximum distance in metres between a dropped point and the simplified polyline.
+
+    Returns
+    -------
+    npt.NDArray[np.intp]
+        Indices of the kept points, ascending; the first and last are always kept.
+    """
+
+    count = len(points)
+    if count <= 2:
+        return np.arange(count)
+
+    latitude, longitude = points[0]
+    x = ((points[:, 1] - longitude + 180) % 360 - 180) * _METRES_PER_DEGREE * math.cos(math.radians(latitude))
+    y = (points[:, 0] - latitude) * _METRES_PER_DEGREE
+
+    keep = np.zeros(count, dtype=bool)
+    keep[[0, -1]] = True
+    ranges = [(0, count - 1)]
+    while ranges:
+        first, last = ranges.pop()
+        if last - first < 2:
+            continue
+
+        # distance of every inner point to the segment first -> last, in one pass
+        dx, dy = x[last] - x[first], y[last] - y[first]
+        px, py = x[first + 1 : last] - x[first], y[first + 1 : last] - y[first]
+        length_squared = dx * dx + dy * dy
+        along = np.clip((px * dx + py * dy) / length_squared, 0.0, 1.0) if length_squared > 0 else 0.0
+        distances = np.hypot(px - along * dx, py - along * dy)
+
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance:
+            split = first + 1 + farthest
+            keep[split] = True
+            ranges += [(first, split), (split, last)]
+
+    return np.flatnonzero(keep)
+
+
+class _Simplified:
+    """One tolerance's simplification of a track, as sequence numbers of the kept points."""
+
+    def __init__(self) -> None:
+        # kept points of the full blocks; the last one anchors the next block
+        self.frozen: list[int] = []
+        # kept points after the anchor, recomputed while the partial block grows
+        self.tail: list[int] = []
+        # sequence number one past the last point covered
+        self.extent = 0
+
+
+class _Track:
+    """One instance's positions, numbered by a sequence that survives trimming."""
+
+    def __init__(self, capacity: int) -> None:
+        self.lock = threading.Lock()
+        self.points = np.empty((capacity, 2), dtype=WAYPOINT_DTYPE)
+        self.count = 0
+        # sequence number of points[0]
+        self.first = 0
+        self.simplified: OrderedDict[float, _Simplified] = OrderedDict()
+
+    @property
+    def end(self) -> int:
+        return self.first + self.count
+
+    def window(self, start: int, stop: int) -> WaypointArray:
+        return self.points[start - self.first : stop - self.first]
+
+    def append(self, position: tuple[float, float], max_points: int) -> None:
+        if self.count and tuple(self.points[self.count - 1]) == position:
+            return
+
+        if self.count == len(self.points):
+            if self.count >= max_points:
+                # drop the oldest quarter so trimming is amortised over many appends
+                dropped = max(1, self.count // 4)
+                self.points[: self.count - dropped] = self.points[dropped : self.count]
+                self.count -= dropped
+                self.first += dropped
+                self._trim()
+            else:
+                grown = np.empty((min(2 * len(self.points), max_points), 2), dtype=WAYPOINT_DTYPE)
+                grown[: self.count] = self.points[: self.count]
+                self.points = grown
+
+        self.points[self.count] = position
+        self.count += 1
+
+    def _trim(self) -> None:
+        for simplified in self.simplified.values():
+            del simplified.frozen[: bisect.bisect_left(simplified.frozen, self.first)]
+            if not simplified.frozen:
+                # the anchor was dropped: start again from the oldest point left
+                simplified.tail.clear()
+                simplified.extent = 0
+
+    def extend(self, simplified: _Simplified, tolerance: float) -> None:
+        if simplified.extent == self.end:
+            return
+
+        if not simplified.frozen:
+            simplified.frozen.append(self.first)
+
+        anchor = simplified.frozen[-1]
+        while self.end - anchor >= TRACK_BLOCK_SIZE:
+            stop = anchor + TRACK_BLOCK_SIZE
+            simplified.frozen.extend((anchor + simplify(self.window(anchor, stop), tolerance)[1:]).tolist())
+            anchor = stop - 1
+
+        simplified.tail = (anchor + simplify(self.window(anchor, self.end), tolerance)[1:]).tolist()
+        simplified.extent = self.end
+
+
+class _TrackState:
+    """Per-app tracks, stored in ``app.extensions["tracks"]``."""
+
+    def __init__(self, max_points: int) -> None:
+        self.lock = threading.Lock()
+        self.max_points = max_points
+        self.tracks: dict[int, _Track] = {}
+
+
+class TrackStore:
+    """
+    Every instance's positions since the server started, up to ``TRACK_MAX_POINTS`` each.
+
+    Status routes call ``append`` after they commit, and delete paths call ``discard`` / ``clear``.
+    """
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Register empty tracks for ``app``.
+
+        Parameters
+        ----------
+        app
+            The Flask app.
+        """
+
+        app.extensions["tracks"] = _TrackState(max(2, int(app.config.get("TRACK_MAX_POINTS", DEFAULT_TRACK_MAX_POINTS))))
+
+    @property
+    def _state(self) -> _TrackState:
+        return current_app.extensions["tracks"]
+
+    def _track(self, instance_id: int) -> _Track | None:
+        state = self._state
+        with state.lock:
+            return state.tracks.get(instance_id)
+
+    def append(self, instance_id: int, position: tuple[float, float] | None) -> None:
+        """
+        Record an instance's committed position; a repeat of the last position is skipped.
+
+        Parameters
+        ----------
+        instance_id
+            The instance whose boat status was written.
+        position
+            Its ``(latitude, longitude)``, or ``None`` if the status has no valid position.
+        """
+
+        if position is None:
+            return
+
+        state = self._state
+        with state.lock:
+            track = state.tracks.get(instance_id)
+            if track is None:
+                track = state.tracks[instance_id] = _Track(min(64, state.max_points))
+
+        with track.lock:
+            track.append(position, state.max_points)
+
+    def discard(self, instance_ids: Iterable[int]) -> None:
+        """
+        Forget the tracks of deleted instances.
+
+        Parameters
+        ----------
+        instance_ids
+            IDs of the instances whose deletion was committed.
+        """
+
+        state = self._state
+        with state.lock:
+            for instance_id in instance_ids:
+                state.tracks.pop(instance_id, None)
+
+    def clear(self) -> None:
+        """Forget every track, e.g. after ``delete_all``."""
+
+        state = self._state
+        with state.lock:
+            state.tracks.clear()
+
+    def simplified(self, instance_id: int, tolerance: float) -> WaypointArray:
+        """
+        Return an instance's track, simplified so no recorded point is more than ``tolerance`` from it.
+
+        Parameters
+        ----------
+        instance_id
+            The instance whose track to return.
+        tolerance
+            Maximum distance in metres; ``0`` returns every recorded point.
+
+        Returns
+        -------
+        WaypointArray
+            ``(n, 2)`` latitude / longitude pairs, oldest first; empty if nothing was recorded.
+        """
+
+        track = self._track(instance_id)
+        if track is None:
+            return np.empty((0, 2), dtype=WAYPOINT_DTYPE)
+
+        with track.lock:
+            if tolerance == 0:
+                return track.points[: track.count].copy()
+
+            simplified = track.simplified.get(tolerance)
+            if simplified is None:
+                simplified = track.simplified[tolerance] = _Simplified()
+                while len(track.simplified) > MAX_TRACK_TOLERANCES:
+                    track.simplified.popitem(last=False)
+            track.simplified.move_to_end(tolerance)
+
+            track.extend(simplified, tolerance)
+            kept = np.array(simplified.frozen + simplified.tail, dtype=np.intp)
+            return track.points[kept - track.first]
+
+
+tracks = TrackStore()
@@ -0,0 +1,225 @@
+"""
+Incremental waypoint edit operations and the per-instance log of recent edits.
+
+See `.github/instructions/python-source.instructions.md` #"Waypoint edits"
+for the operations, the version number and how ``get_new`` replays them.
+"""
+
+__all__ = [
+    "DEFAULT_WAYPOINT_EDIT_LOG_SIZE",
+    "MAX_WAYPOINT_EDIT_OPS",
+    "apply_ops",
+    "forget",
+    "forget_all",
+    "ops_since",
+    "parse_ops",
+    "record_edit",
+]
+
+from collections.abc import Iterable
+from typing import Any
+
+import numpy as np
+from flask import current_app
+from sqlalchemy.orm import Session, scoped_session
+
+from autoboat_telemetry_server.models import WaypointEditTable, db
+from autoboat_telemetry_server.waypoint_storage import WAYPOINT_DTYPE, WaypointArray, parse_json
+
+# versions whose ops are kept per instance; a boat further behind gets the full list
+DEFAULT_WAYPOINT_EDIT_LOG_SIZE = 50
+
+# upper bound for the ops of one /waypoints/edit request
+MAX_WAYPOINT_EDIT_OPS = 1000
+
+# the integer fields of each operation, in the order they are read
+_OP_FIELDS: dict[str, tuple[str, ...]] = {
+    "insert": ("index",),
+    "delete": ("start", "stop"),
+    "move": ("from", "to"),
+    "replace": ("start", "stop"),
+}
+
+
+def parse_ops(ops_data: object) -> list[dict[str, Any]]:
+    """
+    Validate a list of edit operations, without applying them.
+
+    Parameters
+    ----------
+    ops_data
+        The decoded ``ops`` of the request, e.g. ``[{"op": "delete", "start": 3, "stop": 5}]``.
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        The operations with only their known fields, and ``points`` as float pairs.
+
+    Raises
+    ------
+    TypeError
+        If an operation is malformed or a field has the wrong type.
+    ValueError
+        If there are no or too many operations, or a point is out of bounds.
+    """
+
+    if not isinstance(ops_data, list):
+        raise TypeError("Invalid edit format. 'ops' must be a list of operations.")
+
+    if not 1 <= len(ops_data) <= MAX_WAYPOINT_EDIT_OPS:
+        raise ValueError(f"An edit must have between 1 and {MAX_WAYPOINT_EDIT_OPS} operations.")
+
+    ops = []
+    for position, op_data in enumerate(ops_data):
+        if not isinstance(op_data, dict) or op_data.get("op") not in _OP_FIELDS:
+            raise TypeError(f"Operation {position}: 'op' must be one of {', '.join(_OP_FIELDS)}.")
+
+        op: dict[str, Any] = {"op": op_data["op"]}
+        for field in _OP_FIELDS[op["op"]]:
+            value = op_data.get(field)
+            if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+                raise TypeError(f"Operation {position}: '{field}' must be a non-negative integer.")
+            op[field] = value
+
+        if op["op"] in {"insert", "replace"}:
+            op["points"] = parse_json(op_data.get("points")).tolist()
+
+        ops.append(op)
+
+    return ops
+
+
+def apply_ops(points: WaypointArray, ops: list[dict[str, Any]]) -> WaypointArray:
+    """
+    Apply validated operations in order, each against the result of the previous one.
+
+    Parameters
+    ----------
+    points
+        The current ``(n, 2)`` waypoints; not modified.
+    ops
+        Operations from ``parse_ops``.
+
+    Returns
+    -------
+    WaypointArray
+        The edited waypoints.
+
+    Raises
+    ------
+    ValueError
+        If an index or range is outside the waypoints at that point of the edit.
+    """
+
+    for position, op in enumerate(ops):
+        count = len(points)
+        kind = op["op"]
+
+        if kind == "insert":
+            if op["index"] > count:
+                raise ValueError(f"Operation {position}: index {op['index']} is past the end ({count} waypoints).")
+            new_points = np.asarray(op["points"], dtype=WAYPOINT_DTYPE).reshape(-1, 2)
+            points = np.concatenate((points[: op["index"]], new_points, points[op["index"] :]))
+
+        elif kind == "move":
+            if op["from"] >= count or op["to"] >= count:
+                raise ValueError(f"Operation {position}: move indexes must be below {count}.")
+            remaining = np.delete(points, op["from"], axis=0)
+            points = np.insert(remaining, op["to"], points[op["from"]], axis=0)
+
+        else:
+            if not op["start"] <= op["stop"] <= count:
+                raise ValueError(f"Operation {position}: range [{op['start']}, {op['stop']}) is not within {count} waypoints.")
+            new_points = np.asarray(op.get("points", []), dtype=WAYPOINT_DTYPE).reshape(-1, 2)
+            points = np.concatenate((points[: op["start"]], new_points, points[op["stop"] :]))
+
+    return points
+
+
+def record_edit(instance_id: int, version: int, ops: list[dict[str, Any]]) -> None:
+    """
+    Log the operations that produced ``version`` and drop versions past the log size.
+
+    Rows are added to ``db.session``; the caller commits them with the edit.
+
+    Parameters
+    ----------
+    instance_id
+        The instance that was edited.
+    version
+        The instance's new ``waypoints_version``.
+    ops
+        Operations from ``parse_ops``.
+    """
+
+    db.session.add(WaypointEditTable(instance_id=instance_id, version=version, ops=ops))
+
+    log_size = int(current_app.config.get("WAYPOINT_EDIT_LOG_SIZE", DEFAULT_WAYPOINT_EDIT_LOG_SIZE))
+    db.session.execute(
+        db.delete(WaypointEditTable).where(
+            WaypointEditTable.instance_id == instance_id, WaypointEditTable.version <= version - log_size
+        )
+    )
+
+
+def ops_since(session: Session | scoped_session, instance_id: int, since: int, version: int) -> list[dict[str, Any]] | None:
+    """
+    Return the operations that turn version ``since`` into ``version``, if they are all logged.
+
+    Parameters
+    ----------
+    session
+        Session to query with.
+    instance_id
+        The instance whose waypoints changed.
+    since
+        The version the client last acknowledged.
+    version
+        The instance's current ``waypoints_version``; greater than ``since``.
+
+    Returns
+    -------
+    list[dict[str, Any]] | None
+        The operations in order, or ``None`` if a version in between was a full write,
+        has been pruned, or ``since`` is not a version this instance had.
+    """
+
+    if not 0 <= since < version:
+        return None
+
+    edits = (
+        session.execute(
+            db.select(WaypointEditTable.ops)
+            .where(WaypointEditTable.instance_id == instance_id, WaypointEditTable.version > since)
+            .order_by(WaypointEditTable.version)
+        )
+        .scalars()
+        .all()
+    )
+
+    # versions are consecutive, so a complete log has exactly one row per version
+    if len(edits) != version - since:
+        return None
+
+    return [op for ops in edits for op in ops]
+
+
+def forget(instance_ids: Iterable[int]) -> None:
+    """
+    Delete the edit log of deleted instances, in the caller's transaction.
+
+    Parameters
+    ----------
+    instance_ids
+        IDs of the instances being deleted.
+    """
+
+    instance_ids = list(instance_ids)
+    if instance_ids:
+        db.session.execute(db.delete(WaypointEditTable).where(WaypointEditTable.instance_id.in_(instance_ids)))
+
+
+def forget_all() -> None:
+    """Delete every instance's edit log, in the caller's transaction (e.g. ``delete_all``)."""
+
+    db.session.execute(db.delete(WaypointEditTable))
@@ -0,0 +1,240 @@
+"""
+Validate, read and write an instance's waypoints, stored as a packed float64 blob where enabled.
+
+See `.github/instructions/python-source.instructions.md` #"Packed waypoints"
+for the wire format and the two row layouts.
+"""
+
+__all__ = [
+    "DEFAULT_PACK_WAYPOINTS",
+    "WAYPOINT_DTYPE",
+    "WaypointArray",
+    "get_packed",
+    "get_points",
+    "get_waypoints",
+    "parse_json",
+    "parse_packed",
+    "set_waypoints",
+    "waypoint_columns",
+]
+
+import numpy as np
+import numpy.typing as npt
+from flask import current_app
+
+from autoboat_telemetry_server.models import TelemetryTable
+from autoboat_telemetry_server.types import WaypointSequenceType
+
+# store waypoints as a blob unless PACK_WAYPOINTS says otherwise
+DEFAULT_PACK_WAYPOINTS = True
+
+# one waypoint is two little-endian float64s: latitude, longitude
+WAYPOINT_DTYPE = np.dtype("<f8")
+_WAYPOINT_SIZE = 2 * WAYPOINT_DTYPE.itemsize
+
+type WaypointArray = npt.NDArray[np.float64]
+
+
+def _check_bounds(points: WaypointArray) -> WaypointArray:
+    """
+    Check that every waypoint is a finite latitude / longitude pair.
+
+    Parameters
+    ----------
+    points
+        An ``(n, 2)`` float64 array.
+
+    Returns
+    -------
+    WaypointArray
+        The same array.
+
+    Raises
+    ------
+    ValueError
+        If a coordinate is NaN or infinite, a latitude is outside [-90, 90],
+        or a longitude outside [-180, 180].
+    """
+
+    if not np.isfinite(points).all():
+        raise ValueError("Invalid coordinate value. Each coordinate must be finite.")
+
+    if (np.abs(points[:, 0]) > 90).any() or (np.abs(points[:, 1]) > 180).any():
+        raise ValueError("Invalid coordinate value. Latitudes must be within [-90, 90] and longitudes within [-180, 180].")
+
+    return points
+
+
+def _is_coordinate(value: object) -> bool:
+    # exact types: bool subclasses int
+    return type(value) is int or type(value) is float
+
+
+def parse_json(waypoints_data: object) -> WaypointArray:
+    """
+    Validate JSON waypoints, a list of ``[latitude, longitude]`` pairs, in one vectorized pass.
+
+    Parameters
+    ----------
+    waypoints_data
+        The decoded request data.
+
+    Returns
+    -------
+    WaypointArray
+        The waypoints as an ``(n, 2)`` float64 array.
+
+    Raises
+    ------
+    TypeError
+        If the data is not a list of pairs of integers or floats.
+    ValueError
+        If a coordinate is not finite or out of bounds.
+    """
+
+    if not isinstance(waypoints_data, list):
+        raise TypeError("Invalid waypoints data format. Expected a list of [x, y] coordinates.")
+
+    if not waypoints_data:
+        return np.empty((0, 2), dtype=WAYPOINT_DTYPE)
+
+    # an object array never coerces, so ragged nesting shows up in the shape and nested lists in the type check
+    raw = np.array(waypoints_data, dtype=object)
+    if raw.ndim != 2 or raw.shape[1] != 2:
+        raise TypeError("Invalid waypoint format. Each waypoint must be a list or tuple of two coordinates.")
+
+    # checked before the float conversion, which would turn true / false into 1.0 / 0.0
+    if not np.vectorize(_is_coordinate, otypes=[bool])(raw).all():
+        raise TypeError("Invalid coordinate type. Each coordinate must be an integer or float.")
+
+    try:
+        points = raw.astype(WAYPOINT_DTYPE)
+    except OverflowError as e:
+        raise ValueError("Invalid coordinate value. Each coordinate must be finite.") from e
+
+    return _check_bounds(points)
+
+
+def parse_packed(body: bytes) -> WaypointArray:
+    """
+    Validate a packed body of little-endian float64 ``latitude, longitude`` pairs.
+
+    Parameters
+    ----------
+    body
+        The raw request body.
+
+    Returns
+    -------
+    WaypointArray
+        The waypoints as an ``(n, 2)`` float64 array, viewing ``body`` without a copy.
+
+    Raises
+    ------
+    TypeError
+        If the body length is not a multiple of 16 bytes.
+    ValueError
+        If a coordinate is not finite or out of bounds.
+    """
+
+    if len(body) % _WAYPOINT_SIZE:
+        raise TypeError(f"Invalid packed waypoints. The body must be a multiple of {_WAYPOINT_SIZE} bytes.")
+
+    return _check_bounds(np.frombuffer(body, dtype=WAYPOINT_DTYPE).reshape(-1, 2))
+
+
+def waypoint_columns(points: WaypointArray) -> dict[str, object]:
+    """
+    Build the column values of an instance with ``points`` as its waypoints.
+
+    Parameters
+    ----------
+    points
+        Validated ``(n, 2)`` waypoints.
+
+    Returns
+    -------
+    dict[str, object]
+        ``waypoints`` and ``waypoints_packed``; exactly one of them holds the points.
+    """
+
+    if current_app.config.get("PACK_WAYPOINTS", DEFAULT_PACK_WAYPOINTS):
+        return {"waypoints": [], "waypoints_packed": points.astype(WAYPOINT_DTYPE, copy=False).tobytes()}
+
+    return {"waypoints": points.tolist(), "waypoints_packed": None}
+
+
+def set_waypoints(instance: TelemetryTable, points: WaypointArray) -> None:
+    """
+    Replace the instance's waypoints.
+
+    Parameters
+    ----------
+    instance
+        The telemetry instance.
+    points
+        Validated ``(n, 2)`` waypoints.
+    """
+
+    for name, value in waypoint_columns(points).items():
+        setattr(instance, name, value)
+
+
+def get_waypoints(instance: TelemetryTable) -> WaypointSequenceType:
+    """
+    Return the instance's waypoints as a JSON-ready list of pairs, whichever layout the row uses.
+
+    Parameters
+    ----------
+    instance
+        The telemetry instance.
+
+    Returns
+    -------
+    WaypointSequenceType
+        The waypoints.
+    """
+
+    if instance.waypoints_packed is not None:
+        return np.frombuffer(instance.waypoints_packed, dtype=WAYPOINT_DTYPE).reshape(-1, 2).tolist()
+
+    return instance.waypoints
+
+
+def get_points(instance: TelemetryTable) -> WaypointArray:
+    """
+    Return the instance's waypoints as a read-only ``(n, 2)`` float64 array, whichever layout the row uses.
+
+    Parameters
+    ----------
+    instance
+        The telemetry instance.
+
+    Returns
+    -------
+    WaypointArray
+        The waypoints.
+    """
+
+    return np.frombuffer(get_packed(instance), dtype=WAYPOINT_DTYPE).reshape(-1, 2)
+
+
+def get_packed(instance: TelemetryTable) -> bytes:
+    """
+    Return the instance's waypoints as packed little-endian float64 pairs, whichever layout the row uses.
+
+    Parameters
+    ----------
+    instance
+        The telemetry instance.
+
+    Returns
+    -------
+    bytes
+        ``16 * len(waypoints)`` bytes.
+    """
+
+    if instance.waypoints_packed is not None:
+        return instance.waypoints_packed
+
+    return np.asarray(instance.waypoints, dtype=WAYPOINT_DTYPE).reshape(-1, 2).tobytes()
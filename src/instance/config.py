@@ -17,3 +17,58 @@ CORS_ORIGINS: list[str] = [
     "http://localhost:5173",
     "http://127.0.0.1:5173",
 ]
+
+# in-process maintenance scheduler; see .github/instructions/python-source.instructions.md#Maintenance scheduler
+MAINTENANCE_ENABLED = True
+MAINTENANCE_CLEAN_INTERVAL = 300.0
+MAINTENANCE_CLEAN_MAX_AGE = 300.0
+MAINTENANCE_CLEAN_BATCH_SIZE = 500
+MAINTENANCE_CHECKPOINT_INTERVAL = 60.0
+MAINTENANCE_TRUNCATE_CHECKPOINT_INTERVAL = 3600.0
+MAINTENANCE_VACUUM_INTERVAL = 3600.0
+MAINTENANCE_VACUUM_PAGES = 2000
+MAINTENANCE_OPTIMIZE_INTERVAL = 3600.0
+
+# seconds a /metrics SQLite storage snapshot is reused; see python-source.instructions.md#SQLite storage metrics
+STORAGE_METRICS_TTL = 5.0
+
+# connections per bind in the read-only pool; see python-source.instructions.md#Read-only session
+READ_ONLY_POOL_SIZE = 8
+
+# http cache lifetimes (seconds); see python-source.instructions.md#HTTP caching of config hashes
+CONFIG_CACHE_MAX_AGE = 31536000
+HASH_EXISTS_CACHE_MAX_AGE = 60
+
+# store instance parameters as a config hash + overrides; see python-source.instructions.md#Parameter storage by reference
+DEDUPLICATE_AUTOPILOT_PARAMETERS = True
+
+# rows per fetch / per transaction for the NDJSON routes; see python-source.instructions.md#Bulk export and import (NDJSON)
+EXPORT_BATCH_SIZE = 500
+IMPORT_CHUNK_SIZE = 500
+
+# logged parameter changes between history snapshots; see python-source.instructions.md#Parameter history
+PARAMETER_SNAPSHOT_INTERVAL = 100
+
+# store waypoints as packed float64 pairs; see python-source.instructions.md#Packed waypoints
+PACK_WAYPOINTS = True
+
+# waypoint versions whose edit ops are kept for get_new?since=; see python-source.instructions.md#Waypoint edits
+WAYPOINT_EDIT_LOG_SIZE = 50
+
+# boat_status keys of the latitude and longitude; see python-source.instructions.md#Route geometry
+POSITION_FIELDS = ("latitude", "longitude")
+
+# grid cell size (degrees) of the latest-position index; see python-source.instructions.md#Position index
+POSITION_INDEX_CELL_DEGREES = 0.01
+
+# positions kept per instance for /boat_status/track; see python-source.instructions.md#Position tracks
+TRACK_MAX_POINTS = 36000
+
+# add derived_* speed / course / turn rate / distance to boat statuses; see python-source.instructions.md#Derived kinematics
+DERIVE_KINEMATICS = False
+HEADING_FIELD = "heading"
+
+# per-field anomaly detectors; see python-source.instructions.md#Anomaly detection
+ANOMALY_EWMA_ALPHA = 0.05
+ANOMALY_JUMP_SIGMAS = 6.0
+ANOMALY_STUCK_SAMPLES = 50
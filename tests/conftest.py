@@ -21,9 +21,10 @@ SQLite DBs are created in a tmp_path and dropped after each test.
 from __future__ import annotations
 
 import importlib
+import json
 import shutil
 import sys
-from collections.abc import Generator, Iterator
+from collections.abc import Callable, Generator, Iterator
 from pathlib import Path
 from typing import Any
 from unittest.mock import patch
@@ -124,3 +125,15 @@ def db_session(app: Flask) -> scoped_session[Session]:
     from autoboat_telemetry_server.models import db
 
     return db.session
+
+
+@pytest.fixture
+def create_config(client: FlaskClient) -> Callable[[dict], str]:
+    """Return a function that stores a config through ``create_config`` and returns its hash."""
+
+    def create(config: dict) -> str:
+        response = client.post("/autopilot_parameters/create_config", json=json.dumps(config))
+        assert response.status_code == 200, response.data
+        return response.get_json()
+
+    return create
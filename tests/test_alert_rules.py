@@ -0,0 +1,237 @@
+"""
+Tests for ``autoboat_telemetry_server.alert_rules`` and the alert rule routes.
+
+Covers:
+- Rule parsing, ``abs()``, hold units and rejected rules.
+- Hold times on a controlled clock; firing once per excursion and re-arming.
+- Global and instance rules, the diagnostic message (merged with a geofence ERROR) and ``last_fired_at``.
+- Rule route errors, the per-scope limit, and removal on delete.
+"""
+
+from __future__ import annotations
+
+import importlib
+from collections.abc import Callable
+
+import pytest
+from flask import Flask
+from flask.testing import FlaskClient
+
+from autoboat_telemetry_server.alert_rules import MAX_ALERT_RULES, CompiledRule, RuleCache, parse_rule
+from autoboat_telemetry_server.types import DiagnosticMessageIntensity
+
+# the package re-exports the ``alert_rules`` singleton under the module's name
+alert_rules_module = importlib.import_module("autoboat_telemetry_server.alert_rules")
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Callable[[float], None]:
+    """Return a setter for the hold clock."""
+
+    now = [0.0]
+    monkeypatch.setattr(alert_rules_module, "_clock", lambda: now[0])
+
+    def set_time(seconds: float) -> None:
+        now[0] = seconds
+
+    return set_time
+
+
+def _add(client: FlaskClient, rule: str, instance_id: int | None = None, intensity: int | None = None) -> int:
+    body: dict[str, object] = {"rule": rule}
+    if intensity is not None:
+        body["intensity"] = intensity
+
+    path = "/boat_status/add_alert_rule" if instance_id is None else f"/boat_status/add_alert_rule/{instance_id}"
+    response = client.post(path, json=body)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()["rule_id"]
+
+
+def _set(client: FlaskClient, instance_id: int, status: dict) -> list | None:
+    assert client.post(f"/boat_status/set/{instance_id}", json=status).status_code == 200
+    return client.get(f"/instance_manager/get_diagnostic_message/{instance_id}").get_json()
+
+
+class TestCompile:
+    """Rules compile once into a field, a comparison and a hold time."""
+
+    @pytest.mark.parametrize(
+        ("rule", "status", "expected"),
+        [
+            ("battery_voltage < 11.2", {"battery_voltage": 11.0}, True),
+            ("battery_voltage < 11.2", {"battery_voltage": 11.2}, False),
+            ("abs(heel) > 35", {"heel": -40}, True),
+            ("heel > 35", {"heel": -40}, False),
+            ("mode != 2", {"mode": 3}, True),
+            ("speed >= 1e1", {"speed": 10.0}, True),
+            ("heel > 35", {}, False),
+            ("heel > 35", {"heel": "40"}, False),
+            ("heel > 0", {"heel": True}, False),
+            ("heel > 0", {"heel": float("nan")}, False),
+        ],
+    )
+    def test_matches(self, rule: str, status: dict, expected: bool) -> None:
+        assert CompiledRule(rule).matches(status) is expected
+
+    def test_hold_units(self) -> None:
+        assert CompiledRule("x < 1 for 250ms").hold == 0.25
+        assert CompiledRule("x < 1 for 5s").hold == 5.0
+        assert CompiledRule("x < 1 for 2 min").hold == 120.0
+        assert CompiledRule("x < 1").hold == 0.0
+
+    @pytest.mark.parametrize("rule", ["", "x", "x < y", "x << 1", "__import__('os') > 1", "x < 1 for 2h", "x < 1 for 61min"])
+    def test_rejects(self, rule: str) -> None:
+        with pytest.raises(ValueError):  # noqa: PT011
+            CompiledRule(rule)
+
+    def test_parse_rule(self) -> None:
+        assert parse_rule({"rule": "  heel > 35 "}) == {"rule": "heel > 35", "intensity": DiagnosticMessageIntensity.WARNING}
+        with pytest.raises(TypeError):
+            parse_rule(["heel > 35"])
+        with pytest.raises(TypeError):
+            parse_rule({"rule": "heel > 35", "intensity": True})
+        with pytest.raises(ValueError):  # noqa: PT011
+            parse_rule({"rule": "heel > 35", "intensity": 9})
+
+    def test_cache_compiles_once(self) -> None:
+        cache = RuleCache(maxsize=2)
+
+        first = cache.get("heel > 35")
+
+        assert cache.get("heel > 35") is first
+        cache.get("a > 1")
+        cache.get("b > 1")
+        assert (cache.hits, cache.misses, len(cache)) == (1, 3, 2)
+        assert cache.get("heel > 35") is not first
+
+
+class TestFiring:
+    """Rules fire on writes once their condition has held, and re-arm when it clears."""
+
+    def test_hold_and_rearm(self, client: FlaskClient, clock: Callable[[float], None]) -> None:
+        instance_id = client.get("/instance_manager/create").get_json()
+        _add(client, "battery_voltage < 11.2 for 5s", instance_id)
+
+        assert _set(client, instance_id, {"battery_voltage": 11.0}) is None
+        clock(4.0)
+        assert _set(client, instance_id, {"battery_voltage": 11.0}) is None
+        clock(5.0)
+        assert _set(client, instance_id, {"battery_voltage": 11.0}) == [2, "Alert: battery_voltage < 11.2 for 5s."]
+
+        # an operator clears the message; the rule does not fire again until it re-arms
+        client.post(f"/instance_manager/set_diagnostic_message/{instance_id}", json=[1, "ok"])
+        clock(20.0)
+        assert _set(client, instance_id, {"battery_voltage": 11.0}) == [1, "ok"]
+        _set(client, instance_id, {"battery_voltage": 12.0})
+        clock(21.0)
+        _set(client, instance_id, {"battery_voltage": 11.0})
+        clock(26.0)
+        assert _set(client, instance_id, {"battery_voltage": 11.0})[1] == "Alert: battery_voltage < 11.2 for 5s."
+
+    def test_rolled_back_write_does_not_consume_the_firing(
+        self, client: FlaskClient, clock: Callable[[float], None], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        from autoboat_telemetry_server.models import db
+
+        instance_id = client.get("/instance_manager/create").get_json()
+        _add(client, "heel > 30", instance_id)
+
+        def fail() -> None:
+            raise RuntimeError("disk I/O error")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(db.session, "commit", fail)
+            assert client.post(f"/boat_status/set/{instance_id}", json={"heel": 40}).status_code == 500
+
+        assert client.get(f"/boat_status/get_alert_rules/{instance_id}").get_json()[0]["firing"] is False
+        assert _set(client, instance_id, {"heel": 40}) == [2, "Alert: heel > 30."]
+
+    def test_hold_restarts_when_condition_breaks(self, client: FlaskClient, clock: Callable[[float], None]) -> None:
+        instance_id = client.get("/instance_manager/create").get_json()
+        _add(client, "abs(heel) > 35 for 2s", instance_id)
+
+        _set(client, instance_id, {"heel": 40})
+        clock(1.5)
+        _set(client, instance_id, {"heel": 10})
+        clock(3.0)
+
+        assert _set(client, instance_id, {"heel": -40}) is None
+
+    def test_global_and_instance_rules(self, client: FlaskClient, clock: Callable[[float], None]) -> None:
+        first, second = (client.get("/instance_manager/create").get_json() for _ in range(2))
+        global_rule = _add(client, "abs(heel) > 35", intensity=DiagnosticMessageIntensity.ERROR)
+        instance_rule = _add(client, "heel > 30", first)
+
+        assert _set(client, first, {"heel": 40}) == [3, "Alert: abs(heel) > 35; heel > 30."]
+        assert _set(client, second, {"heel": 32}) is None
+        assert _set(client, second, {"heel": -36}) == [3, "Alert: abs(heel) > 35."]
+
+        rules = client.get(f"/boat_status/get_alert_rules/{first}").get_json()
+        assert [(rule["rule_id"], rule["firing"]) for rule in rules] == [(global_rule, True), (instance_rule, True)]
+        assert all(rule["last_fired_at"] for rule in rules)
+        assert [rule["rule_id"] for rule in client.get("/boat_status/get_alert_rules").get_json()] == [global_rule]
+
+    def test_geofence_error_is_not_lowered(self, client: FlaskClient) -> None:
+        instance_id = client.get("/instance_manager/create").get_json()
+        fence = {"name": "harbour", "mode": "keep_out", "points": [[0.0, 0.0], [0.0, 1.0], [1.0, 1.0], [1.0, 0.0]]}
+        client.post(f"/boat_status/add_geofence/{instance_id}", json=fence)
+        _add(client, "heel > 30", instance_id, DiagnosticMessageIntensity.WARNING)
+        merged = [3, "Geofence violation: harbour (keep_out). Alert: heel > 30."]
+
+        assert _set(client, instance_id, {"latitude": 0.5, "longitude": 0.5, "heel": 40}) == merged
+        # still inside the keep-out fence and still heeling: neither check rewrites the message
+        assert _set(client, instance_id, {"latitude": 0.5, "longitude": 0.5, "heel": 41}) == merged
+
+    def test_set_fast_and_derived_fields(self, app: Flask, client: FlaskClient) -> None:
+        app.extensions["kinematics"].enabled = True
+        instance_id = client.get("/instance_manager/create").get_json()
+        client.post(f"/boat_status/set_mapping/{instance_id}", json=[["rudder", "c_int8"]])
+        _add(client, "rudder <= -20", instance_id)
+        _add(client, "derived_distance_travelled == 0", instance_id, DiagnosticMessageIntensity.INFO)
+
+        client.post(f"/boat_status/set_fast/{instance_id}", data=(-25).to_bytes(1, "little", signed=True))
+
+        message = client.get(f"/instance_manager/get_diagnostic_message/{instance_id}").get_json()
+        assert message == [2, "Alert: rudder <= -20; derived_distance_travelled == 0."]
+
+
+class TestRoutes:
+    """Rule route errors, the per-scope limit and deletion."""
+
+    def test_errors(self, client: FlaskClient) -> None:
+        instance_id = client.get("/instance_manager/create").get_json()
+
+        assert client.post(f"/boat_status/add_alert_rule/{instance_id}", json={"rule": "heel >"}).status_code == 400
+        assert client.post(f"/boat_status/add_alert_rule/{instance_id}", json=["heel > 1"]).status_code == 400
+        assert client.post("/boat_status/add_alert_rule/9999", json={"rule": "heel > 1"}).status_code == 400
+        assert client.get("/boat_status/get_alert_rules/9999").status_code == 404
+        assert client.delete("/boat_status/delete_alert_rule/9999").status_code == 404
+
+    def test_limit_per_scope(self, client: FlaskClient) -> None:
+        instance_id = client.get("/instance_manager/create").get_json()
+        for index in range(MAX_ALERT_RULES):
+            _add(client, f"f{index} > 1", instance_id)
+
+        assert client.post(f"/boat_status/add_alert_rule/{instance_id}", json={"rule": "x > 1"}).status_code == 400
+        assert client.post("/boat_status/add_alert_rule", json={"rule": "x > 1"}).status_code == 200
+
+    def test_delete(self, app: Flask, client: FlaskClient) -> None:
+        first, second = (client.get("/instance_manager/create").get_json() for _ in range(2))
+        global_rule = _add(client, "heel > 35")
+        _add(client, "heel > 30", first)
+        kept = _add(client, "heel > 30", second)
+        _set(client, first, {"heel": 40})
+
+        assert client.delete(f"/boat_status/delete_alert_rule/{global_rule}").status_code == 200
+        assert client.get(f"/boat_status/get_alert_rules/{first}").get_json()[0]["firing"] is True
+
+        client.delete(f"/instance_manager/delete/{first}")
+
+        assert first not in app.extensions["alert_rules"].holds
+        assert [rule["rule_id"] for rule in client.get(f"/boat_status/get_alert_rules/{second}").get_json()] == [kept]
+
+        _add(client, "heel > 35")
+        client.delete("/instance_manager/delete_all")
+
+        assert len(client.get("/boat_status/get_alert_rules").get_json()) == 1
@@ -0,0 +1,118 @@
+"""
+Tests for ``autoboat_telemetry_server.anomalies`` and ``/boat_status/anomalies``.
+
+Covers:
+- Non-finite values, jumps and stuck values on synthetic streams.
+- No anomalies on plain noise or on a field that rarely changes.
+- The anomalies route with mapped fields, and removal on delete.
+"""
+
+from __future__ import annotations
+
+import struct
+
+import numpy as np
+from flask import Flask
+from flask.testing import FlaskClient
+
+from autoboat_telemetry_server.anomalies import DEFAULT_ANOMALY_STUCK_SAMPLES, MAX_ANOMALY_FIELDS, anomalies
+
+
+def _feed(instance_id: int, field: str, values: np.ndarray | list[float]) -> list[str]:
+    started: list[str] = []
+    for value in values:
+        started += anomalies.update(instance_id, {field: float(value)})
+    return started
+
+
+class TestDetectors:
+    """Each detector flags its anomaly once, when it starts."""
+
+    def test_noise_is_quiet(self, app: Flask) -> None:
+        rng = np.random.default_rng(0)
+
+        assert _feed(1, "battery_voltage", rng.normal(12.4, 0.05, 5000)) == []
+        assert _feed(1, "mode", [1.0] * 200 + [2.0] * 500) == []
+
+        stats = anomalies.summary(1)["fields"]["battery_voltage"]
+        assert abs(stats["mean"] - 12.4) < 0.05
+        assert abs(stats["stddev"] - 0.05) < 0.02
+
+    def test_non_finite(self, app: Flask) -> None:
+        _feed(1, "heel", [1.0, 2.0])
+
+        assert _feed(1, "heel", [float("nan"), float("inf")]) == ["non_finite"]
+        assert anomalies.summary(1)["active"][0]["type"] == "non_finite"
+        assert anomalies.summary(1)["fields"]["heel"]["last"] == 2.0
+
+        _feed(1, "heel", [3.0])
+
+        assert anomalies.summary(1)["active"] == []
+        assert anomalies.summary(1)["recent"][-1]["value"] is None
+
+    def test_jump(self, app: Flask) -> None:
+        rng = np.random.default_rng(1)
+        _feed(1, "depth", rng.normal(20.0, 0.2, 200))
+
+        assert _feed(1, "depth", [35.0]) == ["jump"]
+        assert anomalies.summary(1)["recent"][-1] == {
+            "field": "depth",
+            "type": "jump",
+            "value": 35.0,
+            "detected_at": anomalies.summary(1)["active"][0]["since"],
+        }
+
+        _feed(1, "depth", [20.1])
+
+        assert anomalies.summary(1)["active"] == []
+
+    def test_stuck_and_recovery(self, app: Flask) -> None:
+        rng = np.random.default_rng(2)
+        _feed(1, "wind_speed", rng.normal(8.0, 1.0, 200))
+
+        frozen = [8.25] * DEFAULT_ANOMALY_STUCK_SAMPLES
+        assert _feed(1, "wind_speed", frozen[:-1]) == []
+        assert _feed(1, "wind_speed", frozen[-1:] * 100) == ["stuck"]
+
+        # the frozen stretch did not shrink the variance, so recovering is not a jump
+        assert _feed(1, "wind_speed", rng.normal(8.0, 1.0, 50)) == []
+        assert anomalies.summary(1)["active"] == []
+
+    def test_fields(self, app: Flask) -> None:
+        anomalies.update(1, {"speed": 1, "mode": "auto", "armed": True})
+        anomalies.update(2, {"speed": 1.0, "heading": 2.0}, ["speed"])
+        anomalies.update(3, {f"f{index}": 1.0 for index in range(MAX_ANOMALY_FIELDS + 5)})
+
+        assert list(anomalies.summary(1)["fields"]) == ["speed"]
+        assert list(anomalies.summary(2)["fields"]) == ["speed"]
+        assert len(anomalies.summary(3)["fields"]) == MAX_ANOMALY_FIELDS
+
+
+class TestRoute:
+    """``/boat_status/anomalies`` serves the detectors kept on each write."""
+
+    def test_mapped_fields(self, app: Flask, client: FlaskClient) -> None:
+        app.extensions["kinematics"].enabled = True
+        instance_id = client.get("/instance_manager/create").get_json()
+        client.post(f"/boat_status/set_mapping/{instance_id}", json=[["latitude", "c_double"], ["longitude", "c_double"]])
+
+        client.post(f"/boat_status/set_fast/{instance_id}", data=struct.pack("<2d", 1.0, 2.0))
+        client.post(f"/boat_status/set_fast/{instance_id}", data=struct.pack("<2d", 1.0, float("nan")))
+        client.post(f"/boat_status/set/{instance_id}", json={"latitude": 1.0, "longitude": 2.0, "rudder": 5.0})
+
+        body = client.get(f"/boat_status/anomalies/{instance_id}").get_json()
+
+        assert set(body["fields"]) == {"latitude", "longitude"}
+        assert [(anomaly["field"], anomaly["type"]) for anomaly in body["recent"]] == [("longitude", "non_finite")]
+        assert body["active"] == []
+
+    def test_errors_and_delete(self, client: FlaskClient) -> None:
+        instance_id = client.get("/instance_manager/create").get_json()
+        client.post(f"/boat_status/set/{instance_id}", json={"heel": 3.0})
+
+        assert client.get(f"/boat_status/anomalies/{instance_id}").get_json()["fields"]["heel"]["mean"] == 3.0
+        assert client.get("/boat_status/anomalies/9999").status_code == 404
+
+        client.delete(f"/instance_manager/delete/{instance_id}")
+
+        assert anomalies.summary(instance_id) == {"active": [], "recent": [], "fields": {}}
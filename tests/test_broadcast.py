@@ -0,0 +1,172 @@
+"""
+Tests for ``autoboat_telemetry_server.broadcast`` and the ``/broadcast`` routes.
+
+Covers:
+- Targets by ID list or by ``user`` / ``name_prefix``, with unknown IDs reported.
+- ``parameters`` and ``updates`` broadcasts keep the digest, the storage layout
+  and the change log in step, and skip instances that can't take the change.
+- Waypoint broadcasts.
+- One UPDATE statement per broadcast, and a timing comparison with per-instance calls
+  (run with ``-s`` to see it).
+"""
+
+from __future__ import annotations
+
+import json
+import time
+
+from flask import Flask
+from flask.testing import FlaskClient
+from sqlalchemy import event
+
+from autoboat_telemetry_server.canonical import parameters_digest
+from autoboat_telemetry_server.models import ParameterChangeTable, TelemetryTable, db
+
+_CONFIG = {"speed": {"default": 1.5, "description": "s"}, "mode": {"default": "auto", "description": "m"}}
+
+
+def _fleet(client: FlaskClient, count: int) -> list[int]:
+    config_hash = client.post("/autopilot_parameters/create_config", json=json.dumps(_CONFIG)).get_json()
+    return client.get(f"/instance_manager/create_many?n={count}&config_hash={config_hash}").get_json()
+
+
+def _broadcast(client: FlaskClient, body: dict) -> dict:
+    response = client.post("/autopilot_parameters/broadcast", json=json.dumps(body))
+    assert response.status_code == 200, response.data
+    return response.get_json()
+
+
+def _results(report: dict) -> dict[int, str]:
+    return {entry["instance_id"]: entry["result"] for entry in report["results"]}
+
+
+class TestParameterBroadcast:
+    """Every target is checked like ``set`` / ``update_existing_parameter`` would."""
+
+    def test_parameters_by_id(self, client: FlaskClient) -> None:
+        first, second = _fleet(client, 2)
+        client.post(f"/autopilot_parameters/update_existing_parameter/{second}/speed", json=json.dumps(3.0))
+        client.get(f"/autopilot_parameters/get_new/{second}")
+        new_parameters = {"speed": 3.0, "mode": "auto"}
+        created = db.session.get(TelemetryTable, first).updated_at
+        db.session.rollback()
+        time.sleep(0.002)
+
+        report = _broadcast(client, {"instance_ids": [first, second, 999], "parameters": new_parameters})
+
+        assert _results(report) == {first: "updated", second: "unchanged", 999: "Instance not found."}
+        assert report["updated"] == 1
+        assert report["seconds"] >= 0
+        assert client.get(f"/autopilot_parameters/get/{first}").get_json() == new_parameters
+        assert client.get(f"/autopilot_parameters/get_new/{first}").get_json() == new_parameters
+        assert client.get(f"/autopilot_parameters/get_new/{second}").get_json() == {}
+
+        instance = db.session.get(TelemetryTable, first)
+        assert instance.autopilot_parameters_digest == parameters_digest(new_parameters)
+        assert instance.autopilot_parameters_by_reference
+        assert instance.autopilot_parameters == {"speed": 3.0}
+        assert instance.updated_at > created
+
+    def test_updates_by_user(self, client: FlaskClient) -> None:
+        ids = _fleet(client, 3)
+        for instance_id in ids[:2]:
+            client.post(f"/instance_manager/set_user/{instance_id}/crew")
+
+        report = _broadcast(client, {"user": "crew", "updates": {"mode": "manual"}})
+
+        assert _results(report) == {ids[0]: "updated", ids[1]: "updated"}
+        assert client.get(f"/autopilot_parameters/get/{ids[0]}").get_json() == {"speed": 1.5, "mode": "manual"}
+        assert client.get(f"/autopilot_parameters/get/{ids[2]}").get_json() == {"speed": 1.5, "mode": "auto"}
+        instance = db.session.get(TelemetryTable, ids[1])
+        assert instance.autopilot_parameters_digest == parameters_digest({"speed": 1.5, "mode": "manual"})
+
+        changes = db.session.execute(db.select(ParameterChangeTable.instance_id, ParameterChangeTable.key)).all()
+        assert sorted(changes) == [(ids[0], "mode"), (ids[1], "mode")]
+
+    def test_ineligible_instances_are_skipped(self, client: FlaskClient) -> None:
+        (configured,) = _fleet(client, 1)
+        empty = client.get("/instance_manager/create").get_json()
+
+        updates = _broadcast(client, {"instance_ids": [configured, empty], "updates": {"missing": 1}})
+        parameters = _broadcast(client, {"instance_ids": [configured], "parameters": {"speed": 2.0}})
+
+        assert _results(updates) == {
+            configured: "Parameter key does not exist in the default autopilot parameters.",
+            empty: "Default autopilot parameters must be set before updating individual parameters.",
+        }
+        assert _results(parameters) == {configured: "Autopilot parameters keys do not match the default configuration keys."}
+
+    def test_invalid_bodies(self, client: FlaskClient) -> None:
+        ids = _fleet(client, 1)
+
+        for body in (
+            {"parameters": {}},
+            {"instance_ids": ids},
+            {"instance_ids": ids, "parameters": {}, "updates": {"speed": 1}},
+            {"instance_ids": ids, "user": "crew", "parameters": {}},
+            {"instance_ids": ["1"], "parameters": {}},
+            {"name_prefix": "", "parameters": {}},
+            {"instance_ids": ids, "updates": {"speed": {"nested": 1}}},
+        ):
+            assert client.post("/autopilot_parameters/broadcast", json=json.dumps(body)).status_code == 400, body
+
+
+class TestWaypointBroadcast:
+    """Waypoints are validated once and written to every target."""
+
+    def test_by_name_prefix(self, client: FlaskClient) -> None:
+        ids = _fleet(client, 3)
+        client.post(f"/instance_manager/set_name/{ids[0]}/sim-a")
+        client.post(f"/instance_manager/set_name/{ids[1]}/sim-b")
+
+        response = client.post("/waypoints/broadcast", json={"name_prefix": "sim-", "waypoints": [[1.0, 2.0]]})
+
+        assert response.status_code == 200
+        assert _results(response.get_json()) == {ids[0]: "updated", ids[1]: "updated"}
+        assert client.get(f"/waypoints/get_new/{ids[1]}").get_json() == [[1.0, 2.0]]
+        assert client.get(f"/waypoints/get/{ids[1]}").headers["X-Waypoints-Version"] == "1"
+        assert client.get(f"/waypoints/get/{ids[2]}").get_json() == []
+
+    def test_invalid_waypoints(self, client: FlaskClient) -> None:
+        ids = _fleet(client, 1)
+
+        response = client.post("/waypoints/broadcast", json={"instance_ids": ids, "waypoints": [[1.0]]})
+
+        assert response.status_code == 400
+
+
+class TestSingleStatement:
+    """A broadcast is one UPDATE however many boats it reaches."""
+
+    def test_one_update(self, app: Flask, client: FlaskClient) -> None:
+        ids = _fleet(client, 50)
+        updates: list[str] = []
+
+        def record(_conn: object, _cursor: object, statement: str, *_args: object) -> None:
+            if statement.startswith("UPDATE telemetry_table"):
+                updates.append(statement)
+
+        engine = db.engines[None]
+        event.listen(engine, "after_cursor_execute", record)
+        try:
+            _broadcast(client, {"instance_ids": ids, "updates": {"speed": 2.0}})
+            client.post("/waypoints/broadcast", json={"instance_ids": ids, "waypoints": [[1.0, 2.0]]})
+        finally:
+            event.remove(engine, "after_cursor_execute", record)
+
+        assert len(updates) == 2
+
+    def test_timing(self, client: FlaskClient) -> None:
+        ids = _fleet(client, 50)
+
+        start = time.perf_counter()
+        for instance_id in ids:
+            client.post(f"/autopilot_parameters/update_existing_parameter/{instance_id}/speed", json=json.dumps(2.0))
+        per_instance = time.perf_counter() - start
+
+        start = time.perf_counter()
+        report = _broadcast(client, {"instance_ids": ids, "updates": {"speed": 3.0}})
+        broadcast = time.perf_counter() - start
+
+        assert report["updated"] == len(ids)
+        print(f"\n50 update_existing_parameter calls: {per_instance:.3f}s, one broadcast: {broadcast:.3f}s")
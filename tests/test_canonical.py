@@ -0,0 +1,140 @@
+"""
+Tests for ``autoboat_telemetry_server.canonical``.
+
+Covers:
+- ``encode`` / ``digest`` are byte-identical to the historical
+  ``json.dumps(sort_keys=True)`` + SHA-256 config hash, so stored hashes stay valid.
+- The running parameter digest is order-independent and its O(1)
+  add/remove updates agree with a full recompute.
+- The routes keep ``autopilot_parameters_digest`` in step with the parameters.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+
+import pytest
+from flask import Flask
+from flask.testing import FlaskClient
+
+from autoboat_telemetry_server.canonical import (
+    EMPTY_PARAMETERS_DIGEST,
+    add_parameter,
+    digest,
+    encode,
+    parameters_digest,
+    remove_parameter,
+)
+from autoboat_telemetry_server.models import HashTable, TelemetryTable, db
+from autoboat_telemetry_server.parameter_storage import get_parameters
+
+CONFIGS = [
+    {"speed": {"default": 1.5, "description": "cruise speed"}},
+    {"b": {"default": [1, 2.25, True, None], "description": "ü ✓"}, "a": {"default": 1e-7, "description": ""}},
+    {"nested": {"default": {"z": 0.1, "y": -0.0, "x": 12345678901234567890}, "description": "x"}},
+]
+
+
+class TestCanonicalEncoding:
+    """The canonical encoder reproduces the legacy config hash exactly."""
+
+    @pytest.mark.parametrize("config", CONFIGS)
+    def test_matches_legacy_json_dumps(self, config: dict) -> None:
+        legacy = json.dumps(config, sort_keys=True, separators=(",", ":"))
+        assert encode(config) == legacy.encode("utf-8")
+        assert digest(config) == hashlib.sha256(legacy.encode("utf-8")).hexdigest()
+        assert HashTable.compute_hash(config) == digest(config)
+
+    def test_key_order_does_not_matter(self) -> None:
+        assert encode({"a": 1, "b": 2}) == encode({"b": 2, "a": 1})
+
+    def test_blake2b_is_optional(self) -> None:
+        assert digest(CONFIGS[0], "blake2b") == hashlib.blake2b(encode(CONFIGS[0]), digest_size=32).hexdigest()
+        assert digest(CONFIGS[0], "blake2b") != digest(CONFIGS[0])
+
+    def test_unknown_algorithm(self) -> None:
+        with pytest.raises(ValueError, match="Unsupported hash algorithm"):
+            digest({}, "md5")
+
+
+class TestParametersDigest:
+    """The running digest can be updated one parameter at a time."""
+
+    def test_empty(self) -> None:
+        assert parameters_digest({}) == EMPTY_PARAMETERS_DIGEST
+
+    def test_order_independent(self) -> None:
+        assert parameters_digest({"a": 1, "b": [2]}) == parameters_digest({"b": [2], "a": 1})
+
+    def test_incremental_update_matches_recompute(self) -> None:
+        parameters = {f"p{i}": float(i) for i in range(50)}
+        running = parameters_digest(parameters)
+
+        running = add_parameter(remove_parameter(running, "p7", 7.0), "p7", 70.5)
+        running = add_parameter(running, "extra", "on")
+        parameters.update(p7=70.5, extra="on")
+
+        assert running == parameters_digest(parameters)
+
+    def test_value_types_are_distinguished(self) -> None:
+        assert parameters_digest({"a": 1}) != parameters_digest({"a": 1.0})
+        assert parameters_digest({"a": 1}) != parameters_digest({"a": True})
+
+    def test_wraps_around(self) -> None:
+        running = remove_parameter(EMPTY_PARAMETERS_DIGEST, "k", 1)
+        assert len(running) == 64
+        assert add_parameter(running, "k", 1) == EMPTY_PARAMETERS_DIGEST
+
+
+class TestRouteDigest:
+    """Every route that writes ``autopilot_parameters`` keeps the digest in step."""
+
+    @staticmethod
+    def _stored(instance_id: int) -> tuple[dict, str]:
+        db.session.expire_all()
+        instance = db.session.get(TelemetryTable, instance_id)
+        return dict(get_parameters(instance)), instance.autopilot_parameters_digest
+
+    @staticmethod
+    def _instance_with_defaults(client: FlaskClient) -> int:
+        instance_id = client.get("/instance_manager/create").get_json()
+        config = {"speed": {"default": 1.5, "description": "s"}, "mode": {"default": "auto", "description": "m"}}
+        assert client.post(f"/autopilot_parameters/set_default/{instance_id}", json=json.dumps(config)).status_code == 200
+        return instance_id
+
+    def test_every_write_path(self, app: Flask, client: FlaskClient) -> None:
+        instance_id = self._instance_with_defaults(client)
+        parameters, running = self._stored(instance_id)
+        assert running == parameters_digest(parameters) != EMPTY_PARAMETERS_DIGEST
+
+        client.post(f"/autopilot_parameters/update_existing_parameter/{instance_id}/speed", json=json.dumps(3.0))
+        parameters, running = self._stored(instance_id)
+        assert parameters["speed"] == 3.0
+        assert running == parameters_digest(parameters)
+
+        client.post(f"/autopilot_parameters/set/{instance_id}", json=json.dumps({"speed": 4.0, "mode": "manual"}))
+        parameters, running = self._stored(instance_id)
+        assert running == parameters_digest({"speed": 4.0, "mode": "manual"})
+
+    def test_new_flag_follows_the_digest(self, app: Flask, client: FlaskClient) -> None:
+        instance_id = self._instance_with_defaults(client)
+
+        client.post(f"/autopilot_parameters/update_existing_parameter/{instance_id}/speed", json=json.dumps(1.5))
+        assert client.get(f"/autopilot_parameters/get_new/{instance_id}").get_json() == {}
+
+        client.post(f"/autopilot_parameters/update_existing_parameter/{instance_id}/speed", json=json.dumps(2.0))
+        assert client.get(f"/autopilot_parameters/get_new/{instance_id}").get_json()["speed"] == 2.0
+
+    def test_get_revalidates_with_digest_etag(self, app: Flask, client: FlaskClient) -> None:
+        instance_id = self._instance_with_defaults(client)
+        first = client.get(f"/autopilot_parameters/get/{instance_id}")
+        etag = first.headers["ETag"]
+        assert first.cache_control.no_cache
+
+        assert client.get(f"/autopilot_parameters/get/{instance_id}", headers={"If-None-Match": etag}).status_code == 304
+
+        client.post(f"/autopilot_parameters/update_existing_parameter/{instance_id}/speed", json=json.dumps(9.0))
+        changed = client.get(f"/autopilot_parameters/get/{instance_id}", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.get_json()["speed"] == 9.0
@@ -0,0 +1,136 @@
+"""
+Tests for ``autoboat_telemetry_server.config_diff`` and the diff routes.
+
+Covers:
+- ``diff_mappings`` classification (added / removed / changed / unchanged).
+- ``DiffCache`` LRU eviction.
+- ``/autopilot_parameters/diff`` and ``/diff_instance`` results, 404s and memoization.
+- A benchmark on configs with thousands of keys: a memoized diff is much
+  cheaper than the first one.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from collections.abc import Callable
+
+from flask.testing import FlaskClient
+
+from autoboat_telemetry_server.config_diff import DiffCache, diff_mappings
+
+
+def _config(values: dict[str, object]) -> dict:
+    return {key: {"default": value, "description": key} for key, value in values.items()}
+
+
+class TestDiffMappings:
+    """Keys are classified by presence, values by canonical encoding."""
+
+    def test_classification(self) -> None:
+        result = diff_mappings({"a": 1, "b": 2, "c": [1]}, {"b": 3, "c": [1], "d": "x"})
+
+        assert result == {"added": {"d": "x"}, "removed": {"a": 1}, "changed": {"b": {"from": 2, "to": 3}}, "unchanged": 1}
+
+    def test_int_and_float_differ(self) -> None:
+        assert diff_mappings({"a": 1}, {"a": 1.0})["changed"] == {"a": {"from": 1, "to": 1.0}}
+
+    def test_identical(self) -> None:
+        assert diff_mappings({"a": {"x": 1}}, {"a": {"x": 1}}) == {"added": {}, "removed": {}, "changed": {}, "unchanged": 1}
+
+
+class TestDiffCache:
+    """The least recently used result is evicted first."""
+
+    def test_lru_eviction(self) -> None:
+        cache = DiffCache(maxsize=2)
+        cache.put("a", {"n": 1})
+        cache.put("b", {"n": 2})
+        assert cache.get("a") == {"n": 1}
+
+        cache.put("c", {"n": 3})
+
+        assert cache.get("b") is None
+        assert cache.get("a") == {"n": 1}
+        assert cache.get("c") == {"n": 3}
+        assert len(cache) == 2
+        assert (cache.hits, cache.misses) == (3, 1)
+
+
+class TestDiffRoutes:
+    """The routes diff cached configs and an instance's live parameters."""
+
+    def test_diff_between_hashes(self, client: FlaskClient, create_config: Callable[[dict], str]) -> None:
+        hash_a = create_config(_config({"speed": 1.0, "mode": "auto"}))
+        hash_b = create_config(_config({"speed": 2.0, "gain": 0.5}))
+
+        result = client.get(f"/autopilot_parameters/diff/{hash_a}/{hash_b}").get_json()
+
+        assert result["added"] == {"gain": {"default": 0.5, "description": "gain"}}
+        assert result["removed"] == {"mode": {"default": "auto", "description": "mode"}}
+        assert result["changed"] == {
+            "speed": {"from": {"default": 1.0, "description": "speed"}, "to": {"default": 2.0, "description": "speed"}}
+        }
+
+    def test_unknown_hash_returns_404(self, client: FlaskClient, create_config: Callable[[dict], str]) -> None:
+        config_hash = create_config(_config({"speed": 1.0}))
+        assert client.get(f"/autopilot_parameters/diff/{config_hash}/unknown").status_code == 404
+        assert client.get("/instance_manager/create").status_code == 200
+        assert client.get("/autopilot_parameters/diff_instance/1/unknown").status_code == 404
+        assert client.get(f"/autopilot_parameters/diff_instance/999/{config_hash}").status_code == 404
+
+    def test_deleted_hash_is_not_served_from_the_memo(self, client: FlaskClient, create_config: Callable[[dict], str]) -> None:
+        hash_a = create_config(_config({"speed": 1.0}))
+        hash_b = create_config(_config({"speed": 2.0}))
+        assert client.get(f"/autopilot_parameters/diff/{hash_a}/{hash_b}").status_code == 200
+
+        client.delete(f"/autopilot_parameters/delete_config/{hash_b}")
+
+        assert client.get(f"/autopilot_parameters/diff/{hash_a}/{hash_b}").status_code == 404
+
+    def test_diff_instance_tracks_live_parameters(self, client: FlaskClient) -> None:
+        instance_id = client.get("/instance_manager/create").get_json()
+        config = _config({"speed": 1.0, "mode": "auto"})
+        config_hash = client.post(f"/autopilot_parameters/set_default/{instance_id}", json=json.dumps(config)).get_json()
+        url = f"/autopilot_parameters/diff_instance/{instance_id}/{config_hash}"
+
+        assert client.get(url).get_json()["changed"] == {}
+
+        client.post(f"/autopilot_parameters/update_existing_parameter/{instance_id}/speed", json=json.dumps(3.5))
+
+        assert client.get(url).get_json()["changed"] == {"speed": {"from": 1.0, "to": 3.5}}
+
+
+class TestDiffBenchmark:
+    """Diffing two 5000-key configs once, then again from the memo."""
+
+    KEYS = 5000
+
+    def test_memoized_diff_of_large_configs(self, client: FlaskClient, create_config: Callable[[dict], str]) -> None:
+        base = {f"param_{i:05d}": float(i) for i in range(self.KEYS)}
+        edited = dict(base)
+        for i in range(0, self.KEYS, 10):
+            edited[f"param_{i:05d}"] = -float(i) - 1.0
+        del edited["param_00001"]
+        edited["param_new"] = 1.0
+
+        hash_a = create_config(_config(base))
+        hash_b = create_config(_config(edited))
+        url = f"/autopilot_parameters/diff/{hash_a}/{hash_b}"
+
+        start = time.perf_counter()
+        cold = client.get(url)
+        cold_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(10):
+            warm = client.get(url)
+        warm_seconds = (time.perf_counter() - start) / 10
+
+        result = cold.get_json()
+        assert len(result["changed"]) == self.KEYS // 10
+        assert list(result["removed"]) == ["param_00001"]
+        assert list(result["added"]) == ["param_new"]
+        assert result["unchanged"] == self.KEYS - 1 - self.KEYS // 10
+        assert warm.get_json() == result
+        print(f"\ndiff of {self.KEYS}-key configs: cold {cold_seconds * 1000:.1f} ms, memoized {warm_seconds * 1000:.1f} ms")
@@ -0,0 +1,127 @@
+"""
+Tests for ``autoboat_telemetry_server.config_store``.
+
+Covers:
+- The store loads existing ``HashTable`` rows and stays coherent with
+  ``create_config``, ``set_default``, ``set_hash_description`` and ``delete_config``.
+- Once loaded, config reads and existence checks never query SQLite.
+- Lookups are counted as hits / misses.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+
+from flask import Flask
+from flask.testing import FlaskClient
+from sqlalchemy import event
+
+from autoboat_telemetry_server import observability
+from autoboat_telemetry_server.config_store import config_store
+from autoboat_telemetry_server.models import HashTable, TelemetryTable, db
+from autoboat_telemetry_server.read_only import read_db
+
+
+def _config(default: float = 1.0) -> dict:
+    return {"speed": {"default": default, "description": "cruise speed"}}
+
+
+def _lookups(result: str) -> float:
+    return observability._config_cache_lookups_total.labels(result=result)._value.get()
+
+
+class TestCoherence:
+    """Every committed hash write is visible to the next read."""
+
+    def test_loads_existing_rows(self, app: Flask, client: FlaskClient) -> None:
+        config = _config()
+        config_hash = HashTable.compute_hash(config)
+        db.session.add(HashTable(config_hash=config_hash, data=config, description="seeded"))
+        db.session.commit()
+
+        assert client.get(f"/autopilot_parameters/get_config/{config_hash}").get_json() == config
+        assert client.get(f"/autopilot_parameters/get_hash_description/{config_hash}").get_json() == "seeded"
+
+    def test_create_config_after_load(self, client: FlaskClient, create_config: Callable[[dict], str]) -> None:
+        assert client.get("/autopilot_parameters/get_hash_exists/unknown").get_json() is False
+
+        config_hash = create_config(_config())
+
+        assert client.get(f"/autopilot_parameters/get_hash_exists/{config_hash}").get_json() is True
+        assert client.get(f"/autopilot_parameters/get_config/{config_hash}").get_json() == _config()
+
+    def test_set_default_adds_the_hash(self, app: Flask, client: FlaskClient) -> None:
+        assert client.get("/autopilot_parameters/get_hash_exists/unknown").get_json() is False
+        (instance_id,) = TelemetryTable.create_many(1)
+        db.session.commit()
+
+        response = client.post(f"/autopilot_parameters/set_default/{instance_id}", json=json.dumps(_config(2.0)))
+        config_hash = response.get_json()
+
+        assert client.get(f"/autopilot_parameters/get_config/{config_hash}").get_json() == _config(2.0)
+
+    def test_description_change(self, client: FlaskClient, create_config: Callable[[dict], str]) -> None:
+        config_hash = create_config(_config())
+        client.post(f"/autopilot_parameters/set_hash_description/{config_hash}/tuned")
+
+        assert client.get(f"/autopilot_parameters/get_hash_description/{config_hash}").get_json() == "tuned"
+
+    def test_delete_config(self, client: FlaskClient, create_config: Callable[[dict], str]) -> None:
+        config_hash = create_config(_config())
+        assert client.delete(f"/autopilot_parameters/delete_config/{config_hash}").status_code == 200
+
+        assert client.get(f"/autopilot_parameters/get_hash_exists/{config_hash}").get_json() is False
+        assert client.get(f"/autopilot_parameters/get_config/{config_hash}").status_code == 404
+
+    def test_instances_get_a_private_copy(self, app: Flask, client: FlaskClient, create_config: Callable[[dict], str]) -> None:
+        app.config["DEDUPLICATE_AUTOPILOT_PARAMETERS"] = False
+        config_hash = create_config(_config())
+        (instance_id,) = TelemetryTable.create_many(1)
+        db.session.commit()
+        client.post(f"/autopilot_parameters/set_default_from_hash/{instance_id}/{config_hash}")
+
+        db.session.get(TelemetryTable, instance_id).default_autopilot_parameters["speed"]["default"] = 99.0
+
+        assert config_store.get(config_hash) == _config()
+
+
+class TestNoDatabaseReads:
+    """After the first read, config reads and existence checks are answered from memory."""
+
+    def test_reads_do_not_query_sqlite(self, client: FlaskClient, create_config: Callable[[dict], str]) -> None:
+        config_hash = create_config(_config())
+        assert client.get(f"/autopilot_parameters/get_hash_exists/{config_hash}").get_json() is True
+
+        statements: list[str] = []
+
+        def record(*args: object) -> None:
+            statements.append(str(args[2]))
+
+        engines = [*read_db.engines.values(), *db.engines.values()]
+        for engine in engines:
+            event.listen(engine, "before_cursor_execute", record)
+        try:
+            assert client.get(f"/autopilot_parameters/get_config/{config_hash}").status_code == 200
+            assert client.get(f"/autopilot_parameters/get_hash_description/{config_hash}").status_code == 200
+            assert client.get("/autopilot_parameters/get_hash_exists/unknown").get_json() is False
+        finally:
+            for engine in engines:
+                event.remove(engine, "before_cursor_execute", record)
+
+        assert statements == []
+
+
+class TestHitRatioMetric:
+    """``config_cache_lookups_total`` splits lookups into hits and misses."""
+
+    def test_hits_and_misses_are_counted(self, client: FlaskClient, create_config: Callable[[dict], str]) -> None:
+        config_hash = create_config(_config())
+        hits, misses = _lookups("hit"), _lookups("miss")
+
+        client.get(f"/autopilot_parameters/get_config/{config_hash}")
+        client.get(f"/autopilot_parameters/get_hash_exists/{config_hash}")
+        client.get("/autopilot_parameters/get_config/unknown")
+
+        assert _lookups("hit") == hits + 2
+        assert _lookups("miss") == misses + 1
@@ -0,0 +1,164 @@
+"""
+Tests for ``autoboat_telemetry_server.geofences`` and the ``/boat_status`` geofence routes.
+
+Covers:
+- ``CompiledPolygon.contains`` matches a plain ray cast over every edge, including concave shapes.
+- ``parse_geofence`` validation.
+- ``set`` and ``set_fast`` raise an ERROR diagnostic and count the violation once per new message.
+- Geofence listing, deletion, and removal with the instance.
+"""
+
+from __future__ import annotations
+
+import struct
+
+import numpy as np
+import pytest
+from flask.testing import FlaskClient
+
+from autoboat_telemetry_server import observability
+from autoboat_telemetry_server.geofences import CompiledPolygon, parse_geofence
+from autoboat_telemetry_server.models import GeofenceTable, db
+from autoboat_telemetry_server.types import DiagnosticMessageIntensity
+
+# a 1 x 1 degree square harbour
+_HARBOUR = [[0.0, 0.0], [0.0, 1.0], [1.0, 1.0], [1.0, 0.0]]
+
+
+def _ray_cast(points: np.ndarray, latitude: float, longitude: float) -> bool:
+    """Reference even-odd test, one edge at a time."""
+
+    inside = False
+    for (a_latitude, a_longitude), (b_latitude, b_longitude) in zip(points, np.roll(points, -1, axis=0), strict=True):
+        if (a_latitude > latitude) != (b_latitude > latitude):
+            crossing = a_longitude + (latitude - a_latitude) * (b_longitude - a_longitude) / (b_latitude - a_latitude)
+            inside ^= bool(longitude < crossing)
+    return inside
+
+
+def _violations(mode: str) -> float:
+    try:
+        return observability._geofence_violations_total.labels(mode=mode)._value.get()  # type: ignore[union-attr]
+    except KeyError:
+        return 0.0
+
+
+def _fenced(client: FlaskClient, mode: str = "keep_in", points: list[list[float]] = _HARBOUR) -> int:
+    instance_id = client.get("/instance_manager/create").get_json()
+    response = client.post(f"/boat_status/add_geofence/{instance_id}", json={"name": "harbour", "mode": mode, "points": points})
+    assert response.status_code == 200, response.data
+    return instance_id
+
+
+def _diagnostic(client: FlaskClient, instance_id: int) -> list | None:
+    return client.get(f"/instance_manager/get_diagnostic_message/{instance_id}").get_json()
+
+
+class TestCompiledPolygon:
+    """The band index and bounding box never change the answer."""
+
+    def test_matches_brute_force(self) -> None:
+        rng = np.random.default_rng(0)
+        # a star with 200 spikes: concave, and many edges per band
+        angles = np.linspace(0, 2 * np.pi, 400, endpoint=False)
+        radii = np.where(np.arange(400) % 2, 0.4, 1.0)
+        points = np.column_stack((radii * np.sin(angles), radii * np.cos(angles)))
+        polygon = CompiledPolygon(points)
+
+        for latitude, longitude in rng.uniform(-1.2, 1.2, (2000, 2)):
+            assert polygon.contains(latitude, longitude) == _ray_cast(points, latitude, longitude)
+
+    def test_bounding_box(self) -> None:
+        polygon = CompiledPolygon(np.array(_HARBOUR))
+
+        assert polygon.bounds == (0.0, 0.0, 1.0, 1.0)
+        assert polygon.contains(0.5, 0.5)
+        assert not polygon.contains(0.5, 1.5)
+        assert not polygon.contains(-0.5, 0.5)
+
+    def test_parse(self) -> None:
+        closed = parse_geofence({"name": "a", "points": [*_HARBOUR, _HARBOUR[0]]})
+
+        assert closed["mode"] == "keep_in"
+        assert len(closed["points_packed"]) == 4 * 16
+
+        with pytest.raises(ValueError, match="between 3"):
+            parse_geofence({"name": "a", "points": _HARBOUR[:2]})
+        with pytest.raises(ValueError, match="mode"):
+            parse_geofence({"name": "a", "mode": "avoid", "points": _HARBOUR})
+        with pytest.raises(TypeError):
+            parse_geofence({"points": _HARBOUR})
+
+
+class TestIngest:
+    """Violations are raised on the status write itself."""
+
+    def test_keep_in_violation(self, client: FlaskClient) -> None:
+        instance_id = _fenced(client)
+        before = _violations("keep_in")
+
+        client.post(f"/boat_status/set/{instance_id}", json={"latitude": 0.5, "longitude": 0.5})
+        assert _diagnostic(client, instance_id) is None
+
+        for _ in range(3):
+            assert client.post(f"/boat_status/set/{instance_id}", json={"latitude": 0.5, "longitude": 2.0}).status_code == 200
+
+        assert _diagnostic(client, instance_id) == [DiagnosticMessageIntensity.ERROR, "Geofence violation: harbour (keep_in)."]
+        assert _violations("keep_in") == before + 1
+
+    def test_keep_out_via_set_fast(self, client: FlaskClient) -> None:
+        instance_id = _fenced(client, mode="keep_out")
+        client.post(f"/boat_status/set_mapping/{instance_id}", json=[["latitude", "c_double"], ["longitude", "c_double"]])
+        before = _violations("keep_out")
+
+        response = client.post(f"/boat_status/set_fast/{instance_id}", data=struct.pack("<2d", 0.25, 0.75))
+
+        assert response.status_code == 200
+        assert _diagnostic(client, instance_id)[0] == DiagnosticMessageIntensity.ERROR
+        assert _violations("keep_out") == before + 1
+
+    def test_cleared_message_is_raised_again(self, client: FlaskClient) -> None:
+        instance_id = _fenced(client)
+        client.post(f"/boat_status/set/{instance_id}", json={"latitude": 5.0, "longitude": 5.0})
+        client.post(f"/instance_manager/set_diagnostic_message/{instance_id}", json=[1, "acknowledged"])
+
+        client.post(f"/boat_status/set/{instance_id}", json={"latitude": 5.0, "longitude": 5.0})
+
+        assert _diagnostic(client, instance_id)[0] == DiagnosticMessageIntensity.ERROR
+
+    def test_status_without_position_is_not_checked(self, client: FlaskClient) -> None:
+        instance_id = _fenced(client)
+
+        client.post(f"/boat_status/set/{instance_id}", json={"heading": 90.0})
+
+        assert _diagnostic(client, instance_id) is None
+
+
+class TestRoutes:
+    """Geofences are listed with their state and removed with the instance."""
+
+    def test_get_and_delete(self, client: FlaskClient) -> None:
+        instance_id = _fenced(client)
+        client.post(f"/boat_status/set/{instance_id}", json={"latitude": 3.0, "longitude": 3.0})
+
+        [geofence] = client.get(f"/boat_status/get_geofences/{instance_id}").get_json()
+
+        assert (geofence["name"], geofence["points"], geofence["violated"]) == ("harbour", _HARBOUR, True)
+        assert client.delete(f"/boat_status/delete_geofence/{instance_id}/{geofence['geofence_id']}").status_code == 200
+        assert client.delete(f"/boat_status/delete_geofence/{instance_id}/{geofence['geofence_id']}").status_code == 404
+        assert client.get(f"/boat_status/get_geofences/{instance_id}").get_json() == []
+
+    def test_errors(self, client: FlaskClient) -> None:
+        instance_id = client.get("/instance_manager/create").get_json()
+
+        assert client.post(f"/boat_status/add_geofence/{instance_id}", json={"name": "x", "points": [[0, 0]]}).status_code == 400
+        assert client.post(f"/boat_status/add_geofence/{instance_id}", json=[1, 2]).status_code == 400
+        assert client.post("/boat_status/add_geofence/9999", json={"name": "x", "points": _HARBOUR}).status_code == 400
+        assert client.get("/boat_status/get_geofences/9999").status_code == 404
+
+    def test_delete_instance_forgets_geofences(self, client: FlaskClient) -> None:
+        instance_id = _fenced(client)
+
+        client.delete(f"/instance_manager/delete/{instance_id}")
+
+        assert db.session.execute(db.select(db.func.count()).select_from(GeofenceTable)).scalar_one() == 0
@@ -0,0 +1,106 @@
+"""
+Tests for ``autoboat_telemetry_server.instance_cleanup``.
+
+Covers:
+- Every per-instance cache the package exports is in ``discard_instances``.
+- Each delete path (``delete``, ``delete_all``, ``clean_instances``, the maintenance clean-up)
+  leaves no rows or process-local state behind.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from flask import Flask
+from flask.testing import FlaskClient
+
+import autoboat_telemetry_server
+from autoboat_telemetry_server import shared_lock_manager
+from autoboat_telemetry_server.instance_cleanup import discard_instances
+from autoboat_telemetry_server.maintenance import delete_inactive_instances
+from autoboat_telemetry_server.models import AlertRuleTable, GeofenceTable, TelemetryTable, db
+
+_FENCE = {"name": "harbour", "points": [[0.0, 0.0], [0.0, 1.0], [1.0, 1.0]]}
+
+
+def _caches() -> dict[str, object]:
+    # a per-instance cache is a package export with discard(ids) and clear()
+    return {
+        name: value
+        for name, value in vars(autoboat_telemetry_server).items()
+        if callable(getattr(value, "discard", None)) and callable(getattr(value, "clear", None))
+    }
+
+
+def _populate(app: Flask, client: FlaskClient) -> int:
+    app.extensions["kinematics"].enabled = True
+    instance_id = client.get("/instance_manager/create").get_json()
+    client.post(f"/boat_status/add_geofence/{instance_id}", json=_FENCE)
+    client.post(f"/boat_status/add_alert_rule/{instance_id}", json={"rule": "heel > 30"})
+    client.post(f"/boat_status/set/{instance_id}", json={"latitude": 2.0, "longitude": 2.0, "heel": 40.0})
+    client.get(f"/instance_manager/get_id/{client.get(f'/instance_manager/get_name/{instance_id}').get_json()}")
+    return instance_id
+
+
+def _assert_clean(app: Flask, instance_id: int) -> None:
+    assert db.session.get(TelemetryTable, instance_id) is None
+    for table in (GeofenceTable, AlertRuleTable):
+        assert not db.session.execute(db.select(table).where(table.instance_id == instance_id)).first()
+
+    assert app.extensions["kinematics"].samples == {}
+    assert app.extensions["alert_rules"].holds == {}
+    assert app.extensions["rolling_stats"].instances == {}
+    assert app.extensions["anomalies"].detectors == {}
+
+
+class TestCoverage:
+    """A cache cannot be left out of the single list."""
+
+    def test_every_exported_cache_is_discarded(self, app: Flask, monkeypatch: pytest.MonkeyPatch) -> None:
+        caches = _caches()
+        called: list[tuple[str, object]] = []
+        for name, cache in caches.items():
+            monkeypatch.setattr(cache, "discard", lambda ids, name=name: called.append((name, list(ids))))
+            monkeypatch.setattr(cache, "clear", lambda name=name: called.append((name, None)))
+
+        discard_instances([7])
+        discard_instances(None)
+
+        assert {"instance_names", "position_index", "tracks", "anomalies"} <= set(caches)
+        assert sorted(called, key=str) == sorted([(name, [7]) for name in caches] + [(name, None) for name in caches], key=str)
+
+
+class TestDeletePaths:
+    """Each delete path goes through ``forget_instances`` and ``discard_instances``."""
+
+    def test_delete(self, app: Flask, client: FlaskClient) -> None:
+        instance_id = _populate(app, client)
+
+        client.delete(f"/instance_manager/delete/{instance_id}")
+
+        _assert_clean(app, instance_id)
+
+    def test_delete_all(self, app: Flask, client: FlaskClient) -> None:
+        instance_id = _populate(app, client)
+
+        client.delete("/instance_manager/delete_all")
+
+        _assert_clean(app, instance_id)
+
+    @pytest.mark.parametrize("path", ["route", "maintenance"])
+    def test_clean_up_of_stale_instances(self, app: Flask, client: FlaskClient, path: str) -> None:
+        instance_id = _populate(app, client)
+        db.session.execute(
+            db.update(TelemetryTable)
+            .where(TelemetryTable.instance_id == instance_id)
+            .values(updated_at=datetime.now(UTC) - timedelta(hours=1))
+        )
+        db.session.commit()
+
+        if path == "route":
+            client.delete("/instance_manager/clean_instances")
+        else:
+            delete_inactive_instances(shared_lock_manager, max_age=timedelta(minutes=5), batch_size=10)
+
+        _assert_clean(app, instance_id)
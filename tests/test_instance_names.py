@@ -0,0 +1,147 @@
+"""
+Tests for ``autoboat_telemetry_server.instance_names``.
+
+Covers:
+- ``get_id`` stays coherent with every write path that creates, renames or
+  deletes instances (routes and the maintenance clean-up).
+- Once loaded, name lookups never query SQLite.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from urllib.parse import quote
+
+import pytest
+from flask import Flask
+from flask.testing import FlaskClient
+from sqlalchemy import event
+
+from autoboat_telemetry_server.instance_names import default_instance_name, instance_names
+from autoboat_telemetry_server.lock_manager import LockManager
+from autoboat_telemetry_server.maintenance import delete_inactive_instances
+from autoboat_telemetry_server.models import TelemetryTable, db
+from autoboat_telemetry_server.read_only import read_db
+
+
+def _get_id(client: FlaskClient, name: str) -> int | None:
+    response = client.get(f"/instance_manager/get_id/{quote(name)}")
+    return response.get_json() if response.status_code == 200 else None
+
+
+class TestCoherence:
+    """Every create, rename and delete is visible to the next lookup."""
+
+    def test_loads_existing_instances(self, app: Flask, client: FlaskClient) -> None:
+        # written before the cache was loaded, then picked up by the first lookup
+        instance_ids = TelemetryTable.create_many(2)
+        db.session.commit()
+
+        assert [_get_id(client, default_instance_name(i)) for i in instance_ids] == instance_ids
+
+    def test_create_and_create_many(self, client: FlaskClient) -> None:
+        assert _get_id(client, "warm-up") is None
+
+        instance_id = client.get("/instance_manager/create").get_json()
+        fleet = client.get("/instance_manager/create_many?n=3").get_json()
+
+        for new_id in [instance_id, *fleet]:
+            assert _get_id(client, default_instance_name(new_id)) == new_id
+
+    def test_rename_moves_the_name(self, client: FlaskClient) -> None:
+        instance_id = client.get("/instance_manager/create").get_json()
+        assert _get_id(client, default_instance_name(instance_id)) == instance_id
+
+        client.post(f"/instance_manager/set_name/{instance_id}/first")
+        client.post(f"/instance_manager/set_name/{instance_id}/second")
+
+        assert _get_id(client, default_instance_name(instance_id)) is None
+        assert _get_id(client, "first") is None
+        assert _get_id(client, "second") == instance_id
+
+    def test_rejected_rename_changes_nothing(self, client: FlaskClient) -> None:
+        first, second = client.get("/instance_manager/create_many?n=2").get_json()
+        client.post(f"/instance_manager/set_name/{first}/taken")
+
+        assert client.post(f"/instance_manager/set_name/{second}/taken").status_code == 400
+        assert _get_id(client, "taken") == first
+        assert _get_id(client, default_instance_name(second)) == second
+
+    @pytest.mark.parametrize(
+        ("method", "path"), [("delete", "/instance_manager/delete/{id}"), ("delete", "/instance_manager/delete_all")]
+    )
+    def test_delete_routes_forget_the_name(self, client: FlaskClient, method: str, path: str) -> None:
+        instance_id = client.get("/instance_manager/create").get_json()
+        client.post(f"/instance_manager/set_name/{instance_id}/doomed")
+        assert _get_id(client, "doomed") == instance_id
+
+        assert getattr(client, method)(path.format(id=instance_id)).status_code == 200
+        assert _get_id(client, "doomed") is None
+
+    def test_clean_instances_forgets_only_stale_names(self, app: Flask, client: FlaskClient) -> None:
+        stale, fresh = TelemetryTable.create_many(2)
+        db.session.execute(
+            db.update(TelemetryTable)
+            .where(TelemetryTable.instance_id == stale)
+            .values(updated_at=datetime.now(UTC) - timedelta(minutes=10))
+        )
+        db.session.commit()
+        assert _get_id(client, default_instance_name(stale)) == stale
+
+        assert client.delete("/instance_manager/clean_instances").status_code == 200
+        assert _get_id(client, default_instance_name(stale)) is None
+        assert _get_id(client, default_instance_name(fresh)) == fresh
+
+    def test_maintenance_clean_up_forgets_names(self, app: Flask, client: FlaskClient) -> None:
+        (stale,) = TelemetryTable.create_many(1)
+        db.session.execute(db.update(TelemetryTable).values(updated_at=datetime.now(UTC) - timedelta(minutes=10)))
+        db.session.commit()
+        assert instance_names.get_id(default_instance_name(stale)) == stale
+
+        delete_inactive_instances(LockManager(), max_age=timedelta(minutes=5), batch_size=10)
+
+        assert instance_names.get_id(default_instance_name(stale)) is None
+
+
+class TestNoDatabaseReads:
+    """After the first lookup, ``get_id`` is answered from memory."""
+
+    def test_lookups_do_not_query_sqlite(self, app: Flask, client: FlaskClient) -> None:
+        instance_id = client.get("/instance_manager/create").get_json()
+        client.post(f"/instance_manager/set_name/{instance_id}/boat")
+        assert _get_id(client, "boat") == instance_id
+
+        statements: list[str] = []
+
+        def record(*args: object) -> None:
+            statements.append(str(args[2]))
+
+        engines = [*read_db.engines.values(), *db.engines.values()]
+        for engine in engines:
+            event.listen(engine, "before_cursor_execute", record)
+        try:
+            assert _get_id(client, "boat") == instance_id
+            assert _get_id(client, "missing") is None
+        finally:
+            for engine in engines:
+                event.remove(engine, "before_cursor_execute", record)
+
+        assert statements == []
+
+
+class TestReservedNames:
+    """Default names can't be taken by another instance (the unique index would block its creation)."""
+
+    def test_other_instances_default_name_is_rejected(self, client: FlaskClient) -> None:
+        instance_id = client.get("/instance_manager/create").get_json()
+        response = client.post(f"/instance_manager/set_name/{instance_id}/{quote(default_instance_name(instance_id + 1))}")
+
+        assert response.status_code == 400
+        assert client.get("/instance_manager/create").get_json() == instance_id + 1
+
+    def test_own_default_name_is_allowed(self, client: FlaskClient) -> None:
+        instance_id = client.get("/instance_manager/create").get_json()
+        client.post(f"/instance_manager/set_name/{instance_id}/renamed")
+
+        response = client.post(f"/instance_manager/set_name/{instance_id}/{quote(default_instance_name(instance_id))}")
+        assert response.status_code == 200
@@ -0,0 +1,109 @@
+"""
+Tests for ``autoboat_telemetry_server.kinematics`` on the boat status write path.
+
+Covers:
+- Speed, course, turn rate and distance on a controlled clock.
+- Statuses without a position or heading keep the interval of the last one that had it.
+- Derivation is off by default, and samples are forgotten on delete.
+"""
+
+from __future__ import annotations
+
+import importlib
+import math
+import struct
+from collections.abc import Callable
+
+import pytest
+from flask import Flask
+from flask.testing import FlaskClient
+
+from autoboat_telemetry_server.route_geometry import EARTH_RADIUS_M
+
+# the package re-exports the ``kinematics`` singleton under the module's name
+kinematics_module = importlib.import_module("autoboat_telemetry_server.kinematics")
+
+# metres per degree of latitude
+_DEGREE = math.radians(1) * EARTH_RADIUS_M
+
+
+@pytest.fixture
+def clock(app: Flask, monkeypatch: pytest.MonkeyPatch) -> Callable[[float], None]:
+    """Enable derivation and return a setter for the ingest clock."""
+
+    app.extensions["kinematics"].enabled = True
+    now = [0.0]
+    monkeypatch.setattr(kinematics_module, "_clock", lambda: now[0])
+
+    def set_time(seconds: float) -> None:
+        now[0] = seconds
+
+    return set_time
+
+
+def _set(client: FlaskClient, instance_id: int, status: dict) -> dict:
+    assert client.post(f"/boat_status/set/{instance_id}", json=status).status_code == 200
+    return client.get(f"/boat_status/get/{instance_id}").get_json()
+
+
+class TestDerivation:
+    """Fields are derived from the previous sample in memory."""
+
+    def test_speed_course_turn_rate_distance(self, client: FlaskClient, clock: Callable[[float], None]) -> None:
+        instance_id = client.get("/instance_manager/create").get_json()
+
+        first = _set(client, instance_id, {"latitude": 0.0, "longitude": 0.0, "heading": 350.0})
+        clock(10.0)
+        second = _set(client, instance_id, {"latitude": 0.001, "longitude": 0.0, "heading": 10.0})
+        clock(20.0)
+        third = _set(client, instance_id, {"latitude": 0.001, "longitude": 0.001, "heading": 10.0})
+
+        assert first == {"latitude": 0.0, "longitude": 0.0, "heading": 350.0, "derived_distance_travelled": 0.0}
+        assert second["derived_speed_over_ground"] == pytest.approx(0.001 * _DEGREE / 10)
+        assert second["derived_course_over_ground"] == pytest.approx(0.0)
+        assert second["derived_turn_rate"] == pytest.approx(2.0)
+        assert third["derived_course_over_ground"] == pytest.approx(90.0, abs=1e-3)
+        assert third["derived_turn_rate"] == 0.0
+        assert third["derived_distance_travelled"] == pytest.approx(0.002 * _DEGREE, rel=1e-6)
+
+    def test_missing_fields_keep_their_interval(self, client: FlaskClient, clock: Callable[[float], None]) -> None:
+        instance_id = client.get("/instance_manager/create").get_json()
+
+        _set(client, instance_id, {"latitude": 0.0, "longitude": 0.0})
+        clock(5.0)
+        without_position = _set(client, instance_id, {"heading": 90.0})
+        clock(10.0)
+        moved = _set(client, instance_id, {"latitude": 0.001, "longitude": 0.0})
+
+        assert set(without_position) == {"heading", "derived_distance_travelled"}
+        assert moved["derived_speed_over_ground"] == pytest.approx(0.001 * _DEGREE / 10)
+        assert "derived_turn_rate" not in moved
+        assert "derived_course_over_ground" not in _set(client, instance_id, {"latitude": 0.001, "longitude": 0.0})
+
+    def test_set_fast(self, client: FlaskClient, clock: Callable[[float], None]) -> None:
+        instance_id = client.get("/instance_manager/create").get_json()
+        client.post(f"/boat_status/set_mapping/{instance_id}", json=[["latitude", "c_double"], ["longitude", "c_double"]])
+
+        client.post(f"/boat_status/set_fast/{instance_id}", data=struct.pack("<2d", 0.0, 0.0))
+        clock(2.0)
+        client.post(f"/boat_status/set_fast/{instance_id}", data=struct.pack("<2d", 0.0, 0.0001))
+        status = client.get(f"/boat_status/get/{instance_id}").get_json()
+
+        assert status["derived_speed_over_ground"] == pytest.approx(0.0001 * _DEGREE / 2)
+
+
+class TestLifecycle:
+    """Derivation is opt-in, and deleted instances start over."""
+
+    def test_disabled_by_default(self, client: FlaskClient) -> None:
+        instance_id = client.get("/instance_manager/create").get_json()
+
+        assert _set(client, instance_id, {"latitude": 1.0, "longitude": 1.0}) == {"latitude": 1.0, "longitude": 1.0}
+
+    def test_delete_forgets_samples(self, app: Flask, client: FlaskClient, clock: Callable[[float], None]) -> None:
+        instance_id = client.get("/instance_manager/create").get_json()
+        _set(client, instance_id, {"latitude": 1.0, "longitude": 1.0})
+
+        client.delete(f"/instance_manager/delete/{instance_id}")
+
+        assert app.extensions["kinematics"].samples == {}
@@ -7,6 +7,7 @@ Covers:
 - ``LockManager.require_read_lock`` (blocking reader decorator).
 - ``LockManager.require_write_lock`` (non-blocking writer decorator,
   returns HTTP 429 on contention).
+- ``LockManager.write_locked`` (blocking context manager for background jobs).
 
 The reader-writer lock is the correctness backbone for SQLite + a single
 Gunicorn worker (#3.6). Breaking its semantics would silently corrupt data
@@ -300,6 +301,28 @@ class TestRequireWriteLock:
         assert reader_results == ["done"]
 
 
+class TestWriteLocked:
+    """``write_locked`` is a blocking context manager for background work."""
+
+    def test_holds_lock_inside_block(self) -> None:
+        lm = LockManager()
+
+        with lm.write_locked():
+            assert lm._rw_lock.acquire_write(blocking=False) is False
+
+        assert lm._rw_lock.acquire_write(blocking=False) is True
+        lm._rw_lock.release_write()
+
+    def test_releases_lock_on_exception(self) -> None:
+        lm = LockManager()
+
+        with pytest.raises(RuntimeError, match="fail"), lm.write_locked():
+            raise RuntimeError("fail")
+
+        assert lm._rw_lock.acquire_write(blocking=False) is True
+        lm._rw_lock.release_write()
+
+
 # --------------------------------------------------------------------------- #
 # Fairness / integration-ish tests
 # --------------------------------------------------------------------------- #
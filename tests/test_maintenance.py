@@ -0,0 +1,310 @@
+"""
+Tests for ``autoboat_telemetry_server.maintenance``.
+
+Covers:
+- ``LeaderLease`` exclusivity between two lease objects on the same file, and an unopenable lease file.
+- ``MaintenanceScheduler`` scheduling (intervals, leader gating, failure isolation).
+- The built-in jobs: batched clean-up, WAL checkpoint, incremental vacuum (and the on-request
+  ``auto_vacuum`` conversion), ``PRAGMA optimize``.
+
+The scheduler thread is never started here; tests drive ``run_pending`` and
+``run_job`` directly (see instructions #"Maintenance scheduler").
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+from flask import Flask
+from sqlalchemy import event, text
+
+from autoboat_telemetry_server import observability, shared_lock_manager
+from autoboat_telemetry_server.lock_manager import LockManager
+from autoboat_telemetry_server.maintenance import (
+    LeaderLease,
+    MaintenanceScheduler,
+    checkpoint_wal,
+    convert_auto_vacuum,
+    delete_inactive_instances,
+    incremental_vacuum,
+    optimize_databases,
+)
+from autoboat_telemetry_server.models import TelemetryTable, db
+
+
+def _create_backdated(count: int, age: timedelta) -> list[int]:
+    """Create ``count`` instances whose ``updated_at`` is ``age`` in the past."""
+
+    instance_ids = TelemetryTable.create_many(count)
+    db.session.execute(
+        db.update(TelemetryTable).where(TelemetryTable.instance_id.in_(instance_ids)).values(updated_at=datetime.now(UTC) - age)
+    )
+    db.session.commit()
+    return instance_ids
+
+
+class TestLeaderLease:
+    """Only one ``LeaderLease`` on a path can be held at a time."""
+
+    def test_second_lease_is_refused_until_release(self, tmp_path: Path) -> None:
+        first = LeaderLease(tmp_path / "maintenance.lock")
+        second = LeaderLease(tmp_path / "maintenance.lock")
+
+        assert first.try_acquire() is True
+        assert second.try_acquire() is False
+        assert first.held and not second.held
+
+        first.release()
+        assert second.try_acquire() is True
+        second.release()
+
+    def test_reacquire_while_held_is_a_no_op(self, tmp_path: Path) -> None:
+        lease = LeaderLease(tmp_path / "maintenance.lock")
+        assert lease.try_acquire() is True
+        assert lease.try_acquire() is True
+        lease.release()
+        assert not lease.held
+
+    def test_unopenable_lease_file_is_not_held(self, tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+        lease = LeaderLease(tmp_path / "missing" / "maintenance.lock")
+
+        with caplog.at_level(logging.ERROR, logger="autoboat_telemetry_server.maintenance"):
+            assert lease.try_acquire() is False
+
+        assert not lease.held
+        assert "maintenance lease file" in caplog.text
+
+
+class TestMaintenanceScheduler:
+    """``run_pending`` honours intervals and the leader lease."""
+
+    def test_jobs_run_once_per_interval(self, app: Flask, tmp_path: Path) -> None:
+        calls: list[str] = []
+        scheduler = MaintenanceScheduler(app, LeaderLease(tmp_path / "maintenance.lock"))
+        scheduler.add_job("fast", 10.0, lambda: calls.append("fast") or 0)
+        scheduler.add_job("slow", 100.0, lambda: calls.append("slow") or 0)
+
+        assert scheduler.run_pending(now=1000.0) == ["fast", "slow"]
+        assert scheduler.run_pending(now=1005.0) == []
+        assert scheduler.run_pending(now=1010.0) == ["fast"]
+        assert calls == ["fast", "slow", "fast"]
+        scheduler.stop()
+
+    def test_non_positive_interval_disables_schedule_only(self, app: Flask, tmp_path: Path) -> None:
+        scheduler = MaintenanceScheduler(app, LeaderLease(tmp_path / "maintenance.lock"))
+        scheduler.add_job("disabled", 0, lambda: 3)
+
+        assert scheduler.run_pending(now=0.0) == []
+        assert scheduler.run_job("disabled") == 3
+        scheduler.stop()
+
+    def test_job_status_records_last_outcome(self, app: Flask, tmp_path: Path) -> None:
+        def failing() -> int:
+            raise RuntimeError("boom")
+
+        scheduler = MaintenanceScheduler(app, LeaderLease(tmp_path / "maintenance.lock"))
+        scheduler.add_job("ok", 1.0, lambda: 4)
+        scheduler.add_job("failing", 1.0, failing)
+        scheduler.run_pending(now=0.0)
+
+        ok, failed = scheduler.job_status()
+        assert ok["last_rows_affected"] == 4
+        assert ok["last_error"] is None
+        assert ok["last_run_at"] is not None
+        assert failed["last_error"] == "boom"
+        scheduler.stop()
+
+    def test_run_job_rejects_unknown_name(self, app: Flask, tmp_path: Path) -> None:
+        scheduler = MaintenanceScheduler(app, LeaderLease(tmp_path / "maintenance.lock"))
+        with pytest.raises(TypeError, match="Unknown maintenance job"):
+            scheduler.run_job("nope")
+
+    def test_follower_runs_nothing(self, app: Flask, tmp_path: Path) -> None:
+        leader = LeaderLease(tmp_path / "maintenance.lock")
+        assert leader.try_acquire()
+
+        calls: list[str] = []
+        scheduler = MaintenanceScheduler(app, LeaderLease(tmp_path / "maintenance.lock"))
+        scheduler.add_job("job", 1.0, lambda: calls.append("job") or 0)
+
+        assert scheduler.run_pending(now=0.0) == []
+        assert calls == []
+        leader.release()
+
+    def test_failing_job_does_not_stop_others(self, app: Flask, tmp_path: Path) -> None:
+        def failing() -> int:
+            raise RuntimeError("boom")
+
+        calls: list[str] = []
+        scheduler = MaintenanceScheduler(app, LeaderLease(tmp_path / "maintenance.lock"))
+        scheduler.add_job("failing", 1.0, failing)
+        scheduler.add_job("ok", 1.0, lambda: calls.append("ok") or 0)
+
+        assert scheduler.run_pending(now=0.0) == ["failing", "ok"]
+        assert calls == ["ok"]
+        scheduler.stop()
+
+    def test_failing_tick_does_not_end_the_loop(
+        self, app: Flask, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        scheduler = MaintenanceScheduler(app, LeaderLease(tmp_path / "maintenance.lock"))
+        scheduler._poll_interval = 0.0
+        ticks: list[None] = []
+
+        def tick() -> list[str]:
+            ticks.append(None)
+            if len(ticks) == 2:
+                scheduler._stop.set()
+            raise OSError("lease file unavailable")
+
+        monkeypatch.setattr(scheduler, "run_pending", tick)
+        with caplog.at_level(logging.ERROR, logger="autoboat_telemetry_server.maintenance"):
+            scheduler._run()
+
+        assert len(ticks) == 2
+        assert caplog.text.count("Maintenance scheduler tick failed.") == 2
+
+    def test_run_job_records_metrics(self, app: Flask, tmp_path: Path) -> None:
+        scheduler = MaintenanceScheduler(app, LeaderLease(tmp_path / "maintenance.lock"))
+        scheduler.add_job("metrics_probe", 1.0, lambda: 7)
+
+        before = observability._maintenance_job_rows_total.labels(job="metrics_probe")._value.get()
+        assert scheduler.run_job("metrics_probe") == 7
+        after = observability._maintenance_job_rows_total.labels(job="metrics_probe")._value.get()
+        assert after == before + 7
+
+    def test_registered_by_create_app(self, app: Flask) -> None:
+        scheduler = app.extensions["maintenance"]
+        assert scheduler.job_names == [
+            "clean_instances",
+            "wal_checkpoint",
+            "wal_checkpoint_truncate",
+            "incremental_vacuum",
+            "convert_auto_vacuum",
+            "optimize",
+        ]
+
+
+class TestDeleteInactiveInstances:
+    """Clean-up deletes only stale rows, in batches, releasing the lock between them."""
+
+    def test_deletes_only_stale_instances(self, app: Flask) -> None:
+        stale = _create_backdated(5, timedelta(minutes=10))
+        (fresh,) = TelemetryTable.create_many(1)
+        db.session.commit()
+
+        deleted = delete_inactive_instances(LockManager(), max_age=timedelta(minutes=5), batch_size=2)
+
+        assert deleted == len(stale)
+        remaining = db.session.scalars(db.select(TelemetryTable.instance_id)).all()
+        assert remaining == [fresh]
+
+    def test_lock_is_released_between_batches(self, app: Flask) -> None:
+        _create_backdated(5, timedelta(minutes=10))
+        lock_manager = LockManager()
+        batches: list[bool] = []
+
+        def before_cursor_execute(*args: object) -> None:
+            # while a batch runs the lock is held; probe it from the batch's instance delete
+            if str(args[2]).startswith("DELETE FROM telemetry_table"):
+                batches.append(lock_manager._rw_lock.acquire_write(blocking=False))
+
+        event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            delete_inactive_instances(lock_manager, max_age=timedelta(minutes=5), batch_size=2)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+        # 3 batches (2 + 2 + 1), each under the lock, and the lock is free afterwards
+        assert batches.count(False) == 3
+        assert lock_manager._rw_lock.acquire_write(blocking=False) is True
+        lock_manager._rw_lock.release_write()
+
+    def test_counts_deletions(self, app: Flask) -> None:
+        _create_backdated(3, timedelta(minutes=10))
+        before = observability._clean_instances_deleted_total._value.get()
+
+        delete_inactive_instances(shared_lock_manager, max_age=timedelta(minutes=5), batch_size=500)
+
+        assert observability._clean_instances_deleted_total._value.get() == before + 3
+
+    def test_rolls_back_and_releases_lock_on_error(self, app: Flask) -> None:
+        lock_manager = LockManager()
+        db.drop_all()
+
+        with pytest.raises(Exception, match="no such table"):
+            delete_inactive_instances(lock_manager, max_age=timedelta(minutes=5), batch_size=2)
+
+        assert lock_manager._rw_lock.acquire_write(blocking=False) is True
+        lock_manager._rw_lock.release_write()
+        db.create_all()
+
+
+class TestSqliteHousekeeping:
+    """Checkpoint and optimize run against every bind without raising."""
+
+    def test_checkpoint_wal(self, app: Flask) -> None:
+        TelemetryTable.create_many(3)
+        db.session.commit()
+        assert checkpoint_wal() >= 0
+
+    def test_optimize_databases(self, app: Flask) -> None:
+        lock_manager = LockManager()
+        assert optimize_databases(lock_manager) == 2
+        assert lock_manager._rw_lock.acquire_write(blocking=False) is True
+        lock_manager._rw_lock.release_write()
+
+    def test_truncate_checkpoint_empties_wal_and_releases_lock(self, app: Flask, tmp_path: Path) -> None:
+        TelemetryTable.create_many(50)
+        db.session.commit()
+        lock_manager = LockManager()
+
+        checkpoint_wal("truncate", lock_manager)
+
+        wal_path = Path(db.engine.url.database + "-wal")
+        assert not wal_path.exists() or wal_path.stat().st_size == 0
+        assert lock_manager._rw_lock.acquire_write(blocking=False) is True
+        lock_manager._rw_lock.release_write()
+
+    def test_checkpoint_rejects_unknown_mode(self, app: Flask) -> None:
+        with pytest.raises(ValueError, match="Invalid checkpoint mode"):
+            checkpoint_wal("EVERYTHING")
+
+    def test_incremental_vacuum_frees_pages(self, app: Flask) -> None:
+        TelemetryTable.create_many(500)
+        db.session.commit()
+        db.session.execute(db.delete(TelemetryTable))
+        db.session.commit()
+        assert db.session.execute(text("PRAGMA freelist_count")).scalar_one() > 0
+
+        freed = incremental_vacuum(LockManager(), max_pages=10_000)
+
+        assert freed > 0
+        assert db.session.execute(text("PRAGMA freelist_count")).scalar_one() == 0
+
+    def test_incremental_vacuum_skips_legacy_database(self, app: Flask, caplog: pytest.LogCaptureFixture) -> None:
+        with db.engine.connect() as connection:
+            connection.execute(text("PRAGMA auto_vacuum=NONE"))
+            connection.execute(text("VACUUM"))
+
+        with caplog.at_level(logging.WARNING, logger="autoboat_telemetry_server.maintenance"):
+            assert incremental_vacuum(LockManager(), max_pages=10) == 0
+
+        assert "run convert_auto_vacuum" in caplog.text
+        with db.engine.connect() as connection:
+            assert connection.execute(text("PRAGMA auto_vacuum")).scalar_one() == 0
+
+    def test_convert_auto_vacuum_runs_only_on_request(self, app: Flask) -> None:
+        with db.engine.connect() as connection:
+            connection.execute(text("PRAGMA auto_vacuum=NONE"))
+            connection.execute(text("VACUUM"))
+
+        assert "convert_auto_vacuum" not in app.extensions["maintenance"].run_pending(now=float("inf"))
+        assert convert_auto_vacuum(LockManager()) == 1
+        assert convert_auto_vacuum(LockManager()) == 0
+
+        with db.engine.connect() as connection:
+            assert connection.execute(text("PRAGMA auto_vacuum")).scalar_one() == 2
@@ -14,7 +14,9 @@ Flask-Migrate API directly (the same API the CLI uses).
 
 from __future__ import annotations
 
+import json
 import sqlite3
+import struct
 from pathlib import Path
 
 import pytest
@@ -35,6 +37,20 @@ def _tables_in(db_path: Path) -> list[str]:
         conn.close()
 
 
+def _indexes_in(db_path: Path, table: str) -> list[str]:
+    """Return the named (non-autoindex) index names on ``table`` in a SQLite file."""
+
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='index' AND tbl_name=? AND name NOT LIKE 'sqlite_%' ORDER BY name",
+            (table,),
+        ).fetchall()
+        return [r[0] for r in rows]
+    finally:
+        conn.close()
+
+
 @pytest.fixture
 def migration_app(tmp_path: Path) -> Flask:
     """Build an app whose INSTANCE_DIR points at a fresh temp dir.
@@ -126,7 +142,7 @@ class TestMultiBindMigration:
             from flask_migrate import downgrade, upgrade
 
             upgrade()
-            downgrade()
+            downgrade(revision="base")
 
         # alembic_version persists after downgrade to base, but the data
         # tables should be gone
@@ -149,3 +165,294 @@ class TestMultiBindMigration:
         hashes_path = Path(hashes_db.replace("sqlite:///", ""))
         assert "telemetry_table" in _tables_in(instances_path)
         assert "hash_table" in _tables_in(hashes_path)
+
+    def test_listing_indexes_round_trip(self, migration_app: Flask, tmp_path: Path) -> None:
+        """0002 adds the get_all_instance_info indexes; downgrading one step removes only them."""
+
+        instances_path = Path(migration_app.config["SQLALCHEMY_BINDS"][None].replace("sqlite:///", ""))
+        listing_indexes = {"ix_telemetry_table_user_updated_at", "ix_telemetry_table_current_config_hash_updated_at"}
+
+        with migration_app.app_context():
+            from flask_migrate import downgrade, upgrade
+
+            upgrade()
+            assert listing_indexes <= set(_indexes_in(instances_path, "telemetry_table"))
+
+            downgrade(revision="0001_initial")
+            indexes = set(_indexes_in(instances_path, "telemetry_table"))
+
+        assert not listing_indexes & indexes
+        assert "ix_telemetry_table_updated_at" in indexes
+
+    def test_unique_identifier_renames_existing_duplicates(self, migration_app: Flask, tmp_path: Path) -> None:
+        """0003 keeps the lowest id's name, renames the other duplicates, then enforces uniqueness."""
+
+        instances_path = Path(migration_app.config["SQLALCHEMY_BINDS"][None].replace("sqlite:///", ""))
+
+        with migration_app.app_context():
+            from flask_migrate import upgrade
+
+            upgrade(revision="0002_listing_indexes")
+
+            conn = sqlite3.connect(instances_path)
+            try:
+                conn.executemany(
+                    "INSERT INTO telemetry_table (instance_id, instance_identifier, user, current_config_hash, "
+                    "default_autopilot_parameters, autopilot_parameters, autopilot_parameters_new_flag, boat_status, "
+                    "boat_status_new_flag, waypoints, waypoints_new_flag, created_at, updated_at) "
+                    "VALUES (?, ?, 'unknown', '', '{}', '{}', 0, '{}', 0, '[]', 0, '2026-01-01', '2026-01-01')",
+                    [(1, "boat"), (2, "boat"), (3, "other")],
+                )
+                conn.commit()
+            finally:
+                conn.close()
+
+            upgrade()
+
+        conn = sqlite3.connect(instances_path)
+        try:
+            names = conn.execute("SELECT instance_id, instance_identifier FROM telemetry_table ORDER BY instance_id").fetchall()
+            with pytest.raises(sqlite3.IntegrityError):
+                conn.execute("UPDATE telemetry_table SET instance_identifier = 'boat' WHERE instance_id = 3")
+        finally:
+            conn.close()
+
+        assert names == [(1, "boat"), (2, "boat (2)"), (3, "other")]
+
+    def test_parameters_digest_is_backfilled(self, migration_app: Flask, tmp_path: Path) -> None:
+        """0004 adds autopilot_parameters_digest and fills it for existing rows."""
+
+        from autoboat_telemetry_server.canonical import EMPTY_PARAMETERS_DIGEST, parameters_digest
+
+        instances_path = Path(migration_app.config["SQLALCHEMY_BINDS"][None].replace("sqlite:///", ""))
+        parameters = {"speed": 1.5, "mode": "auto"}
+
+        with migration_app.app_context():
+            from flask_migrate import upgrade
+
+            upgrade(revision="0003_unique_identifier")
+
+            conn = sqlite3.connect(instances_path)
+            try:
+                conn.executemany(
+                    "INSERT INTO telemetry_table (instance_id, instance_identifier, user, current_config_hash, "
+                    "default_autopilot_parameters, autopilot_parameters, autopilot_parameters_new_flag, boat_status, "
+                    "boat_status_new_flag, waypoints, waypoints_new_flag, created_at, updated_at) "
+                    "VALUES (?, ?, 'unknown', '', '{}', ?, 0, '{}', 0, '[]', 0, '2026-01-01', '2026-01-01')",
+                    [(1, "with-params", json.dumps(parameters)), (2, "empty", "{}")],
+                )
+                conn.commit()
+            finally:
+                conn.close()
+
+            upgrade()
+
+        conn = sqlite3.connect(instances_path)
+        try:
+            digests = conn.execute("SELECT autopilot_parameters_digest FROM telemetry_table ORDER BY instance_id").fetchall()
+        finally:
+            conn.close()
+
+        assert digests == [(parameters_digest(parameters),), (EMPTY_PARAMETERS_DIGEST,)]
+
+    def test_parameters_by_reference_converts_matching_rows(self, migration_app: Flask, tmp_path: Path) -> None:
+        """0005 turns rows matching their stored config into overrides, and downgrade restores them."""
+
+        from autoboat_telemetry_server.models import HashTable
+
+        instances_path = Path(migration_app.config["SQLALCHEMY_BINDS"][None].replace("sqlite:///", ""))
+        hashes_path = Path(migration_app.config["SQLALCHEMY_BINDS"]["hashes"].replace("sqlite:///", ""))
+        config = {"speed": {"default": 1.5, "description": "s"}, "mode": {"default": "auto", "description": "m"}}
+        config_hash = HashTable.compute_hash(config)
+        rows = [
+            (1, "matching", config_hash, json.dumps(config), json.dumps({"speed": 2.0, "mode": "auto"})),
+            (2, "other-keys", config_hash, json.dumps(config), json.dumps({"speed": 2.0})),
+            (3, "no-config", "", "{}", json.dumps({"speed": 2.0})),
+        ]
+
+        with migration_app.app_context():
+            from flask_migrate import downgrade, upgrade
+
+            upgrade(revision="0004_parameters_digest")
+
+            conn = sqlite3.connect(hashes_path)
+            try:
+                conn.execute(
+                    "INSERT INTO hash_table (config_hash, data, description, created_at) VALUES (?, ?, '', '2026-01-01')",
+                    (config_hash, json.dumps(config)),
+                )
+                conn.commit()
+            finally:
+                conn.close()
+
+            conn = sqlite3.connect(instances_path)
+            try:
+                conn.executemany(
+                    "INSERT INTO telemetry_table (instance_id, instance_identifier, user, current_config_hash, "
+                    "default_autopilot_parameters, autopilot_parameters, autopilot_parameters_new_flag, boat_status, "
+                    "boat_status_new_flag, waypoints, waypoints_new_flag, created_at, updated_at) "
+                    "VALUES (?, ?, 'unknown', ?, ?, ?, 0, '{}', 0, '[]', 0, '2026-01-01', '2026-01-01')",
+                    rows,
+                )
+                conn.commit()
+            finally:
+                conn.close()
+
+            upgrade(revision="0005_parameters_by_reference")
+
+            conn = sqlite3.connect(instances_path)
+            try:
+                converted = conn.execute(
+                    "SELECT default_autopilot_parameters, autopilot_parameters, autopilot_parameters_by_reference "
+                    "FROM telemetry_table ORDER BY instance_id"
+                ).fetchall()
+            finally:
+                conn.close()
+
+            downgrade(revision="0004_parameters_digest")
+
+        conn = sqlite3.connect(instances_path)
+        try:
+            restored = conn.execute(
+                "SELECT instance_id, instance_identifier, current_config_hash, default_autopilot_parameters, "
+                "autopilot_parameters FROM telemetry_table ORDER BY instance_id"
+            ).fetchall()
+        finally:
+            conn.close()
+
+        assert [(json.loads(d), json.loads(p), by_reference) for d, p, by_reference in converted] == [
+            ({}, {"speed": 2.0}, 1),
+            (config, {"speed": 2.0}, 0),
+            ({}, {"speed": 2.0}, 0),
+        ]
+        assert [(*row[:3], json.loads(row[3]), json.loads(row[4])) for row in restored] == [
+            (*row[:3], json.loads(row[3]), json.loads(row[4])) for row in rows
+        ]
+
+    def test_parameter_history_tables_round_trip(self, migration_app: Flask, tmp_path: Path) -> None:
+        """0006 creates the change log and snapshot tables with their indexes; downgrade drops them."""
+
+        instances_path = Path(migration_app.config["SQLALCHEMY_BINDS"][None].replace("sqlite:///", ""))
+
+        with migration_app.app_context():
+            from flask_migrate import downgrade, upgrade
+
+            upgrade()
+            tables = set(_tables_in(instances_path))
+            change_indexes = set(_indexes_in(instances_path, "parameter_change_table"))
+            snapshot_indexes = set(_indexes_in(instances_path, "parameter_snapshot_table"))
+
+            downgrade(revision="0005_parameters_by_reference")
+            tables_after = set(_tables_in(instances_path))
+
+        assert {"parameter_change_table", "parameter_snapshot_table"} <= tables
+        assert change_indexes == {
+            "ix_parameter_change_table_instance_id_change_id",
+            "ix_parameter_change_table_instance_id_changed_at",
+        }
+        assert snapshot_indexes == {"ix_parameter_snapshot_table_instance_id_taken_at"}
+        assert not {"parameter_change_table", "parameter_snapshot_table"} & tables_after
+
+    def test_packed_waypoints_downgrade_unpacks(self, migration_app: Flask, tmp_path: Path) -> None:
+        """0007 adds the blob column; its downgrade moves packed waypoints back into the JSON column."""
+
+        instances_path = Path(migration_app.config["SQLALCHEMY_BINDS"][None].replace("sqlite:///", ""))
+
+        with migration_app.app_context():
+            from flask_migrate import downgrade, upgrade
+
+            upgrade()
+            with sqlite3.connect(instances_path) as conn:
+                conn.execute(
+                    "INSERT INTO telemetry_table (instance_identifier, user, current_config_hash, "
+                    "default_autopilot_parameters, autopilot_parameters, autopilot_parameters_new_flag, "
+                    "autopilot_parameters_digest, boat_status, boat_status_mapping, "
+                    "boat_status_new_flag, waypoints, waypoints_packed, waypoints_new_flag, created_at, updated_at) "
+                    "VALUES ('a', 'u', '', '{}', '{}', 0, '', '{}', '[]', 0, '[]', ?, 0, '2026-01-01', '2026-01-01')",
+                    (struct.pack("<4d", 1.0, 2.0, 3.0, 4.0),),
+                )
+
+            downgrade(revision="0006_parameter_history")
+
+            with sqlite3.connect(instances_path) as conn:
+                columns = {row[1] for row in conn.execute("PRAGMA table_info(telemetry_table)")}
+                (waypoints,) = conn.execute("SELECT waypoints FROM telemetry_table").fetchone()
+
+        assert "waypoints_packed" not in columns
+        assert json.loads(waypoints) == [[1.0, 2.0], [3.0, 4.0]]
+
+    def test_waypoint_edits_round_trip(self, migration_app: Flask, tmp_path: Path) -> None:
+        """0008 adds waypoints_version and the edit log; downgrade removes both."""
+
+        instances_path = Path(migration_app.config["SQLALCHEMY_BINDS"][None].replace("sqlite:///", ""))
+
+        with migration_app.app_context():
+            from flask_migrate import downgrade, upgrade
+
+            upgrade()
+            with sqlite3.connect(instances_path) as conn:
+                columns = {row[1] for row in conn.execute("PRAGMA table_info(telemetry_table)")}
+            indexes = set(_indexes_in(instances_path, "waypoint_edit_table"))
+
+            downgrade(revision="0007_packed_waypoints")
+            with sqlite3.connect(instances_path) as conn:
+                columns_after = {row[1] for row in conn.execute("PRAGMA table_info(telemetry_table)")}
+            tables_after = set(_tables_in(instances_path))
+
+        assert "waypoints_version" in columns
+        assert indexes == {"ix_waypoint_edit_table_instance_id_version"}
+        assert "waypoints_version" not in columns_after
+        assert "waypoint_edit_table" not in tables_after
+
+    def test_geofences_round_trip(self, migration_app: Flask, tmp_path: Path) -> None:
+        """0009 creates the geofence table with its instance index; downgrade drops it."""
+
+        instances_path = Path(migration_app.config["SQLALCHEMY_BINDS"][None].replace("sqlite:///", ""))
+
+        with migration_app.app_context():
+            from flask_migrate import downgrade, upgrade
+
+            upgrade()
+            indexes = set(_indexes_in(instances_path, "geofence_table"))
+
+            downgrade(revision="0008_waypoint_edits")
+            tables_after = set(_tables_in(instances_path))
+
+        assert indexes == {"ix_geofence_table_instance_id"}
+        assert "geofence_table" not in tables_after
+
+    def test_position_fields_round_trip(self, migration_app: Flask, tmp_path: Path) -> None:
+        """0010 adds telemetry_table.boat_status_position_fields; downgrade removes it."""
+
+        instances_path = Path(migration_app.config["SQLALCHEMY_BINDS"][None].replace("sqlite:///", ""))
+
+        with migration_app.app_context():
+            from flask_migrate import downgrade, upgrade
+
+            upgrade()
+            with sqlite3.connect(instances_path) as conn:
+                columns = {row[1] for row in conn.execute("PRAGMA table_info(telemetry_table)")}
+
+            downgrade(revision="0009_geofences")
+            with sqlite3.connect(instances_path) as conn:
+                columns_after = {row[1] for row in conn.execute("PRAGMA table_info(telemetry_table)")}
+
+        assert "boat_status_position_fields" in columns
+        assert "boat_status_position_fields" not in columns_after
+
+    def test_alert_rules_round_trip(self, migration_app: Flask, tmp_path: Path) -> None:
+        """0011 creates the alert rule table with its instance index; downgrade drops it."""
+
+        instances_path = Path(migration_app.config["SQLALCHEMY_BINDS"][None].replace("sqlite:///", ""))
+
+        with migration_app.app_context():
+            from flask_migrate import downgrade, upgrade
+
+            upgrade()
+            indexes = set(_indexes_in(instances_path, "alert_rule_table"))
+
+            downgrade(revision="0010_position_fields")
+            tables_after = set(_tables_in(instances_path))
+
+        assert indexes == {"ix_alert_rule_table_instance_id"}
+        assert "alert_rule_table" not in tables_after
@@ -8,7 +8,8 @@ Covers:
 - ``HashTable.to_dict`` (serialization).
 - ``TelemetryTable.validate_user`` (the immutability invariant, #3.3).
 - ``TelemetryTable.to_dict`` and ``get_all_ids``.
-- The ``after_insert`` hook that auto-sets ``instance_identifier`` (#3.5).
+- The ``before_insert`` hook that auto-sets ``instance_identifier`` (#3.5).
+- ``TelemetryTable.create_many`` (single-statement bulk creation).
 """
 
 from __future__ import annotations
@@ -184,14 +185,36 @@ class TestValidateUser:
         instance.user = "unknown"
         assert instance.user == "unknown"
 
+    def test_user_can_be_passed_to_the_constructor(self, app: Flask) -> None:
+        """An un-flushed instance has ``user is None``, which counts as not set yet."""
+
+        instance = TelemetryTable(user="alice")
+        assert instance.user == "alice"
+        with pytest.raises(ValueError, match="can only be set once"):
+            instance.user = "bob"
+
 
 # --------------------------------------------------------------------------- #
-# DB-backed tests: after_insert hook, to_dict, get_all_ids, check_hash_exists
+# DB-backed tests: before_insert hook, create_many, to_dict, get_all_ids, check_hash_exists
 # --------------------------------------------------------------------------- #
 
 
-class TestAfterInsertHook:
-    """The ``after_insert`` event auto-sets ``instance_identifier`` (#3.5)."""
+def _count_statements(app: Flask) -> list[str]:
+    """Record every SQL statement issued on the default bind into the returned list."""
+
+    from sqlalchemy import event
+
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _record)
+    return statements
+
+
+class TestInstanceIdentifierHook:
+    """The ``before_insert`` event auto-sets ``instance_identifier`` (#3.5) inside the INSERT."""
 
     def test_auto_sets_default_identifier(self, app: Flask) -> None:
         instance = TelemetryTable(
@@ -229,6 +252,79 @@ class TestAfterInsertHook:
         db.session.commit()
         assert instance.instance_identifier == f"Unnamed instance #{instance.instance_id}"
 
+    def test_default_identifier_needs_no_follow_up_update(self, app: Flask) -> None:
+        """The old ``after_insert`` hook issued a second UPDATE per insert; the name is now part of the INSERT."""
+
+        statements = _count_statements(app)
+        instance = TelemetryTable(
+            default_autopilot_parameters={}, autopilot_parameters={}, boat_status={}, waypoints=[], boat_status_mapping=[]
+        )
+        db.session.add(instance)
+        db.session.flush()
+
+        assert [s.split()[0] for s in statements] == ["INSERT"]
+
+    def test_ids_stay_in_step_with_names_after_deleting_the_newest_row(self, app: Flask) -> None:
+        first, second = (
+            TelemetryTable(
+                default_autopilot_parameters={}, autopilot_parameters={}, boat_status={}, waypoints=[], boat_status_mapping=[]
+            )
+            for _ in range(2)
+        )
+        db.session.add_all([first, second])
+        db.session.commit()
+        db.session.delete(second)
+        db.session.commit()
+
+        third = TelemetryTable(
+            default_autopilot_parameters={}, autopilot_parameters={}, boat_status={}, waypoints=[], boat_status_mapping=[]
+        )
+        db.session.add(third)
+        db.session.commit()
+        assert third.instance_identifier == f"Unnamed instance #{third.instance_id}"
+
+
+class TestCreateMany:
+    """``create_many`` inserts N default instances with one ``INSERT ... RETURNING``."""
+
+    def test_returns_ascending_ids_with_default_names(self, app: Flask) -> None:
+        ids = TelemetryTable.create_many(5)
+        db.session.commit()
+
+        assert ids == sorted(ids)
+        assert len(set(ids)) == 5
+        names = dict(db.session.execute(db.select(TelemetryTable.instance_id, TelemetryTable.instance_identifier)).all())
+        assert names == {instance_id: f"Unnamed instance #{instance_id}" for instance_id in ids}
+
+    def test_continues_after_existing_rows(self, app: Flask) -> None:
+        (first,) = TelemetryTable.create_many(1)
+        second, third = TelemetryTable.create_many(2)
+        db.session.commit()
+        assert (second, third) == (first + 1, first + 2)
+
+    def test_uses_a_single_statement(self, app: Flask) -> None:
+        statements = _count_statements(app)
+        TelemetryTable.create_many(50)
+        assert len(statements) == 1
+        assert "INSERT INTO telemetry_table" in statements[0]
+        assert "RETURNING instance_id" in statements[0]
+
+    def test_rows_have_empty_defaults(self, app: Flask) -> None:
+        (instance_id,) = TelemetryTable.create_many(1)
+        db.session.commit()
+
+        instance = db.session.get(TelemetryTable, instance_id)
+        assert instance is not None
+        assert instance.user == "unknown"
+        assert instance.boat_status == {}
+        assert instance.waypoints == []
+        assert instance.autopilot_parameters_new_flag is False
+        assert instance.created_at == instance.updated_at
+
+    def test_rejects_non_positive_count(self, app: Flask) -> None:
+        with pytest.raises(ValueError, match="at least 1"):
+            TelemetryTable.create_many(0)
+
 
 class TestTelemetryTableToDict:
     """``to_dict`` serializes a subset of columns for the info routes."""
@@ -357,6 +453,14 @@ class TestSqlitePragmas:
     def test_busy_timeout_is_set(self, app: Flask) -> None:
         assert self._pragma(app, "busy_timeout") == 5000
 
+    def test_new_databases_use_incremental_auto_vacuum(self, app: Flask) -> None:
+        from sqlalchemy import text
+
+        # auto_vacuum=INCREMENTAL is reported as the integer 2
+        assert self._pragma(app, "auto_vacuum") == 2
+        with app.app_context(), db.engines["hashes"].connect() as conn:
+            assert conn.execute(text("PRAGMA auto_vacuum")).scalar() == 2
+
 
 # --------------------------------------------------------------------------- #
 # Indexes on TelemetryTable (updated_at, instance_identifier)
@@ -0,0 +1,156 @@
+"""
+Tests for ``autoboat_telemetry_server.ndjson`` and the NDJSON export / import routes.
+
+Covers:
+- ``iter_records`` / ``chunked`` parse and split lazily, naming the bad line on errors.
+- ``/autopilot_parameters/export`` + ``import`` and ``/instance_manager/export`` +
+  ``import`` round-trip state between two servers, streaming and in chunks.
+- Duplicates are skipped, default names follow the new IDs, and rows committed
+  before an invalid line stay imported.
+- A throughput benchmark (run with ``-s`` to see rows/sec).
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import time
+from collections.abc import Callable
+
+import pytest
+from flask import Flask
+from flask.testing import FlaskClient
+
+from autoboat_telemetry_server.ndjson import NDJSON_MIMETYPE, chunked, encode_line, iter_records
+
+_CONFIG = {"speed": {"default": 1.5, "description": "s"}, "mode": {"default": "auto", "description": "m"}}
+
+
+def _ndjson(records: list[dict]) -> bytes:
+    return b"".join(encode_line(record) for record in records)
+
+
+def _lines(response_data: bytes) -> list[dict]:
+    return [json.loads(line) for line in response_data.splitlines()]
+
+
+class TestParsing:
+    """Records are read one line at a time."""
+
+    def test_iter_records_skips_blank_lines(self) -> None:
+        stream = io.BytesIO(b'{"a": 1}\n\n{"b": 2}\n')
+
+        assert list(iter_records(stream)) == [(1, {"a": 1}), (3, {"b": 2})]
+
+    def test_invalid_json_names_the_line(self) -> None:
+        with pytest.raises(ValueError, match="Line 2"):
+            list(iter_records(io.BytesIO(b'{"a": 1}\n{oops\n')))
+
+    def test_non_object_is_a_type_error(self) -> None:
+        with pytest.raises(TypeError, match="Line 1"):
+            list(iter_records(io.BytesIO(b"[1, 2]\n")))
+
+    def test_chunked(self) -> None:
+        assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+
+class TestConfigExportImport:
+    """Configs round-trip by hash, and existing hashes are skipped."""
+
+    def test_round_trip(self, app: Flask, client: FlaskClient, create_config: Callable[[dict], str]) -> None:
+        config_hash = create_config(_CONFIG)
+        client.post(f"/autopilot_parameters/set_hash_description/{config_hash}/tuned")
+
+        response = client.get("/autopilot_parameters/export")
+        assert response.status_code == 200
+        assert response.mimetype == NDJSON_MIMETYPE
+        assert response.is_streamed
+        exported = response.get_data()
+        assert _lines(exported)[0]["data"] == _CONFIG
+
+        client.delete(f"/autopilot_parameters/delete_config/{config_hash}")
+        report = client.post("/autopilot_parameters/import", data=exported).get_json()
+
+        assert report["imported"] == 1
+        assert report["skipped"] == 0
+        assert client.get(f"/autopilot_parameters/get_config/{config_hash}").get_json() == _CONFIG
+        assert client.get(f"/autopilot_parameters/get_hash_description/{config_hash}").get_json() == "tuned"
+
+        again = client.post("/autopilot_parameters/import", data=exported).get_json()
+        assert (again["imported"], again["skipped"]) == (0, 1)
+
+    def test_mismatched_hash_is_rejected(self, client: FlaskClient) -> None:
+        body = _ndjson([{"config_hash": "0" * 64, "data": _CONFIG}])
+
+        response = client.post("/autopilot_parameters/import", data=body)
+
+        assert response.status_code == 400
+        assert "Line 1" in response.get_json()["error"]
+
+
+class TestInstanceExportImport:
+    """Instances are recreated with new IDs, their state, and their config reference."""
+
+    def test_round_trip(self, app: Flask, client: FlaskClient, create_config: Callable[[dict], str]) -> None:
+        config_hash = create_config(_CONFIG)
+        named, unnamed = client.get(f"/instance_manager/create_many?n=2&config_hash={config_hash}").get_json()
+        client.post(f"/instance_manager/set_name/{named}/alpha")
+        client.post(f"/instance_manager/set_user/{named}/crew")
+        client.post(f"/autopilot_parameters/update_existing_parameter/{named}/speed", json=json.dumps(3.0))
+        client.post(f"/waypoints/set/{named}", json=[[1.0, 2.0]])
+
+        exported = client.get("/instance_manager/export").get_data()
+        assert [record["instance_id"] for record in _lines(exported)] == [named, unnamed]
+
+        client.delete("/instance_manager/delete_all")
+        app.config["IMPORT_CHUNK_SIZE"] = 1
+        report = client.post("/instance_manager/import", data=exported).get_json()
+        assert (report["imported"], report["skipped"]) == (2, 0)
+        assert report["rows_per_second"] > 0
+
+        new_id = client.get("/instance_manager/get_id/alpha").get_json()
+        assert client.get(f"/instance_manager/get_user/{new_id}").get_json() == "crew"
+        assert client.get(f"/autopilot_parameters/get/{new_id}").get_json() == {"speed": 3.0, "mode": "auto"}
+        assert client.get(f"/autopilot_parameters/get_hash/{new_id}").get_json() == config_hash
+        assert client.get(f"/waypoints/get/{new_id}").get_json() == [[1.0, 2.0]]
+
+        ids = client.get("/instance_manager/get_ids").get_json()
+        other_id = next(instance_id for instance_id in ids if instance_id != new_id)
+        assert client.get(f"/instance_manager/get_name/{other_id}").get_json() == f"Unnamed instance #{other_id}"
+
+    def test_taken_names_are_skipped(self, client: FlaskClient) -> None:
+        instance_id = client.get("/instance_manager/create").get_json()
+        client.post(f"/instance_manager/set_name/{instance_id}/alpha")
+
+        report = client.post("/instance_manager/import", data=_ndjson([{"instance_identifier": "alpha"}])).get_json()
+
+        assert (report["imported"], report["skipped"]) == (0, 1)
+
+    def test_committed_chunks_survive_a_bad_line(self, app: Flask, client: FlaskClient) -> None:
+        app.config["IMPORT_CHUNK_SIZE"] = 2
+        body = _ndjson([{"instance_identifier": "a"}, {"instance_identifier": "b"}, {"instance_identifier": "c"}]) + b"{oops\n"
+
+        response = client.post("/instance_manager/import", data=body)
+
+        assert response.status_code == 400
+        assert response.get_json()["imported"] == 2
+        assert "Line 4" in response.get_json()["error"]
+        assert client.get("/instance_manager/get_id/b").status_code == 200
+        assert client.get("/instance_manager/get_id/c").status_code == 404
+
+
+class TestImportBenchmark:
+    """Bulk import is one request with chunked transactions instead of thousands of per-row calls."""
+
+    def test_throughput(self, client: FlaskClient) -> None:
+        count = 5000
+        body = _ndjson([{"instance_identifier": f"boat-{i}", "boat_status": {"speed": i}} for i in range(count)])
+
+        start = time.perf_counter()
+        report = client.post("/instance_manager/import", data=body).get_json()
+        elapsed = time.perf_counter() - start
+
+        assert report["imported"] == count
+        exported = client.get("/instance_manager/export").get_data()
+        assert len(exported.splitlines()) == count
+        print(f"\nimported {count} instances in {elapsed:.3f}s ({report['rows_per_second']:.0f} rows/sec)")
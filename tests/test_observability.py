@@ -7,6 +7,7 @@ import logging
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+import pytest
 from flask.testing import FlaskClient
 
 if TYPE_CHECKING:
@@ -254,6 +255,130 @@ class TestCleanInstancesCounter:
         assert after == before
 
 
+class TestGeofenceViolationsCounter:
+    """``geofence_violations_total`` counts one violation per geofence, labelled by mode."""
+
+    def test_increments_per_mode(self, app: Flask) -> None:
+        labels = {"mode": "keep_out"}
+        before = _counter_value(observability._geofence_violations_total, labels)
+
+        observability.count_geofence_violations(["keep_out", "keep_out"])
+
+        assert _counter_value(observability._geofence_violations_total, labels) == before + 2.0
+
+
+class TestAlertRuleMetrics:
+    """``observe_alert_rules`` counts evaluated and fired rules and times the evaluation."""
+
+    def test_counts_evaluations_and_fired_rules(self, app: Flask) -> None:
+        from prometheus_client import REGISTRY
+
+        from autoboat_telemetry_server.types import DiagnosticMessageIntensity
+
+        labels = {"intensity": "error"}
+        evaluated = REGISTRY.get_sample_value("alert_rule_evaluations_total") or 0.0
+        fired = _counter_value(observability._alert_rules_fired_total, labels)
+        timed = REGISTRY.get_sample_value("alert_rule_evaluation_seconds_count") or 0.0
+
+        observability.observe_alert_rules(3, 0.0001, [DiagnosticMessageIntensity.ERROR])
+        observability.observe_alert_rules(0, 0.0, [])
+
+        assert REGISTRY.get_sample_value("alert_rule_evaluations_total") == evaluated + 3
+        assert _counter_value(observability._alert_rules_fired_total, labels) == fired + 1
+        assert REGISTRY.get_sample_value("alert_rule_evaluation_seconds_count") == timed + 1
+
+
+class TestAnomaliesCounter:
+    """``anomalies_detected_total`` counts one anomaly per started detector, labelled by type."""
+
+    def test_increments_per_type(self, app: Flask) -> None:
+        labels = {"type": "stuck"}
+        before = _counter_value(observability._anomalies_detected_total, labels)
+
+        observability.count_anomalies(["stuck", "jump", "stuck"])
+
+        assert _counter_value(observability._anomalies_detected_total, labels) == before + 2.0
+
+
+class TestSqliteStorageCollector:
+    """The custom storage collector reports per-bind gauges, cached between scrapes."""
+
+    def test_reports_rows_and_pages_per_bind(self, app: Flask, client: FlaskClient) -> None:
+        from prometheus_client import REGISTRY
+
+        from autoboat_telemetry_server.models import TelemetryTable, db
+
+        TelemetryTable.create_many(3)
+        db.session.commit()
+        app.config["STORAGE_METRICS_TTL"] = 0.0
+        observability._storage_collector.bind(app)
+
+        assert REGISTRY.get_sample_value("sqlite_table_rows", {"bind": "default", "table": "telemetry_table"}) == 3
+        assert REGISTRY.get_sample_value("sqlite_table_rows", {"bind": "hashes", "table": "hash_table"}) == 0
+        # append-only logs are never counted
+        assert REGISTRY.get_sample_value("sqlite_table_rows", {"bind": "default", "table": "parameter_change_table"}) is None
+        for bind in ("default", "hashes"):
+            assert REGISTRY.get_sample_value("sqlite_page_count", {"bind": bind}) > 0
+            assert REGISTRY.get_sample_value("sqlite_freelist_count", {"bind": bind}) >= 0
+            assert REGISTRY.get_sample_value("sqlite_wal_size_bytes", {"bind": bind}) >= 0
+
+        assert b"sqlite_page_count" in client.get("/metrics").data
+
+    def test_snapshot_is_cached_within_ttl(self, app: Flask) -> None:
+        from prometheus_client import REGISTRY
+
+        from autoboat_telemetry_server.models import TelemetryTable, db
+
+        app.config["STORAGE_METRICS_TTL"] = 60.0
+        observability._storage_collector.bind(app)
+        labels = {"bind": "default", "table": "telemetry_table"}
+        assert REGISTRY.get_sample_value("sqlite_table_rows", labels) == 0
+
+        TelemetryTable.create_many(2)
+        db.session.commit()
+        assert REGISTRY.get_sample_value("sqlite_table_rows", labels) == 0
+
+        # re-binding drops the snapshot
+        observability._storage_collector.bind(app)
+        assert REGISTRY.get_sample_value("sqlite_table_rows", labels) == 2
+
+    def test_checkpoint_duration_is_observed(self, app: Flask) -> None:
+        from prometheus_client import REGISTRY
+
+        from autoboat_telemetry_server.maintenance import checkpoint_wal
+
+        labels = {"bind": "hashes", "mode": "PASSIVE"}
+        before = REGISTRY.get_sample_value("sqlite_checkpoint_duration_seconds_count", labels) or 0.0
+        checkpoint_wal()
+        assert REGISTRY.get_sample_value("sqlite_checkpoint_duration_seconds_count", labels) == before + 1
+
+    def test_counts_locked_database_errors(self, app: Flask) -> None:
+        import sqlite3
+
+        from sqlalchemy import text
+
+        from autoboat_telemetry_server.models import db
+
+        before = _counter_value(observability._sqlite_busy_errors_total, {"bind": "default"})
+
+        # an outside connection holds the write lock; a zero busy_timeout makes ours fail at once
+        blocker = sqlite3.connect(db.engine.url.database)
+        blocker.execute("BEGIN IMMEDIATE")
+        try:
+            with db.engine.connect() as connection:
+                connection.execute(text("PRAGMA busy_timeout=0"))
+                try:
+                    with pytest.raises(Exception, match="database is locked"):
+                        connection.execute(text("INSERT INTO telemetry_table (instance_identifier) VALUES ('x')"))
+                finally:
+                    connection.execute(text("PRAGMA busy_timeout=5000"))
+        finally:
+            blocker.rollback()
+            blocker.close()
+
+        assert _counter_value(observability._sqlite_busy_errors_total, {"bind": "default"}) == before + 1
+
+
 class TestStructuredLogging:
     """The JSON request logger emits one structured record per request."""
 
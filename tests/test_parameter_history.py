@@ -0,0 +1,148 @@
+"""
+Tests for ``autoboat_telemetry_server.parameter_history`` and ``/autopilot_parameters/history``.
+
+Covers:
+- Every parameter write path logs only the keys it changed, in its own transaction.
+- The first logged write stores a baseline snapshot; later snapshots follow the interval.
+- Time-range listing and point-in-time reconstruction, which never replays more
+  than one snapshot interval.
+- Deleting an instance deletes its history.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from datetime import UTC, datetime
+
+from flask import Flask
+from flask.testing import FlaskClient
+
+from autoboat_telemetry_server.models import ParameterChangeTable, ParameterSnapshotTable, db
+
+_CONFIG = {"speed": {"default": 1.5, "description": "s"}, "mode": {"default": "auto", "description": "m"}}
+
+
+def _instance_with_defaults(client: FlaskClient) -> int:
+    instance_id = client.get("/instance_manager/create").get_json()
+    assert client.post(f"/autopilot_parameters/set_default/{instance_id}", json=json.dumps(_CONFIG)).status_code == 200
+    return instance_id
+
+
+def _update(client: FlaskClient, instance_id: int, key: str, value: object) -> None:
+    response = client.post(f"/autopilot_parameters/update_existing_parameter/{instance_id}/{key}", json=json.dumps(value))
+    assert response.status_code == 200, response.data
+
+
+def _now() -> str:
+    # sqlite keeps microseconds, so successive writes a few ms apart get distinct timestamps
+    time.sleep(0.002)
+    moment = datetime.now(UTC).isoformat()
+    time.sleep(0.002)
+    return moment
+
+
+class TestChangeLog:
+    """Only changed keys are logged, with their old and new values."""
+
+    def test_write_paths(self, client: FlaskClient) -> None:
+        instance_id = _instance_with_defaults(client)
+        _update(client, instance_id, "speed", 3.0)
+        _update(client, instance_id, "speed", 3.0)
+        client.post(f"/autopilot_parameters/set/{instance_id}", json=json.dumps({"speed": 3.0, "mode": "manual"}))
+
+        changes = client.get(f"/autopilot_parameters/history/{instance_id}").get_json()
+
+        assert [(c["key"], c["change"], c["old"], c["new"]) for c in changes] == [
+            ("mode", "added", None, "auto"),
+            ("speed", "added", None, 1.5),
+            ("speed", "changed", 1.5, 3.0),
+            ("mode", "changed", "auto", "manual"),
+        ]
+
+    def test_time_range(self, client: FlaskClient) -> None:
+        instance_id = _instance_with_defaults(client)
+        start = _now()
+        _update(client, instance_id, "speed", 2.0)
+        middle = _now()
+        _update(client, instance_id, "speed", 3.0)
+
+        in_range = client.get(f"/autopilot_parameters/history/{instance_id}", query_string={"since": start, "until": middle})
+
+        assert [c["new"] for c in in_range.get_json()] == [2.0]
+        assert len(client.get(f"/autopilot_parameters/history/{instance_id}?limit=1").get_json()) == 1
+
+    def test_bad_queries(self, client: FlaskClient) -> None:
+        instance_id = _instance_with_defaults(client)
+
+        assert client.get(f"/autopilot_parameters/history/{instance_id}?since=yesterday").status_code == 400
+        assert client.get(f"/autopilot_parameters/history/{instance_id}?limit=0").status_code == 400
+        assert client.get("/autopilot_parameters/history/999").status_code == 404
+
+
+class TestReconstruction:
+    """Point-in-time reads start from the nearest snapshot."""
+
+    def test_point_in_time(self, client: FlaskClient) -> None:
+        instance_id = _instance_with_defaults(client)
+        _update(client, instance_id, "speed", 2.0)
+        at = _now()
+        _update(client, instance_id, "speed", 3.0)
+
+        response = client.get(f"/autopilot_parameters/history/{instance_id}", query_string={"at": at})
+
+        assert response.status_code == 200
+        assert response.get_json()["parameters"] == {"speed": 2.0, "mode": "auto"}
+
+    def test_before_history_is_400(self, client: FlaskClient) -> None:
+        before = _now()
+        instance_id = _instance_with_defaults(client)
+
+        assert client.get(f"/autopilot_parameters/history/{instance_id}", query_string={"at": before}).status_code == 400
+
+    def test_baseline_keeps_unlogged_parameters(self, app: Flask, client: FlaskClient) -> None:
+        config_hash = client.post("/autopilot_parameters/create_config", json=json.dumps(_CONFIG)).get_json()
+        (instance_id,) = client.get(f"/instance_manager/create_many?n=1&config_hash={config_hash}").get_json()
+        _update(client, instance_id, "mode", "manual")
+
+        at = _now()
+        response = client.get(f"/autopilot_parameters/history/{instance_id}", query_string={"at": at})
+
+        assert response.get_json()["parameters"] == {"speed": 1.5, "mode": "manual"}
+        snapshot = db.session.execute(db.select(ParameterSnapshotTable)).scalar_one()
+        assert (snapshot.change_id, snapshot.parameters) == (0, {"speed": 1.5, "mode": "auto"})
+
+    def test_replay_is_bounded_by_the_snapshot_interval(self, app: Flask, client: FlaskClient) -> None:
+        app.config["PARAMETER_SNAPSHOT_INTERVAL"] = 10
+        instance_id = _instance_with_defaults(client)
+        for value in range(50):
+            _update(client, instance_id, "speed", float(value))
+        at = _now()
+
+        response = client.get(f"/autopilot_parameters/history/{instance_id}", query_string={"at": at})
+        snapshots = (
+            db.session.execute(db.select(ParameterSnapshotTable).order_by(ParameterSnapshotTable.snapshot_id)).scalars().all()
+        )
+        last_change_id = db.session.execute(db.select(db.func.max(ParameterChangeTable.change_id))).scalar_one()
+
+        assert response.get_json()["parameters"] == {"speed": 49.0, "mode": "auto"}
+        # baseline + one every 10 of the 52 changes, so at most 10 are ever replayed
+        assert len(snapshots) == 1 + 5
+        assert last_change_id - snapshots[-1].change_id < 10
+
+
+class TestForget:
+    """Deleted instances take their history with them, so a reused ID starts clean."""
+
+    def test_delete(self, client: FlaskClient) -> None:
+        instance_id = _instance_with_defaults(client)
+        client.delete(f"/instance_manager/delete/{instance_id}")
+
+        assert db.session.execute(db.select(db.func.count()).select_from(ParameterChangeTable)).scalar_one() == 0
+        assert db.session.execute(db.select(db.func.count()).select_from(ParameterSnapshotTable)).scalar_one() == 0
+
+    def test_delete_all(self, client: FlaskClient) -> None:
+        _instance_with_defaults(client)
+        client.delete("/instance_manager/delete_all")
+
+        assert db.session.execute(db.select(db.func.count()).select_from(ParameterChangeTable)).scalar_one() == 0
@@ -0,0 +1,125 @@
+"""
+Tests for ``autoboat_telemetry_server.parameter_storage``.
+
+Covers:
+- ``overrides`` keeps only values whose canonical encoding differs from the default.
+- Routes store parameters as a config reference plus overrides and read them back resolved.
+- Rows fall back to full copies when deduplication is off or the keys no longer match the config.
+- ``create_many?config_hash=`` starts a whole fleet on one shared reference.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+
+from flask import Flask
+from flask.testing import FlaskClient
+
+from autoboat_telemetry_server.canonical import parameters_digest
+from autoboat_telemetry_server.models import TelemetryTable, db
+from autoboat_telemetry_server.parameter_storage import overrides
+
+_CONFIG = {"speed": {"default": 1.5, "description": "s"}, "mode": {"default": "auto", "description": "m"}}
+
+
+def _row(instance_id: int) -> TelemetryTable:
+    db.session.expire_all()
+    return db.session.get(TelemetryTable, instance_id)
+
+
+def _instance_on(client: FlaskClient, config_hash: str) -> int:
+    instance_id = client.get("/instance_manager/create").get_json()
+    assert client.post(f"/autopilot_parameters/set_default_from_hash/{instance_id}/{config_hash}").status_code == 200
+    return instance_id
+
+
+class TestOverrides:
+    """Only values that serialize differently from the default are kept."""
+
+    def test_sparse(self) -> None:
+        assert overrides({"a": 1, "b": "x"}, {"a": 1, "b": "y"}) == {"b": "y"}
+
+    def test_int_and_float_differ(self) -> None:
+        assert overrides({"a": 1}, {"a": 1.0}) == {"a": 1.0}
+
+
+class TestByReference:
+    """Rows on a stored config keep only a reference and their overrides."""
+
+    def test_set_default_from_hash_stores_a_reference(
+        self, app: Flask, client: FlaskClient, create_config: Callable[[dict], str]
+    ) -> None:
+        instance_id = _instance_on(client, create_config(_CONFIG))
+
+        row = _row(instance_id)
+        assert row.autopilot_parameters_by_reference is True
+        assert row.default_autopilot_parameters == {}
+        assert row.autopilot_parameters == {}
+        assert client.get(f"/autopilot_parameters/get/{instance_id}").get_json() == {"speed": 1.5, "mode": "auto"}
+        assert client.get(f"/autopilot_parameters/get_default/{instance_id}").get_json() == _CONFIG
+
+    def test_updates_store_only_overrides(self, app: Flask, client: FlaskClient, create_config: Callable[[dict], str]) -> None:
+        instance_id = _instance_on(client, create_config(_CONFIG))
+
+        client.post(f"/autopilot_parameters/update_existing_parameter/{instance_id}/speed", json=json.dumps(3.0))
+        assert _row(instance_id).autopilot_parameters == {"speed": 3.0}
+
+        client.post(f"/autopilot_parameters/set/{instance_id}", json=json.dumps({"speed": 1.5, "mode": "manual"}))
+        row = _row(instance_id)
+        assert row.autopilot_parameters == {"mode": "manual"}
+        assert row.autopilot_parameters_digest == parameters_digest({"speed": 1.5, "mode": "manual"})
+        assert client.get(f"/autopilot_parameters/get_new/{instance_id}").get_json() == {"speed": 1.5, "mode": "manual"}
+
+    def test_set_default_stores_a_reference(self, app: Flask, client: FlaskClient) -> None:
+        instance_id = client.get("/instance_manager/create").get_json()
+        client.post(f"/autopilot_parameters/set_default/{instance_id}", json=json.dumps(_CONFIG))
+
+        row = _row(instance_id)
+        assert row.autopilot_parameters_by_reference is True
+        assert client.get(f"/autopilot_parameters/get/{instance_id}").get_json() == {"speed": 1.5, "mode": "auto"}
+
+    def test_mismatched_keys_fall_back_to_full_copies(
+        self, app: Flask, client: FlaskClient, create_config: Callable[[dict], str]
+    ) -> None:
+        instance_id = _instance_on(client, create_config(_CONFIG))
+        client.post(f"/autopilot_parameters/update_existing_parameter/{instance_id}/speed", json=json.dumps(2.0))
+
+        # existing parameters are kept across a config switch, so their keys no longer match
+        other_hash = create_config({"heading": {"default": 0, "description": "h"}})
+        client.post(f"/autopilot_parameters/set_default_from_hash/{instance_id}/{other_hash}")
+
+        row = _row(instance_id)
+        assert row.autopilot_parameters_by_reference is False
+        assert row.autopilot_parameters == {"speed": 2.0, "mode": "auto"}
+        assert row.default_autopilot_parameters == {"heading": {"default": 0, "description": "h"}}
+
+    def test_disabled_stores_full_copies(self, app: Flask, client: FlaskClient, create_config: Callable[[dict], str]) -> None:
+        app.config["DEDUPLICATE_AUTOPILOT_PARAMETERS"] = False
+        instance_id = _instance_on(client, create_config(_CONFIG))
+
+        row = _row(instance_id)
+        assert row.autopilot_parameters_by_reference is False
+        assert row.default_autopilot_parameters == _CONFIG
+        assert row.autopilot_parameters == {"speed": 1.5, "mode": "auto"}
+
+
+class TestFleetCreation:
+    """``create_many?config_hash=`` writes one reference per boat and no config copies."""
+
+    def test_fleet_shares_the_reference(self, app: Flask, client: FlaskClient, create_config: Callable[[dict], str]) -> None:
+        config_hash = create_config(_CONFIG)
+
+        response = client.get(f"/instance_manager/create_many?n=100&config_hash={config_hash}")
+        assert response.status_code == 200
+        instance_ids = response.get_json()
+
+        rows = db.session.execute(db.select(TelemetryTable).where(TelemetryTable.instance_id.in_(instance_ids))).scalars().all()
+        assert len(rows) == 100
+        assert all(row.autopilot_parameters_by_reference and row.current_config_hash == config_hash for row in rows)
+        assert all(row.default_autopilot_parameters == {} and row.autopilot_parameters == {} for row in rows)
+        assert rows[0].autopilot_parameters_digest == parameters_digest({"speed": 1.5, "mode": "auto"})
+        assert client.get(f"/autopilot_parameters/get/{instance_ids[-1]}").get_json() == {"speed": 1.5, "mode": "auto"}
+
+    def test_unknown_hash_is_404(self, client: FlaskClient) -> None:
+        assert client.get("/instance_manager/create_many?n=2&config_hash=missing").status_code == 404
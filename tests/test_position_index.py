@@ -0,0 +1,191 @@
+"""
+Tests for ``autoboat_telemetry_server.position_index`` and ``/boat_status/near`` / ``bbox``.
+
+Covers:
+- ``near`` and ``bbox`` match a brute-force scan of every position.
+- Boxes across the antimeridian and circles reaching a pole.
+- Per-instance position fields (``set_position_fields``), validated and exported.
+- ``positions.status_number``, the numeric check shared by every status reader.
+- The index stays coherent with status writes, deletes and imports, and queries issue no SQL once loaded.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+
+import numpy as np
+from flask import Flask
+from flask.testing import FlaskClient
+from sqlalchemy import event
+
+from autoboat_telemetry_server.models import db
+from autoboat_telemetry_server.positions import status_number
+from autoboat_telemetry_server.route_geometry import EARTH_RADIUS_M
+
+
+def _haversine(a: tuple[float, float], b: tuple[float, float]) -> float:
+    latitude_a, longitude_a, latitude_b, longitude_b = map(math.radians, (*a, *b))
+    half_chord = (
+        math.sin((latitude_b - latitude_a) / 2) ** 2
+        + math.cos(latitude_a) * math.cos(latitude_b) * math.sin((longitude_b - longitude_a) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(half_chord))
+
+
+def _boat(client: FlaskClient, latitude: float, longitude: float) -> int:
+    instance_id = client.get("/instance_manager/create").get_json()
+    client.post(f"/boat_status/set/{instance_id}", json={"latitude": latitude, "longitude": longitude})
+    return instance_id
+
+
+def _near(client: FlaskClient, latitude: float, longitude: float, radius: float) -> list[int]:
+    response = client.get(f"/boat_status/near?lat={latitude}&lon={longitude}&radius={radius}")
+    assert response.status_code == 200, response.data
+    return [found["instance_id"] for found in response.get_json()]
+
+
+def _bbox(client: FlaskClient, south: float, west: float, north: float, east: float) -> list[int]:
+    response = client.get(f"/boat_status/bbox?south={south}&west={west}&north={north}&east={east}")
+    assert response.status_code == 200, response.data
+    return [found["instance_id"] for found in response.get_json()]
+
+
+class TestQueries:
+    """The grid answers exactly what a scan of every boat would."""
+
+    def test_near_matches_brute_force(self, client: FlaskClient) -> None:
+        rng = np.random.default_rng(0)
+        boats = {
+            _boat(client, latitude, longitude): (latitude, longitude)
+            for latitude, longitude in zip(rng.uniform(37.0, 37.05, 60), rng.uniform(-76.05, -76.0, 60), strict=True)
+        }
+
+        for radius in (100.0, 500.0, 2000.0, 10_000.0):
+            centre = (37.02, -76.02)
+            expected = sorted((d, i) for i, position in boats.items() if (d := _haversine(centre, position)) <= radius)
+            assert _near(client, *centre, radius) == [instance_id for _, instance_id in expected]
+
+    def test_near_is_sorted_with_distances(self, client: FlaskClient) -> None:
+        far = _boat(client, 37.01, -76.0)
+        close = _boat(client, 37.001, -76.0)
+
+        found = client.get("/boat_status/near?lat=37&lon=-76&radius=5000").get_json()
+
+        assert [boat["instance_id"] for boat in found] == [close, far]
+        assert found[0]["distance"] == _haversine((37.0, -76.0), (37.001, -76.0))
+
+    def test_bbox(self, client: FlaskClient) -> None:
+        inside = _boat(client, 37.5, -76.5)
+        _boat(client, 38.5, -76.5)
+
+        assert _bbox(client, 37, -77, 38, -76) == [inside]
+
+    def test_antimeridian_and_pole(self, client: FlaskClient) -> None:
+        east = _boat(client, 0.0, 179.995)
+        west = _boat(client, 0.0, -179.995)
+        polar = _boat(client, 89.999, 45.0)
+
+        assert _bbox(client, -1, 179.9, 1, -179.9) == [east, west]
+        assert sorted(_near(client, 0.0, 180.0, 1000.0)) == [east, west]
+        assert _near(client, 89.999, -135.0, 1000.0) == [polar]
+        assert set(_near(client, 0.0, 0.0, math.pi * EARTH_RADIUS_M)) == {east, west, polar}
+
+    def test_errors(self, client: FlaskClient) -> None:
+        assert client.get("/boat_status/near?lat=0&lon=0").status_code == 400
+        assert client.get("/boat_status/near?lat=91&lon=0&radius=1").status_code == 400
+        assert client.get("/boat_status/near?lat=0&lon=0&radius=-1").status_code == 400
+        assert client.get("/boat_status/bbox?south=1&west=0&north=0&east=1").status_code == 400
+        assert client.get("/boat_status/bbox?south=0&west=0&north=1").status_code == 400
+
+
+class TestPositionFields:
+    """Each instance can name the keys of its position."""
+
+    def test_custom_fields(self, client: FlaskClient) -> None:
+        instance_id = client.get("/instance_manager/create").get_json()
+        client.post(f"/boat_status/set/{instance_id}", json={"gps_lat": 10.0, "gps_lon": 20.0})
+        assert _near(client, 10.0, 20.0, 10.0) == []
+
+        assert client.post(f"/boat_status/set_position_fields/{instance_id}", json=["gps_lat", "gps_lon"]).status_code == 200
+
+        assert _near(client, 10.0, 20.0, 10.0) == [instance_id]
+        client.post(f"/boat_status/set_position_fields/{instance_id}", data="null", content_type="application/json")
+        assert _near(client, 10.0, 20.0, 10.0) == []
+
+    def test_validation_and_export(self, client: FlaskClient) -> None:
+        instance_id = client.get("/instance_manager/create").get_json()
+
+        assert client.post(f"/boat_status/set_position_fields/{instance_id}", json=["a"]).status_code == 404
+        assert client.post(f"/boat_status/set_position_fields/{instance_id}", json=["a", "a"]).status_code == 400
+        client.post(f"/boat_status/set_position_fields/{instance_id}", json=["a", "b"])
+
+        [record] = [json.loads(line) for line in client.get("/instance_manager/export").data.splitlines()]
+        assert record["boat_status_position_fields"] == ["a", "b"]
+
+
+class TestStatusNumber:
+    """Status values count as numbers only if they are non-boolean ints / floats."""
+
+    def test_values(self) -> None:
+        assert status_number(3) == 3.0
+        assert isinstance(status_number(3), float)
+        for value in (None, True, "1.0", [1.0], math.nan, math.inf):
+            assert status_number(value) is None
+
+        assert math.isnan(status_number(math.nan, finite=False))
+        assert status_number(False, finite=False) is None
+
+
+class TestCoherence:
+    """Every committed write that moves, adds or removes a boat updates the loaded index."""
+
+    def test_writes_and_deletes(self, client: FlaskClient) -> None:
+        instance_id = _boat(client, 1.0, 1.0)
+        assert _near(client, 1.0, 1.0, 10.0) == [instance_id]
+
+        client.post(f"/boat_status/set/{instance_id}", json={"latitude": 2.0, "longitude": 2.0})
+        assert _near(client, 1.0, 1.0, 10.0) == []
+        assert _near(client, 2.0, 2.0, 10.0) == [instance_id]
+
+        client.post(f"/boat_status/set/{instance_id}", json={"heading": 0.0})
+        assert _near(client, 2.0, 2.0, 10.0) == []
+
+        other = _boat(client, 3.0, 3.0)
+        client.delete(f"/instance_manager/delete/{other}")
+        assert _bbox(client, -90, -180, 90, 180) == []
+
+    def test_set_fast_and_import(self, client: FlaskClient) -> None:
+        instance_id = client.get("/instance_manager/create").get_json()
+        client.post(f"/boat_status/set_mapping/{instance_id}", json=[["latitude", "c_double"], ["longitude", "c_double"]])
+        assert _near(client, 5.0, 5.0, 10.0) == []
+
+        client.post(f"/boat_status/set_fast/{instance_id}", data=np.array([5.0, 5.0], dtype="<f8").tobytes())
+        assert _near(client, 5.0, 5.0, 10.0) == [instance_id]
+
+        body = client.get("/instance_manager/export").data
+        client.delete("/instance_manager/delete_all")
+        assert _near(client, 5.0, 5.0, 10.0) == []
+
+        client.post("/instance_manager/import", data=body)
+        assert len(_near(client, 5.0, 5.0, 10.0)) == 1
+
+    def test_loaded_queries_issue_no_sql(self, app: Flask, client: FlaskClient) -> None:
+        _boat(client, 1.0, 1.0)
+        _near(client, 1.0, 1.0, 10.0)
+        statements: list[str] = []
+
+        def record(*args: object) -> None:
+            statements.append(str(args[2]))
+
+        engines = set(db.engines.values())
+        for engine in engines:
+            event.listen(engine, "before_cursor_execute", record)
+        try:
+            _near(client, 1.0, 1.0, 10.0)
+            _bbox(client, 0, 0, 2, 2)
+        finally:
+            for engine in engines:
+                event.remove(engine, "before_cursor_execute", record)
+
+        assert statements == []
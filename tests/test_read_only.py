@@ -0,0 +1,132 @@
+"""
+Tests for ``autoboat_telemetry_server.read_only``.
+
+Covers:
+- The read-only engines refuse writes and have their own pools.
+- Read routes don't take the shared lock (they answer while a writer holds it).
+- Read-after-write visibility: a read route sees every committed write and
+  never sees an uncommitted one.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+
+import pytest
+from flask import Flask
+from flask.testing import FlaskClient
+from sqlalchemy import text
+
+from autoboat_telemetry_server import shared_lock_manager
+from autoboat_telemetry_server.models import HashTable, TelemetryTable, db
+from autoboat_telemetry_server.read_only import read_db
+
+
+def _create_instance() -> int:
+    (instance_id,) = TelemetryTable.create_many(1)
+    db.session.commit()
+    return instance_id
+
+
+class TestReadOnlyEngines:
+    """The read-only engines are separate, query-only connections to the same files."""
+
+    def test_separate_engine_per_bind(self, app: Flask) -> None:
+        assert set(read_db.engines) == set(db.engines)
+        for bind_key, engine in read_db.engines.items():
+            assert engine is not db.engines[bind_key]
+
+    @pytest.mark.parametrize("bind_key", [None, "hashes"])
+    def test_connections_are_query_only(self, app: Flask, bind_key: str | None) -> None:
+        with read_db.engines[bind_key].connect() as connection:
+            assert connection.execute(text("PRAGMA query_only")).scalar_one() == 1
+            # connection-scoped pragmas still apply
+            assert connection.execute(text("PRAGMA busy_timeout")).scalar_one() == 5000
+
+    def test_writes_are_rejected(self, app: Flask) -> None:
+        _create_instance()
+        with pytest.raises(Exception, match="readonly database"):
+            read_db.session.execute(db.delete(TelemetryTable))
+
+        read_db.session.rollback()
+        assert TelemetryTable.get_all_ids() != []
+
+    def test_session_reads_both_binds(self, app: Flask) -> None:
+        instance_id = _create_instance()
+        db.session.add(HashTable(config_hash="abc", data={}))
+        db.session.commit()
+
+        assert read_db.session.get(TelemetryTable, instance_id) is not None
+        assert HashTable.check_hash_exists("abc", read_db.session) is True
+        assert TelemetryTable.get_all_ids(read_db.session) == [instance_id]
+
+
+class TestReadRoutesSkipTheLock:
+    """Pure read routes answer while a writer holds the shared lock."""
+
+    @pytest.mark.parametrize(
+        "path",
+        [
+            "/boat_status/get/{id}",
+            "/waypoints/get/{id}",
+            "/autopilot_parameters/get/{id}",
+            "/autopilot_parameters/get_default/{id}",
+            "/autopilot_parameters/get_all_hashes",
+            "/instance_manager/get_instance_info/{id}",
+            "/instance_manager/get_all_instance_info",
+            "/instance_manager/get_ids",
+        ],
+    )
+    def test_read_does_not_wait_for_writer(self, client: FlaskClient, path: str) -> None:
+        instance_id = _create_instance()
+        responses = []
+
+        assert shared_lock_manager._rw_lock.acquire_write(blocking=False)
+        try:
+            reader = threading.Thread(target=lambda: responses.append(client.get(path.format(id=instance_id))))
+            reader.start()
+            reader.join(timeout=5.0)
+        finally:
+            shared_lock_manager._rw_lock.release_write()
+
+        assert not reader.is_alive()
+        assert responses[0].status_code == 200
+
+
+class TestReadAfterWrite:
+    """A read route reflects every committed write immediately."""
+
+    def test_status_round_trips(self, client: FlaskClient) -> None:
+        instance_id = _create_instance()
+
+        for step in range(5):
+            status = {"heading": float(step), "step": step}
+            assert client.post(f"/boat_status/set/{instance_id}", json=status).status_code == 200
+            assert client.get(f"/boat_status/get/{instance_id}").get_json() == status
+
+    def test_new_config_is_visible(self, client: FlaskClient) -> None:
+        config = {"p": {"default": 1, "description": "p"}}
+        response = client.post("/autopilot_parameters/create_config", json=json.dumps(config))
+        config_hash = response.get_json()
+
+        assert client.get(f"/autopilot_parameters/get_hash_exists/{config_hash}").get_json() is True
+        assert client.get(f"/autopilot_parameters/get_config/{config_hash}").get_json() == config
+
+    def test_deleted_instance_is_gone(self, client: FlaskClient) -> None:
+        instance_id = _create_instance()
+        assert client.get(f"/instance_manager/get_name/{instance_id}").status_code == 200
+
+        assert client.delete(f"/instance_manager/delete/{instance_id}").status_code == 200
+        assert client.get(f"/instance_manager/get_name/{instance_id}").status_code == 404
+
+    def test_uncommitted_write_is_invisible_until_commit(self, app: Flask, client: FlaskClient) -> None:
+        instance_id = _create_instance()
+        instance = db.session.get(TelemetryTable, instance_id)
+        instance.instance_identifier = "pending"
+        db.session.flush()
+
+        assert client.get(f"/instance_manager/get_name/{instance_id}").get_json() != "pending"
+
+        db.session.commit()
+        assert client.get(f"/instance_manager/get_name/{instance_id}").get_json() == "pending"
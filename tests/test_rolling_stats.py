@@ -0,0 +1,113 @@
+"""
+Tests for ``autoboat_telemetry_server.rolling_stats`` and ``/boat_status/stats``.
+
+Covers:
+- Bucketed windows match statistics computed from the raw samples in range.
+- Buckets age out of each window on a controlled clock.
+- Tracked fields come from ``boat_status_mapping`` plus ``derived_*`` fields.
+- The stats route, and removal on delete.
+"""
+
+from __future__ import annotations
+
+import importlib
+import struct
+from collections.abc import Callable
+
+import numpy as np
+import pytest
+from flask import Flask
+from flask.testing import FlaskClient
+
+from autoboat_telemetry_server.rolling_stats import MAX_STATS_FIELDS, rolling_stats
+
+# the package re-exports the ``rolling_stats`` singleton under the module's name
+rolling_stats_module = importlib.import_module("autoboat_telemetry_server.rolling_stats")
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Callable[[float], None]:
+    """Return a setter for the ingest clock."""
+
+    now = [0.0]
+    monkeypatch.setattr(rolling_stats_module, "_clock", lambda: now[0])
+
+    def set_time(seconds: float) -> None:
+        now[0] = seconds
+
+    return set_time
+
+
+class TestWindows:
+    """Merged buckets give the statistics of the samples they cover."""
+
+    def test_matches_raw_samples(self, app: Flask, clock: Callable[[float], None]) -> None:
+        rng = np.random.default_rng(0)
+        times = np.sort(rng.uniform(0, 900, 5000))
+        values = rng.normal(12.0, 0.5, 5000)
+
+        for moment, value in zip(times, values, strict=True):
+            clock(moment)
+            rolling_stats.update(1, {"battery_voltage": value})
+
+        # 60 s buckets aligned to multiples of 60: the current one and the nine before it
+        in_window = values[times >= (times[-1] // 60 - 9) * 60]
+        summary = rolling_stats.summary(1, "10min")["battery_voltage"]
+
+        assert summary["count"] == len(in_window)
+        assert summary["mean"] == pytest.approx(in_window.mean())
+        assert summary["stddev"] == pytest.approx(in_window.std())
+        assert (summary["min"], summary["max"]) == (in_window.min(), in_window.max())
+
+    def test_buckets_age_out(self, app: Flask, clock: Callable[[float], None]) -> None:
+        rolling_stats.update(1, {"heel": 30.0})
+        clock(30.0)
+        rolling_stats.update(1, {"heel": 10.0})
+
+        assert rolling_stats.summary(1, "10s")["heel"]["count"] == 1
+        assert rolling_stats.summary(1, "1min")["heel"]["mean"] == 20.0
+
+        clock(1000.0)
+
+        assert rolling_stats.summary(1, "10min") == {}
+
+    def test_fields(self, app: Flask, clock: Callable[[float], None]) -> None:
+        rolling_stats.update(1, {"speed": 1, "mode": "auto", "armed": True, "bad": float("nan")})
+        rolling_stats.update(2, {"speed": 1.0, "heading": 2.0}, ["speed"])
+        rolling_stats.update(3, {f"f{index}": 1.0 for index in range(MAX_STATS_FIELDS + 5)})
+
+        assert list(rolling_stats.summary(1)) == ["speed"]
+        assert list(rolling_stats.summary(2)) == ["speed"]
+        assert len(rolling_stats.summary(3)) == MAX_STATS_FIELDS
+
+
+class TestRoute:
+    """``/boat_status/stats`` serves the aggregates kept on each write."""
+
+    def test_mapping_fields(self, app: Flask, client: FlaskClient, clock: Callable[[float], None]) -> None:
+        app.extensions["kinematics"].enabled = True
+        instance_id = client.get("/instance_manager/create").get_json()
+        client.post(f"/boat_status/set_mapping/{instance_id}", json=[["latitude", "c_double"], ["longitude", "c_double"]])
+
+        for latitude in (0.0, 0.001, 0.002):
+            client.post(f"/boat_status/set_fast/{instance_id}", data=struct.pack("<2d", latitude, 0.0))
+        client.post(f"/boat_status/set/{instance_id}", json={"latitude": 0.003, "longitude": 0.0, "rudder": 5.0})
+
+        stats = client.get(f"/boat_status/stats/{instance_id}?window=10s").get_json()
+
+        assert {"latitude", "longitude", "derived_distance_travelled"} <= set(stats)
+        assert "rudder" not in stats
+        assert stats["latitude"]["count"] == 4
+        assert stats["latitude"]["max"] == 0.003
+
+    def test_errors_and_delete(self, client: FlaskClient) -> None:
+        instance_id = client.get("/instance_manager/create").get_json()
+        client.post(f"/boat_status/set/{instance_id}", json={"heel": 3.0})
+
+        assert client.get(f"/boat_status/stats/{instance_id}").get_json()["heel"]["mean"] == 3.0
+        assert client.get(f"/boat_status/stats/{instance_id}?window=1h").status_code == 400
+        assert client.get("/boat_status/stats/9999").status_code == 404
+
+        client.delete("/instance_manager/delete_all")
+
+        assert rolling_stats.summary(instance_id) == {}
@@ -0,0 +1,192 @@
+"""
+Tests for ``autoboat_telemetry_server.route_geometry`` and ``/waypoints/legs`` / ``progress``.
+
+Covers:
+- Leg distances, bearings and cumulative distance against hand-computed values.
+- Cross-track error sign, distance remaining and the closest-leg choice.
+- The segment index finds the same leg as a search over every leg.
+- Writes warm the geometry cache, so progress requests do not recompute it.
+- A benchmark of progress on a 10 000-point survey mission (run with ``-s`` to see it).
+"""
+
+from __future__ import annotations
+
+import math
+import time
+
+import numpy as np
+import pytest
+from flask.testing import FlaskClient
+
+from autoboat_telemetry_server import route_geometry
+from autoboat_telemetry_server.route_geometry import EARTH_RADIUS_M, GeometryCache, RouteGeometry
+
+_DEGREE_M = EARTH_RADIUS_M * math.pi / 180
+_EQUATOR = [[0.0, 0.0], [0.0, 1.0], [0.0, 2.0]]
+
+
+def _survey(rows: int, columns: int) -> np.ndarray:
+    """Return a lawnmower pattern of ``rows * columns`` points near Blacksburg."""
+
+    latitudes = np.repeat(37.0 + np.arange(rows) * 0.001, columns)
+    longitudes = np.tile(-80.0 + np.arange(columns) * 0.001, rows).reshape(rows, columns)
+    longitudes[1::2] = longitudes[1::2, ::-1]
+    return np.column_stack((latitudes, longitudes.ravel()))
+
+
+def _mission(client: FlaskClient, points: list[list[float]], status: dict | None = None) -> int:
+    instance_id = client.get("/instance_manager/create").get_json()
+    assert client.post(f"/waypoints/set/{instance_id}", json=points).status_code == 200
+    if status is not None:
+        client.post(f"/boat_status/set/{instance_id}", json=status)
+    return instance_id
+
+
+class TestLegs:
+    """Per-leg arrays match the great-circle formulas."""
+
+    def test_distances_and_bearings(self) -> None:
+        geometry = RouteGeometry(np.array([[0.0, 0.0], [0.0, 1.0], [1.0, 1.0], [1.0, 1.0]]))
+
+        assert geometry.leg_count == 3
+        assert geometry.leg_distances == pytest.approx([_DEGREE_M, _DEGREE_M, 0.0])
+        assert geometry.leg_bearings[:2] == pytest.approx([90.0, 0.0])
+        assert geometry.cumulative_distances == pytest.approx([0.0, _DEGREE_M, 2 * _DEGREE_M, 2 * _DEGREE_M])
+        assert geometry.legs()["cumulative_distance"] == pytest.approx([0.0, _DEGREE_M, 2 * _DEGREE_M])
+
+    def test_westward_bearing_wraps(self) -> None:
+        assert RouteGeometry(np.array([[0.0, 0.0], [0.0, -1.0]])).leg_bearings[0] == pytest.approx(270.0)
+
+
+class TestProgress:
+    """A position is placed on its closest leg."""
+
+    def test_cross_track_sign_and_remaining(self) -> None:
+        geometry = RouteGeometry(np.array(_EQUATOR))
+
+        left = geometry.progress(0.1, 0.5)
+        right = geometry.progress(-0.1, 1.5)
+
+        assert left["leg"] == 0
+        assert left["cross_track_error"] == pytest.approx(-0.1 * _DEGREE_M, rel=1e-6)
+        assert left["distance_remaining"] == pytest.approx(1.5 * _DEGREE_M, rel=1e-4)
+        assert right["leg"] == 1
+        assert right["cross_track_error"] == pytest.approx(0.1 * _DEGREE_M, rel=1e-6)
+        assert right["distance_to_next_waypoint"] == pytest.approx(0.5 * _DEGREE_M, rel=1e-4)
+        assert right["bearing_to_next_waypoint"] < 90.0
+
+    def test_before_the_start_and_past_the_end(self) -> None:
+        geometry = RouteGeometry(np.array(_EQUATOR))
+
+        before = geometry.progress(0.0, -1.0)
+        after = geometry.progress(0.0, 3.0)
+
+        assert (before["leg"], before["distance_along_leg"]) == (0, 0.0)
+        assert before["distance_remaining"] == pytest.approx(2 * _DEGREE_M)
+        assert (after["leg"], after["distance_remaining"]) == (1, 0.0)
+
+    def test_index_matches_brute_force(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        points = _survey(40, 50)
+        indexed = RouteGeometry(points)
+        monkeypatch.setattr(route_geometry, "SEGMENT_BLOCK_SIZE", len(points))
+        brute = RouteGeometry(points)
+        rng = np.random.default_rng(0)
+
+        for latitude, longitude in zip(rng.uniform(36.99, 37.05, 200), rng.uniform(-80.01, -79.94, 200), strict=True):
+            assert indexed.nearest_leg(latitude, longitude) == pytest.approx(brute.nearest_leg(latitude, longitude))
+
+
+class TestCache:
+    """Geometries are keyed by content and computed once."""
+
+    def test_lru(self) -> None:
+        cache = GeometryCache(maxsize=1)
+        first = np.array(_EQUATOR).tobytes()
+
+        assert cache.get(first) is cache.get(first)
+        cache.get(np.array(_EQUATOR[:2]).tobytes())
+
+        assert (len(cache), cache.hits, cache.misses) == (1, 1, 2)
+
+    def test_writes_warm_the_cache(self, client: FlaskClient, monkeypatch: pytest.MonkeyPatch) -> None:
+        built = []
+
+        class CountingGeometry(RouteGeometry):
+            def __init__(self, points: np.ndarray) -> None:
+                built.append(len(points))
+                super().__init__(points)
+
+        monkeypatch.setattr(route_geometry, "RouteGeometry", CountingGeometry)
+        instance_id = _mission(client, [[10.0, 10.0], [10.0, 11.0]], {"latitude": 10.0, "longitude": 10.5})
+        client.post(f"/waypoints/edit/{instance_id}", json={"ops": [{"op": "insert", "index": 2, "points": [[11.0, 11.0]]}]})
+
+        for _ in range(3):
+            assert client.get(f"/waypoints/progress/{instance_id}").status_code == 200
+
+        assert built == [2, 3]
+
+
+class TestRoutes:
+    """The routes read the position from the latest boat status."""
+
+    def test_progress(self, client: FlaskClient) -> None:
+        instance_id = _mission(client, _EQUATOR, {"latitude": 0.1, "longitude": 0.5, "heading": 90.0})
+
+        response = client.get(f"/waypoints/progress/{instance_id}")
+        body = response.get_json()
+
+        assert response.status_code == 200
+        assert response.headers["X-Waypoints-Version"] == "1"
+        assert (body["version"], body["position"], body["leg"]) == (1, [0.1, 0.5], 0)
+        assert body["total_distance"] == pytest.approx(2 * _DEGREE_M)
+        assert client.get(f"/waypoints/progress/{instance_id}?lat=0&lon=1.5").get_json()["leg"] == 1
+
+    def test_position_fields(self, app: object, client: FlaskClient) -> None:
+        app.config["POSITION_FIELDS"] = ("lat", "lon")
+        instance_id = _mission(client, _EQUATOR, {"lat": 0.0, "lon": 1.5})
+
+        assert client.get(f"/waypoints/progress/{instance_id}").get_json()["leg"] == 1
+
+    def test_legs(self, client: FlaskClient) -> None:
+        instance_id = _mission(client, _EQUATOR)
+
+        body = client.get(f"/waypoints/legs/{instance_id}").get_json()
+
+        assert body["version"] == 1
+        assert body["bearing"] == pytest.approx([90.0, 90.0])
+        assert body["distance"] == pytest.approx([_DEGREE_M, _DEGREE_M])
+
+    def test_errors(self, client: FlaskClient) -> None:
+        no_position = _mission(client, _EQUATOR, {"latitude": "north"})
+        one_waypoint = _mission(client, [[0.0, 0.0]], {"latitude": 0.0, "longitude": 0.0})
+
+        assert client.get(f"/waypoints/progress/{no_position}").status_code == 400
+        assert client.get(f"/waypoints/progress/{no_position}?lat=0").status_code == 400
+        assert client.get(f"/waypoints/progress/{no_position}?lat=95&lon=0").status_code == 400
+        assert client.get(f"/waypoints/progress/{one_waypoint}").status_code == 400
+        assert client.get(f"/waypoints/legs/{one_waypoint}").status_code == 400
+        assert client.get("/waypoints/progress/9999?lat=0&lon=0").status_code == 404
+        assert client.get("/waypoints/legs/9999").status_code == 404
+
+
+class TestSurveyBenchmark:
+    """The segment index keeps progress cheap on long missions."""
+
+    def test_ten_thousand_points(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        points = _survey(100, 100)
+        geometry = RouteGeometry(points)
+        monkeypatch.setattr(route_geometry, "SEGMENT_BLOCK_SIZE", len(points))
+        brute = RouteGeometry(points)
+
+        start = time.perf_counter()
+        for _ in range(100):
+            geometry.progress(37.05, -79.95)
+        indexed_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(100):
+            brute.progress(37.05, -79.95)
+        brute_seconds = time.perf_counter() - start
+
+        assert geometry.progress(37.05, -79.95) == pytest.approx(brute.progress(37.05, -79.95))
+        print(f"\n10000 waypoints: 100 progress lookups indexed {indexed_seconds:.3f}s, all legs {brute_seconds:.3f}s")
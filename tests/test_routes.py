@@ -92,6 +92,123 @@ class TestInstanceManagerCreate:
         }
 
 
+class TestInstanceManagerCreateMany:
+    """``create_many`` provisions a simulation fleet in one transaction."""
+
+    def test_create_many_returns_ids(self, client: FlaskClient) -> None:
+        response = client.get("/instance_manager/create_many?n=3")
+        assert response.status_code == 200
+        ids = response.get_json()
+        assert len(ids) == 3
+        assert set(ids) <= set(client.get("/instance_manager/get_ids").get_json())
+
+    def test_create_many_instances_have_default_names(self, client: FlaskClient) -> None:
+        ids = client.get("/instance_manager/create_many?n=2").get_json()
+        for instance_id in ids:
+            name = client.get(f"/instance_manager/get_name/{instance_id}").get_json()
+            assert name == f"Unnamed instance #{instance_id}"
+
+    def test_create_many_missing_n_returns_400(self, client: FlaskClient) -> None:
+        response = client.get("/instance_manager/create_many")
+        assert response.status_code == 400
+        assert b"between 1 and" in response.data
+
+    def test_create_many_out_of_range_returns_400(self, client: FlaskClient) -> None:
+        from autoboat_telemetry_server.routes.instance_manager import MAX_CREATE_MANY
+
+        assert client.get("/instance_manager/create_many?n=0").status_code == 400
+        assert client.get(f"/instance_manager/create_many?n={MAX_CREATE_MANY + 1}").status_code == 400
+        assert client.get("/instance_manager/get_ids").get_json() == []
+
+
+class TestInstanceManagerListing:
+    """``get_all_instance_info`` filters and keyset-paginates, newest first."""
+
+    @staticmethod
+    def _seed(count: int) -> list[int]:
+        """Create ``count`` instances with distinct ``updated_at`` (oldest first) and alternating users/hashes."""
+
+        instance_ids = TelemetryTable.create_many(count)
+        now = datetime.now(UTC)
+        for offset, instance_id in enumerate(instance_ids):
+            db.session.execute(
+                db.update(TelemetryTable)
+                .where(TelemetryTable.instance_id == instance_id)
+                .values(
+                    user="alice" if offset % 2 == 0 else "bob",
+                    instance_identifier=f"{'sim' if offset % 2 == 0 else 'boat'}-{offset}",
+                    current_config_hash="a" * 64 if offset % 2 == 0 else "b" * 64,
+                    updated_at=now - timedelta(minutes=count - offset),
+                )
+            )
+        db.session.commit()
+        return instance_ids
+
+    def test_unpaged_listing_is_newest_first_without_cursor(self, app: Flask, client: FlaskClient) -> None:
+        instance_ids = self._seed(4)
+        response = client.get("/instance_manager/get_all_instance_info")
+        assert response.status_code == 200
+        assert [row["instance_id"] for row in response.get_json()] == instance_ids[::-1]
+        assert "X-Next-Cursor" not in response.headers
+
+    def test_pages_cover_every_row_once(self, app: Flask, client: FlaskClient) -> None:
+        instance_ids = self._seed(7)
+        seen: list[int] = []
+        url = "/instance_manager/get_all_instance_info?limit=3"
+        pages = 0
+        while True:
+            response = client.get(url)
+            assert response.status_code == 200
+            seen.extend(row["instance_id"] for row in response.get_json())
+            pages += 1
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+            url = f"/instance_manager/get_all_instance_info?limit=3&after={cursor}"
+
+        assert pages == 3
+        assert seen == instance_ids[::-1]
+
+    def test_equal_updated_at_is_broken_by_instance_id(self, app: Flask, client: FlaskClient) -> None:
+        instance_ids = TelemetryTable.create_many(3)
+        db.session.execute(db.update(TelemetryTable).values(updated_at=datetime.now(UTC)))
+        db.session.commit()
+
+        first = client.get("/instance_manager/get_all_instance_info?limit=2")
+        cursor = first.headers["X-Next-Cursor"]
+        second = client.get(f"/instance_manager/get_all_instance_info?limit=2&after={cursor}")
+
+        ids = [row["instance_id"] for row in first.get_json() + second.get_json()]
+        assert ids == sorted(instance_ids, reverse=True)
+
+    @pytest.mark.parametrize(
+        ("query", "expected_offsets"),
+        [
+            ("user=alice", [4, 2, 0]),
+            ("name_prefix=boat", [3, 1]),
+            (f"config_hash={'b' * 64}", [3, 1]),
+            ("user=bob&name_prefix=boat-3", [3]),
+        ],
+    )
+    def test_filters(self, app: Flask, client: FlaskClient, query: str, expected_offsets: list[int]) -> None:
+        instance_ids = self._seed(5)
+        response = client.get(f"/instance_manager/get_all_instance_info?{query}")
+        assert response.status_code == 200
+        assert [row["instance_id"] for row in response.get_json()] == [instance_ids[i] for i in expected_offsets]
+
+    def test_active_since_filter(self, app: Flask, client: FlaskClient) -> None:
+        instance_ids = self._seed(5)
+        # offsets 3 and 4 were updated 2 and 1 minutes ago
+        since = (datetime.now(UTC) - timedelta(minutes=2, seconds=30)).isoformat()
+        response = client.get("/instance_manager/get_all_instance_info", query_string={"active_since": since})
+        assert [row["instance_id"] for row in response.get_json()] == [instance_ids[4], instance_ids[3]]
+
+    @pytest.mark.parametrize("query", ["limit=0", "limit=abc", "after=not-a-cursor", "active_since=yesterday"])
+    def test_invalid_query_returns_400(self, app: Flask, client: FlaskClient, query: str) -> None:
+        self._seed(2)
+        assert client.get(f"/instance_manager/get_all_instance_info?{query}").status_code == 400
+
+
 class TestInstanceManagerDelete:
     def test_delete_existing(self, client: FlaskClient) -> None:
         instance_id = _create_instance(client)
@@ -582,6 +699,55 @@ class TestAutopilotCreateConfig:
         assert desc == "my-description"
 
 
+class TestAutopilotHttpCaching:
+    """``get_config`` is immutable per hash; ``get_hash_exists`` caches only a ``true``."""
+
+    def _create(self, client: FlaskClient) -> str:
+        return client.post("/autopilot_parameters/create_config", json=json.dumps(_make_config())).get_json()
+
+    def test_get_config_is_immutable_with_hash_etag(self, client: FlaskClient) -> None:
+        config_hash = self._create(client)
+        response = client.get(f"/autopilot_parameters/get_config/{config_hash}")
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] == f'"{config_hash}"'
+        assert response.cache_control.public
+        assert response.cache_control.immutable
+        assert response.cache_control.max_age == 31536000
+
+    def test_matching_if_none_match_returns_304(self, client: FlaskClient) -> None:
+        config_hash = self._create(client)
+        response = client.get(f"/autopilot_parameters/get_config/{config_hash}", headers={"If-None-Match": f'"{config_hash}"'})
+
+        assert response.status_code == 304
+        assert response.data == b""
+        assert response.headers["ETag"] == f'"{config_hash}"'
+
+    def test_other_etag_returns_body(self, client: FlaskClient) -> None:
+        config_hash = self._create(client)
+        response = client.get(f"/autopilot_parameters/get_config/{config_hash}", headers={"If-None-Match": '"stale"'})
+
+        assert response.status_code == 200
+        assert response.get_json() == _make_config()
+
+    def test_unknown_config_is_not_cacheable(self, client: FlaskClient) -> None:
+        response = client.get("/autopilot_parameters/get_config/unknown")
+        assert response.status_code == 404
+        assert "Cache-Control" not in response.headers
+
+    def test_hash_exists_caches_only_true(self, app: Flask, client: FlaskClient) -> None:
+        app.config["HASH_EXISTS_CACHE_MAX_AGE"] = 30
+        config_hash = self._create(client)
+
+        positive = client.get(f"/autopilot_parameters/get_hash_exists/{config_hash}")
+        negative = client.get("/autopilot_parameters/get_hash_exists/unknown")
+
+        assert positive.cache_control.public
+        assert positive.cache_control.max_age == 30
+        assert negative.cache_control.no_cache
+        assert negative.cache_control.max_age is None
+
+
 class TestAutopilotSetDefault:
     def test_set_default_creates_hash_and_applies_defaults(self, client: FlaskClient) -> None:
         instance_id = _create_instance(client)
@@ -741,6 +907,32 @@ class TestAutopilotSetDefaultFromHash:
 # --------------------------------------------------------------------------- #
 
 
+class TestAdminMaintenance:
+    """``/admin/maintenance`` lists jobs and ``/admin/maintenance/run/<job>`` runs them on demand."""
+
+    def test_lists_jobs(self, client: FlaskClient) -> None:
+        response = client.get("/admin/maintenance")
+        assert response.status_code == 200
+        names = [job["name"] for job in response.get_json()["jobs"]]
+        assert {"wal_checkpoint", "wal_checkpoint_truncate", "incremental_vacuum", "optimize"} <= set(names)
+
+    @pytest.mark.parametrize("job_name", ["wal_checkpoint", "wal_checkpoint_truncate", "incremental_vacuum", "optimize"])
+    def test_runs_housekeeping_jobs(self, client: FlaskClient, job_name: str) -> None:
+        response = client.post(f"/admin/maintenance/run/{job_name}")
+        assert response.status_code == 200
+        body = response.get_json()
+        assert body["job"] == job_name
+        assert body["rows_affected"] >= 0
+
+        listed = {job["name"]: job for job in client.get("/admin/maintenance").get_json()["jobs"]}
+        assert listed[job_name]["last_run_at"] is not None
+
+    def test_unknown_job_is_404(self, client: FlaskClient) -> None:
+        response = client.post("/admin/maintenance/run/nope")
+        assert response.status_code == 404
+        assert "Unknown maintenance job" in response.get_json()
+
+
 class TestRouteLocking:
     """Sanity-check that routes are lock-decorated by observing 429 behavior.
 
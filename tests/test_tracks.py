@@ -0,0 +1,139 @@
+"""
+Tests for ``autoboat_telemetry_server.tracks`` and ``/boat_status/track``.
+
+Covers:
+- ``simplify`` keeps every point within the tolerance of the simplified polyline.
+- Block-wise extension between requests gives the same polyline as one request at the end.
+- Tracks are trimmed at ``TRACK_MAX_POINTS``.
+- The track route, and removal on delete.
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+from flask import Flask
+from flask.testing import FlaskClient
+
+from autoboat_telemetry_server.route_geometry import EARTH_RADIUS_M
+from autoboat_telemetry_server.tracks import TRACK_BLOCK_SIZE, simplify, tracks
+
+
+def _random_walk(count: int, seed: int = 0) -> np.ndarray:
+    """A boat wandering about a metre per sample."""
+
+    steps = np.random.default_rng(seed).normal(0.0, 1e-5, (count, 2))
+    return np.array([37.0, -76.0]) + np.cumsum(steps, axis=0)
+
+
+def _max_deviation(points: np.ndarray, polyline: np.ndarray) -> float:
+    """Farthest any point lies from the polyline, in metres, on one plane for the whole track."""
+
+    scale = math.radians(1) * EARTH_RADIUS_M
+    cosine = math.cos(math.radians(points[0, 0]))
+    xy = np.column_stack((points[:, 1] * cosine, points[:, 0])) * scale
+    line = np.column_stack((polyline[:, 1] * cosine, polyline[:, 0])) * scale
+
+    starts, ends = line[:-1], line[1:]
+    direction = ends - starts
+    length_squared = np.maximum((direction**2).sum(axis=1), 1e-12)
+    offsets = xy[:, None, :] - starts[None, :, :]
+    along = np.clip((offsets * direction).sum(axis=2) / length_squared, 0.0, 1.0)
+    distances = np.linalg.norm(offsets - along[:, :, None] * direction, axis=2)
+    return float(distances.min(axis=1).max())
+
+
+class TestSimplify:
+    """Douglas-Peucker on one block."""
+
+    def test_straight_line_keeps_end_points(self) -> None:
+        points = np.column_stack((np.linspace(37.0, 37.01, 50), np.full(50, -76.0)))
+
+        assert simplify(points, 1.0).tolist() == [0, 49]
+
+    def test_within_tolerance(self) -> None:
+        points = _random_walk(TRACK_BLOCK_SIZE)
+
+        for tolerance in (0.5, 2.0, 10.0):
+            kept = simplify(points, tolerance)
+
+            assert kept[0] == 0
+            assert kept[-1] == len(points) - 1
+            assert _max_deviation(points, points[kept]) <= tolerance * 1.001
+        assert len(simplify(points, 10.0)) < len(simplify(points, 0.5)) < len(points)
+
+
+class TestTrackStore:
+    """Tracks extend their cached simplifications as points arrive."""
+
+    def test_incremental_matches_one_pass(self, app: Flask) -> None:
+        points = _random_walk(5 * TRACK_BLOCK_SIZE + 37)
+
+        for start in range(0, len(points), 100):
+            for position in points[start : start + 100]:
+                tracks.append(1, tuple(position))
+            tracks.simplified(1, 3.0)
+        incremental = tracks.simplified(1, 3.0)
+
+        for position in points:
+            tracks.append(2, tuple(position))
+        one_pass = tracks.simplified(2, 3.0)
+
+        assert np.array_equal(incremental, one_pass)
+        assert len(incremental) < len(points) / 4
+        assert _max_deviation(points, incremental) <= 3.0 * 1.001
+        assert np.array_equal(tracks.simplified(1, 0), points)
+
+    def test_repeats_and_missing_positions_are_skipped(self, app: Flask) -> None:
+        for position in [(1.0, 1.0), (1.0, 1.0), None, (1.0, 2.0)]:
+            tracks.append(1, position)
+
+        assert tracks.simplified(1, 0).tolist() == [[1.0, 1.0], [1.0, 2.0]]
+        assert tracks.simplified(2, 5.0).tolist() == []
+
+    def test_trimmed_at_max_points(self, app: Flask) -> None:
+        app.extensions["tracks"].max_points = 100
+        points = _random_walk(1000)
+
+        for index, position in enumerate(points):
+            tracks.append(1, tuple(position))
+            if index % 7 == 0:
+                tracks.simplified(1, 2.0)
+
+        kept = tracks.simplified(1, 0)
+        simplified = tracks.simplified(1, 2.0)
+
+        assert len(kept) <= 100
+        assert np.array_equal(kept, points[-len(kept) :])
+        assert np.array_equal(simplified[-1], points[-1])
+        assert _max_deviation(kept[-len(kept) // 2 :], simplified) <= 2.0 * 1.001
+
+
+class TestRoute:
+    """``/boat_status/track`` serves the recorded positions."""
+
+    def test_track(self, client: FlaskClient) -> None:
+        instance_id = client.get("/instance_manager/create").get_json()
+        points = _random_walk(300)
+        for latitude, longitude in points:
+            client.post(f"/boat_status/set/{instance_id}", json={"latitude": latitude, "longitude": longitude})
+
+        full = client.get(f"/boat_status/track/{instance_id}").get_json()
+        simplified = client.get(f"/boat_status/track/{instance_id}?tolerance=5").get_json()
+
+        assert np.array_equal(full, points)
+        assert 2 <= len(simplified) < len(full)
+        assert _max_deviation(points, np.array(simplified)) <= 5.0 * 1.001
+
+    def test_errors_and_delete(self, client: FlaskClient) -> None:
+        instance_id = client.get("/instance_manager/create").get_json()
+        client.post(f"/boat_status/set/{instance_id}", json={"latitude": 1.0, "longitude": 1.0})
+
+        assert client.get("/boat_status/track/9999").status_code == 404
+        assert client.get(f"/boat_status/track/{instance_id}?tolerance=-1").status_code == 400
+        assert client.get(f"/boat_status/track/{instance_id}?tolerance=far").status_code == 400
+
+        client.delete(f"/instance_manager/delete/{instance_id}")
+
+        assert tracks.simplified(instance_id, 0).tolist() == []
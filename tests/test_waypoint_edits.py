@@ -0,0 +1,171 @@
+"""
+Tests for ``autoboat_telemetry_server.waypoint_edits`` and ``/waypoints/edit``.
+
+Covers:
+- ``apply_ops`` insert / delete / move / replace semantics and bounds.
+- The edit route versions every write, rejects stale ``base_version`` with 409,
+  and applies all operations or none.
+- ``get_new?since=`` returns only the missing ops while they are all logged,
+  the full list after a full write or pruning, and ``{}`` when up to date.
+- Deleting an instance deletes its edit log.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from flask import Flask
+from flask.testing import FlaskClient
+
+from autoboat_telemetry_server.models import WaypointEditTable, db
+from autoboat_telemetry_server.waypoint_edits import apply_ops, parse_ops
+
+_MISSION = [[0.0, 0.0], [1.0, 1.0], [2.0, 2.0], [3.0, 3.0]]
+
+
+def _apply(points: list[list[float]], ops: list[dict]) -> list[list[float]]:
+    return apply_ops(np.asarray(points, dtype="<f8").reshape(-1, 2), parse_ops(ops)).tolist()
+
+
+def _mission(client: FlaskClient) -> int:
+    instance_id = client.get("/instance_manager/create").get_json()
+    assert client.post(f"/waypoints/set/{instance_id}", json=_MISSION).status_code == 200
+    return instance_id
+
+
+def _edit(client: FlaskClient, instance_id: int, ops: list[dict], **body: object) -> dict:
+    response = client.post(f"/waypoints/edit/{instance_id}", json={"ops": ops, **body})
+    assert response.status_code == 200, response.data
+    return response.get_json()
+
+
+class TestOperations:
+    """Each operation sees the result of the previous one."""
+
+    def test_each_op(self) -> None:
+        assert _apply(_MISSION, [{"op": "insert", "index": 1, "points": [[9.0, 9.0]]}])[:3] == [
+            [0.0, 0.0],
+            [9.0, 9.0],
+            [1.0, 1.0],
+        ]
+        assert _apply(_MISSION, [{"op": "delete", "start": 1, "stop": 3}]) == [[0.0, 0.0], [3.0, 3.0]]
+        assert _apply(_MISSION, [{"op": "move", "from": 0, "to": 3}]) == [[1.0, 1.0], [2.0, 2.0], [3.0, 3.0], [0.0, 0.0]]
+        assert _apply(_MISSION, [{"op": "replace", "start": 1, "stop": 4, "points": [[5.0, 5.0]]}]) == [[0.0, 0.0], [5.0, 5.0]]
+
+    def test_ops_compose(self) -> None:
+        ops = [{"op": "delete", "start": 0, "stop": 3}, {"op": "insert", "index": 1, "points": [[7.0, 7.0]]}]
+
+        assert _apply(_MISSION, ops) == [[3.0, 3.0], [7.0, 7.0]]
+
+    def test_out_of_range(self) -> None:
+        for op in (
+            {"op": "insert", "index": 5, "points": []},
+            {"op": "delete", "start": 3, "stop": 2},
+            {"op": "move", "from": 4, "to": 0},
+            {"op": "replace", "start": 0, "stop": 5, "points": []},
+        ):
+            with pytest.raises(ValueError, match="Operation 0"):
+                _apply(_MISSION, [op])
+
+    def test_malformed(self) -> None:
+        for ops in (
+            [{"op": "rotate"}],
+            [{"op": "delete", "start": -1, "stop": 2}],
+            [{"op": "insert", "index": 0}],
+            [{"op": "insert", "index": 0, "points": [[1.5, True]]}],
+            {"op": "x"},
+        ):
+            with pytest.raises(TypeError):
+                parse_ops(ops)
+
+        with pytest.raises(ValueError, match="between 1"):
+            parse_ops([])
+
+
+class TestEditRoute:
+    """Edits are versioned, atomic and checked against the caller's version."""
+
+    def test_edit_bumps_version(self, client: FlaskClient) -> None:
+        instance_id = _mission(client)
+
+        result = _edit(client, instance_id, [{"op": "delete", "start": 0, "stop": 1}], base_version=1)
+
+        assert result == {"version": 2, "count": 3}
+        response = client.get(f"/waypoints/get/{instance_id}")
+        assert response.get_json() == _MISSION[1:]
+        assert response.headers["X-Waypoints-Version"] == "2"
+        assert client.get(f"/waypoints/get_fast/{instance_id}").headers["X-Waypoints-Version"] == "2"
+
+    def test_stale_base_version_is_409(self, client: FlaskClient) -> None:
+        instance_id = _mission(client)
+
+        response = client.post(
+            f"/waypoints/edit/{instance_id}", json={"ops": [{"op": "move", "from": 0, "to": 1}], "base_version": 0}
+        )
+
+        assert response.status_code == 409
+        assert response.get_json()["version"] == 1
+
+    def test_invalid_edit_changes_nothing(self, client: FlaskClient) -> None:
+        instance_id = _mission(client)
+        ops = [{"op": "delete", "start": 0, "stop": 1}, {"op": "move", "from": 10, "to": 0}]
+
+        assert client.post(f"/waypoints/edit/{instance_id}", json={"ops": ops}).status_code == 400
+        assert client.post("/waypoints/edit/9999", json={"ops": ops}).status_code == 400
+        assert client.get(f"/waypoints/get/{instance_id}").get_json() == _MISSION
+        assert client.get(f"/waypoints/get/{instance_id}").headers["X-Waypoints-Version"] == "1"
+
+
+class TestGetNewSince:
+    """A boat that acknowledges its version downloads only the ops it missed."""
+
+    def test_ops_since(self, client: FlaskClient) -> None:
+        instance_id = _mission(client)
+        first = [{"op": "replace", "start": 0, "stop": 1, "points": [[5.0, 5.0]]}]
+        second = [{"op": "delete", "start": 3, "stop": 4}]
+        _edit(client, instance_id, first)
+        _edit(client, instance_id, second)
+
+        response = client.get(f"/waypoints/get_new/{instance_id}?since=1")
+
+        assert response.get_json() == {"version": 3, "ops": first + second}
+        assert client.get(f"/waypoints/get_new/{instance_id}?since=3").get_json() == {}
+        assert client.get(f"/waypoints/get_new/{instance_id}").get_json() == {}
+
+    def test_full_write_breaks_the_chain(self, client: FlaskClient) -> None:
+        instance_id = _mission(client)
+        _edit(client, instance_id, [{"op": "delete", "start": 0, "stop": 1}])
+        client.post(f"/waypoints/set/{instance_id}", json=[[8.0, 8.0]])
+        _edit(client, instance_id, [{"op": "insert", "index": 1, "points": [[9.0, 9.0]]}])
+
+        assert client.get(f"/waypoints/get_new/{instance_id}?since=1").get_json() == {
+            "version": 4,
+            "waypoints": [[8.0, 8.0], [9.0, 9.0]],
+        }
+        assert client.get(f"/waypoints/get_new/{instance_id}?since=3").get_json()["ops"] == [
+            {"op": "insert", "index": 1, "points": [[9.0, 9.0]]}
+        ]
+
+    def test_pruned_versions_fall_back_to_the_full_list(self, app: Flask, client: FlaskClient) -> None:
+        app.config["WAYPOINT_EDIT_LOG_SIZE"] = 2
+        instance_id = _mission(client)
+        for _ in range(3):
+            _edit(client, instance_id, [{"op": "move", "from": 0, "to": 3}])
+
+        assert db.session.execute(db.select(db.func.count()).select_from(WaypointEditTable)).scalar_one() == 2
+        assert "waypoints" in client.get(f"/waypoints/get_new/{instance_id}?since=1").get_json()
+        assert "ops" in client.get(f"/waypoints/get_new/{instance_id}?since=2").get_json()
+
+    def test_bad_since(self, client: FlaskClient) -> None:
+        instance_id = _mission(client)
+
+        assert client.get(f"/waypoints/get_new/{instance_id}?since=-1").status_code == 400
+        assert client.get(f"/waypoints/get_new/{instance_id}?since=abc").status_code == 400
+
+    def test_delete_forgets_the_log(self, client: FlaskClient) -> None:
+        instance_id = _mission(client)
+        _edit(client, instance_id, [{"op": "delete", "start": 0, "stop": 1}])
+
+        client.delete(f"/instance_manager/delete/{instance_id}")
+
+        assert db.session.execute(db.select(db.func.count()).select_from(WaypointEditTable)).scalar_one() == 0
@@ -0,0 +1,125 @@
+"""
+Tests for ``autoboat_telemetry_server.waypoint_storage`` and ``/waypoints/set_fast`` / ``get_fast``.
+
+Covers:
+- Vectorized validation of JSON and packed waypoints (shape, type, finiteness, bounds).
+- Both routes read both row layouts, so the JSON routes stay compatible.
+- ``PACK_WAYPOINTS`` picks the layout of new writes.
+- A benchmark of a 10 000-point survey mission (run with ``-s`` to see it).
+"""
+
+from __future__ import annotations
+
+import math
+import time
+
+import numpy as np
+import pytest
+from flask import Flask
+from flask.testing import FlaskClient
+
+from autoboat_telemetry_server.models import TelemetryTable, db
+from autoboat_telemetry_server.waypoint_storage import parse_json, parse_packed
+
+_OCTET_STREAM = "application/octet-stream"
+
+
+def _packed(points: list[list[float]]) -> bytes:
+    return np.asarray(points, dtype="<f8").tobytes()
+
+
+class TestValidation:
+    """Bad waypoints are rejected as a whole, without a per-point loop."""
+
+    def test_json_shapes_and_types(self) -> None:
+        assert parse_json([]).shape == (0, 2)
+        assert parse_json([[1, 2.5], [-3, 4]]).tolist() == [[1.0, 2.5], [-3.0, 4.0]]
+
+        for bad in ({"not": "a list"}, [[1.0]], [[1.0, 2.0, 3.0]], [[1.0, 2.0], [3.0]], [["a", "b"]], [[True, False]], [1, 2]):
+            with pytest.raises(TypeError):
+                parse_json(bad)
+
+    def test_json_rejects_booleans_mixed_with_numbers(self) -> None:
+        for bad in ([[True, 1], [0, 0]], [[1.5, True]], [[1, [2, 3]]], [[1.0, None]]):
+            with pytest.raises(TypeError, match="Invalid coordinate type"):
+                parse_json(bad)
+
+        with pytest.raises(ValueError, match="Invalid coordinate value"):
+            parse_json([[10**400, 0]])
+
+    def test_bounds_and_finiteness(self) -> None:
+        for bad in ([[91.0, 0.0]], [[0.0, -180.5]], [[math.nan, 0.0]], [[0.0, math.inf]]):
+            with pytest.raises(ValueError, match="Invalid coordinate value"):
+                parse_json(bad)
+
+        with pytest.raises(ValueError, match="Invalid coordinate value"):
+            parse_packed(_packed([[0.0, 0.0], [math.nan, 1.0]]))
+
+    def test_packed_length(self) -> None:
+        assert parse_packed(b"").shape == (0, 2)
+
+        with pytest.raises(TypeError, match="multiple of 16"):
+            parse_packed(b"\x00" * 24)
+
+
+class TestFastRoutes:
+    """The binary and JSON routes are interchangeable."""
+
+    def test_set_fast_then_json_get(self, client: FlaskClient) -> None:
+        instance_id = client.get("/instance_manager/create").get_json()
+        points = [[37.2296, -80.4139], [37.23, -80.41]]
+
+        response = client.post(f"/waypoints/set_fast/{instance_id}", data=_packed(points), content_type=_OCTET_STREAM)
+
+        assert response.status_code == 200
+        assert client.get(f"/waypoints/get/{instance_id}").get_json() == points
+        assert client.get(f"/waypoints/get_new/{instance_id}").get_json() == points
+
+        fast = client.get(f"/waypoints/get_fast/{instance_id}")
+        assert fast.mimetype == _OCTET_STREAM
+        assert fast.data == _packed(points)
+
+    def test_json_set_then_get_fast(self, client: FlaskClient) -> None:
+        instance_id = client.get("/instance_manager/create").get_json()
+        client.post(f"/waypoints/set/{instance_id}", json=[[1, 2]])
+
+        assert client.get(f"/waypoints/get_fast/{instance_id}").data == _packed([[1.0, 2.0]])
+        assert db.session.get(TelemetryTable, instance_id).waypoints == []
+
+    def test_unpacked_rows_are_still_served(self, app: Flask, client: FlaskClient) -> None:
+        app.config["PACK_WAYPOINTS"] = False
+        instance_id = client.get("/instance_manager/create").get_json()
+        client.post(f"/waypoints/set/{instance_id}", json=[[1.0, 2.0]])
+
+        instance = db.session.get(TelemetryTable, instance_id)
+        assert (instance.waypoints, instance.waypoints_packed) == ([[1.0, 2.0]], None)
+        assert client.get(f"/waypoints/get_fast/{instance_id}").data == _packed([[1.0, 2.0]])
+
+    def test_errors(self, client: FlaskClient) -> None:
+        instance_id = client.get("/instance_manager/create").get_json()
+
+        assert client.post(f"/waypoints/set_fast/{instance_id}", data=b"\x00" * 8).status_code == 400
+        assert client.post(f"/waypoints/set_fast/{instance_id}", data=_packed([[100.0, 0.0]])).status_code == 400
+        assert client.post(f"/waypoints/set/{instance_id}", json=[[0.0, 200.0]]).status_code == 400
+        assert client.post("/waypoints/set_fast/9999", data=b"").status_code == 400
+        assert client.get("/waypoints/get_fast/9999").status_code == 404
+
+
+class TestSurveyBenchmark:
+    """A long survey mission is validated and stored in one pass."""
+
+    def test_ten_thousand_points(self, client: FlaskClient) -> None:
+        instance_id = client.get("/instance_manager/create").get_json()
+        rng = np.random.default_rng(0)
+        points = np.column_stack((rng.uniform(-90, 90, 10_000), rng.uniform(-180, 180, 10_000)))
+
+        start = time.perf_counter()
+        assert client.post(f"/waypoints/set/{instance_id}", json=points.tolist()).status_code == 200
+        json_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        assert client.post(f"/waypoints/set_fast/{instance_id}", data=points.astype("<f8").tobytes()).status_code == 200
+        fast_seconds = time.perf_counter() - start
+
+        assert client.get(f"/waypoints/get_fast/{instance_id}").data == points.astype("<f8").tobytes()
+        print(f"\n10000 waypoints: JSON set {json_seconds:.3f}s, packed set_fast {fast_seconds:.3f}s")